@@ -0,0 +1,67 @@
+# benchmarks/bench_combinations.py
+# Files Combinations grouping + solver benchmark (1M rows / 30k ZIP-like groups by default).
+#
+#   python -m benchmarks.bench_combinations [--rows N] [--groups G] [--legacy-grouping]
+import argparse
+import time
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+from utils.combinations.solver import SOLVERS, group_rows, plan_combinations
+
+
+def make_frame(rows, groups, seed=7):
+    """Skewed group sizes (a few big ZIPs, many small ones), shuffled rows."""
+    rng = np.random.default_rng(seed)
+    weights = rng.pareto(1.2, groups) + 1
+    sizes = np.maximum(1, np.floor(weights / weights.sum() * rows)).astype(np.int64)
+    sizes[np.argmax(sizes)] += rows - sizes.sum()
+    zips = np.repeat(np.arange(10000, 10000 + groups), sizes)
+    rng.shuffle(zips)
+    return pd.DataFrame({"Zip": zips.astype(str), "Value": np.arange(rows)})
+
+
+def legacy_grouping(df, column):
+    grouped_records = defaultdict(list)
+    for idx, row in df.iterrows():
+        grouped_records[row[column]].append(idx)
+    return grouped_records
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Files Combinations solvers")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--groups", type=int, default=30_000)
+    parser.add_argument("--requests", type=int, nargs="+",
+                        default=[50_000, 120_000, 75_000, 200_000, 33_333, 10_001])
+    parser.add_argument("--legacy-grouping", action="store_true",
+                        help="Also time the old iterrows() grouping (slow)")
+    args = parser.parse_args()
+
+    df = make_frame(args.rows, args.groups)
+    print(f"📊 {len(df):,} rows, {df['Zip'].nunique():,} groups, requests {args.requests}")
+
+    if args.legacy_grouping:
+        start = time.perf_counter()
+        legacy_grouping(df, "Zip")
+        print(f"⏱️ iterrows grouping: {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    keys, sizes, rows = group_rows(df, "Zip")
+    print(f"⏱️ groupby().indices grouping: {time.perf_counter() - start:.3f}s")
+
+    requirements = [(f"Combination_{i + 1}", n) for i, n in enumerate(args.requests)]
+    for solver in SOLVERS:
+        start = time.perf_counter()
+        plan, remaining = plan_combinations(sizes, requirements, solver)
+        elapsed = time.perf_counter() - start
+        misses = [int(sizes[ids].sum()) - requested for _, requested, ids in plan]
+        exact = sum(1 for m in misses if m == 0)
+        print(f"🎯 {solver}: {elapsed:.3f}s, exact {exact}/{len(plan)}, "
+              f"off by {misses}, remaining groups {len(remaining):,}")
+
+
+if __name__ == "__main__":
+    main()
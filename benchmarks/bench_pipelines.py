@@ -0,0 +1,122 @@
+# benchmarks/bench_pipelines.py
+# Per-step and end-to-end timings for the four list-building pipelines on synthetic data.
+#
+#   python -m benchmarks.bench_pipelines [--sizes 10k 100k] [--pipelines listbuilding aae_3_phone]
+#                                        [--formats csv xlsx] [--repeat 3] [--type3-max] [--no-full]
+#                                        [--json out.json]
+#
+# Steps run in memory on the previous step's output (copied, not timed), so each
+# step_0X is measured on its own; the full runs read the generated file and write
+# every output like the app does.
+import os
+import shutil
+import argparse
+import importlib
+import tempfile
+
+from benchmarks.datagen import FORMATS, SIZES, ensure_dataset, make_skiptrace, parse_size
+from benchmarks.results import BenchResults, measure
+
+# name -> (module, input variant, full-run function, step 04 function)
+PIPELINES = {
+    "listbuilding": ("pipeline.listbuilding_pipeline", "standard", "run_pipeline", "step_04_process_phones"),
+    "resident": ("pipeline.resident_data", "standard", "run_pipeline", "step_04_process_phones"),
+    "vacant_lot": ("pipeline.vacant_lot_pipeline.6_phone_number_vacant_lot", "standard",
+                   "run_pipeline", "step_04_process_phones"),
+    "aae_3_phone": ("pipeline.AAE_3_phone_lsb", "owner_name", "run_aae_pipeline", "step_04_remove_landlines"),
+}
+TYPE3_MAX_PIPELINES = ("resident", "vacant_lot")  # the ones that pad a Type3-max input
+
+
+def _fresh(folder):
+    def setup():
+        shutil.rmtree(folder, ignore_errors=True)
+        os.makedirs(folder)
+    return setup
+
+
+def bench_steps(results, name, label, module, raw, work_dir, repeat, quiet):
+    _, _, _, step_04_name = PIPELINES[name]
+    list_name = f"Bench-{name}-{len(raw)}"
+    out_dir = os.path.join(work_dir, "steps", name)
+    rows = len(raw)
+
+    runs, df_01 = measure(lambda: module.step_01_clean_and_standardize(raw.copy(), list_name),
+                          repeat, quiet=quiet)
+    if isinstance(df_01, tuple):  # resident / vacant lot also return has_type3_max
+        df_01 = df_01[0]
+    results.add(f"{label}.step_01", rows, runs, len(df_01))
+
+    runs, df_02 = measure(lambda: module.step_02_remove_phones(df_01.copy()), repeat, quiet=quiet)
+    results.add(f"{label}.step_02", len(df_01), runs, len(df_02))
+
+    runs, df_03 = measure(lambda: module.step_03_dedupe_and_cleanup(df_01.copy(), list_name, out_dir),
+                          repeat, setup=_fresh(out_dir), quiet=quiet)
+    results.add(f"{label}.step_03", len(df_01), runs, len(df_03))
+
+    step_04 = getattr(module, step_04_name)
+    runs, df_04 = measure(lambda: step_04(df_03.copy()), repeat, quiet=quiet)
+    results.add(f"{label}.step_04", len(df_03), runs, len(df_04))
+
+    runs, df_05 = measure(lambda: module.step_05_reshape(df_04.copy()), repeat, quiet=quiet)
+    results.add(f"{label}.step_05", len(df_04), runs, len(df_05))
+
+
+def bench_full(results, name, label, module, input_path, rows, fmt, work_dir, repeat, quiet):
+    _, _, run_name, _ = PIPELINES[name]
+    out_dir = os.path.join(work_dir, "full", name)
+    list_name = f"Bench-{name}-{rows}"
+    run = getattr(module, run_name)
+    runs, _ = measure(lambda: run(input_path, list_name, out_dir), repeat, setup=_fresh(out_dir), quiet=quiet)
+    results.add(f"{label}.{run_name}", rows, runs, fmt=fmt)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the list-building pipelines")
+    parser.add_argument("--sizes", nargs="+", default=["10k"], help=f"Row counts ({', '.join(SIZES)} or a number)")
+    parser.add_argument("--pipelines", nargs="+", choices=list(PIPELINES), default=list(PIPELINES))
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=["csv"],
+                        help="Input formats for the full runs")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--type3-max", action="store_true",
+                        help=f"Feed {' and '.join(TYPE3_MAX_PIPELINES)} a Type3-max input (Phone1..3 only)")
+    parser.add_argument("--no-steps", action="store_true", help="Skip the per-step timings")
+    parser.add_argument("--no-full", action="store_true", help="Skip the full pipeline runs")
+    parser.add_argument("--data", default="bench_data", help="Folder for generated inputs (reused)")
+    parser.add_argument("--work", default=None, help="Scratch folder for outputs (default: temp)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", default=None, help="Results file (default: bench_results/pipelines-<time>.json)")
+    parser.add_argument("--verbose", action="store_true", help="Show the pipelines' own output")
+    args = parser.parse_args()
+
+    work_dir = args.work or tempfile.mkdtemp(prefix="bench_pipelines_")
+    # Benchmark runs must not land in the user's run catalog
+    os.environ.setdefault("HITROTECH_DATA_DIR", os.path.join(work_dir, "app_data"))
+
+    results = BenchResults("pipelines", args)
+    quiet = not args.verbose
+    try:
+        for size in args.sizes:
+            rows = parse_size(size)
+            for name in args.pipelines:
+                module_name, variant = PIPELINES[name][:2]
+                if args.type3_max and name in TYPE3_MAX_PIPELINES:
+                    variant = "type3_max"
+                label = name if variant == PIPELINES[name][1] else f"{name}:{variant}"
+                module = importlib.import_module(module_name)
+                print(f"📊 {name}: {rows:,} rows ({variant})")
+                if not args.no_steps:
+                    bench_steps(results, name, label, module, make_skiptrace(rows, variant, args.seed),
+                                work_dir, args.repeat, quiet)
+                if not args.no_full:
+                    for fmt in args.formats:
+                        input_path = ensure_dataset(args.data, rows, variant, fmt, args.seed)
+                        bench_full(results, name, label, module, input_path, rows, fmt, work_dir, args.repeat, quiet)
+    finally:
+        if not args.work:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    results.save(args.json)
+
+
+if __name__ == "__main__":
+    main()
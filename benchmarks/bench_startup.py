@@ -0,0 +1,116 @@
+# benchmarks/bench_startup.py
+# GUI startup cost: time to import the app (and optionally show its first window),
+# with the packages that cost the most taken from `python -X importtime`.
+#
+#   python -m benchmarks.bench_startup [--repeat 5] [--window] [--ref HEAD~1] [--top 15] [--json out.json]
+#
+# Every run is a fresh interpreter. --ref also measures another commit (checked out
+# into a temporary git worktree), so one report shows before and after.
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+from benchmarks.results import BenchResults
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs inside the measured interpreter; prints one JSON line with its timings
+PROBE = """
+import json, time
+t0 = time.perf_counter()
+import main.main03 as app_module
+t1 = time.perf_counter()
+window = None
+if {window}:
+    import ttkbootstrap as tb
+    root = tb.Window(themename="cosmo")
+    app_module.FurtherExtendedApp(root)
+    root.update()
+    window = time.perf_counter() - t0
+    root.destroy()
+print("PROBE " + json.dumps({{"import_s": t1 - t0, "window_s": window}}))
+"""
+
+
+def parse_importtime(stderr):
+    """`-X importtime` lines -> {root package: seconds}, summing each module's own (self) time."""
+    packages = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        own, _, name = line[len("import time:"):].split("|", 2)
+        root = name.strip().split(".")[0]
+        packages[root] = packages.get(root, 0) + int(own) / 1e6
+    return packages
+
+
+def run_probe(cwd, window=False):
+    """One fresh interpreter: (probe timings, {package: seconds})."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", PROBE.format(window=window)],
+                          cwd=cwd, capture_output=True, text=True)
+    line = next((l for l in proc.stdout.splitlines() if l.startswith("PROBE ")), None)
+    if proc.returncode != 0 or line is None:
+        raise RuntimeError((proc.stderr.strip().splitlines() or ["no output"])[-1])
+    return json.loads(line[len("PROBE "):]), parse_importtime(proc.stderr)
+
+
+def measure_tree(results, label, cwd, repeat, window, top):
+    imports, windows, packages = [], [], {}
+    for _ in range(max(1, repeat)):
+        probe, run_packages = run_probe(cwd, window)
+        imports.append(probe["import_s"])
+        if probe["window_s"] is not None:
+            windows.append(probe["window_s"])
+        for name, seconds in run_packages.items():
+            packages[name] = min(seconds, packages.get(name, seconds))
+    slowest = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+    results.add(f"{label}.import_app", None, imports,
+                top_imports=[{"package": name, "seconds": round(s, 4)} for name, s in slowest])
+    if windows:
+        results.add(f"{label}.first_window", None, windows)
+    for name, seconds in slowest:
+        print(f"   {seconds * 1000:9.1f} ms  {name}")
+
+
+def _worktree(ref):
+    folder = tempfile.mkdtemp(prefix="bench_startup_")
+    subprocess.run(["git", "worktree", "add", "--detach", folder, ref], cwd=REPO_ROOT,
+                   check=True, capture_output=True)
+    return folder
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark GUI startup (imports and first window)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--window", action="store_true", help="Also build the main window (needs a display)")
+    parser.add_argument("--ref", default=None, help="Also measure this git commit, e.g. HEAD~1")
+    parser.add_argument("--top", type=int, default=15, help="Most expensive packages to list")
+    parser.add_argument("--json", default=None, help="Results file (default: bench_results/startup-<time>.json)")
+    args = parser.parse_args()
+
+    results = BenchResults("startup", args)
+    trees = [("current", REPO_ROOT)]
+    worktree = None
+    try:
+        if args.ref:
+            worktree = _worktree(args.ref)
+            trees.insert(0, (args.ref, worktree))
+        for label, cwd in trees:
+            print(f"📊 {label}")
+            try:
+                measure_tree(results, label, cwd, args.repeat, args.window, args.top)
+            except RuntimeError as e:
+                results.fail(f"{label}.import_app", None, e)
+    finally:
+        if worktree:
+            subprocess.run(["git", "worktree", "remove", "--force", worktree], cwd=REPO_ROOT, capture_output=True)
+            shutil.rmtree(worktree, ignore_errors=True)
+    results.save(args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+# benchmarks/bench_tools.py
+# Timings for the file tools (separator, merger, subtractor, column adder) on synthetic data.
+#
+#   python -m benchmarks.bench_tools [--sizes 10k 100k] [--tools separator merger]
+#                                    [--formats csv xlsx] [--repeat 3] [--json out.json]
+#
+# Each tool is imported only when its benchmark runs.
+import os
+import shutil
+import argparse
+import tempfile
+
+import numpy as np
+
+from benchmarks.datagen import FORMATS, SIZES, dataset_name, ensure_dataset, make_skiptrace, parse_size, write_dataset
+from benchmarks.results import BenchResults, measure
+
+TOOLS = ("separator", "merger", "subtractor", "column_adder")
+MERGE_PARTS = 4
+SUBTRACT_FRACTION = 0.3
+KEY_COLUMNS = ["associated_property_address_line_1", "associated_property_address_zipcode"]
+
+
+def _fresh(folder):
+    def setup():
+        shutil.rmtree(folder, ignore_errors=True)
+        os.makedirs(folder)
+    return setup
+
+
+def _split(df, parts, folder, fmt, prefix):
+    paths = []
+    for i, chunk in enumerate(np.array_split(np.arange(len(df)), parts)):
+        paths.append(write_dataset(df.iloc[chunk], folder, f"{prefix}_{i + 1}", [fmt])[fmt])
+    return paths
+
+
+def bench_separator(results, input_path, rows, fmt, work_dir, repeat, quiet):
+    from utils.separator import separate_by_column
+    out_dir = os.path.join(work_dir, "separator")
+    runs, _ = measure(lambda: separate_by_column(input_path, "associated_property_address_state", out_dir,
+                                                 file_format=fmt),
+                      repeat, setup=_fresh(out_dir), quiet=quiet)
+    results.add("separator.separate_by_column", rows, runs, fmt=fmt, files=len(os.listdir(out_dir)))
+
+
+def bench_merger(results, df, rows, fmt, work_dir, repeat, quiet):
+    from utils.merger import merge_files
+    parts = _split(df, MERGE_PARTS, os.path.join(work_dir, "merger_in"), fmt, "part")
+    out_dir = os.path.join(work_dir, "merger_out")
+    runs, (_, total, _) = measure(lambda: merge_files(parts, "Parcel Id", out_dir),
+                                  repeat, setup=_fresh(out_dir), quiet=quiet)
+    results.add("merger.merge_files", rows, runs, total, fmt=fmt, files=MERGE_PARTS)
+
+
+def bench_subtractor(results, input_path, df, rows, fmt, work_dir, repeat, quiet):
+    from utils.records_subtractor import subtract_records
+    rng = np.random.default_rng(0)
+    right = df.iloc[np.flatnonzero(rng.random(len(df)) < SUBTRACT_FRACTION)]
+    right_path = write_dataset(right, os.path.join(work_dir, "subtractor_in"), "right", [fmt])[fmt]
+    out_dir = os.path.join(work_dir, "subtractor_out")
+    output_path = os.path.join(out_dir, f"result.{fmt}")
+    runs, _ = measure(lambda: subtract_records([input_path], [right_path], KEY_COLUMNS, KEY_COLUMNS,
+                                               output_path, output_format=fmt),
+                      repeat, setup=_fresh(out_dir), quiet=quiet)
+    results.add("subtractor.subtract_records", rows, runs, fmt=fmt, right_rows=len(right))
+
+
+def bench_column_adder(results, df, rows, fmt, work_dir, repeat, quiet):
+    from utils.gen_coloumns_adder import apply_column_addition
+    master_dir = os.path.join(work_dir, "adder_master")
+    master = df[["Parcel Id", "Email"]].drop_duplicates("Parcel Id")
+    master_path = write_dataset(master, master_dir, "master", ["csv"])["csv"]
+    targets = df.drop(columns=["Email"])
+    source_dir = os.path.join(work_dir, "adder_targets")
+    _split(targets, 2, source_dir, fmt, "target")
+    target_dir = os.path.join(work_dir, "adder_run")
+
+    def setup():
+        shutil.rmtree(target_dir, ignore_errors=True)
+        shutil.copytree(source_dir, target_dir)
+
+    new_columns = [("Email", "Owner Email", "Parcel Id", None)]
+    for join_mode in ("single", "composite"):
+        runs, message = measure(
+            lambda: apply_column_addition(master_path, target_dir, [("Parcel Id", "Parcel Id")], new_columns,
+                                          use_cache=False, join_mode=join_mode),
+            repeat, setup=setup, quiet=quiet)
+        if not str(message).startswith("✅"):
+            print(f"⚠️ column adder ({join_mode}): {message}")
+        results.add(f"column_adder.{join_mode}", rows, runs, fmt=fmt, files=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the file tools")
+    parser.add_argument("--sizes", nargs="+", default=["10k"], help=f"Row counts ({', '.join(SIZES)} or a number)")
+    parser.add_argument("--tools", nargs="+", choices=TOOLS, default=list(TOOLS))
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=["csv"])
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--data", default="bench_data", help="Folder for generated inputs (reused)")
+    parser.add_argument("--work", default=None, help="Scratch folder for outputs (default: temp)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", default=None, help="Results file (default: bench_results/tools-<time>.json)")
+    parser.add_argument("--verbose", action="store_true", help="Show the tools' own output")
+    args = parser.parse_args()
+
+    work_dir = args.work or tempfile.mkdtemp(prefix="bench_tools_")
+    os.environ.setdefault("HITROTECH_DATA_DIR", os.path.join(work_dir, "app_data"))
+
+    results = BenchResults("tools", args)
+    quiet = not args.verbose
+    try:
+        for size in args.sizes:
+            rows = parse_size(size)
+            df = make_skiptrace(rows, "standard", args.seed)
+            print(f"📊 {dataset_name(rows, 'standard', args.seed)}: {rows:,} rows")
+            for fmt in args.formats:
+                input_path = ensure_dataset(args.data, rows, "standard", fmt, args.seed)
+                cases = {
+                    "separator": lambda: bench_separator(results, input_path, rows, fmt, work_dir, args.repeat, quiet),
+                    "merger": lambda: bench_merger(results, df, rows, fmt, work_dir, args.repeat, quiet),
+                    "subtractor": lambda: bench_subtractor(results, input_path, df, rows, fmt, work_dir,
+                                                           args.repeat, quiet),
+                    "column_adder": lambda: bench_column_adder(results, df, rows, fmt, work_dir, args.repeat, quiet),
+                }
+                for tool in args.tools:
+                    try:
+                        cases[tool]()
+                    except Exception as e:
+                        results.fail(tool, rows, e, fmt=fmt)
+    finally:
+        if not args.work:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    results.save(args.json)
+
+
+if __name__ == "__main__":
+    main()
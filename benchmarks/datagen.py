@@ -0,0 +1,190 @@
+# benchmarks/datagen.py
+# Deterministic synthetic skiptrace exports for the benchmarks.
+#
+#   python -m benchmarks.datagen [--sizes 10k 100k 1M] [--variants standard type3_max owner_name]
+#                                [--formats csv xlsx] [--out bench_data]
+#
+# Same seed + rows + variant -> the same rows. The data carries what the
+# pipelines branch on: repeated property addresses (with case/spacing variants),
+# exact duplicate rows, shared emails, rows without phones (No Hit), Landline /
+# Wireless / VoIP types, ZIP+4 zips and a Parcel Id column.
+import os
+import argparse
+
+import numpy as np
+import pandas as pd
+
+VARIANTS = ("standard", "type3_max", "owner_name")
+FORMATS = ("csv", "xlsx")
+SIZES = {"10k": 10_000, "100k": 100_000, "1M": 1_000_000}
+
+FIRST_NAMES = ["James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda", "David",
+               "Elizabeth", "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas",
+               "Sarah", "Carlos", "Maria", "Wei", "Aisha", "Omar", "Priya", "Tyrone", "Ngozi"]
+LAST_NAMES = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez",
+              "Martinez", "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas", "Taylor",
+              "Moore", "Jackson", "Martin", "Lee", "Perez", "Thompson", "White", "Nguyen", "Okafor"]
+STREETS = ["Main", "Oak", "Pine", "Maple", "Cedar", "Elm", "Washington", "Lake", "Hill", "Park",
+           "Sunset", "Lincoln", "Jackson", "Church", "Willow", "Highland", "River", "Meadow"]
+SUFFIXES = ["St", "Ave", "Rd", "Dr", "Ln", "Ct", "Blvd", "Way"]
+CITIES = [("Houston", "TX"), ("Dallas", "TX"), ("Austin", "TX"), ("Phoenix", "AZ"), ("Tucson", "AZ"),
+          ("Atlanta", "GA"), ("Macon", "GA"), ("Tampa", "FL"), ("Orlando", "FL"), ("Miami", "FL"),
+          ("Memphis", "TN"), ("Nashville", "TN"), ("Cleveland", "OH"), ("Columbus", "OH")]
+EMAIL_DOMAINS = ["gmail.com", "yahoo.com", "hotmail.com", "outlook.com", "aol.com"]
+PHONE_TYPES = np.array(["Wireless", "Landline", "VoIP"], dtype=object)
+
+
+def _pick(rng, values, rows):
+    return np.asarray(values, dtype=object)[rng.integers(0, len(values), rows)]
+
+
+def make_skiptrace(rows, variant="standard", seed=42, dup_address_rate=0.15, dup_row_rate=0.02,
+                   no_phone_rate=0.12):
+    """
+    One skiptrace export as a DataFrame.
+    variant: "standard" (phone_1..6), "type3_max" (Phone1..3 / Type1..3 only, the export
+    the resident and vacant-lot pipelines pad with temporary Phone4-6) or
+    "owner_name" (AAE style: "Owner Name" instead of first/last name, phone_1..3).
+    """
+    if variant not in VARIANTS:
+        raise ValueError(f"variant must be one of {VARIANTS}")
+    rng = np.random.default_rng(seed)
+
+    first = _pick(rng, FIRST_NAMES, rows)
+    last = _pick(rng, LAST_NAMES, rows)
+    city_idx = rng.integers(0, len(CITIES), rows)
+    cities = np.array([c for c, _ in CITIES], dtype=object)[city_idx]
+    states = np.array([s for _, s in CITIES], dtype=object)[city_idx]
+    street = (pd.Series(rng.integers(1, 20000, rows)).astype(str) + " "
+              + pd.Series(_pick(rng, STREETS, rows)) + " " + pd.Series(_pick(rng, SUFFIXES, rows)))
+    zips = pd.Series(10000 + city_idx * 500 + rng.integers(0, 500, rows)).astype(str)
+    plus4 = rng.random(rows) < 0.2
+    zips[plus4] = zips[plus4] + "-" + pd.Series(rng.integers(1000, 9999, rows))[plus4].astype(str)
+
+    # Repeated owners: the same property appears again, spelled differently
+    dup_address = rng.random(rows) < dup_address_rate
+    dup_source = (rng.random(rows) * np.arange(rows)).astype(np.int64)  # an earlier row
+    respelled = street[dup_source[dup_address]].reset_index(drop=True)
+    style = rng.integers(0, 3, len(respelled))
+    respelled = respelled.where(style != 0, respelled.str.upper())
+    respelled = respelled.where(style != 1, respelled.str.replace(" ", "  ", n=1))
+    respelled = respelled.where(style != 2, respelled + " ")
+    street_values = street.to_numpy(dtype=object)
+    street_values[dup_address] = respelled.to_numpy(dtype=object)
+
+    # Mailing address: mostly the property, sometimes elsewhere (absentee), lower case
+    absentee = rng.random(rows) < 0.35
+    mail_street = street_values.copy()
+    mail_street[absentee] = street.to_numpy(dtype=object)[rng.integers(0, max(rows, 1), int(absentee.sum()))]
+    mail_street = pd.Series(mail_street, dtype=object).str.lower().to_numpy()
+    mail_city = pd.Series(cities, dtype=object).str.lower().to_numpy()
+
+    df = pd.DataFrame({
+        "first_name": first,
+        "last_name": last,
+        "associated_property_address_line_1": street_values,
+        "associated_property_address_city": cities,
+        "associated_property_address_state": states,
+        "associated_property_address_zipcode": zips.to_numpy(dtype=object),
+        "primary_mailing_address": mail_street,
+        "primary_mailing_city": mail_city,
+        "primary_mailing_state": states,
+        "primary_mailing_zip": zips.str.split("-").str[0].to_numpy(dtype=object),
+        "Parcel Id": pd.Series(rng.integers(10**9, 10**10, rows)).astype(str).radd("P-").to_numpy(dtype=object),
+    })
+
+    # Phones: how many each row got, filled from phone_1 onward; some rows start at phone_4
+    n_phones = 3 if variant in ("type3_max", "owner_name") else 6
+    hits = rng.integers(1, n_phones + 1, rows)
+    hits[rng.random(rows) < no_phone_rate] = 0
+    late_start = (rng.random(rows) < 0.05) & (n_phones == 6)
+    for i in range(1, n_phones + 1):
+        slot = i - 1 - np.where(late_start, 3, 0)
+        has = (slot >= 0) & (slot < hits)
+        numbers = pd.array(rng.integers(2_000_000_000, 9_999_999_999, rows), dtype="Int64")
+        numbers[~has] = pd.NA
+        types = PHONE_TYPES[rng.choice(3, rows, p=[0.6, 0.3, 0.1])]
+        types[~has] = None
+        if variant == "type3_max":
+            df[f"Phone{i}"] = numbers
+            df[f"Type{i}"] = types
+        else:
+            df[f"phone_{i}"] = numbers
+            df[f"phone_{i}_type"] = types
+
+    # Emails: shared by family members / repeated owners, some missing
+    email_pool = max(1, rows // 3)
+    owner = rng.integers(0, email_pool, rows)
+    emails = (pd.Series(first).str.lower() + "." + pd.Series(last).str.lower()
+              + pd.Series(owner).astype(str) + "@" + pd.Series(_pick(rng, EMAIL_DOMAINS, rows)))
+    emails = emails.to_numpy(dtype=object)
+    emails[rng.random(rows) < 0.25] = None
+    df["Email"] = emails
+
+    if variant == "owner_name":
+        df.insert(0, "Owner Name", (pd.Series(first) + " " + pd.Series(last)).to_numpy(dtype=object))
+        df = df.drop(columns=["first_name", "last_name"])
+
+    # Exact duplicate rows (double exports)
+    order = np.arange(rows)
+    dup_rows = rng.random(rows) < dup_row_rate
+    order[dup_rows] = dup_source[dup_rows]
+    return df.iloc[order].reset_index(drop=True)
+
+
+def dataset_name(rows, variant, seed=42):
+    return f"skiptrace_{variant}_{rows}_s{seed}"
+
+
+def write_dataset(df, folder, name, formats=FORMATS):
+    """Write df as <folder>/<name>.<fmt> for each format; returns {fmt: path}."""
+    os.makedirs(folder, exist_ok=True)
+    paths = {}
+    for fmt in formats:
+        path = os.path.join(folder, f"{name}.{fmt}")
+        if fmt == "csv":
+            df.to_csv(path, index=False)
+        elif fmt == "xlsx":
+            with pd.ExcelWriter(path, engine="xlsxwriter",
+                                engine_kwargs={"options": {"constant_memory": True}}) as writer:
+                df.to_excel(writer, index=False)
+        else:
+            raise ValueError(f"format must be one of {FORMATS}")
+        paths[fmt] = path
+    return paths
+
+
+def ensure_dataset(folder, rows, variant="standard", fmt="csv", seed=42):
+    """Path of a generated dataset, generating it only when missing."""
+    name = dataset_name(rows, variant, seed)
+    path = os.path.join(folder, f"{name}.{fmt}")
+    if not os.path.exists(path):
+        write_dataset(make_skiptrace(rows, variant, seed), folder, name, [fmt])
+    return path
+
+
+def parse_size(text):
+    if text in SIZES:
+        return SIZES[text]
+    return int(text.replace("_", "").replace(",", ""))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic skiptrace exports")
+    parser.add_argument("--sizes", nargs="+", default=list(SIZES), help="Row counts (10k, 100k, 1M or a number)")
+    parser.add_argument("--variants", nargs="+", choices=VARIANTS, default=list(VARIANTS))
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=list(FORMATS))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", default="bench_data")
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        rows = parse_size(size)
+        for variant in args.variants:
+            df = make_skiptrace(rows, variant, args.seed)
+            for fmt, path in write_dataset(df, args.out, dataset_name(rows, variant, args.seed), args.formats).items():
+                print(f"✅ {path} ({len(df):,} rows)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# benchmarks/results.py
+# Timing + JSON results shared by the benchmark scripts, and a comparer for two runs.
+#
+#   python -m benchmarks.results OLD.json NEW.json
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import contextlib
+from datetime import datetime
+
+RESULTS_VERSION = 1
+
+
+def environment():
+    import numpy as np
+    import pandas as pd
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+    }
+
+
+def measure(func, repeat=1, setup=None, quiet=True):
+    """
+    Call func() `repeat` times (setup() before each call is not timed).
+    Returns (seconds per run, result of the last run). quiet swallows the tools' prints.
+    """
+    runs = []
+    result = None
+    for _ in range(max(1, repeat)):
+        if setup:
+            setup()
+        sink = io.StringIO() if quiet else None
+        with contextlib.redirect_stdout(sink) if quiet else contextlib.nullcontext():
+            start = time.perf_counter()
+            result = func()
+            runs.append(time.perf_counter() - start)
+    return runs, result
+
+
+class BenchResults:
+    """Collects benchmark cases and writes them as one JSON document."""
+
+    def __init__(self, suite, args=None):
+        self.suite = suite
+        self.args = dict(vars(args)) if args is not None else {}
+        self.created = datetime.now().isoformat(timespec="seconds")
+        self.cases = []
+
+    def add(self, name, rows, runs, rows_out=None, fmt=None, **extra):
+        best = min(runs)
+        case = {"name": name, "rows": rows, "format": fmt, "rows_out": rows_out,
+                "seconds": round(best, 4), "runs": [round(r, 4) for r in runs],
+                "rows_per_s": round(rows / best) if rows and best > 0 else None}
+        case.update(extra)
+        self.cases.append(case)
+        out = f" -> {rows_out:,}" if rows_out is not None else ""
+        label = f"{name} [{fmt}]" if fmt else name
+        size = f"{rows:,}{out} rows in " if rows is not None else ""  # rows=None: timing-only cases
+        print(f"⏱️ {label}: {size}{best:.3f}s")
+        return case
+
+    def fail(self, name, rows, error, fmt=None):
+        """Record a case that raised, so one broken tool does not end the whole run."""
+        self.cases.append({"name": name, "rows": rows, "format": fmt, "error": f"{type(error).__name__}: {error}"})
+        label = f"{name} [{fmt}]" if fmt else name
+        print(f"❌ {label}: {type(error).__name__}: {error}")
+
+    def to_dict(self):
+        return {"version": RESULTS_VERSION, "suite": self.suite, "created": self.created,
+                "environment": environment(), "args": self.args, "cases": self.cases}
+
+    def save(self, path=None):
+        if path is None:
+            stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+            path = os.path.join("bench_results", f"{self.suite}-{stamp}.json")
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=1)
+        print(f"📄 Results saved to {path}")
+        return path
+
+
+def load_results(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(old, new):
+    """Rows (name, rows, format, old s, new s, new/old) for cases present in both runs."""
+    key = lambda c: (c["name"], c["rows"], c.get("format"))
+    before = {key(c): c for c in old["cases"] if "seconds" in c}
+    rows = []
+    for case in new["cases"]:
+        prev = before.get(key(case))
+        if prev is None or "seconds" not in case:
+            continue
+        ratio = case["seconds"] / prev["seconds"] if prev["seconds"] else None
+        rows.append((case["name"], case["rows"], case.get("format"), prev["seconds"], case["seconds"], ratio))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("old")
+    parser.add_argument("new")
+    args = parser.parse_args()
+
+    rows = compare(load_results(args.old), load_results(args.new))
+    if not rows:
+        print("⚠️ No cases in common.")
+        sys.exit(1)
+    for name, n, fmt, old_s, new_s, ratio in rows:
+        label = f"{name} [{fmt}]" if fmt else name
+        change = f"{ratio:.2f}x" if ratio is not None else "n/a"
+        size = f"{n:>9,} rows" if n is not None else " " * 14
+        print(f"{label:<45} {size}  {old_s:>9.3f}s -> {new_s:>9.3f}s  ({change})")
+
+
+if __name__ == "__main__":
+    main()
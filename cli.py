@@ -0,0 +1,359 @@
+# cli.py
+# Headless command line for the pipelines and file tools (never imports tkinter / ttkbootstrap).
+#
+#   python -m cli listbuilding "lists/*.csv" --workers 4 [--out DIR] [--profile]
+#   python -m cli aae INPUT_DIR [--step01] [--address-index [--address-max-age DAYS]]
+#   python -m cli resident INPUT_DIR --keep "SkipTraced" "GHL Ready"
+#   python -m cli vacant-lot INPUT_DIR --out output
+#   python -m cli csv2xlsx "exports/*.csv"          python -m cli xlsx2csv FOLDER
+#   python -m cli separate FILE --column "County" [--format csv]
+#   python -m cli merge "parts/*.xlsx" --key "Parcel Id" [--out DIR]
+#   python -m cli subtract --left A.xlsx --right B.xlsx --left-cols Address Zip --right-cols Address Zip -o out.xlsx
+#   python -m cli add-columns --master M.csv --folder TARGETS --map "Parcel Id=Parcel Id" --add "Email=Owner Email"
+#   python -m cli collect BASE_DIR "GHL Ready" [--link hardlink] [--workers 8] [--full]
+#   python -m cli extract FOLDER [--scripts 1 2 3] [--dry-run]
+#
+# Inputs can be files, folders (their CSV/XLSX files, not recursive) or glob patterns
+# ("**" recurses). Every command prints its timing and exits non-zero when something failed.
+import os
+import sys
+import glob
+import time
+import argparse
+import importlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+PIPELINES = {
+    # command -> (module, run function)
+    "listbuilding": ("pipeline.listbuilding_pipeline", "run_pipeline"),
+    "aae": ("pipeline.AAE_3_phone_lsb", "run_aae_pipeline"),
+    "resident": ("pipeline.resident_data", "run_pipeline"),
+    "vacant-lot": ("pipeline.vacant_lot_pipeline.6_phone_number_vacant_lot", "run_pipeline"),
+}
+# Default output folder next to the inputs, the same place the app's directory runs use
+DEFAULT_OUTPUT = {
+    "listbuilding": "Processed",
+    "aae": "AAE_3_Phone_LSB_Output",
+    "resident": "",  # these two add "Processed/<list>" themselves
+    "vacant-lot": "",
+}
+KEEP_LABELS = ["SkipTraced", "2BSkip", "CC Ready", "SC Ready", "GHL Ready", "No Hit"]
+DATA_EXTENSIONS = (".csv", ".xlsx")
+
+
+# ---------------------------------------
+# Inputs
+# ---------------------------------------
+def expand_inputs(patterns, extensions=DATA_EXTENSIONS):
+    """Files, folders (their top-level data files) and glob patterns -> file list without repeats."""
+    files = []
+    for pattern in patterns:
+        matches = glob.glob(pattern, recursive=True) if glob.has_magic(pattern) else [pattern]
+        for path in sorted(matches):
+            if os.path.isdir(path):
+                files.extend(os.path.join(path, name) for name in sorted(os.listdir(path))
+                             if name.lower().endswith(extensions) and not name.startswith("~$"))
+            elif os.path.isfile(path) and path.lower().endswith(extensions):
+                files.append(path)
+    unique = {}
+    for f in files:
+        unique.setdefault(os.path.abspath(f), f)
+    return list(unique.values())
+
+
+def _require_inputs(files, patterns):
+    if not files:
+        print(f"❌ No CSV/XLSX files matched: {' '.join(patterns)}")
+        sys.exit(2)
+    return files
+
+
+# ---------------------------------------
+# Work items (module level so worker processes can run them)
+# ---------------------------------------
+def _run_pipeline_file(command, input_path, output_folder, options, profile):
+    from utils.profiling import profiling
+
+    module_name, func_name = PIPELINES[command]
+    run = getattr(importlib.import_module(module_name), func_name)
+    list_name = os.path.splitext(os.path.basename(input_path))[0]
+    if command == "aae":
+        # process_aae_directory makes these before each list; run_aae_pipeline expects them
+        for folder in KEEP_LABELS:
+            os.makedirs(os.path.join(output_folder, list_name, folder), exist_ok=True)
+    start = time.perf_counter()
+    with profiling(profile):
+        if command == "aae":
+            run(input_path, list_name, output_folder, options.get("step01", False))
+        elif command in ("resident", "vacant-lot"):
+            run(input_path, list_name, output_folder, keep_outputs=options.get("keep"))
+        else:
+            run(input_path, list_name, output_folder)
+    return time.perf_counter() - start
+
+
+def _convert_file(func_name, input_path):
+    from utils import converters
+
+    start = time.perf_counter()
+    getattr(converters, func_name)(input_path, None)
+    return time.perf_counter() - start
+
+
+def run_jobs(label, jobs, workers):
+    """
+    jobs: [(name, func, args)]. Runs them in this process (workers <= 1) or in a process pool.
+    Prints one line per job; returns the number of failures.
+    """
+    failures = 0
+
+    def report(name, seconds=None, error=None):
+        nonlocal failures
+        if error is None:
+            print(f"⏱️ {label}: {name} done in {seconds:.2f}s")
+        else:
+            failures += 1
+            print(f"❌ {label}: {name} failed: {error}")
+
+    if workers <= 1 or len(jobs) <= 1:
+        for name, func, args in jobs:
+            try:
+                report(name, func(*args))
+            except Exception as e:
+                report(name, error=e)
+        return failures
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        futures = {pool.submit(func, *args): name for name, func, args in jobs}
+        for future in as_completed(futures):
+            try:
+                report(futures[future], future.result())
+            except Exception as e:
+                report(futures[future], error=e)
+    return failures
+
+
+# ---------------------------------------
+# Commands
+# ---------------------------------------
+def cmd_pipeline(args):
+    from utils.address_index import DEFAULT_MAX_AGE_DAYS, using_address_index
+
+    files = _require_inputs(expand_inputs(args.inputs), args.inputs)
+    options = {"step01": getattr(args, "step01", False), "keep": getattr(args, "keep", None)}
+    jobs = []
+    for path in files:
+        output_folder = args.out or os.path.join(os.path.dirname(os.path.abspath(path)),
+                                                 DEFAULT_OUTPUT[args.command])
+        os.makedirs(output_folder, exist_ok=True)
+        jobs.append((os.path.basename(path), _run_pipeline_file,
+                     (args.command, path, output_folder, options, args.profile)))
+    workers = args.workers
+    if args.address_index and workers > 1:
+        # Each list must see the addresses of the lists before it
+        print("ℹ️ --address-index: lists run one at a time, in input order")
+        workers = 1
+    print(f"⚡ {args.command}: {len(jobs)} file(s), {max(1, workers)} worker(s)")
+    max_age = DEFAULT_MAX_AGE_DAYS if args.address_max_age is None else args.address_max_age
+    with using_address_index(args.address_index, max_age):
+        return run_jobs(args.command, jobs, workers)
+
+
+def cmd_convert(args):
+    extension = ".csv" if args.command == "csv2xlsx" else ".xlsx"
+    func_name = "csv_to_excel" if args.command == "csv2xlsx" else "excel_to_csv"
+    files = _require_inputs(expand_inputs(args.inputs, (extension,)), args.inputs)
+    jobs = [(os.path.basename(path), _convert_file, (func_name, path)) for path in files]
+    return run_jobs(args.command, jobs, args.workers)
+
+
+def cmd_separate(args):
+    from utils.separator import separate_by_column
+
+    failures = 0
+    for path in _require_inputs(expand_inputs(args.inputs), args.inputs):
+        try:
+            separate_by_column(path, args.column, args.out, file_format=args.format, handle_na=args.na)
+        except Exception as e:
+            failures += 1
+            print(f"❌ separate: {os.path.basename(path)} failed: {e}")
+    return failures
+
+
+def cmd_merge(args):
+    from utils.merger import merge_files
+
+    files = _require_inputs(expand_inputs(args.inputs), args.inputs)
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+    output_xlsx, total, _ = merge_files(files, args.key, args.out)
+    print(f"✅ Merged {len(files)} file(s), {total:,} records -> {output_xlsx}")
+    return 0
+
+
+def cmd_subtract(args):
+    from utils.records_subtractor import subtract_records
+
+    left = _require_inputs(expand_inputs(args.left), args.left)
+    right = _require_inputs(expand_inputs(args.right), args.right)
+    output_dir = os.path.dirname(args.output)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    subtract_records(left, right, args.left_cols, args.right_cols, args.output, output_format=args.format)
+    return 0
+
+
+def _pairs(values, option):
+    pairs = []
+    for value in values:
+        if "=" not in value:
+            raise SystemExit(f"❌ {option} expects NAME=NAME, got: {value}")
+        a, b = value.split("=", 1)
+        pairs.append((a.strip(), b.strip()))
+    return pairs
+
+
+def cmd_add_columns(args):
+    from utils.gen_coloumns_adder import apply_column_addition
+
+    mapped_pairs = _pairs(args.map, "--map")
+    new_columns = [(src, new, args.after, args.before) for src, new in _pairs(args.add, "--add")]
+    message = apply_column_addition(args.master, args.folder, mapped_pairs, new_columns,
+                                    progress_callback=lambda i, n: print(f"📄 {i}/{n} files"),
+                                    use_cache=not args.no_cache, join_mode=args.join,
+                                    duplicate_policy=args.duplicates)
+    print(message)
+    return 0 if str(message).startswith("✅") else 1
+
+
+def cmd_collect(args):
+    from utils.record_collector import collect_records
+
+    result = collect_records(args.base, args.folder_name, link_mode=args.link,
+                             workers=args.workers, incremental=not args.full)
+    return 0 if result["copied"] + result["linked"] + result["unchanged"] + result["duplicates"] else 1
+
+
+def cmd_extract(args):
+    from utils import readRecords_campaignReady_driveReady as records
+
+    original_dir = os.getcwd()
+    os.chdir(args.folder)
+    try:
+        for script in args.scripts:
+            start = time.perf_counter()
+            if script == "1":
+                records.run_script1(rescan=args.rescan, week=args.week, state=args.state)
+            elif script == "2":
+                records.run_script2(stage_copy=not args.no_stage_copy, zip_mode=args.zip_mode)
+            else:
+                records.run_script3(dry_run=args.dry_run)
+            print(f"⏱️ extract: script {script} done in {time.perf_counter() - start:.2f}s")
+    finally:
+        os.chdir(original_dir)
+    return 0
+
+
+# ---------------------------------------
+# Parser
+# ---------------------------------------
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m cli", description="Hitrotech Data Tools without the GUI")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    for command in PIPELINES:
+        p = sub.add_parser(command, help=f"Run the {command} pipeline on files, folders or globs")
+        p.add_argument("inputs", nargs="+")
+        p.add_argument("--out", default=None,
+                       help="Output folder (default: next to each input, like the app)")
+        p.add_argument("--workers", type=int, default=1, help="Files processed in parallel (processes)")
+        p.add_argument("--profile", action="store_true",
+                       help="Write List Building Profile.pstats / .folded.txt next to each list")
+        p.add_argument("--address-index", action="store_true",
+                       help="Move addresses that earlier lists or runs processed to 'Previously Processed'")
+        p.add_argument("--address-max-age", type=int, default=None, metavar="DAYS",
+                       help="Forget addresses no list processed for DAYS days (default: 180)")
+        if command == "aae":
+            p.add_argument("--step01", action="store_true", help="Inputs are Step01 files (skip step 01)")
+        if command in ("resident", "vacant-lot"):
+            p.add_argument("--keep", nargs="+", choices=KEEP_LABELS, default=None,
+                           help="Outputs to keep (default: all)")
+        p.set_defaults(func=cmd_pipeline)
+
+    for command, help_text in (("csv2xlsx", "Convert CSV files to Excel"), ("xlsx2csv", "Convert Excel files to CSV")):
+        p = sub.add_parser(command, help=help_text)
+        p.add_argument("inputs", nargs="+")
+        p.add_argument("--workers", type=int, default=1)
+        p.set_defaults(func=cmd_convert)
+
+    p = sub.add_parser("separate", help="Split files by the values of one column")
+    p.add_argument("inputs", nargs="+")
+    p.add_argument("--column", required=True)
+    p.add_argument("--out", default=None, help="Output folder (default: Separated_Files next to the input)")
+    p.add_argument("--format", choices=["xlsx", "csv", "both"], default="xlsx")
+    p.add_argument("--na", choices=["skip", "include", "separate"], default="skip", help="Rows without a value")
+    p.set_defaults(func=cmd_separate)
+
+    p = sub.add_parser("merge", help="Stack files into merged_output.xlsx")
+    p.add_argument("inputs", nargs="+")
+    p.add_argument("--key", required=True, help="Key column to align on")
+    p.add_argument("--out", default=None, help="Output folder (default: the first file's folder)")
+    p.set_defaults(func=cmd_merge)
+
+    p = sub.add_parser("subtract", help="Remove the right side's records from the left side")
+    p.add_argument("--left", nargs="+", required=True)
+    p.add_argument("--right", nargs="+", required=True)
+    p.add_argument("--left-cols", nargs="+", required=True)
+    p.add_argument("--right-cols", nargs="+", required=True)
+    p.add_argument("--output", "-o", required=True)
+    p.add_argument("--format", choices=["xlsx", "csv"], default="xlsx")
+    p.set_defaults(func=cmd_subtract)
+
+    p = sub.add_parser("add-columns", help="Add columns from a master file to every file in a folder")
+    p.add_argument("--master", required=True)
+    p.add_argument("--folder", required=True)
+    p.add_argument("--map", nargs="+", required=True, metavar="MASTER_KEY=TARGET_KEY")
+    p.add_argument("--add", nargs="+", required=True, metavar="MASTER_COLUMN=NEW_NAME")
+    p.add_argument("--after", default=None, help="Place the new columns after this column")
+    p.add_argument("--before", default=None, help="Place the new columns before this column")
+    p.add_argument("--join", choices=["single", "composite"], default="single")
+    p.add_argument("--duplicates", choices=["last", "first", "error"], default="last")
+    p.add_argument("--no-cache", action="store_true", help="Do not use the master file cache")
+    p.set_defaults(func=cmd_add_columns)
+
+    p = sub.add_parser("collect", help="Collect the files of every folder with this name")
+    p.add_argument("base")
+    p.add_argument("folder_name")
+    p.add_argument("--link", choices=["hardlink", "reflink"], default=None, help="Link instead of copy")
+    p.add_argument("--workers", type=int, default=8)
+    p.add_argument("--full", action="store_true", help="Ignore what earlier runs collected")
+    p.set_defaults(func=cmd_collect)
+
+    p = sub.add_parser("extract", help="Record Extractor scripts 1-3 on a folder")
+    p.add_argument("folder")
+    p.add_argument("--scripts", nargs="+", choices=["1", "2", "3"], default=["1", "2", "3"])
+    p.add_argument("--rescan", action="store_true")
+    p.add_argument("--week", default=None)
+    p.add_argument("--state", default=None)
+    p.add_argument("--no-stage-copy", action="store_true", help="Script 2: zip only, no Collected copy")
+    p.add_argument("--zip-mode", choices=["deflate", "store", "auto"], default="deflate")
+    p.add_argument("--dry-run", action="store_true", help="Script 3: report only")
+    p.set_defaults(func=cmd_extract)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    start = time.perf_counter()
+    try:
+        failures = args.func(args)
+    except Exception as e:
+        print(f"❌ {args.command} failed: {type(e).__name__}: {e}")
+        failures = 1
+    print(f"⏱️ {args.command} finished in {time.perf_counter() - start:.2f}s"
+          + (f" ({failures} failed)" if failures else ""))
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
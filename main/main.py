@@ -11,11 +11,12 @@ from tkinter import filedialog, ttk
 from ttkbootstrap.constants import *
 
 from ui.ui_main import HitrotechUI
-from utils.merger import open_merger_tool
+from ui.jobs_panel import JobsPanel
+from utils.job_executor import DONE, JobExecutor, estimate_memory_mb
+from utils.progress import ProgressDispatcher, report, reporting
 
 import importlib
 import importlib.util
-import pandas as pd
 from datetime import datetime
 
 # -----------------------------
@@ -50,29 +51,69 @@ def _try_import(path, name):
                 f"Could not import {name} from {path}.\n\nError: {e}\n\n"
                 "Make sure your project files are available or adjust TOOL_DEFS to your setup."
             )
+        _missing.import_failed = True
         return _missing
 
-# Lazily resolved callables (evaluated inside actions)
+# Tool key -> (module path, name); imported on first use, see LazyUtils
+UTIL_SOURCES = {
+    'csv_to_excel': ('utils.converters', 'csv_to_excel'),
+    'excel_to_csv': ('utils.converters', 'excel_to_csv'),
+    'merge_files': ('utils.merger', 'merge_files'),
+    'open_merger_tool': ('utils.merger', 'open_merger_tool'),
+    'separate_by_column': ('utils.separator', 'separate_by_column'),
+    'run_step05_pipeline': ('utils.ghl_compiler', 'run_step05_pipeline'),
+    'run_column_mapper': ('utils.column_mapper', 'run_column_mapper'),
+    'run_script1': ('utils.readRecords_campaignReady_driveReady', 'run_script1'),
+    'run_script2': ('utils.readRecords_campaignReady_driveReady', 'run_script2'),
+    'run_script3': ('utils.readRecords_campaignReady_driveReady', 'run_script3'),
+    'process_directory': ('pipeline.listbuilding_pipeline', 'process_directory'),
+    'run_pipeline': ('pipeline.listbuilding_pipeline', 'run_pipeline'),
+    'process_aae_directory': ('pipeline.AAE_3_phone_lsb', 'process_aae_directory'),
+    'run_aae_pipeline': ('pipeline.AAE_3_phone_lsb', 'run_aae_pipeline'),
+    'run_column_adder': ('utils.gen_coloumns_adder', 'run_column_adder'),
+    'run_record_collector': ('utils.record_collector', 'run_record_collector'),
+    # Vacant lot 6 phone pipeline (module filename may start with digit; fallback loader will handle it)
+    'run_vacant_6_pipeline': ('pipeline.vacant_lot_pipeline.6_phone_number_vacant_lot', 'run_pipeline'),
+    'run_resident_pipeline': ('pipeline.resident_data', 'run_pipeline'),
+    'subtract_records': ('utils.records_subtractor', 'subtract_records'),
+    'files_combinations_tool': ('utils.combinations.file_combinations', 'FilesCombinationsTool'),
+}
+
+# Imported in the background once the window is up, so the first click does not pay for them
+BACKGROUND_IMPORTS = ["numpy", "pandas", "openpyxl", "xlsxwriter"]
+
+
+class LazyUtils(dict):
+    """
+    self.utils['name'] imports the tool on first use and keeps it (the import cache).
+    A failed import is not kept, so fixing the file and clicking again works.
+    """
+    _lock = threading.Lock()
+
+    def __missing__(self, key):
+        path, name = UTIL_SOURCES[key]
+        with self._lock:
+            if key in self:  # resolved by another thread meanwhile
+                return dict.__getitem__(self, key)
+            func = _try_import(path, name)
+            if not getattr(func, 'import_failed', False):
+                self[key] = func
+        return func
+
+
 def get_utils():
-    return {
-        'csv_to_excel': _try_import('utils.converters', 'csv_to_excel'),
-        'excel_to_csv': _try_import('utils.converters', 'excel_to_csv'),
-        'merge_files': _try_import('utils.merger', 'merge_files'),
-        'separate_by_column': _try_import('utils.separator', 'separate_by_column'),
-        'run_step05_pipeline': _try_import('utils.ghl_compiler', 'run_step05_pipeline'),
-        'run_column_mapper': _try_import('utils.column_mapper', 'run_column_mapper'),
-        'run_script1': _try_import('utils.readRecords_campaignReady_driveReady', 'run_script1'),
-        'run_script2': _try_import('utils.readRecords_campaignReady_driveReady', 'run_script2'),
-        'run_script3': _try_import('utils.readRecords_campaignReady_driveReady', 'run_script3'),
-        'process_directory': _try_import('pipeline.listbuilding_pipeline', 'process_directory'),
-        'run_pipeline': _try_import('pipeline.listbuilding_pipeline', 'run_pipeline'),
-        'process_aae_directory': _try_import('pipeline.AAE_3_phone_lsb', 'process_aae_directory'),
-        'run_aae_pipeline': _try_import('pipeline.AAE_3_phone_lsb', 'run_aae_pipeline'),
-        'run_column_adder': _try_import('utils.gen_coloumns_adder', 'run_column_adder'),
-        'run_record_collector': _try_import('utils.record_collector', 'run_record_collector'),
-        # Vacant lot 6 phone pipeline (module filename may start with digit; fallback loader will handle it)
-        'run_vacant_6_pipeline': _try_import('pipeline.vacant_lot_pipeline.6_phone_number_vacant_lot', 'run_pipeline'),
-    }
+    return LazyUtils()
+
+
+def start_background_imports(modules=BACKGROUND_IMPORTS):
+    """Import the heavy libraries on a daemon thread; errors surface later at first real use."""
+    def work():
+        for module in modules:
+            try:
+                importlib.import_module(module)
+            except Exception:
+                pass
+    threading.Thread(target=work, name="background-imports", daemon=True).start()
 
 # -----------------------------
 
@@ -84,8 +125,14 @@ class HitrotechApp:
     def __init__(self, root):
         self.root = root
         self.utils = get_utils()
+        self.jobs = JobExecutor()  # pipelines run here, in worker processes
+        self.jobs_panel = None
         self.ui = None
         self.setup_app()
+        # after() runs once the main loop has drawn the window
+        self.root.after(200, start_background_imports)
+        self.root.after(150, self._poll_jobs)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
     # ///////////// Always on TOP
     def open_tool_window(self, tool_func):
@@ -98,7 +145,7 @@ class HitrotechApp:
     def action_record_collector(self):
         win = tb.Toplevel(self.root)
         win.title("Record Collector Tool")
-        win.geometry("520x420")
+        win.geometry("520x480")
         
         # Use ttkbootstrap style instead of bg color
         main_frame = tb.Frame(win)
@@ -130,6 +177,12 @@ class HitrotechApp:
         custom_var = tk.StringVar()
         tb.Entry(main_frame, textvariable=custom_var, width=42).pack(pady=5)
 
+        # Links are instant on the same drive, but a hardlinked file is the SAME file as its source
+        link_modes = {"Copy files": None, "Hardlink (same drive)": "hardlink", "Reflink (same drive)": "reflink"}
+        link_var = tk.StringVar(value="Copy files")
+        tb.Label(main_frame, text="Collect as:", font=("Segoe UI", 10)).pack(pady=(6, 0))
+        tb.Combobox(main_frame, textvariable=link_var, values=list(link_modes), state="readonly", width=40).pack(pady=5)
+
         def run_collector():
             base = path_var.get().strip()
             if not base or not os.path.isdir(base):
@@ -141,8 +194,10 @@ class HitrotechApp:
                 self.ui.show_error("❌ Error", "Please select or enter a folder name")
                 return
 
+            link_mode = link_modes[link_var.get()]
+
             def work():
-                self.utils['run_record_collector'](base, folder_name)
+                self.utils['run_record_collector'](base, folder_name, link_mode=link_mode)
                 self.ui.show_info("✅ Done", f"Files collected for '{folder_name}'")
 
             self.run_with_loader(work)
@@ -168,20 +223,76 @@ class HitrotechApp:
             'coladder': self.action_column_adder,
             # new vacant lot 6 phones tool
             'vacant6': self.action_vacant_lot_6_phone,
+            'jobs': self.action_jobs,
         }
 
     def run_with_loader(self, func, *args, **kwargs):
+        """Run func in a thread behind the loader; its utils.progress.report() events drive the bar."""
         popup, prog = self.ui.show_loading()
+        dispatcher = ProgressDispatcher(self.root, lambda state: self.ui.show_progress(popup, prog, state),
+                                        on_finish=popup.destroy)
 
         def task():
             try:
-                func(*args, **kwargs)
+                with reporting(dispatcher):
+                    func(*args, **kwargs)
             finally:
-                # destroy the loader on the GUI thread
-                self.root.after(0, popup.destroy)
+                # the dispatcher destroys the loader on the GUI thread
+                dispatcher.finish()
 
+        dispatcher.start()
         threading.Thread(target=task, daemon=True).start()
 
+    # -----------------------------
+    # Jobs (process pool, see utils/job_executor.py)
+    # -----------------------------
+    def job_target(self, key):
+        """UTIL_SOURCES entry as the executor's "module:function" target."""
+        path, name = UTIL_SOURCES[key]
+        return f"{path}:{name}"
+
+    def run_jobs(self, jobs, done_message, profile=False):
+        """
+        Queue jobs [(title, util key, args, kwargs, input files)] and show the Jobs window.
+        One message once all of them have finished, listing any that failed or were cancelled.
+        """
+        batch = {"remaining": len(jobs), "problems": []}
+
+        def finished(job):
+            if job.status != DONE:
+                batch["problems"].append(f"{job.title}: {job.error}")
+            batch["remaining"] -= 1
+            if batch["remaining"] == 0:
+                if batch["problems"]:
+                    self.ui.show_error("❌ Error", "Some jobs did not finish:\n\n" + "\n".join(batch["problems"]))
+                else:
+                    self.ui.show_info("✅ Done", done_message)
+
+        for title, key, args, kwargs, files in jobs:
+            self.jobs.submit(title, self.job_target(key), *args, memory_mb=estimate_memory_mb(files),
+                             profile=profile, on_done=finished, on_error=finished, **kwargs)
+        self.action_jobs()
+
+    def _poll_jobs(self):
+        try:
+            self.jobs.poll()
+        finally:
+            self.root.after(150, self._poll_jobs)
+
+    def action_jobs(self):
+        if self.jobs_panel is not None and self.jobs_panel.exists():
+            self.jobs_panel.win.lift()
+        else:
+            self.jobs_panel = JobsPanel(self.root, self.jobs)
+
+    def on_close(self):
+        active = self.jobs.active()
+        if active and not messagebox.askyesno(
+                "Jobs running", f"{len(active)} job(s) are still queued or running.\n\nCancel them and quit?"):
+            return
+        self.jobs.shutdown()
+        self.root.destroy()
+
     # -----------------------------
     # Actions (each is self-contained and resilient to missing project files)
     # -----------------------------
@@ -196,6 +307,7 @@ class HitrotechApp:
         def work():
             ok = 0
             for f in files:
+                report(item=ok + 1, items=len(files))
                 self.utils['csv_to_excel'](f, out)
                 ok += 1
             self.ui.show_info("✅ Success", f"Converted {ok} CSV file(s) to Excel.")
@@ -212,6 +324,7 @@ class HitrotechApp:
         def work():
             ok = 0
             for f in files:
+                report(item=ok + 1, items=len(files))
                 self.utils['excel_to_csv'](f, out)
                 ok += 1
             self.ui.show_info("✅ Success", f"Converted {ok} Excel file(s) to CSV (folder: {out}).")
@@ -219,7 +332,7 @@ class HitrotechApp:
         self.run_with_loader(work)
 
     def action_merge(self):
-        open_merger_tool(self.root, self.ui)
+        self.utils['open_merger_tool'](self.root, self.ui)
 
     def action_separate(self):
         # Create advanced separator dashboard
@@ -387,6 +500,7 @@ class HitrotechApp:
             files = file_listbox.get(0, tk.END)
             if files:
                 try:
+                    import pandas as pd  # usually already loaded by the background imports
                     first_file = files[0]
                     if first_file.endswith('.csv'):
                         df = pd.read_csv(first_file, nrows=1)
@@ -418,37 +532,49 @@ class HitrotechApp:
             
             os.makedirs(output_folder, exist_ok=True)
             
-            def process_files():
-                total_files = len(files)
-                processed = 0
-                
-                for file in files:
-                    try:
-                        status_var.set(f"Processing {os.path.basename(file)}...")
-                        progress_var.set((processed / total_files) * 100)
-                        
-                        # Use the advanced separator function
-                        self.utils['separate_by_column'](
-                            file=file,
-                            column=column,
-                            output_dir=os.path.join(output_folder, os.path.splitext(os.path.basename(file))[0]),
-                            file_format=format_var.get(),
-                            handle_na=nan_var.get(),
-                            max_files=limit_var.get() if limit_var.get() > 0 else None
-                        )
-                        
-                        processed += 1
-                        progress_var.set((processed / total_files) * 100)
-                        
-                    except Exception as e:
-                        self.root.after(0, lambda: messagebox.showerror(
-                            "Error", f"Failed to process {file}: {str(e)}"))
-                
+            file_format = format_var.get()
+            handle_na = nan_var.get()
+            max_files = limit_var.get() if limit_var.get() > 0 else None
+            total_files = len(files)
+            outcome = {"processed": 0, "errors": []}
+
+            # The worker only reports; the dispatcher updates the Tk variables on the Tk thread
+            def show_progress(state):
+                progress_var.set(state.overall_percent or 0)
+                status_var.set(state.text())
+
+            def show_result():
+                progress_var.set(100)
                 status_var.set("Complete!")
-                self.root.after(0, lambda: messagebox.showinfo(
-                    "Success", f"Processed {processed} of {total_files} files"))
-            
+                for file, error in outcome["errors"]:
+                    messagebox.showerror("Error", f"Failed to process {file}: {error}")
+                messagebox.showinfo("Success", f"Processed {outcome['processed']} of {total_files} files")
+
+            dispatcher = ProgressDispatcher(self.root, show_progress, on_finish=show_result)
+
+            def process_files():
+                try:
+                    with reporting(dispatcher):
+                        for i, file in enumerate(files, 1):
+                            report(item=i, items=total_files)
+                            try:
+                                # Use the advanced separator function
+                                self.utils['separate_by_column'](
+                                    file=file,
+                                    column=column,
+                                    output_dir=os.path.join(output_folder, os.path.splitext(os.path.basename(file))[0]),
+                                    file_format=file_format,
+                                    handle_na=handle_na,
+                                    max_files=max_files
+                                )
+                                outcome["processed"] += 1
+                            except Exception as e:
+                                outcome["errors"].append((file, e))
+                finally:
+                    dispatcher.finish()
+
             # Run in background thread
+            dispatcher.start()
             threading.Thread(target=process_files, daemon=True).start()
         
         tb.Button(action_frame, text="🔄 Update Columns", bootstyle="info", 
@@ -469,7 +595,8 @@ class HitrotechApp:
             return
 
         def work():
-            for f in files:
+            for i, f in enumerate(files, 1):
+                report(item=i, items=len(files))
                 self.utils['run_step05_pipeline'](f)
             self.ui.show_info("✅ Success", "GHL Ready files created")
 
@@ -484,7 +611,7 @@ class HitrotechApp:
     def action_records_extractor(self):
         win = tb.Toplevel(self.root)
         win.title("Records Extractor Tool")
-        win.geometry("520x420")
+        win.geometry("520x550")
         
         main_frame = tb.Frame(win)
         main_frame.pack(fill="both", expand=True)
@@ -514,27 +641,58 @@ class HitrotechApp:
         tb.Radiobutton(options_frame, text="Collect GHL Ready Files & Create Zip", variable=script_var, value="script2", bootstyle="primary-toolbutton").pack(anchor="w", pady=5)
         tb.Radiobutton(options_frame, text="Organize Folders Structure", variable=script_var, value="script3", bootstyle="primary-toolbutton").pack(anchor="w", pady=5)
 
+        zip_frame = tb.Frame(main_frame)
+        zip_frame.pack(pady=5)
+        stage_var = tk.BooleanVar(value=True)
+        tb.Checkbutton(zip_frame, text="Keep 'Collected GHL Ready Files' copy", variable=stage_var, bootstyle="round-toggle").pack(side="left", padx=5)
+        zip_modes = {"Deflate": "deflate", "Store (no compression)": "store", "Auto": "auto"}
+        zip_mode_var = tk.StringVar(value="Deflate")
+        tb.Combobox(zip_frame, textvariable=zip_mode_var, values=list(zip_modes), state="readonly", width=20).pack(side="left", padx=5)
+        dry_run_var = tk.BooleanVar(value=False)
+        tb.Checkbutton(main_frame, text="Dry run folder organization (report only)", variable=dry_run_var, bootstyle="round-toggle").pack(pady=5)
+
+        # Record extraction reads the run catalog; a rescan walks the drive again
+        catalog_frame = tb.Frame(main_frame)
+        catalog_frame.pack(pady=5)
+        week_var = tk.StringVar()
+        state_var = tk.StringVar()
+        tb.Label(catalog_frame, text="Week:").pack(side="left")
+        tb.Entry(catalog_frame, textvariable=week_var, width=6).pack(side="left", padx=(2, 8))
+        tb.Label(catalog_frame, text="State:").pack(side="left")
+        tb.Entry(catalog_frame, textvariable=state_var, width=5).pack(side="left", padx=(2, 8))
+        rescan_var = tk.BooleanVar(value=False)
+        tb.Checkbutton(catalog_frame, text="Rescan drive", variable=rescan_var, bootstyle="round-toggle").pack(side="left")
+
         def run_selected_script():
             folder = path_var.get().strip()
             if not folder or not os.path.isdir(folder):
                 self.ui.show_error("❌ Error", "Please select a valid folder path")
                 return
+            stage_copy = stage_var.get()
+            zip_mode = zip_modes[zip_mode_var.get()]
+            dry_run = dry_run_var.get()
+            extract_options = {"rescan": rescan_var.get(),
+                               "week": week_var.get().strip() or None,
+                               "state": state_var.get().strip() or None}
 
             def work():
                 original_dir = os.getcwd()
                 os.chdir(folder)
                 try:
                     if script_var.get() == "script1":
-                        self.utils['run_script1']()
+                        self.utils['run_script1'](**extract_options)
                         self.ui.show_info("✅ Success", "Records extracted successfully!")
                     elif script_var.get() == "script2":
-                        self.utils['run_script2']()
+                        self.utils['run_script2'](stage_copy, zip_mode)
                         self.ui.show_info("✅ Success", "GHL Ready files collected and zip created!")
                     elif script_var.get() == "script3":
-                        self.utils['run_script3']()
-                        self.ui.show_info("✅ Success", "Folders organized successfully!")
+                        plan = self.utils['run_script3'](dry_run)
+                        if dry_run:
+                            self.ui.show_info("📝 Dry Run", f"Nothing changed. Planned: {plan.summary()}")
+                        else:
+                            self.ui.show_info("✅ Success", "Folders organized successfully!")
                     else:
-                        self.utils['run_script1'](); self.utils['run_script2'](); self.utils['run_script3']()
+                        self.utils['run_script1'](**extract_options); self.utils['run_script2'](stage_copy, zip_mode); self.utils['run_script3'](dry_run)
                         self.ui.show_info("✅ Success", "All operations completed successfully!")
                 except Exception as e:
                     self.ui.show_error("❌ Error", f"An error occurred: {e}")
@@ -549,7 +707,7 @@ class HitrotechApp:
     def action_pipeline_bulk(self):
         win = tb.Toplevel(self.root)
         win.title("Pipeline ListBuilding Bulk")
-        win.geometry("520x300")
+        win.geometry("520x370")
         
         main_frame = tb.Frame(win)
         main_frame.pack(fill="both", expand=True)
@@ -569,7 +727,11 @@ class HitrotechApp:
         tb.Button(frame_path, text="Browse", bootstyle="secondary", command=browse_folder).pack(side="left")
 
         step05_var = tk.BooleanVar(value=True)
-        tb.Checkbutton(main_frame, text="Include Step05 (GHL Ready)", variable=step05_var, bootstyle="round-toggle").pack(pady=14)
+        tb.Checkbutton(main_frame, text="Include Step05 (GHL Ready)", variable=step05_var, bootstyle="round-toggle").pack(pady=(14, 4))
+        index_var = tk.BooleanVar(value=False)
+        tb.Checkbutton(main_frame, text="Set aside addresses processed by earlier lists", variable=index_var, bootstyle="round-toggle").pack(pady=4)
+        profile_var = tk.BooleanVar(value=False)
+        tb.Checkbutton(main_frame, text="Profile this run", variable=profile_var, bootstyle="round-toggle").pack(pady=(4, 10))
 
         def run_bulk():
             folder = path_var.get().strip()
@@ -577,18 +739,9 @@ class HitrotechApp:
                 self.ui.show_error("❌ Error", "Please select a valid folder path")
                 return
 
-            def work():
-                if not step05_var.get():
-                    pl = importlib.import_module('pipeline.listbuilding_pipeline')
-                    orig = getattr(pl, 'step_05_reshape', lambda df: df)
-                    setattr(pl, 'step_05_reshape', lambda df: df)
-                    self.utils['process_directory'](folder)
-                    setattr(pl, 'step_05_reshape', orig)
-                else:
-                    self.utils['process_directory'](folder)
-                self.ui.show_info("✅ Done", "Pipeline processing complete.")
-
-            self.run_with_loader(work)
+            self.run_jobs([(f"ListBuilding: {os.path.basename(folder)}", 'process_directory', (folder,),
+                            {"include_step05": step05_var.get(), "address_index": index_var.get()}, _data_files(folder))],
+                          "Pipeline processing complete.", profile=profile_var.get())
 
         tb.Button(main_frame, text="Run Pipeline", bootstyle="success", command=run_bulk, width=20).pack(pady=12)
 
@@ -596,7 +749,7 @@ class HitrotechApp:
     def action_aae_3_phone_lsb(self):
         win = tb.Toplevel(self.root)
         win.title("AAE 3 Phone LSB")
-        win.geometry("520x290")
+        win.geometry("520x360")
         
         main_frame = tb.Frame(win)
         main_frame.pack(fill="both", expand=True)
@@ -616,7 +769,11 @@ class HitrotechApp:
         tb.Button(frame_path, text="Browse", bootstyle="secondary", command=browse_folder).pack(side="left")
 
         step01_var = tk.BooleanVar(value=False)
-        tb.Checkbutton(main_frame, text="Process Step01 Files (Skip Step01 processing)", variable=step01_var, bootstyle="round-toggle").pack(pady=14)
+        tb.Checkbutton(main_frame, text="Process Step01 Files (Skip Step01 processing)", variable=step01_var, bootstyle="round-toggle").pack(pady=(14, 4))
+        index_var = tk.BooleanVar(value=False)
+        tb.Checkbutton(main_frame, text="Set aside addresses processed by earlier lists", variable=index_var, bootstyle="round-toggle").pack(pady=4)
+        profile_var = tk.BooleanVar(value=False)
+        tb.Checkbutton(main_frame, text="Profile this run", variable=profile_var, bootstyle="round-toggle").pack(pady=(4, 10))
 
         def run_aae():
             folder = path_var.get().strip()
@@ -624,11 +781,9 @@ class HitrotechApp:
                 self.ui.show_error("❌ Error", "Please select a valid folder path")
                 return
 
-            def work():
-                self.utils['process_aae_directory'](folder, process_step01_files=step01_var.get())
-                self.ui.show_info("✅ Done", "AAE 3 Phone LSB processing complete.")
-
-            self.run_with_loader(work)
+            self.run_jobs([(f"AAE 3 Phone LSB: {os.path.basename(folder)}", 'process_aae_directory', (folder,),
+                            {"process_step01_files": step01_var.get(), "address_index": index_var.get()}, _data_files(folder))],
+                          "AAE 3 Phone LSB processing complete.", profile=profile_var.get())
 
         tb.Button(main_frame, text="Run AAE 3 Phone LSB", bootstyle="success", command=run_aae, width=22).pack(pady=12)
 
@@ -636,7 +791,7 @@ class HitrotechApp:
     def action_vacant_lot_6_phone(self):
         win = tb.Toplevel(self.root)
         win.title("Vacant Lot — 6 Phone Numbers")
-        win.geometry("560x420")
+        win.geometry("560x460")
         
         main_frame = tb.Frame(win)
         main_frame.pack(fill="both", expand=True)
@@ -678,6 +833,8 @@ class HitrotechApp:
             var = tk.BooleanVar(value=True)
             checkbox_vars[lbl] = var
             tb.Checkbutton(cb_frame, text=lbl, variable=var, bootstyle="round-toggle").pack(anchor="w")
+        profile_var = tk.BooleanVar(value=False)
+        tb.Checkbutton(main_frame, text="Profile this run", variable=profile_var, bootstyle="round-toggle").pack(pady=(8, 0))
 
         def run_vacant():
             input_folder = input_var.get().strip()
@@ -692,23 +849,25 @@ class HitrotechApp:
 
             keep_list = [lbl for lbl, v in checkbox_vars.items() if v.get()]
 
-            def work():
-                try:
-                    # loop over all CSV/XLSX files in the folder
-                    for file in os.listdir(input_folder):
-                        if file.endswith(".csv") or file.endswith(".xlsx"):
-                            file_path = os.path.join(input_folder, file)
-                            list_name = os.path.splitext(os.path.basename(file))[0]
-                            self.utils['run_vacant_6_pipeline'](file_path, list_name, out_folder, keep_outputs=keep_list)
-                    self.ui.show_info("✅ Done", "Vacant Lot pipeline finished for all files.")
-                except Exception as e:
-                    self.ui.show_error("❌ Error", f"Pipeline failed: {e}")
-
-            self.run_with_loader(work)
+            # one job per CSV/XLSX file in the folder
+            jobs = []
+            for file_path in _data_files(input_folder):
+                list_name = os.path.splitext(os.path.basename(file_path))[0]
+                jobs.append((f"Vacant Lot: {list_name}", 'run_vacant_6_pipeline', (file_path, list_name, out_folder),
+                             {"keep_outputs": keep_list}, [file_path]))
+            if not jobs:
+                self.ui.show_error("❌ Error", "No CSV/XLSX files in the input folder")
+                return
+            self.run_jobs(jobs, "Vacant Lot pipeline finished for all files.", profile=profile_var.get())
 
         tb.Button(main_frame, text="Start List Building", bootstyle="success", command=run_vacant, width=28).pack(pady=14)
 
 
+def _data_files(folder):
+    """The CSV/XLSX files directly in folder (what the pipelines' directory runs pick up)."""
+    return [os.path.join(folder, f) for f in sorted(os.listdir(folder)) if f.endswith((".csv", ".xlsx"))]
+
+
 # -----------------------------
 # Tool definitions (add here; UI updates automatically)
 # -----------------------------
@@ -790,6 +949,13 @@ TOOL_DEFS = [
         'icon': '📂',
         'action_text': 'Collect',
     },
+    {
+        'key': 'jobs',
+        'title': 'Jobs',
+        'desc': 'Queued and running pipeline jobs: progress, cancel, how many run at once.',
+        'icon': '📋',
+        'action_text': 'Open',
+    },
 ]
 
 # -----------------------------
@@ -8,14 +8,11 @@ from main.main import HitrotechApp, TOOL_DEFS  # Import base app + tools
 # from logs.report_summary_logs import logger, log_tool_usage, open_today_report_folder
 
 import subprocess
-import pandas as pd
 import threading
 
-# Import the new subtractor script
-from utils.records_subtractor import subtract_records, subtract_folders
-
-# Import the resident data pipeline
-from pipeline.resident_data import run_pipeline as run_resident_pipeline
+# The subtractor and the resident data pipeline are imported on first use (self.utils)
+from main.main import _data_files
+from utils.progress import ProgressDispatcher, reporting
 
 # -----------------------------
 # Extended Application
@@ -177,6 +174,7 @@ class ExtendedApp(HitrotechApp):
         
         # Function to update column lists from files
         def update_column_lists():
+            import pandas as pd  # usually already loaded by the background imports
             try:
                 # Get columns from first left file if available
                 left_files = left_files_listbox.get(0, tk.END)
@@ -285,30 +283,44 @@ class ExtendedApp(HitrotechApp):
             output_format = output_format_var.get()
             output_path = os.path.join(output_folder, f"{output_name}.{output_format}")
             
-            def work():
-                try:
-                    progress_var.set(10)
-                    progress_label.config(text="Starting subtraction...")
-                    
-                    # Use the standalone subtractor function
-                    subtract_records(
-                        left_files=list(left_files),
-                        right_files=list(right_files),
-                        left_columns=left_columns,
-                        right_columns=right_columns,
-                        output_path=output_path,
-                        output_format=output_format
-                    )
-                    
+            outcome = {"error": None}
+
+            # The worker only reports; the dispatcher updates the widgets on the Tk thread
+            def show_progress(state):
+                progress_var.set(state.overall_percent or 0)
+                progress_label.config(text=state.text())
+
+            def show_result():
+                if outcome["error"] is None:
                     progress_var.set(100)
                     progress_label.config(text="✅ Subtraction completed!")
-                    
                     self.ui.show_info("✅ Success", f"Subtraction completed. Result saved to:\n{output_path}")
-                    
-                except Exception as e:
+                else:
                     progress_label.config(text="❌ Error occurred!")
-                    self.ui.show_error("❌ Error", f"An error occurred during subtraction:\n{str(e)}")
+                    self.ui.show_error("❌ Error", f"An error occurred during subtraction:\n{str(outcome['error'])}")
+
+            dispatcher = ProgressDispatcher(self.root, show_progress, on_finish=show_result)
+
+            def work():
+                try:
+                    with reporting(dispatcher):
+                        # Use the standalone subtractor function
+                        self.utils['subtract_records'](
+                            left_files=list(left_files),
+                            right_files=list(right_files),
+                            left_columns=left_columns,
+                            right_columns=right_columns,
+                            output_path=output_path,
+                            output_format=output_format
+                        )
+                except Exception as e:
+                    outcome["error"] = e
+                finally:
+                    dispatcher.finish()
             
+            progress_var.set(0)
+            progress_label.config(text="Starting subtraction...")
+            dispatcher.start()
             # Run in a separate thread
             thread = threading.Thread(target=work)
             thread.daemon = True
@@ -329,7 +341,7 @@ class ExtendedApp(HitrotechApp):
     def action_vacant_lot_6_phone(self):
         win = tb.Toplevel(self.root)
         win.title("Vacant Lot —  Phone Numbers")
-        win.geometry("560x420")
+        win.geometry("560x460")
         
         # Use regular tkinter Frame for background
         main_frame = tk.Frame(win, bg="#fff3e0")
@@ -372,6 +384,8 @@ class ExtendedApp(HitrotechApp):
             var = tk.BooleanVar(value=True)
             checkbox_vars[lbl] = var
             tb.Checkbutton(cb_frame, text=lbl, variable=var, bootstyle="round-toggle").pack(anchor="w")
+        profile_var = tk.BooleanVar(value=False)
+        tb.Checkbutton(main_frame, text="Profile this run", variable=profile_var, bootstyle="round-toggle").pack(pady=(8, 0))
 
         def run_vacant():
             input_folder = input_var.get().strip()
@@ -386,20 +400,16 @@ class ExtendedApp(HitrotechApp):
 
             keep_list = [lbl for lbl, v in checkbox_vars.items() if v.get()]
 
-            def work():
-                try:
-                    for file in os.listdir(input_folder):
-                        if file.endswith(".csv") or file.endswith(".xlsx"):
-                            file_path = os.path.join(input_folder, file)
-                            list_name = os.path.splitext(os.path.basename(file))[0]
-                            self.utils['run_vacant_6_pipeline'](
-                                file_path, list_name, out_folder, keep_outputs=keep_list
-                            )
-                    self.ui.show_info("✅ Done", "Vacant Lot pipeline finished for all files.")
-                except Exception as e:
-                    self.ui.show_error("❌ Error", f"Pipeline failed: {e}")
-
-            self.run_with_loader(work)
+            # one job per CSV/XLSX file in the folder
+            jobs = []
+            for file_path in _data_files(input_folder):
+                list_name = os.path.splitext(os.path.basename(file_path))[0]
+                jobs.append((f"Vacant Lot: {list_name}", 'run_vacant_6_pipeline', (file_path, list_name, out_folder),
+                             {"keep_outputs": keep_list}, [file_path]))
+            if not jobs:
+                self.ui.show_error("❌ Error", "No CSV/XLSX files in the input folder")
+                return
+            self.run_jobs(jobs, "Vacant Lot pipeline finished for all files.", profile=profile_var.get())
 
         tb.Button(main_frame, text="Start List Building", bootstyle="success", command=run_vacant, width=28).pack(pady=14)
 
@@ -407,7 +417,7 @@ class ExtendedApp(HitrotechApp):
     def action_resident_data(self):
         win = tb.Toplevel(self.root)
         win.title("Resident Data — Phone Numbers")
-        win.geometry("560x420")
+        win.geometry("560x460")
         
         # Use regular tkinter Frame for background
         main_frame = tk.Frame(win, bg="#fff3e0")
@@ -450,6 +460,8 @@ class ExtendedApp(HitrotechApp):
             var = tk.BooleanVar(value=True)
             checkbox_vars[lbl] = var
             tb.Checkbutton(cb_frame, text=lbl, variable=var, bootstyle="round-toggle").pack(anchor="w")
+        profile_var = tk.BooleanVar(value=False)
+        tb.Checkbutton(main_frame, text="Profile this run", variable=profile_var, bootstyle="round-toggle").pack(pady=(8, 0))
 
         def run_resident():
             input_folder = input_var.get().strip()
@@ -464,20 +476,16 @@ class ExtendedApp(HitrotechApp):
 
             keep_list = [lbl for lbl, v in checkbox_vars.items() if v.get()]
 
-            def work():
-                try:
-                    for file in os.listdir(input_folder):
-                        if file.endswith(".csv") or file.endswith(".xlsx"):
-                            file_path = os.path.join(input_folder, file)
-                            list_name = os.path.splitext(os.path.basename(file))[0]
-                            run_resident_pipeline(
-                                file_path, list_name, out_folder, keep_outputs=keep_list
-                            )
-                    self.ui.show_info("✅ Done", "Resident Data pipeline finished for all files.")
-                except Exception as e:
-                    self.ui.show_error("❌ Error", f"Pipeline failed: {e}")
-
-            self.run_with_loader(work)
+            # one job per CSV/XLSX file in the folder
+            jobs = []
+            for file_path in _data_files(input_folder):
+                list_name = os.path.splitext(os.path.basename(file_path))[0]
+                jobs.append((f"Resident Data: {list_name}", 'run_resident_pipeline', (file_path, list_name, out_folder),
+                             {"keep_outputs": keep_list}, [file_path]))
+            if not jobs:
+                self.ui.show_error("❌ Error", "No CSV/XLSX files in the input folder")
+                return
+            self.run_jobs(jobs, "Resident Data pipeline finished for all files.", profile=profile_var.get())
 
         tb.Button(main_frame, text="Start List Building", bootstyle="success", command=run_resident, width=28).pack(pady=14)
 
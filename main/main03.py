@@ -4,7 +4,6 @@ import ttkbootstrap as tb
 from tkinter import filedialog, messagebox
 
 from main.main02 import ExtendedApp, TOOL_DEFS  # Import base app + tools and existing tool definitions
-from utils.combinations.file_combinations import FilesCombinationsTool
 
 # -----------------------------
 # Further Extended Application
@@ -13,10 +12,12 @@ from utils.combinations.file_combinations import FilesCombinationsTool
 class FurtherExtendedApp(ExtendedApp):
     def __init__(self, root):
         super().__init__(root)
-        self.files_comb_tool = FilesCombinationsTool(root)
+        self.files_comb_tool = None  # created on first open (imports pandas)
         
     # ---- Files Combinations Tool
     def action_files_combinations(self):
+        if self.files_comb_tool is None:
+            self.files_comb_tool = self.utils['files_combinations_tool'](self.root)
         self.files_comb_tool.open_tool_window()
     
     # ---- Dummy Tool
@@ -3,6 +3,12 @@ import os
 import re
 from datetime import datetime
 
+from utils.address_index import recording_list, split_previously_processed, using_address_index
+from utils.dedupe import dedupe_keep_first
+from utils.instrumentation import buffered_log, file_folder_name, flush_logs, instrument, output_folder_name
+from utils.progress import open_reporting, report
+from utils.run_tracking import PipelineRun
+
 # -------------------------
 # Utilities
 # -------------------------
@@ -46,6 +52,7 @@ def initialize_tracking_log(output_folder, list_name):
     ensure_folder(tracker_folder)
     
     tracker_path = os.path.join(tracker_folder, f"{list_name}_processing_tracker.txt")
+    flush_logs(tracker_path)  # lines still pending from an earlier run of this list
     
     with open(tracker_path, 'w') as f:
         f.write(f"AAE 3 Phone LSB Processing Tracker - {list_name}\n")
@@ -56,24 +63,24 @@ def initialize_tracking_log(output_folder, list_name):
     return tracker_path
 
 def log_processing_step(tracker_path, step_name, record_count, file_path=None, details=""):
-    """Log a processing step to the tracking file"""
-    with open(tracker_path, 'a') as f:
-        timestamp = datetime.now().strftime('%H:%M:%S')
-        f.write(f"[{timestamp}] {step_name}: {record_count} records")
-        if file_path:
-            f.write(f" -> {os.path.basename(file_path)}")
-        if details:
-            f.write(f" ({details})")
-        f.write("\n")
+    """Log a processing step to the tracking file (buffered; written by finalize_tracking_log)"""
+    timestamp = datetime.now().strftime('%H:%M:%S')
+    line = f"[{timestamp}] {step_name}: {record_count} records"
+    if file_path:
+        line += f" -> {os.path.basename(file_path)}"
+    if details:
+        line += f" ({details})"
+    buffered_log(tracker_path).write(line + "\n")
 
 def finalize_tracking_log(tracker_path, total_steps, success=True):
     """Finalize the tracking log with summary"""
-    with open(tracker_path, 'a') as f:
-        f.write("\n" + "=" * 60 + "\n")
-        status = "COMPLETED SUCCESSFULLY" if success else "COMPLETED WITH ERRORS"
-        f.write(f"Processing {status}: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        f.write(f"Total processing steps: {total_steps}\n")
-        f.write("=" * 60 + "\n")
+    f = buffered_log(tracker_path)
+    f.write("\n" + "=" * 60 + "\n")
+    status = "COMPLETED SUCCESSFULLY" if success else "COMPLETED WITH ERRORS"
+    f.write(f"Processing {status}: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+    f.write(f"Total processing steps: {total_steps}\n")
+    f.write("=" * 60 + "\n")
+    flush_logs(tracker_path)
 
 def create_summary_tracker(output_folder, all_trackers):
     """Create a summary tracker for all processed lists"""
@@ -100,6 +107,7 @@ def create_summary_tracker(output_folder, all_trackers):
 # -------------------------
 # STEP 01: Clean + standardize (split Owner Name => First/Last)
 # -------------------------
+@instrument()
 def step_01_clean_and_standardize(df, list_name, tracker_path=None):
     # Extract email data if available
     email_col_name, email_data = extract_email_column(df)
@@ -163,6 +171,7 @@ def step_01_clean_and_standardize(df, list_name, tracker_path=None):
 # -------------------------
 # STEP 02: Remove phones (creates 2BSkip output)
 # -------------------------
+@instrument()
 def step_02_remove_phones(df, tracker_path=None):
     result = df.drop(columns=['Phone1', 'Type1', 'Phone2', 'Type2', 'Phone3', 'Type3','Email'], errors='ignore')
     
@@ -174,6 +183,7 @@ def step_02_remove_phones(df, tracker_path=None):
 
 # -------------------------
 # STEP 03: Dedupe + No Hit extraction
+@instrument(describe=file_folder_name)
 def remove_type_columns_from_cc_ready(file_path):
     """
     Remove Type1–Type6 columns from CC Ready files but KEEP Email
@@ -204,15 +214,16 @@ def remove_type_columns_from_cc_ready(file_path):
         return None
 
 # -------------------------
+@instrument()
 def step_03_dedupe_and_cleanup(df, list_name, output_folder=None, tracker_path=None):
-    initial_count = len(df)
-    df = df.drop_duplicates()
-    after_dedupe = len(df)
-    
-    df['normalized_address'] = df['Property Address'].apply(normalize_address)
-    df = df.drop_duplicates(subset=['normalized_address'])
-    after_address_dedupe = len(df)
-    df = df.drop(columns=['normalized_address'], errors='ignore')
+    # Identical rows, then repeated normalized addresses (first kept), in one pass
+    df, duplicates, address_duplicates = dedupe_keep_first(df, 'Property Address', count_rows=True)
+
+    # Addresses an earlier list already processed (only with the address index on)
+    df, df_previous = split_previously_processed(df, list_name)
+    if not df_previous.empty and output_folder:
+        save_to_folder(df_previous, os.path.join(output_folder, "Previously Processed"), list_name,
+                       tracker_path=tracker_path)
 
     mask_no_phones = df[['Phone1', 'Phone2', 'Phone3']].isna().all(axis=1)
     df_no_hit = df[mask_no_phones].copy()
@@ -258,7 +269,7 @@ def step_03_dedupe_and_cleanup(df, list_name, output_folder=None, tracker_path=N
     
     # Log this step
     if tracker_path:
-        details = f"Duplicates removed: {initial_count - after_dedupe}, Address duplicates: {after_dedupe - after_address_dedupe}"
+        details = f"Duplicates removed: {duplicates}, Address duplicates: {address_duplicates}"
         log_processing_step(tracker_path, "Step 03 - Deduplicated (CC Ready)", len(df), details=details)
     
     return df
@@ -266,6 +277,7 @@ def step_03_dedupe_and_cleanup(df, list_name, output_folder=None, tracker_path=N
 # -------------------------
 # STEP 03.5: Process Step03 File (CC Ready) - Remove Type columns and swap Phone4/Phone5
 # -------------------------
+@instrument(describe=file_folder_name)
 def process_step03_file(file_path, tracker_path=None):
     """
     Process Step03 File (CC Ready): Remove Type, Type1, Type2, Type3 columns,
@@ -332,6 +344,7 @@ def process_step03_file(file_path, tracker_path=None):
 # -------------------------
 # STEP 04: Remove landlines (only where TypeX == 'Landline')
 # -------------------------
+@instrument()
 def step_04_remove_landlines(df, tracker_path=None):
     initial_count = len(df)
     
@@ -376,6 +389,7 @@ def step_04_remove_landlines(df, tracker_path=None):
 # -------------------------
 # STEP 05: Reshape for GHL - ALWAYS use PROPERTY columns
 # -------------------------
+@instrument()
 def step_05_reshape(df, tracker_path=None):
     def extract_numeric_phone(phone):
         if pd.isna(phone):
@@ -453,6 +467,7 @@ def step_05_reshape(df, tracker_path=None):
 # -------------------------
 # SAVE helper
 # -------------------------
+@instrument(describe=output_folder_name)
 def save_to_folder(df, folder, list_name, suffix="", tracker_path=None):
     ensure_folder(folder)
     filepath = os.path.join(folder, f"{list_name}{suffix}.xlsx")
@@ -491,128 +506,144 @@ def run_aae_pipeline(input_path, list_name, output_folder, is_step01_file=False)
     # Create individual output folder for this specific list
     individual_output_folder = os.path.join(output_folder, list_name)
     ensure_folder(individual_output_folder)
+    # The addresses step_03 keeps count as processed only once every output is saved
+    with PipelineRun("aae_3_phone", list_name, input_path, individual_output_folder) as run, recording_list(list_name):
     
-    step01_folder = os.path.join(individual_output_folder, "SkipTraced")
-    filepath_01 = os.path.join(step01_folder, f"{list_name}.xlsx")
+        step01_folder = os.path.join(individual_output_folder, "SkipTraced")
+        filepath_01 = os.path.join(step01_folder, f"{list_name}.xlsx")
     
-    # If input is already a Step01 file, use it directly
-    if is_step01_file:
-        print(f"Using existing Step01 file: {input_path}")
-        df_01 = pd.read_excel(input_path)
-        save_to_folder(df_01, step01_folder, list_name, tracker_path=tracker_path)
-    else:
-        # Check if Step01 file already exists
-        if os.path.exists(filepath_01):
-            print(f"Found existing step01 file: {filepath_01}. Loading it instead of reprocessing.")
-            df_01 = pd.read_excel(filepath_01)
-            log_processing_step(tracker_path, "Loaded existing Step01 file", len(df_01), filepath_01)
+        # If input is already a Step01 file, use it directly
+        if is_step01_file:
+            print(f"Using existing Step01 file: {input_path}")
+            df_01 = pd.read_excel(input_path)
+            save_to_folder(df_01, step01_folder, list_name, tracker_path=tracker_path)
         else:
-            print(f"No existing step01 file found. Processing from raw file: {input_path}")
-            # Handle both CSV and Excel files
-            if input_path.endswith('.csv'):
-                df_raw = pd.read_csv(input_path)
+            # Check if Step01 file already exists
+            if os.path.exists(filepath_01):
+                print(f"Found existing step01 file: {filepath_01}. Loading it instead of reprocessing.")
+                df_01 = pd.read_excel(filepath_01)
+                log_processing_step(tracker_path, "Loaded existing Step01 file", len(df_01), filepath_01)
             else:
-                df_raw = pd.read_excel(input_path)
+                print(f"No existing step01 file found. Processing from raw file: {input_path}")
+                # Handle both CSV and Excel files
+                if input_path.endswith('.csv'):
+                    with open_reporting(input_path) as f:
+                        df_raw = pd.read_csv(f)
+                else:
+                    with open_reporting(input_path) as f:
+                        df_raw = pd.read_excel(f)
             
-            log_processing_step(tracker_path, "Loaded raw input file", len(df_raw), input_path)
-            df_01 = step_01_clean_and_standardize(df_raw, list_name, tracker_path)
-            save_to_folder(df_01, step01_folder, list_name, tracker_path=tracker_path)
-
-    df_02 = step_02_remove_phones(df_01, tracker_path)
-    filepath_02 = save_to_folder(df_02, os.path.join(individual_output_folder, "2BSkip"), list_name, tracker_path=tracker_path)
-
-    df_03 = step_03_dedupe_and_cleanup(df_01, list_name, individual_output_folder, tracker_path)
-    filepath_03 = save_to_folder(df_03, os.path.join(individual_output_folder, "CC Ready"), list_name, tracker_path=tracker_path)
-    
-    # Process the Step03 (CC Ready) file to remove Type columns and swap Phone4/Phone5
-    process_step03_file(filepath_03, tracker_path)
-    remove_type_columns_from_cc_ready(filepath_03)
-
-    df_04 = step_04_remove_landlines(df_03, tracker_path)
-    filepath_04 = save_to_folder(df_04, os.path.join(individual_output_folder, "SC Ready"), list_name, tracker_path=tracker_path)
-
-    df_05 = step_05_reshape(df_04, tracker_path)
-    filepath_05 = save_to_folder(df_05, os.path.join(individual_output_folder, "GHL Ready"), list_name, tracker_path=tracker_path)
-
-    # Create final record count tracker
-    tracker_data = {
-        "SkipTraced": len(df_01),
-        "2BSkip": len(df_02),
-        "CC Ready": len(df_03),
-        "SC Ready": len(df_04),
-        "GHL Ready": len(df_05)
-    }
-    
-    # Create the list building records tracker
-    tracker_lines = []
-    for label, count in tracker_data.items():
-        tracker_lines.append(f"{label}: {count}")
-    
-    list_tracker_path = os.path.join(individual_output_folder, "List Building Records.txt")
-    with open(list_tracker_path, "w") as f:
-        f.write(f"List Building Records - {list_name}\n")
-        f.write("=" * 40 + "\n")
-        f.write("\n".join(tracker_lines))
-        f.write(f"\n\nGenerated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-
-    # log_processing_step(tracker_path, "List Building Records Created", 0, list_tracker_path)
-    
-    # Finalize the tracking log
-    finalize_tracking_log(tracker_path, 6, success=True)
-    
-    print("📋 Trackers saved:")
-    # print(f"   - Processing tracker: {tracker_path}")
-    print(f"   - List building records: {list_tracker_path}")
-    
-    return [filepath_01, filepath_02, filepath_03, filepath_04, filepath_05], tracker_data
+                log_processing_step(tracker_path, "Loaded raw input file", len(df_raw), input_path)
+                df_01 = step_01_clean_and_standardize(df_raw, list_name, tracker_path)
+                save_to_folder(df_01, step01_folder, list_name, tracker_path=tracker_path)
+        run.lap("Step 01 - SkipTraced")
+
+        df_02 = step_02_remove_phones(df_01, tracker_path)
+        filepath_02 = save_to_folder(df_02, os.path.join(individual_output_folder, "2BSkip"), list_name, tracker_path=tracker_path)
+        run.lap("Step 02 - 2BSkip")
+
+        df_03 = step_03_dedupe_and_cleanup(df_01, list_name, individual_output_folder, tracker_path)
+        filepath_03 = save_to_folder(df_03, os.path.join(individual_output_folder, "CC Ready"), list_name, tracker_path=tracker_path)
+    
+        # Process the Step03 (CC Ready) file to remove Type columns and swap Phone4/Phone5
+        process_step03_file(filepath_03, tracker_path)
+        remove_type_columns_from_cc_ready(filepath_03)
+        run.lap("Step 03 - CC Ready")
+
+        df_04 = step_04_remove_landlines(df_03, tracker_path)
+        filepath_04 = save_to_folder(df_04, os.path.join(individual_output_folder, "SC Ready"), list_name, tracker_path=tracker_path)
+        run.lap("Step 04 - SC Ready")
+
+        df_05 = step_05_reshape(df_04, tracker_path)
+        filepath_05 = save_to_folder(df_05, os.path.join(individual_output_folder, "GHL Ready"), list_name, tracker_path=tracker_path)
+        run.lap("Step 05 - GHL Ready")
+
+        # Create final record count tracker
+        tracker_data = {
+            "SkipTraced": len(df_01),
+            "2BSkip": len(df_02),
+            "CC Ready": len(df_03),
+            "SC Ready": len(df_04),
+            "GHL Ready": len(df_05)
+        }
+    
+        # Create the list building records tracker
+        tracker_lines = []
+        for label, count in tracker_data.items():
+            tracker_lines.append(f"{label}: {count}")
+            run.count(label, count)
+        for label, path in zip(tracker_data, [filepath_01, filepath_02, filepath_03, filepath_04, filepath_05]):
+            run.output(label, path)
+    
+        list_tracker_path = os.path.join(individual_output_folder, "List Building Records.txt")
+        with open(list_tracker_path, "w") as f:
+            f.write(f"List Building Records - {list_name}\n")
+            f.write("=" * 40 + "\n")
+            f.write("\n".join(tracker_lines))
+            f.write(f"\n\nGenerated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+
+        # log_processing_step(tracker_path, "List Building Records Created", 0, list_tracker_path)
+    
+        # Finalize the tracking log
+        finalize_tracking_log(tracker_path, 6, success=True)
+    
+        print("📋 Trackers saved:")
+        # print(f"   - Processing tracker: {tracker_path}")
+        print(f"   - List building records: {list_tracker_path}")
+        run.lap("Tracker")
+    
+        return [filepath_01, filepath_02, filepath_03, filepath_04, filepath_05], tracker_data
 
 # -------------------------
 # Process directory for AAE 3 Phone LSB
 # -------------------------
-def process_aae_directory(input_folder, process_step01_files=False):
+def process_aae_directory(input_folder, process_step01_files=False, address_index=False):
     output_folder = os.path.join(input_folder, "AAE_3_Phone_LSB_Output")
     ensure_folder(output_folder)
     
     all_trackers = {}
     
-    # Process all files in the input folder
-    for file in os.listdir(input_folder):
-        file_path = os.path.join(input_folder, file)
-        list_name = os.path.splitext(file)[0]
+    # Process all CSV/XLSX files in the input folder
+    files = [f for f in os.listdir(input_folder) if f.endswith((".csv", ".xlsx"))]
+    with using_address_index(address_index):
+        for i, file in enumerate(files, 1):
+            file_path = os.path.join(input_folder, file)
+            list_name = os.path.splitext(file)[0]
         
-        # Check if we should process this file
-        should_process = False
-        is_step01_file = False
+            # Check if we should process this file
+            should_process = False
+            is_step01_file = False
         
-        if process_step01_files and file.endswith(".xlsx"):
-            # Check if this is a Step01 file by looking for specific columns
-            try:
-                df_check = pd.read_excel(file_path, nrows=1)
-                if all(col in df_check.columns for col in ['First Name', 'Last Name', 'Phone1', 'Type1']):
-                    is_step01_file = True
-                    should_process = True
-            except:
-                pass
-        elif not process_step01_files and (file.endswith(".csv") or file.endswith(".xlsx")):
-            should_process = True
+            if process_step01_files and file.endswith(".xlsx"):
+                # Check if this is a Step01 file by looking for specific columns
+                try:
+                    df_check = pd.read_excel(file_path, nrows=1)
+                    if all(col in df_check.columns for col in ['First Name', 'Last Name', 'Phone1', 'Type1']):
+                        is_step01_file = True
+                        should_process = True
+                except:
+                    pass
+            elif not process_step01_files and (file.endswith(".csv") or file.endswith(".xlsx")):
+                should_process = True
         
-        if should_process:
-            print(f"\n{'='*50}")
-            print(f"Processing {list_name}...")
-            print(f"{'='*50}")
+            if should_process:
+                print(f"\n{'='*50}")
+                print(f"Processing {list_name}...")
+                print(f"{'='*50}")
+                report(list_name=list_name, item=i, items=len(files))
             
-            # Create individual subfolders for this list
-            individual_output_folder = os.path.join(output_folder, list_name)
-            ensure_folder(individual_output_folder)
+                # Create individual subfolders for this list
+                individual_output_folder = os.path.join(output_folder, list_name)
+                ensure_folder(individual_output_folder)
             
-            # Create subfolders for this specific list
-            subfolders = ["SkipTraced", "2BSkip", "CC Ready", "SC Ready", "GHL Ready", "No Hit"]
-            for folder in subfolders:
-                ensure_folder(os.path.join(individual_output_folder, folder))
+                # Create subfolders for this specific list
+                subfolders = ["SkipTraced", "2BSkip", "CC Ready", "SC Ready", "GHL Ready", "No Hit"]
+                for folder in subfolders:
+                    ensure_folder(os.path.join(individual_output_folder, folder))
             
-            # Run the pipeline and capture tracker data
-            _, tracker_data = run_aae_pipeline(file_path, list_name, output_folder, is_step01_file)
-            all_trackers[list_name] = tracker_data
+                # Run the pipeline and capture tracker data
+                _, tracker_data = run_aae_pipeline(file_path, list_name, output_folder, is_step01_file)
+                all_trackers[list_name] = tracker_data
     
     # Create a summary tracker for all processed lists
     if all_trackers:
@@ -631,6 +662,6 @@ if __name__ == "__main__":
     
     print("AAE 3 Phone LSB Pipeline Script with Tracking Loaded")
     print("Available functions:")
-    print("- process_aae_directory(input_folder, process_step01_files=False)")
+    print("- process_aae_directory(input_folder, process_step01_files=False, address_index=False)")
     print("- run_aae_pipeline(input_path, list_name, output_folder, is_step01_file=False)")
     print("- process_step03_file(file_path)  # For individual CC Ready file processing")
\ No newline at end of file
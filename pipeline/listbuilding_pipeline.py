@@ -2,6 +2,12 @@ import pandas as pd
 import os
 import re
 
+from utils.address_index import recording_list, split_previously_processed, using_address_index
+from utils.dedupe import dedupe_keep_first
+from utils.instrumentation import file_folder_name, instrument, output_folder_name
+from utils.progress import open_reporting, report
+from utils.run_tracking import PipelineRun
+
 # -------------------------------
 # Helpers
 # -------------------------------
@@ -23,6 +29,7 @@ def ensure_folder(folder):
 # -------------------------------
 # STEP 03.5: Remove Type columns from CC Ready files
 # -------------------------------
+@instrument(describe=file_folder_name)
 def remove_type_columns_from_cc_ready(file_path):
     """
     Remove Type1–Type6 columns from CC Ready files but KEEP Email
@@ -56,6 +63,7 @@ def remove_type_columns_from_cc_ready(file_path):
 # -------------------------------
 # STEP 01
 # -------------------------------
+@instrument()
 def step_01_clean_and_standardize(df, list_name):
     cleaned = df.rename(columns={
         'first_name': 'First Name',
@@ -103,6 +111,7 @@ def step_01_clean_and_standardize(df, list_name):
 # -------------------------------
 # STEP 02
 # -------------------------------
+@instrument()
 def step_02_remove_phones(df):
     return df.drop(columns=[
         'Phone1','Type1','Phone2','Type2','Phone3','Type3',
@@ -112,11 +121,15 @@ def step_02_remove_phones(df):
 # -------------------------------
 # STEP 03
 # -------------------------------
+@instrument()
 def step_03_dedupe_and_cleanup(df, list_name, output_folder=None):
-    df = df.drop_duplicates()
-    df['normalized_address'] = df['Property Address'].apply(normalize_address)
-    df = df.drop_duplicates(subset=['normalized_address'])
-    df = df.drop(columns=['normalized_address'], errors='ignore')
+    # Identical rows, then repeated normalized addresses (first kept), in one pass
+    df, _, _ = dedupe_keep_first(df, 'Property Address')
+
+    # Addresses an earlier list already processed (only with the address index on)
+    df, df_previous = split_previously_processed(df, list_name)
+    if not df_previous.empty and output_folder:
+        save_to_folder(df_previous, os.path.join(output_folder, "Previously Processed"), list_name)
 
     mask_no_phones = df[[f'Phone{i}' for i in range(1,7) if f'Phone{i}' in df.columns]].isna().all(axis=1)
     df_no_hit = df[mask_no_phones].copy()
@@ -146,6 +159,7 @@ def step_03_dedupe_and_cleanup(df, list_name, output_folder=None):
 # -------------------------------
 # STEP 04
 # -------------------------------
+@instrument()
 def step_04_process_phones(df):
     df = df[df[[f'Phone{i}' for i in range(1, 7) if f'Phone{i}' in df.columns]].notna().any(axis=1)].copy()
 
@@ -195,6 +209,7 @@ def step_04_process_phones(df):
 # -------------------------------
 # STEP 05
 # -------------------------------
+@instrument()
 def step_05_reshape(df):
     def extract_numeric_phone(phone):
         return phone  # keep as-is
@@ -244,6 +259,7 @@ def step_05_reshape(df):
 # -------------------------------
 # Save helper
 # -------------------------------
+@instrument(describe=output_folder_name)
 def save_to_folder(df, folder, list_name, suffix=""):
     ensure_folder(folder)
     filepath = os.path.join(folder, f"{list_name}{suffix}.xlsx")
@@ -266,52 +282,65 @@ def save_to_folder(df, folder, list_name, suffix=""):
 # -------------------------------
 # RUN PIPELINE
 # -------------------------------
-def run_pipeline(input_path, list_name, output_folder):
+def run_pipeline(input_path, list_name, output_folder, include_step05=True):
+    """include_step05=False writes the SC Ready rows to GHL Ready unchanged (no reshape)."""
     # Create individual output folder
     individual_output_folder = os.path.join(output_folder, list_name)
     ensure_folder(individual_output_folder)
+    # The addresses step_03 keeps count as processed only once every output is saved
+    with PipelineRun("listbuilding", list_name, input_path, individual_output_folder) as run, recording_list(list_name):
 
-    # Subfolders
-    subfolders = ["SkipTraced", "2BSkip", "CC Ready", "SC Ready", "GHL Ready", "No Hit"]
-    for folder in subfolders:
-        ensure_folder(os.path.join(individual_output_folder, folder))
+        # Subfolders
+        subfolders = ["SkipTraced", "2BSkip", "CC Ready", "SC Ready", "GHL Ready", "No Hit"]
+        for folder in subfolders:
+            ensure_folder(os.path.join(individual_output_folder, folder))
 
-    step01_folder = os.path.join(individual_output_folder, "SkipTraced")
-    filepath_01 = os.path.join(step01_folder, f"{list_name}.xlsx")
+        step01_folder = os.path.join(individual_output_folder, "SkipTraced")
+        filepath_01 = os.path.join(step01_folder, f"{list_name}.xlsx")
 
-    if os.path.exists(filepath_01):
-        print(f"Found existing step01 file: {filepath_01}. Loading it instead of reprocessing.")
-        df_01 = pd.read_excel(filepath_01)
-    else:
-        if input_path.endswith('.csv'):
-            df_raw = pd.read_csv(input_path)
-        elif input_path.endswith('.xlsx'):
-            df_raw = pd.read_excel(input_path)
+        if os.path.exists(filepath_01):
+            print(f"Found existing step01 file: {filepath_01}. Loading it instead of reprocessing.")
+            df_01 = pd.read_excel(filepath_01)
         else:
-            raise ValueError("Unsupported input file type.")
-        df_01 = step_01_clean_and_standardize(df_raw, list_name)
-        save_to_folder(df_01, step01_folder, list_name)
+            if input_path.endswith('.csv'):
+                with open_reporting(input_path) as f:
+                    df_raw = pd.read_csv(f)
+            elif input_path.endswith('.xlsx'):
+                with open_reporting(input_path) as f:
+                    df_raw = pd.read_excel(f)
+            else:
+                raise ValueError("Unsupported input file type.")
+            df_01 = step_01_clean_and_standardize(df_raw, list_name)
+            save_to_folder(df_01, step01_folder, list_name)
+        run.lap("Step 01 - SkipTraced")
 
-    df_02 = step_02_remove_phones(df_01)
-    filepath_02 = save_to_folder(df_02, os.path.join(individual_output_folder, "2BSkip"), list_name)
+        df_02 = step_02_remove_phones(df_01)
+        filepath_02 = save_to_folder(df_02, os.path.join(individual_output_folder, "2BSkip"), list_name)
+        run.lap("Step 02 - 2BSkip")
 
-    df_03 = step_03_dedupe_and_cleanup(df_01, list_name, individual_output_folder)
-    filepath_03 = save_to_folder(df_03, os.path.join(individual_output_folder, "CC Ready"), list_name)
+        df_03 = step_03_dedupe_and_cleanup(df_01, list_name, individual_output_folder)
+        filepath_03 = save_to_folder(df_03, os.path.join(individual_output_folder, "CC Ready"), list_name)
+        run.lap("Step 03 - CC Ready")
 
     
 
-    df_04 = step_04_process_phones(pd.read_excel(filepath_03))
-    filepath_04 = save_to_folder(df_04, os.path.join(individual_output_folder, "SC Ready"), list_name)
+        df_04 = step_04_process_phones(pd.read_excel(filepath_03))
+        filepath_04 = save_to_folder(df_04, os.path.join(individual_output_folder, "SC Ready"), list_name)
+        run.lap("Step 04 - SC Ready")
 
-    df_05 = step_05_reshape(pd.read_excel(filepath_04))
-    filepath_05 = save_to_folder(df_05, os.path.join(individual_output_folder, "GHL Ready"), list_name)
+        df_05 = pd.read_excel(filepath_04)
+        if include_step05:
+            df_05 = step_05_reshape(df_05)
+        filepath_05 = save_to_folder(df_05, os.path.join(individual_output_folder, "GHL Ready"), list_name)
+        run.lap("Step 05 - GHL Ready")
 
     
 
-    remove_phone6_from_cc_ready(filepath_03)
-    remove_type_columns_from_cc_ready(filepath_03)
-        # Reorder No Hit file if it exists
-    reorder_nohit_file(os.path.join(individual_output_folder, "No Hit", f"{list_name}.xlsx"))
+        remove_phone6_from_cc_ready(filepath_03)
+        remove_type_columns_from_cc_ready(filepath_03)
+            # Reorder No Hit file if it exists
+        reorder_nohit_file(os.path.join(individual_output_folder, "No Hit", f"{list_name}.xlsx"))
+        run.lap("Post-processing")
     
 
 
@@ -320,52 +349,57 @@ def run_pipeline(input_path, list_name, output_folder):
 
     
 
-    # Tracker
-    no_hit_path = os.path.join(individual_output_folder, "No Hit", f"{list_name}.xlsx")
+        # Tracker
+        no_hit_path = os.path.join(individual_output_folder, "No Hit", f"{list_name}.xlsx")
 
-    tracker_data = {
-        "SkipTraced": filepath_01,
-        "2BSkip": filepath_02,
-        "CC Ready": filepath_03,
-        "SC Ready": filepath_04,
-        "GHL Ready": filepath_05,
-        "No Hit File": no_hit_path
-    }
+        tracker_data = {
+            "SkipTraced": filepath_01,
+            "2BSkip": filepath_02,
+            "CC Ready": filepath_03,
+            "SC Ready": filepath_04,
+            "GHL Ready": filepath_05,
+            "No Hit File": no_hit_path
+        }
 
-    tracker_lines = []
-    for label, path in tracker_data.items():
-        try:
-            if os.path.exists(path):
-                df_tmp = pd.read_excel(path)
-                count = df_tmp["List"].notna().sum() if "List" in df_tmp.columns else len(df_tmp)
-            else:
-                count = 0  # If file missing → 0
-            tracker_lines.append(f"{label}: {count}")
-        except Exception as e:
-            tracker_lines.append(f"{label}: Error reading file - {str(e)}")
+        tracker_lines = []
+        for label, path in tracker_data.items():
+            try:
+                if os.path.exists(path):
+                    df_tmp = pd.read_excel(path)
+                    count = df_tmp["List"].notna().sum() if "List" in df_tmp.columns else len(df_tmp)
+                else:
+                    count = 0  # If file missing → 0
+                tracker_lines.append(f"{label}: {count}")
+                run.count(label, count)
+                run.output(label, path)
+            except Exception as e:
+                tracker_lines.append(f"{label}: Error reading file - {str(e)}")
 
-    tracker_path = os.path.join(individual_output_folder, "List Building Records.txt")
-    with open(tracker_path, "w") as f:
-        f.write("\n".join(tracker_lines))
+        tracker_path = os.path.join(individual_output_folder, "List Building Records.txt")
+        with open(tracker_path, "w") as f:
+            f.write("\n".join(tracker_lines))
 
-    print("📋 Tracker saved at:", tracker_path)
+        print("📋 Tracker saved at:", tracker_path)
+        run.lap("Tracker")
 
-    return [filepath_01, filepath_02, filepath_03, filepath_04, filepath_05, no_hit_path]
+        return [filepath_01, filepath_02, filepath_03, filepath_04, filepath_05, no_hit_path]
 
 # -------------------------------
 # PROCESS DIRECTORY
 # -------------------------------
-def process_directory(input_folder):
+def process_directory(input_folder, include_step05=True, address_index=False):
     output_folder = os.path.join(input_folder, "Processed")
     ensure_folder(output_folder)
 
-    for filename in os.listdir(input_folder):
-        if filename.lower().endswith(('.csv', '.xlsx')):
+    filenames = [f for f in os.listdir(input_folder) if f.lower().endswith(('.csv', '.xlsx'))]
+    with using_address_index(address_index):
+        for i, filename in enumerate(filenames, 1):
             input_path = os.path.join(input_folder, filename)
             list_name = os.path.splitext(filename)[0]
             print(f"⚡ Processing {filename} ...")
+            report(list_name=list_name, item=i, items=len(filenames))
             try:
-                run_pipeline(input_path, list_name, output_folder)
+                run_pipeline(input_path, list_name, output_folder, include_step05=include_step05)
             except Exception as e:
                 print(f"❌ Failed on {filename}: {e}")
 
@@ -378,6 +412,7 @@ def process_individual_cc_ready_file(file_path):
 # -------------------------------
 # Remove Phone6 from CC Ready
 # -------------------------------
+@instrument(describe=file_folder_name)
 def remove_phone6_from_cc_ready(file_path):
     try:
         df = pd.read_excel(file_path)
@@ -403,6 +438,7 @@ def remove_phone6_from_cc_ready(file_path):
 
 
 
+@instrument(describe=file_folder_name)
 def reorder_nohit_file(no_hit_path):
     """
     If No Hit file exists, reorder its columns so that:
@@ -2,6 +2,12 @@ import pandas as pd
 import os
 import re
 
+from utils.address_index import recording_list, split_previously_processed, using_address_index
+from utils.dedupe import dedupe_keep_first
+from utils.instrumentation import file_folder_name, instrument, output_folder_name
+from utils.progress import open_reporting, report
+from utils.run_tracking import PipelineRun
+
 # -------------------------------
 # Helpers
 # -------------------------------
@@ -33,6 +39,7 @@ def step_01_prepare_emails(df):
 # -------------------------------
 # STEP 03.5: Remove Type columns from CC Ready files
 # -------------------------------
+@instrument(describe=file_folder_name)
 def remove_type_columns_from_cc_ready(file_path, has_type3_max=False):
     """
     Remove Type1–Type6 columns from CC Ready files but KEEP Email
@@ -70,6 +77,7 @@ def remove_type_columns_from_cc_ready(file_path, has_type3_max=False):
 # -------------------------------
 # STEP 01
 # -------------------------------
+@instrument()
 def step_01_clean_and_standardize(df, list_name):
     # Check if input has max Type3 (no Type4/Phone4)
     has_type3_max = ('Type4' not in df.columns and 'Phone4' not in df.columns and 
@@ -156,6 +164,7 @@ def step_01_clean_and_standardize(df, list_name):
 # -------------------------------
 # STEP 02
 # -------------------------------
+@instrument()
 def step_02_remove_phones(df):
     # Define base columns to remove (excluding Parcel Id for now)
     columns_to_remove = [
@@ -172,6 +181,7 @@ def step_02_remove_phones(df):
 # -------------------------------
 # STEP 03
 # -------------------------------
+@instrument()
 def step_03_dedupe_and_cleanup(df, list_name, output_folder=None):
     # df = df.drop_duplicates()
     # if 'Property Address' in df.columns:
@@ -209,19 +219,26 @@ def step_03_dedupe_and_cleanup(df, list_name, output_folder=None):
         print(f"📂 No Hit file created at: {no_hit_path}")
 
     df = df[~mask_no_phones]
-    df = df.drop_duplicates()
 
     if 'Parcel Id' in df.columns:
-    # Remove blanks in Parcel Id
-     df = df[df['Parcel Id'].notna() & (df['Parcel Id'].astype(str).str.strip() != "")]
-    # Remove duplicates based on Parcel Id
-    df = df.drop_duplicates(subset=['Parcel Id'])
+        # Remove blanks in Parcel Id
+        df = df[df['Parcel Id'].notna() & (df['Parcel Id'].astype(str).str.strip() != "")]
+        # Identical rows, then repeated Parcel Ids (first kept), in one pass
+        df, _, _ = dedupe_keep_first(df, 'Parcel Id', normalize=False)
+    else:
+        df, _, _ = dedupe_keep_first(df)
+
+    # Addresses an earlier list already processed (only with the address index on)
+    df, df_previous = split_previously_processed(df, list_name)
+    if not df_previous.empty and output_folder:
+        save_to_folder(df_previous, os.path.join(output_folder, "Previously Processed"), list_name)
     df['List'] = list_name
     return df
 
 # -------------------------------
 # STEP 04
 # -------------------------------
+@instrument()
 def step_04_process_phones(df):
     phone_cols = [f'Phone{i}' for i in range(1,7) if f'Phone{i}' in df.columns]
     if phone_cols:
@@ -290,6 +307,7 @@ def step_04_process_phones(df):
 # -------------------------------
 # STEP 05
 # -------------------------------
+@instrument()
 def step_05_reshape(df):
     def extract_numeric_phone(phone):
         return phone  # keep as-is
@@ -343,6 +361,7 @@ def step_05_reshape(df):
 # -------------------------------
 # Save helper
 # -------------------------------
+@instrument(describe=output_folder_name)
 def save_to_folder(df, folder, list_name, suffix=""):
     ensure_folder(folder)
     filepath = os.path.join(folder, f"{list_name}{suffix}.xlsx")
@@ -365,6 +384,7 @@ def save_to_folder(df, folder, list_name, suffix=""):
 # -------------------------------
 # Clean up temporary columns ONLY from Step01 file
 # -------------------------------
+@instrument(describe=file_folder_name)
 def cleanup_step01_temporary_columns(file_path):
     """
     Remove temporary Phone4-6 and Type4-6 columns from Step01 file only
@@ -408,6 +428,7 @@ def cleanup_step01_temporary_columns(file_path):
 # -------------------------------
 # Clean up temporary columns from No Hit file
 # -------------------------------
+@instrument(describe=file_folder_name)
 def cleanup_nohit_temporary_columns(file_path):
     """
     Remove temporary Phone4-6 and Type4-6 columns from No Hit file
@@ -451,6 +472,7 @@ def cleanup_nohit_temporary_columns(file_path):
 # Remove Phone6 from CC Ready
 # -------------------------------
 
+@instrument(describe=file_folder_name)
 def remove_phone6_and_type_columns_from_cc_ready(file_path):
     try:
         df = pd.read_excel(file_path)
@@ -515,6 +537,7 @@ def remove_phone6_and_type_columns_from_cc_ready(file_path):
 #         print(f"❌ Error removing Phone6 from CC Ready file: {str(e)}")
 #         return None
 
+@instrument(describe=file_folder_name)
 def reorder_nohit_file(no_hit_path):
     """
     If No Hit file exists, reorder its columns so that:
@@ -577,135 +600,148 @@ def run_pipeline(input_path, list_name, output_folder, keep_outputs=None):
     # Create individual output folder inside Processed
     individual_output_folder = os.path.join(processed_folder, list_name)
     ensure_folder(individual_output_folder)
+    # The addresses step_03 keeps count as processed only once every output is saved
+    with PipelineRun("vacant_lot", list_name, input_path, individual_output_folder) as run, recording_list(list_name):
 
-    # Subfolders
-    subfolders = ["SkipTraced", "2BSkip", "CC Ready", "SC Ready", "GHL Ready", "No Hit"]
-    for folder in subfolders:
-        ensure_folder(os.path.join(individual_output_folder, folder))
+        # Subfolders
+        subfolders = ["SkipTraced", "2BSkip", "CC Ready", "SC Ready", "GHL Ready", "No Hit"]
+        for folder in subfolders:
+            ensure_folder(os.path.join(individual_output_folder, folder))
 
-    step01_folder = os.path.join(individual_output_folder, "SkipTraced")
-    filepath_01 = os.path.join(step01_folder, f"{list_name}.xlsx")
+        step01_folder = os.path.join(individual_output_folder, "SkipTraced")
+        filepath_01 = os.path.join(step01_folder, f"{list_name}.xlsx")
 
-    has_type3_max = False
+        has_type3_max = False
     
-    if os.path.exists(filepath_01):
-        print(f"Found existing step01 file: {filepath_01}. Loading it instead of reprocessing.")
-        df_01 = pd.read_excel(filepath_01)
-        # Check if this file has temporary columns by checking if Phone4 exists but is all empty
-        if 'Phone4' in df_01.columns and df_01['Phone4'].isna().all():
-            has_type3_max = True
-    else:
-        if input_path.endswith('.csv'):
-            df_raw = pd.read_csv(input_path)
-        elif input_path.endswith('.xlsx'):
-            df_raw = pd.read_excel(input_path)
+        if os.path.exists(filepath_01):
+            print(f"Found existing step01 file: {filepath_01}. Loading it instead of reprocessing.")
+            df_01 = pd.read_excel(filepath_01)
+            # Check if this file has temporary columns by checking if Phone4 exists but is all empty
+            if 'Phone4' in df_01.columns and df_01['Phone4'].isna().all():
+                has_type3_max = True
         else:
-            raise ValueError("Unsupported input file type.")
+            if input_path.endswith('.csv'):
+                with open_reporting(input_path) as f:
+                    df_raw = pd.read_csv(f)
+            elif input_path.endswith('.xlsx'):
+                with open_reporting(input_path) as f:
+                    df_raw = pd.read_excel(f)
+            else:
+                raise ValueError("Unsupported input file type.")
         
-        # Check if input has max Type3 (no Type4/Phone4)
-        has_type3_max = ('Type4' not in df_raw.columns and 'Phone4' not in df_raw.columns and 
-                        'Type3' in df_raw.columns)
+            # Check if input has max Type3 (no Type4/Phone4)
+            has_type3_max = ('Type4' not in df_raw.columns and 'Phone4' not in df_raw.columns and 
+                            'Type3' in df_raw.columns)
         
-        df_01, _ = step_01_clean_and_standardize(df_raw, list_name)
-        save_to_folder(df_01, step01_folder, list_name)
-
-    df_02 = step_02_remove_phones(df_01)
-    filepath_02 = save_to_folder(df_02, os.path.join(individual_output_folder, "2BSkip"), list_name)
-
-    df_03 = step_03_dedupe_and_cleanup(df_01, list_name, individual_output_folder)
-    filepath_03 = save_to_folder(df_03, os.path.join(individual_output_folder, "CC Ready"), list_name)
-
-    df_04 = step_04_process_phones(pd.read_excel(filepath_03))
-    filepath_04 = save_to_folder(df_04, os.path.join(individual_output_folder, "SC Ready"), list_name)
-
-    df_05 = step_05_reshape(pd.read_excel(filepath_04))
-    filepath_05 = save_to_folder(df_05, os.path.join(individual_output_folder, "GHL Ready"), list_name)
+            df_01, _ = step_01_clean_and_standardize(df_raw, list_name)
+            save_to_folder(df_01, step01_folder, list_name)
+        run.lap("Step 01 - SkipTraced")
+
+        df_02 = step_02_remove_phones(df_01)
+        filepath_02 = save_to_folder(df_02, os.path.join(individual_output_folder, "2BSkip"), list_name)
+        run.lap("Step 02 - 2BSkip")
+
+        df_03 = step_03_dedupe_and_cleanup(df_01, list_name, individual_output_folder)
+        filepath_03 = save_to_folder(df_03, os.path.join(individual_output_folder, "CC Ready"), list_name)
+        run.lap("Step 03 - CC Ready")
+
+        df_04 = step_04_process_phones(pd.read_excel(filepath_03))
+        filepath_04 = save_to_folder(df_04, os.path.join(individual_output_folder, "SC Ready"), list_name)
+        run.lap("Step 04 - SC Ready")
+
+        df_05 = step_05_reshape(pd.read_excel(filepath_04))
+        filepath_05 = save_to_folder(df_05, os.path.join(individual_output_folder, "GHL Ready"), list_name)
+        run.lap("Step 05 - GHL Ready")
+
+        # Post-processing tweaks - pass has_type3_max to preserve temporary Type columns
+        # remove_phone6_from_cc_ready(filepath_03)
+        # remove_type_columns_from_cc_ready(filepath_03, has_type3_max)
+        remove_phone6_and_type_columns_from_cc_ready(filepath_03)
+
+        # Reorder No Hit file if it exists
+        reorder_nohit_file(os.path.join(individual_output_folder, "No Hit", f"{list_name}.xlsx"))
+
+        # Clean up temporary columns from Step01 and No Hit files if needed
+        if has_type3_max:
+            cleanup_step01_temporary_columns(filepath_01)
+            no_hit_path = os.path.join(individual_output_folder, "No Hit", f"{list_name}.xlsx")
+            cleanup_nohit_temporary_columns(no_hit_path)
+        run.lap("Post-processing")
+
+        # Tracker
+        no_hit_path = os.path.join(individual_output_folder, "No Hit", f"{list_name}.xlsx")
 
-    # Post-processing tweaks - pass has_type3_max to preserve temporary Type columns
-    # remove_phone6_from_cc_ready(filepath_03)
-    # remove_type_columns_from_cc_ready(filepath_03, has_type3_max)
-    remove_phone6_and_type_columns_from_cc_ready(filepath_03)
+        tracker_data = {
+            "SkipTraced": filepath_01,
+            "2BSkip": filepath_02,
+            "CC Ready": filepath_03,
+            "SC Ready": filepath_04,
+            "GHL Ready": filepath_05,
+            "No Hit File": no_hit_path
+        }
 
-    # Reorder No Hit file if it exists
-    reorder_nohit_file(os.path.join(individual_output_folder, "No Hit", f"{list_name}.xlsx"))
+        tracker_lines = []
+        for label, path in tracker_data.items():
+            try:
+                if os.path.exists(path):
+                    df_tmp = pd.read_excel(path)
+                    count = df_tmp["List"].notna().sum() if "List" in df_tmp.columns else len(df_tmp)
+                else:
+                    count = 0  # If file missing → 0
+                tracker_lines.append(f"{label}: {count}")
+                run.count(label, count)
+                run.output(label, path)
+            except Exception as e:
+                tracker_lines.append(f"{label}: Error reading file - {str(e)}")
 
-    # Clean up temporary columns from Step01 and No Hit files if needed
-    if has_type3_max:
-        cleanup_step01_temporary_columns(filepath_01)
-        no_hit_path = os.path.join(individual_output_folder, "No Hit", f"{list_name}.xlsx")
-        cleanup_nohit_temporary_columns(no_hit_path)
-
-    # Tracker
-    no_hit_path = os.path.join(individual_output_folder, "No Hit", f"{list_name}.xlsx")
-
-    tracker_data = {
-        "SkipTraced": filepath_01,
-        "2BSkip": filepath_02,
-        "CC Ready": filepath_03,
-        "SC Ready": filepath_04,
-        "GHL Ready": filepath_05,
-        "No Hit File": no_hit_path
-    }
-
-    tracker_lines = []
-    for label, path in tracker_data.items():
-        try:
-            if os.path.exists(path):
-                df_tmp = pd.read_excel(path)
-                count = df_tmp["List"].notna().sum() if "List" in df_tmp.columns else len(df_tmp)
-            else:
-                count = 0  # If file missing → 0
-            tracker_lines.append(f"{label}: {count}")
-        except Exception as e:
-            tracker_lines.append(f"{label}: Error reading file - {str(e)}")
+        tracker_path = os.path.join(individual_output_folder, "List Building Records.txt")
+        with open(tracker_path, "w") as f:
+            f.write("\n".join(tracker_lines))
 
-    tracker_path = os.path.join(individual_output_folder, "List Building Records.txt")
-    with open(tracker_path, "w") as f:
-        f.write("\n".join(tracker_lines))
 
+        print("📋 Tracker saved at:", tracker_path)
+        run.lap("Tracker")
 
-    print("📋 Tracker saved at:", tracker_path)
 
 
 
 
+        # If keep_outputs specified, remove any outputs NOT listed
+        if keep_outputs is not None:
+            # map "No Hit File" label to how user likely sees "No Hit" checkbox
+            allowed_labels = set(keep_outputs)
+            # Accept both "No Hit" and "No Hit File" synonyms
+            if "No Hit" in allowed_labels:
+                allowed_labels.add("No Hit File")
+            if "No Hit File" in allowed_labels:
+                allowed_labels.add("No Hit")
 
-    # If keep_outputs specified, remove any outputs NOT listed
-    if keep_outputs is not None:
-        # map "No Hit File" label to how user likely sees "No Hit" checkbox
-        allowed_labels = set(keep_outputs)
-        # Accept both "No Hit" and "No Hit File" synonyms
-        if "No Hit" in allowed_labels:
-            allowed_labels.add("No Hit File")
-        if "No Hit File" in allowed_labels:
-            allowed_labels.add("No Hit")
+            for label, path in tracker_data.items():
+                if label not in allowed_labels:
+                    try:
+                        if os.path.exists(path):
+                            os.remove(path)
+                            print(f"🗑️ Deleted {label} at {path} (user requested not to keep).")
+                    except Exception as e:
+                        print(f"⚠️ Failed to delete {path}: {e}")
 
-        for label, path in tracker_data.items():
-            if label not in allowed_labels:
+            # Additionally, try to clean empty subfolders (best-effort)
+            for folder in subfolders:
+                folder_path = os.path.join(individual_output_folder, folder)
                 try:
-                    if os.path.exists(path):
-                        os.remove(path)
-                        print(f"🗑️ Deleted {label} at {path} (user requested not to keep).")
-                except Exception as e:
-                    print(f"⚠️ Failed to delete {path}: {e}")
-
-        # Additionally, try to clean empty subfolders (best-effort)
-        for folder in subfolders:
-            folder_path = os.path.join(individual_output_folder, folder)
-            try:
-                if os.path.isdir(folder_path) and not os.listdir(folder_path):
-                    os.rmdir(folder_path)
-            except Exception:
-                pass
+                    if os.path.isdir(folder_path) and not os.listdir(folder_path):
+                        os.rmdir(folder_path)
+                except Exception:
+                    pass
 
 
 
-    # //Funciton of Replacements of SkipTraced Files 
+        # //Funciton of Replacements of SkipTraced Files 
 
 
-        # Replace SkipTraced with external version if available
-    external_skiptraced_folder = os.path.join(output_folder, "SkipTraced")
-    replace_skiptraced_file(list_name, individual_output_folder, external_skiptraced_folder)
+            # Replace SkipTraced with external version if available
+        external_skiptraced_folder = os.path.join(output_folder, "SkipTraced")
+        replace_skiptraced_file(list_name, individual_output_folder, external_skiptraced_folder)
 
 
 
@@ -714,20 +750,22 @@ def run_pipeline(input_path, list_name, output_folder, keep_outputs=None):
     
 
 
-    return [filepath_01, filepath_02, filepath_03, filepath_04, filepath_05, no_hit_path]
+        return [filepath_01, filepath_02, filepath_03, filepath_04, filepath_05, no_hit_path]
 
 # -------------------------------
 # PROCESS DIRECTORY
 # -------------------------------
-def process_directory(input_folder):
+def process_directory(input_folder, address_index=False):
     output_folder = os.path.join(input_folder, "Processed")
     ensure_folder(output_folder)
 
-    for filename in os.listdir(input_folder):
-        if filename.lower().endswith(('.csv', '.xlsx')):
+    filenames = [f for f in os.listdir(input_folder) if f.lower().endswith(('.csv', '.xlsx'))]
+    with using_address_index(address_index):
+        for i, filename in enumerate(filenames, 1):
             input_path = os.path.join(input_folder, filename)
             list_name = os.path.splitext(filename)[0]
             print(f"⚡ Processing {filename} ...")
+            report(list_name=list_name, item=i, items=len(filenames))
             try:
                 run_pipeline(input_path, list_name, input_folder)  # Pass input_folder as output_folder
             except Exception as e:
@@ -1,10 +1,14 @@
-import ttkbootstrap as tb
-from main.main03 import FurtherExtendedApp   # Use the further extended app
-
-def run_app():
-    root = tb.Window(themename="cosmo")
-    app = FurtherExtendedApp(root)
-    root.mainloop()
-
-if __name__ == "__main__":
+import multiprocessing
+
+def run_app():
+    # Imported here: job worker processes re-import this module and need no GUI
+    import ttkbootstrap as tb
+    from main.main03 import FurtherExtendedApp   # Use the further extended app
+
+    root = tb.Window(themename="cosmo")
+    app = FurtherExtendedApp(root)
+    root.mainloop()
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()  # job workers in a frozen (PyInstaller) build
     run_app()
\ No newline at end of file
@@ -0,0 +1,6 @@
+# tests/conftest.py
+# The app runs from the repository root (python run.py / python -m cli), so do the tests.
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
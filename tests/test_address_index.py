@@ -0,0 +1,185 @@
+# tests/test_address_index.py
+# AddressIndex: lookups, same-day re-runs, eviction by age, the save-time merge, and
+# recording a list's addresses only when its run finishes.
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import address_index
+from utils.address_index import (AddressIndex, recording_list, split_previously_processed,
+                                  using_address_index)
+from utils.dedupe import address_hashes, normalize_addresses
+
+
+def hashes(*addresses):
+    return address_hashes(normalize_addresses(pd.Series(addresses, dtype=object)))
+
+
+def record(index, list_name, *addresses):
+    index.record(hashes(*addresses), list_name)
+    index.commit(list_name)
+
+
+@pytest.fixture
+def path(tmp_path):
+    return os.path.join(tmp_path, "addresses.npz")
+
+
+@pytest.fixture
+def day(monkeypatch):
+    """Set the day later indexes are opened on (days since EPOCH)."""
+    today = [2000]
+    monkeypatch.setattr(address_index, "_today", lambda: today[0])
+
+    def set_day(value):
+        today[0] = value
+    return set_day
+
+
+def test_lookup_and_record(path, day):
+    index = AddressIndex(path)
+    seen, lists, days = index.lookup(hashes("1 Main St"), "A")
+    assert seen.tolist() == [False] and lists.tolist() == [-1] and days.tolist() == [-1]
+
+    record(index, "A", "1 Main St", "2 Oak Ave")
+    seen, lists, days = index.lookup(hashes("1  MAIN st ", "3 Elm Rd", "2 oak ave"), "B")
+    assert seen.tolist() == [True, False, True]
+    assert [index.list_name(code) for code in lists] == ["A", "", "A"]
+    assert days.tolist() == [2000, -1, 2000]
+    assert len(index) == 2
+
+
+def test_staged_addresses_need_a_commit(path, day):
+    index = AddressIndex(path)
+    index.record(hashes("1 Main St"), "A")
+    assert not index.lookup(hashes("1 Main St"), "B")[0].any()
+    index.discard("A")
+    index.commit("A")
+    assert len(index) == 0
+    index.save()
+    assert not os.path.exists(path)
+
+
+def test_same_day_rerun_is_not_a_repeat(path, day):
+    index = AddressIndex(path)
+    record(index, "A", "1 Main St")
+    assert index.lookup(hashes("1 Main St"), "A")[0].tolist() == [False]
+    index.save()
+
+    day(2001)
+    later = AddressIndex(path)
+    assert later.lookup(hashes("1 Main St"), "A")[0].tolist() == [True]
+    assert later.lookup(hashes("1 Main St"), "B")[0].tolist() == [True]
+
+
+def test_eviction_by_age(path, day):
+    index = AddressIndex(path, max_age_days=30)
+    record(index, "A", "1 Main St", "2 Oak Ave")
+    index.save()
+
+    day(2020)
+    index = AddressIndex(path, max_age_days=30)
+    record(index, "B", "2 Oak Ave")
+    index.save()
+
+    day(2040)  # 1 Main St is 40 days old, 2 Oak Ave 20
+    index = AddressIndex(path, max_age_days=30)
+    assert index.lookup(hashes("1 Main St", "2 Oak Ave"), "C")[0].tolist() == [False, True]
+    record(index, "C", "3 Elm Rd")
+    index.save()
+    assert len(AddressIndex(path)) == 2  # 1 Main St evicted on save
+
+
+def test_save_merges_with_a_file_changed_on_disk(path, day):
+    first, second = AddressIndex(path), AddressIndex(path)
+    record(first, "A", "1 Main St", "2 Oak Ave")
+    first.save()
+    record(second, "B", "2 Oak Ave", "3 Elm Rd")
+    second.save()
+
+    merged = AddressIndex(path)
+    assert len(merged) == 3
+    seen, lists, _ = merged.lookup(hashes("1 Main St", "2 Oak Ave", "3 Elm Rd"), "C")
+    assert seen.all()
+    # Same day: the run saving last wins a shared address
+    assert [merged.list_name(code) for code in lists] == ["A", "B", "B"]
+    assert sorted(merged.names) == ["A", "B"]
+
+
+def test_newer_entry_on_disk_wins(path, day):
+    index = AddressIndex(path)
+    record(index, "A", "1 Main St")
+    index.save()
+    stale = AddressIndex(path)  # opened on day 2000
+
+    day(2005)
+    newer = AddressIndex(path)
+    record(newer, "B", "1 Main St")
+    newer.save()
+
+    record(stale, "C", "1 Main St")
+    stale.save()
+    merged = AddressIndex(path)
+    assert merged.days.tolist() == [2005]
+    assert merged.list_name(int(merged.lists[0])) == "B"
+
+
+def test_unreadable_file_starts_a_new_index(path, day):
+    with open(path, "wb") as f:
+        f.write(b"not an npz")
+    assert len(AddressIndex(path)) == 0
+
+
+# ---------------------------------------
+# One list's run
+# ---------------------------------------
+def frame(*addresses):
+    return pd.DataFrame({"Property Address": list(addresses), "Owner": ["x"] * len(addresses)})
+
+
+def test_split_records_only_when_the_list_finishes(path, day):
+    with using_address_index(True, path=path):
+        with recording_list("A"):
+            kept, previous = split_previously_processed(frame("1 Main St", "2 Oak Ave", ""), "A")
+            assert (len(kept), len(previous)) == (3, 0)
+        with recording_list("B"):
+            kept, previous = split_previously_processed(frame("1 main st", "9 Pine Ct"), "B")
+    assert kept["Property Address"].tolist() == ["9 Pine Ct"]
+    assert previous["Previously Processed In"].tolist() == ["A"]
+    assert previous["Last Processed"].tolist() == [(address_index.EPOCH + pd.Timedelta(days=2000)).isoformat()]
+    assert len(AddressIndex(path)) == 3
+
+
+def test_failed_list_records_nothing(path, day):
+    with using_address_index(True, path=path):
+        with pytest.raises(OSError):
+            with recording_list("A"):
+                split_previously_processed(frame("1 Main St"), "A")
+                raise OSError("disk full while writing CC Ready")
+        with recording_list("B"):
+            kept, previous = split_previously_processed(frame("1 Main St", "2 Oak Ave"), "B")
+        assert (len(kept), len(previous)) == (2, 0)
+    index = AddressIndex(path)
+    assert [index.list_name(code) for code in index.lookup(hashes("1 Main St"), "C")[1]] == ["B"]
+
+
+def test_failed_run_keeps_earlier_lists(path, day):
+    with pytest.raises(RuntimeError):
+        with using_address_index(True, path=path):
+            with recording_list("A"):
+                split_previously_processed(frame("1 Main St"), "A")
+            with recording_list("B"):
+                split_previously_processed(frame("2 Oak Ave"), "B")
+                raise RuntimeError("cancelled")
+    index = AddressIndex(path)
+    assert index.lookup(hashes("1 Main St", "2 Oak Ave"), "C")[0].tolist() == [True, False]
+
+
+def test_without_an_index_nothing_changes():
+    df = frame("1 Main St", "1 Main St")
+    with recording_list("A"):
+        kept, previous = split_previously_processed(df, "A")
+    assert kept is df and previous.empty
+    assert np.asarray(previous.columns == df.columns).all()
@@ -0,0 +1,76 @@
+# tests/test_combinations_solver.py
+# Files Combinations solvers: exact fills, group reuse, oversized fallback and the remainder.
+import itertools
+import random
+
+import numpy as np
+import pytest
+
+from utils.combinations.solver import (DP_MAX_CAPACITY, SOLVERS, _subset_sum, plan_combinations,
+                                       solve_exact)
+
+
+def subset_totals(sizes):
+    """Every total some subset of sizes adds up to."""
+    totals = {0}
+    for size in sizes:
+        totals |= {t + size for t in totals}
+    return totals
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_subset_sum_against_brute_force(seed):
+    rng = random.Random(seed)
+    values = rng.sample(range(1, 30), rng.randint(1, 5))
+    counts = [rng.randint(1, 4) for _ in values]
+    capacity = rng.randint(0, 120)
+    taken, best = _subset_sum(values, counts, capacity)
+
+    items = [v for v, c in zip(values, counts) for _ in range(c)]
+    assert best == max(t for t in subset_totals(items) if t <= capacity)
+    assert sum(v * k for v, k in taken.items()) == best
+    assert all(0 < k <= counts[values.index(v)] for v, k in taken.items())
+
+
+@pytest.mark.parametrize("seed", range(100))
+def test_exact_fill_within_the_dp_bound(seed):
+    rng = random.Random(seed)
+    sizes = np.array([rng.randint(1, 40) for _ in range(rng.randint(1, 10))], dtype=np.int64)
+    requested = rng.randint(1, int(sizes.sum()) + 5)
+    [ids] = solve_exact(sizes, [requested])
+    reachable = max(t for t in subset_totals(sizes.tolist()) if t <= requested)
+    if reachable:
+        assert sizes[ids].sum() == reachable
+    else:
+        assert len(ids) == 1 and sizes[ids[0]] > requested
+
+
+def test_smallest_oversized_group_when_nothing_fits():
+    sizes = np.array([500, 300, 900], dtype=np.int64)
+    assert solve_exact(sizes, [200])[0].tolist() == [1]
+    assert SOLVERS["Greedy (largest first)"](sizes, [200])[0].tolist() == [2]
+
+
+def test_best_fit_above_the_dp_bound_is_not_exact():
+    # Documented limit: the pre-fill commits to 350k; a larger DP bound finds 300k + 300k
+    sizes = np.array([350_000, 300_000, 300_000], dtype=np.int64)
+    assert solve_exact(sizes, [600_000])[0].tolist() == [0]
+    assert sorted(solve_exact(sizes, [600_000], dp_max_capacity=600_000)[0].tolist()) == [1, 2]
+    assert DP_MAX_CAPACITY < 600_000
+
+
+@pytest.mark.parametrize("seed", range(50))
+@pytest.mark.parametrize("solver", list(SOLVERS))
+def test_groups_are_used_once_and_the_rest_remains(solver, seed):
+    rng = random.Random(seed)
+    sizes = np.array([rng.choice([0, 1, 2, 5, 40, 300, 4000, 120_000]) for _ in range(rng.randint(0, 60))],
+                     dtype=np.int64)
+    requests = [(f"C{i}", rng.choice([1, 10, 500, 5000, 300_000])) for i in range(rng.randint(1, 6))]
+    plan, remaining = plan_combinations(sizes, requests, solver)
+
+    assert [(name, requested) for name, requested, _ in plan] == requests[:len(plan)]
+    picked = list(itertools.chain.from_iterable(ids.tolist() for _, _, ids in plan))
+    assert len(picked) == len(set(picked))
+    assert sorted(picked + remaining.tolist()) == list(range(len(sizes)))
+    if len(plan) < len(requests):  # stopped early: every group was used
+        assert len(remaining) == 0
@@ -0,0 +1,76 @@
+# tests/test_composite_key_index.py
+# CompositeKeyIndex: which master row wins a repeated key, and the join's match counts.
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.gen_coloumns_adder import DUPLICATE_POLICIES, CompositeKeyIndex
+
+KEYS = ["First", "Last"]
+
+
+def master(rows):
+    return pd.DataFrame(rows, columns=["First", "Last", "Phone"])
+
+
+def join(index, rows):
+    return index.join(pd.DataFrame(rows, columns=KEYS), KEYS)
+
+
+@pytest.mark.parametrize("policy", DUPLICATE_POLICIES)
+def test_unique_keys_work_with_every_policy(policy):
+    index = CompositeKeyIndex(master([["Ann", "Lee", "1"], ["Bob", "Lee", "2"], ["Ann", "Kim", "3"]]),
+                              KEYS, ["Phone"], policy)
+    out, stats = join(index, [["Bob", "Lee"], ["Ann", "Kim"], ["Ann", "Lee"], ["Cy", "Lee"]])
+    assert out[:, 0].tolist() == ["2", "3", "1", ""]
+    assert stats == {"matched": 3, "missed": 1, "ambiguous": 0}
+
+
+@pytest.mark.parametrize("policy, phone", [("last", "3"), ("first", "1")])
+def test_repeated_key_winner(policy, phone):
+    index = CompositeKeyIndex(master([["Ann", "Lee", "1"], ["Bob", "Lee", "2"], ["Ann", "Lee", "3"]]),
+                              KEYS, ["Phone"], policy)
+    out, stats = join(index, [["Ann", "Lee"], ["Bob", "Lee"], ["Ann", "Lee"], ["Ann", "Le"]])
+    assert out[:, 0].tolist() == [phone, "2", phone, ""]
+    assert stats == {"matched": 3, "missed": 1, "ambiguous": 2}
+
+
+def test_error_policy_raises_on_repeated_keys():
+    rows = [["Ann", "Lee", "1"], ["Ann", "Lee", "2"], ["Bob", "Lee", "3"], ["Bob", "Lee", "4"], ["Bob", "Lee", "5"]]
+    with pytest.raises(ValueError, match="2 key"):
+        CompositeKeyIndex(master(rows), KEYS, ["Phone"], "error")
+
+
+def test_unknown_policy():
+    with pytest.raises(ValueError):
+        CompositeKeyIndex(master([["Ann", "Lee", "1"]]), KEYS, ["Phone"], "newest")
+
+
+def test_keys_compare_as_strings():
+    # 7 and "7" are one key; the key columns are not mixed up ("a","b" vs "b","a")
+    index = CompositeKeyIndex(master([[7, "b", "1"], ["b", 7, "2"]]), KEYS, ["Phone"], "error")
+    out, stats = join(index, [["7", "b"], ["b", "7"], ["7", "7"]])
+    assert out[:, 0].tolist() == ["1", "2", ""]
+    assert stats == {"matched": 2, "missed": 1, "ambiguous": 0}
+
+
+def test_non_default_master_index():
+    df = master([["Ann", "Lee", "1"], ["Ann", "Lee", "2"]])
+    df.index = [10, 5]
+    out, _ = join(CompositeKeyIndex(df, KEYS, ["Phone"], "first"), [["Ann", "Lee"]])
+    assert out[:, 0].tolist() == ["1"]
+
+
+def test_random_against_dict_lookup():
+    # 'last' keeps the old dict behaviour: {key: row} overwritten in master order
+    rng = np.random.default_rng(0)
+    names = ["Ann", "Bob", "Cy", "Di"]
+    rows = [[rng.choice(names), rng.choice(names), str(i)] for i in range(200)]
+    lookup = {(f, l): p for f, l, p in rows}
+    counts = pd.Series([(f, l) for f, l, _ in rows]).value_counts()
+    folder = [[rng.choice(names + ["Ed"]), rng.choice(names)] for _ in range(300)]
+    out, stats = join(CompositeKeyIndex(master(rows), KEYS, ["Phone"], "last"), folder)
+    assert out[:, 0].tolist() == [lookup.get((f, l), "") for f, l in folder]
+    matched = [(f, l) for f, l in folder if (f, l) in lookup]
+    assert stats == {"matched": len(matched), "missed": len(folder) - len(matched),
+                     "ambiguous": sum(counts[key] > 1 for key in matched)}
@@ -0,0 +1,181 @@
+# tests/test_dedupe.py
+# dedupe_keep_first() must keep exactly the rows, in the order, of the two-pass step_03 dedupe
+# it replaced, and report the same counts. The old code is frozen below.
+import importlib.util
+import os
+import random
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import dedupe
+from utils.dedupe import dedupe_keep_first, repeated_rows
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# ---------------------------------------
+# The old code
+# ---------------------------------------
+def normalize_address(addr):
+    if pd.isna(addr): return ""
+    addr = str(addr).strip().lower()
+    addr = re.sub(r"\s+", " ", addr)
+    return addr
+
+
+def old_dedupe(df, key_column=None, normalize=True):
+    """(rows, identical rows removed, repeated keys removed) as step_03 computed them."""
+    initial_count = len(df)
+    df = df.drop_duplicates()
+    after_dedupe = len(df)
+    if key_column is None:
+        return df, initial_count - after_dedupe, 0
+    if normalize:
+        df['normalized_address'] = df[key_column].apply(normalize_address)
+        df = df.drop_duplicates(subset=['normalized_address'])
+        df = df.drop(columns=['normalized_address'], errors='ignore')
+    else:
+        df = df.drop_duplicates(subset=[key_column])
+    return df, initial_count - after_dedupe, after_dedupe - len(df)
+
+
+def old_vacant_lot_step_03(df, list_name):
+    """The vacant-lot step_03 without its No Hit file (it needs a Parcel Id column)."""
+    phone_cols = [f'Phone{i}' for i in range(1,7) if f'Phone{i}' in df.columns]
+    mask_no_phones = df[phone_cols].isna().all(axis=1)
+    df = df[~mask_no_phones]
+    df = df.drop_duplicates()
+    df = df[df['Parcel Id'].notna() & (df['Parcel Id'].astype(str).str.strip() != "")]
+    df = df.drop_duplicates(subset=['Parcel Id'])
+    df['List'] = list_name
+    return df
+
+
+def vacant_lot_pipeline():
+    path = os.path.join(ROOT, "pipeline", "vacant_lot_pipeline", "6_phone_number_vacant_lot.py")
+    spec = importlib.util.spec_from_file_location("vacant_lot_phone_numbers", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# ---------------------------------------
+# Random frames
+# ---------------------------------------
+STREETS = ["12 Main St", "12 main st", " 12  MAIN st ", "12\tMain St", "4 Oak Ave", "4 oak ave ",
+           "ÉLM Rd 7", "élm rd 7", "", " "]
+MISSING = [None, np.nan]
+NUMBERS = [1, 1.0, "1", " 1", 2, 2.5]
+
+
+def random_frame(rng, rows, mixed):
+    """Rows drawn from small pools (so rows and addresses repeat), often copying an earlier row."""
+    addresses = STREETS + MISSING + (NUMBERS if mixed else [])
+    data = []
+    for _ in range(rows):
+        if data and rng.random() < 0.25:
+            data.append(list(rng.choice(data)))
+            continue
+        data.append([
+            rng.choice(addresses),
+            rng.choice(["Ann", "ann", "Bob", None]),
+            rng.choice(["555-0100", "555-0101", None, np.nan]),
+            rng.choice(["P-1", "P-2", "p-1", " P-1", "", " ", None, np.nan] + ([7, 7.0, "7"] if mixed else [])),
+        ])
+    columns = ["Property Address", "Owner", "Phone1", "Parcel Id"]
+    # Text-only frames get pandas' own dtypes (as read from a CSV); mixed ones stay object
+    df = pd.DataFrame(data, columns=columns, dtype=object if mixed else None)
+    index = list(range(rows))
+    rng.shuffle(index)
+    df.index = [i * 3 for i in index]
+    return df
+
+
+def check(df, key_column=None, normalize=True):
+    want, want_identical, want_repeated = old_dedupe(df.copy(), key_column, normalize)
+    got, identical, repeated = dedupe_keep_first(df, key_column, normalize=normalize, count_rows=True)
+    pd.testing.assert_frame_equal(got, want)
+    assert (identical, repeated) == (want_identical, want_repeated)
+    # Without count_rows: the same rows; a skipped row count leaves one total
+    got, identical, repeated = dedupe_keep_first(df, key_column, normalize=normalize)
+    pd.testing.assert_frame_equal(got, want)
+    if identical is None:
+        assert repeated == want_identical + want_repeated
+    else:
+        assert (identical, repeated) == (want_identical, want_repeated)
+
+
+# ---------------------------------------
+# Tests
+# ---------------------------------------
+@pytest.mark.parametrize("seed", range(100))
+@pytest.mark.parametrize("mixed", [False, True])
+def test_random_frames_match_the_old_dedupe(seed, mixed):
+    rng = random.Random(seed)
+    df = random_frame(rng, rng.choice([0, 1, 2, 5, 40, 200]), mixed)
+    check(df, "Property Address")
+    check(df, "Parcel Id", normalize=False)
+    check(df)
+
+
+def test_numbers_in_the_address_column():
+    # 1.0 and 1 are one value to drop_duplicates but normalize to "1.0" and "1"
+    df = pd.DataFrame({"Property Address": [1.0, 1, "1", " 1"], "Owner": ["a"] * 4}, dtype=object)
+    check(df, "Property Address")
+    got, identical, repeated = dedupe_keep_first(df, "Property Address", count_rows=True)
+    assert got.index.tolist() == [0, 2]
+    assert (identical, repeated) == (1, 1)
+
+
+def test_missing_addresses_are_one_address():
+    df = pd.DataFrame({"Property Address": [None, np.nan, "", " "], "Owner": ["a", "b", "c", "d"]})
+    check(df, "Property Address")
+    assert dedupe_keep_first(df, "Property Address")[0].index.tolist() == [0]
+
+
+def test_rows_identical_except_for_missing_cells():
+    df = pd.DataFrame({"Property Address": ["1 A St", "1 A St", "1 a st"],
+                       "Owner": [None, np.nan, None]}, dtype=object)
+    check(df, "Property Address")
+    check(df)
+
+
+def test_repeated_rows_matches_duplicated():
+    rng = random.Random(7)
+    for mixed in (False, True):
+        df = random_frame(rng, 300, mixed)
+        assert repeated_rows(df).tolist() == df.duplicated().tolist()
+        for column in df.columns:
+            # One column: None and NaN are different values to pandas
+            assert repeated_rows(df[[column]]).tolist() == df[[column]].duplicated().tolist()
+
+
+def test_hash_collisions_fall_back_to_pandas(monkeypatch):
+    # Every row hashes the same: the column codes must catch it
+    monkeypatch.setattr(dedupe, "_mix", lambda h: h * np.uint64(0))
+    rng = random.Random(3)
+    for mixed in (False, True):
+        df = random_frame(rng, 100, mixed)
+        assert repeated_rows(df).tolist() == df.duplicated().tolist()
+        check(df, "Property Address")
+        check(df)
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_vacant_lot_parcel_id_branch(seed):
+    step_03 = vacant_lot_pipeline().step_03_dedupe_and_cleanup
+    rng = random.Random(seed)
+    df = random_frame(rng, rng.choice([1, 5, 40, 200]), mixed=seed % 2 == 1)
+    pd.testing.assert_frame_equal(step_03(df.copy(), "List A"), old_vacant_lot_step_03(df.copy(), "List A"))
+
+
+def test_vacant_lot_without_parcel_id_drops_identical_rows():
+    # The old step raised KeyError here
+    step_03 = vacant_lot_pipeline().step_03_dedupe_and_cleanup
+    df = random_frame(random.Random(11), 100, mixed=False).drop(columns=["Parcel Id"])
+    want = df[df["Phone1"].notna()].drop_duplicates()
+    want["List"] = "List A"
+    pd.testing.assert_frame_equal(step_03(df, "List A"), want)
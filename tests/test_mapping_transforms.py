@@ -0,0 +1,117 @@
+# tests/test_mapping_transforms.py
+# transform_series(s, name) must give exactly what s.apply(TRANSFORMATION_OPTIONS[name]) gives.
+import math
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.mapping_core import TRANSFORMATION_OPTIONS, VECTORIZED_TRANSFORMS, transform_series
+
+# Every per-cell transform ("Extract Email" works on the whole frame, not on a column;
+# "None" leaves the column as it is, see test_none_returns_the_column)
+CELL_TRANSFORMS = [name for name in TRANSFORMATION_OPTIONS if name not in ("None", "Extract Email")]
+
+
+def assert_same(actual, expected):
+    """Same index, name, dtype and cells; a cell matches only a cell of the same type."""
+    assert actual.index.equals(expected.index)
+    assert actual.name == expected.name
+    assert actual.dtype == expected.dtype
+    for got, want in zip(actual.tolist(), expected.tolist()):
+        if got is want:
+            continue
+        assert type(got) is type(want), (got, want)
+        if isinstance(want, float) and math.isnan(want):
+            assert math.isnan(got)
+        else:
+            assert got == want, (got, want)
+
+
+def check(series, name):
+    assert_same(transform_series(series, name), series.apply(TRANSFORMATION_OPTIONS[name]))
+
+
+def test_every_vectorized_transform_is_a_cell_transform():
+    assert set(VECTORIZED_TRANSFORMS) <= set(CELL_TRANSFORMS)
+
+
+def test_none_returns_the_column():
+    # apply(lambda x: x) would re-infer the dtype; "None" must not touch the column at all
+    s = pd.Series([" a ", None, 1], dtype=object)
+    assert transform_series(s, "None") is s
+
+
+@pytest.mark.parametrize("name", CELL_TRANSFORMS)
+def test_missing_values_pass_through(name):
+    check(pd.Series(["  main st ", None, np.nan, "", "oak  AVE"], dtype=object, name="Address"), name)
+    check(pd.Series([None, np.nan], dtype=object), name)
+    check(pd.Series([], dtype=object), name)
+
+
+@pytest.mark.parametrize("name", CELL_TRANSFORMS)
+def test_whitespace_and_case(name):
+    values = ["  john   SMITH ", "john smith", "JOHN\tSMITH", "mary-ann o'neil", "x", " ", "a\n b",
+              "MAC donald  jr.", "123 main st  apt 4"]
+    check(pd.Series(values * 3, dtype=object, name="Owner"), name)
+
+
+@pytest.mark.parametrize("name", CELL_TRANSFORMS)
+def test_pascal_case_collapses_whitespace(name):
+    s = pd.Series(["  new   york  ", "los\t\tangeles", "san  francisco "], dtype=object)
+    check(s, name)
+    if name == "Pascal Case":
+        assert transform_series(s, name).tolist() == ["New York", "Los Angeles", "San Francisco"]
+
+
+@pytest.mark.parametrize("name", CELL_TRANSFORMS)
+def test_mixed_type_object_columns(name):
+    # Numbers and strings together take the per-cell path
+    check(pd.Series(["12 main st", 12, 12.5, None, True, " 12 Main St ", np.nan, 1.0, "1"], dtype=object), name)
+    check(pd.Series([pd.Timestamp("2024-01-02"), "jan 2", None], dtype=object), name)
+
+
+@pytest.mark.parametrize("name", CELL_TRANSFORMS)
+def test_numeric_columns(name):
+    check(pd.Series([1, 2, 2, 30000], name="Zip"), name)
+    check(pd.Series([1.5, np.nan, 2.0]), name)
+    check(pd.Series([10, 20, None], dtype=object), name)
+    check(pd.Series([True, False]), name)
+
+
+@pytest.mark.parametrize("name", CELL_TRANSFORMS)
+def test_unicode(name):
+    values = ["ÉCOLE  rue", "straße", "ǆemal", "İstanbul", "  日本 東京 ", "ﬁne", "o'BRIEN", "ÀÉÎ õü"]
+    check(pd.Series(values, dtype=object), name)
+
+
+@pytest.mark.parametrize("name", CELL_TRANSFORMS)
+def test_string_dtype_columns(name):
+    check(pd.Series(["  a  b ", None, "C d"], dtype="string"), name)
+
+
+@pytest.mark.parametrize("name", CELL_TRANSFORMS)
+def test_keeps_the_index(name):
+    check(pd.Series(["b  x", None, "a"], index=[7, 3, 5], dtype=object, name="Col"), name)
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("name", CELL_TRANSFORMS)
+def test_random_columns(name, seed):
+    rng = random.Random(seed)
+    words = ["main", "ST", "Oak", "ave", "ÉLM", "straße", "", "12", "o'neil", "Mc"]
+    gaps = [" ", "  ", "\t", " \n"]
+
+    def text():
+        parts = [rng.choice(words) for _ in range(rng.randint(1, 4))]
+        cell = "".join(part + rng.choice(gaps) for part in parts)
+        return rng.choice(["", " ", "  "]) + cell[:-1] + rng.choice(["", " "])
+
+    pool = [text() for _ in range(15)]
+    strings_only = [rng.choice(pool) for _ in range(60)]
+    check(pd.Series(strings_only, dtype=object), name)
+    with_missing = [rng.choice(pool + [None, np.nan]) for _ in range(60)]
+    check(pd.Series(with_missing, dtype=object), name)
+    mixed = [rng.choice(pool + [None, np.nan, 1, 1.0, 7, 2.5]) for _ in range(60)]
+    check(pd.Series(mixed, dtype=object), name)
@@ -0,0 +1,79 @@
+# tests/test_master_cache.py
+# MasterCache.load() must give what load_file() gives for the same columns, cold and warm.
+import os
+
+import pandas as pd
+import pytest
+
+from utils.gen_coloumns_adder import load_file
+from utils.master_cache import MasterCache
+
+
+def write(tmp_path, name, df):
+    path = os.path.join(tmp_path, name)
+    if name.endswith(".csv"):
+        df.to_csv(path, index=False)
+    else:
+        df.to_excel(path, index=False)
+    return path
+
+
+def check(tmp_path, path, columns):
+    cache = MasterCache(root=os.path.join(tmp_path, "cache"))
+    want = load_file(path)
+    want.columns = want.columns.astype(str)
+    want = want[[c for c in want.columns if c in set(columns)]].astype(object)
+    pd.testing.assert_frame_equal(cache.load(path, columns=columns)[0], want)
+    df, hit = cache.load(path, columns=columns)
+    assert hit
+    pd.testing.assert_frame_equal(df, want)
+    return df
+
+
+@pytest.mark.parametrize("name", ["master.xlsx", "master.csv"])
+def test_numeric_and_date_headers(tmp_path, name):
+    df = pd.DataFrame({2024: ["a", "b"], "K": ["1", "2"], pd.Timestamp("2024-01-01"): ["x", "y"], 7.5: ["p", "q"]})
+    path = write(tmp_path, name, df)
+    header = MasterCache(root=os.path.join(tmp_path, "cache")).header(path)
+    assert header[:2] == ["2024", "K"]
+    got = check(tmp_path, path, ["2024", "K", header[2], header[3]])
+    assert got["2024"].tolist() == ["a", "b"]
+    check(tmp_path, path, ["2024"])
+
+
+@pytest.mark.parametrize("name", ["master.xlsx", "master.csv"])
+def test_duplicate_headers(tmp_path, name):
+    df = pd.DataFrame([["1", "2", "3"], ["4", "5", "6"]], columns=["K", "K", "L"])
+    path = write(tmp_path, name, df)
+    got = check(tmp_path, path, ["K.1", "L"])
+    assert got["K.1"].tolist() == ["2", "5"]
+
+
+def test_columns_added_to_a_cached_master(tmp_path):
+    path = write(tmp_path, "master.xlsx", pd.DataFrame({"A": ["1", "2"], 10: ["x", None], "C": ["p", "q"]}))
+    cache = MasterCache(root=os.path.join(tmp_path, "cache"))
+    assert cache.load(path, columns=["C"])[1] is False
+    df, hit = cache.load(path, columns=["10", "C"])
+    assert hit is False
+    assert df.to_dict("list") == {"10": ["x", ""], "C": ["p", "q"]}
+    assert cache.load(path, columns=["C", "10"])[1] is True
+
+
+def test_cell_text_round_trips(tmp_path):
+    values = ["", " ", "é ü 日本", "a\x00b", "\x00", "line\nbreak", "tab\tx", "'quoted'", "12345"]
+    path = write(tmp_path, "master.csv", pd.DataFrame({"V": values, "W": ["x"] * len(values)}))
+    got = check(tmp_path, path, ["V", "W"])
+    assert got["V"].tolist() == load_file(path)["V"].tolist()
+
+
+def test_empty_columns_and_no_rows(tmp_path):
+    path = write(tmp_path, "master.csv", pd.DataFrame({"A": ["", ""], "B": ["1", "2"]}))
+    assert check(tmp_path, path, ["A"])["A"].tolist() == ["", ""]
+    path = write(tmp_path, "empty.csv", pd.DataFrame({"A": [], "B": []}))
+    assert len(check(tmp_path, path, ["A", "B"])) == 0
+
+
+def test_no_requested_column_in_the_file(tmp_path):
+    path = write(tmp_path, "master.csv", pd.DataFrame({"A": ["1"]}))
+    df, hit = MasterCache(root=os.path.join(tmp_path, "cache")).load(path, columns=["Z"])
+    assert (list(df.columns), len(df), hit) == ([], 0, False)
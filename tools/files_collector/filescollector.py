@@ -1,52 +1,28 @@
 import os
-import shutil
 import tkinter as tk
 from tkinter import messagebox
 
-def collect_files_from_folders(base_path, target_folder_name):
+from utils.collector_engine import collect_folder_files, DEFAULT_WORKERS
+
+def collect_files_from_folders(base_path, target_folder_name, link_mode=None, workers=DEFAULT_WORKERS):
     """
     Recursively search for folders with the specified name and collect all files from them.
     
     Args:
         base_path (str): The root directory to start searching from
         target_folder_name (str): The name of the folder to search for and collect files from
+        link_mode (str): None to copy, or "hardlink"/"reflink" when on the same filesystem
+        workers (int): Number of parallel copy threads
         
     Returns:
         tuple: (success_count, total_files_copied, target_folder_path)
     """
-    target_folder = os.path.join(base_path, target_folder_name)
-    
-    # Make target folder if not exists
-    os.makedirs(target_folder, exist_ok=True)
-    
-    success_count = 0
-    total_files_copied = 0
-    
-    for root, dirs, files in os.walk(base_path):
-        # If folder name matches our target (case insensitive)
-        if os.path.basename(root).lower() == target_folder_name.lower():
-            for file in files:
-                source_file = os.path.join(root, file)
-                dest_file = os.path.join(target_folder, file)
-                
-                # If duplicate file name exists, rename by adding suffix
-                if os.path.exists(dest_file):
-                    base, ext = os.path.splitext(file)
-                    i = 1
-                    while os.path.exists(os.path.join(target_folder, f"{base}_{i}{ext}")):
-                        i += 1
-                    dest_file = os.path.join(target_folder, f"{base}_{i}{ext}")
-                
-                try:
-                    shutil.copy2(source_file, dest_file)
-                    total_files_copied += 1
-                except Exception as e:
-                    print(f"❌ Failed to copy {source_file}: {e}")
-                    continue
-            
-            success_count += 1
+    result = collect_folder_files(base_path, target_folder_name, case_insensitive=True,
+                                  workers=workers, link_mode=link_mode)
+    for source_file, error in result["errors"]:
+        print(f"❌ Failed to copy {source_file}: {error}")
     
-    return success_count, total_files_copied, target_folder
+    return result["folders"], result["copied"] + result["linked"], result["target"]
 
 def run_files_collector_ui(parent, base_path, folder_name):
     """
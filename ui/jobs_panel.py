@@ -0,0 +1,97 @@
+import os
+import tkinter as tk
+from tkinter import ttk
+import ttkbootstrap as tb
+
+STATUS_TEXT = {
+    "queued": "⏳ Queued",
+    "running": "⚙️ Running",
+    "done": "✅ Done",
+    "failed": "❌ Failed",
+    "cancelled": "⛔ Cancelled",
+}
+
+
+def _format_seconds(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    return f"{minutes}:{seconds:02d}"
+
+
+class JobsPanel:
+    """Window over a JobExecutor: every job with its status, progress (%, rows/s) and time; cancel, max parallel jobs."""
+
+    REFRESH_MS = 500
+
+    def __init__(self, root, executor):
+        self.executor = executor
+        self.win = tb.Toplevel(root)
+        self.win.title("Jobs")
+        self.win.geometry("940x380")
+
+        top = tb.Frame(self.win)
+        top.pack(fill="x", padx=10, pady=(10, 4))
+        tb.Label(top, text="Max parallel jobs:", font=("Segoe UI", 10)).pack(side="left")
+        self.max_var = tk.IntVar(value=executor.max_running)
+        tb.Spinbox(top, from_=1, to=max(1, os.cpu_count() or 1), textvariable=self.max_var, width=4,
+                   command=self.apply_max_running).pack(side="left", padx=6)
+        self.summary_var = tk.StringVar()
+        tb.Label(top, textvariable=self.summary_var, font=("Segoe UI", 9)).pack(side="right")
+
+        columns = ("id", "job", "status", "progress", "time")
+        self.tree = ttk.Treeview(self.win, columns=columns, show="headings", height=12)
+        for col, text, width in (("id", "#", 40), ("job", "Job", 230), ("status", "Status", 110),
+                                 ("progress", "Progress", 420), ("time", "Time", 70)):
+            self.tree.heading(col, text=text)
+            self.tree.column(col, width=width, anchor="w" if col in ("job", "progress") else "center")
+        self.tree.pack(fill="both", expand=True, padx=10, pady=4)
+
+        buttons = tb.Frame(self.win)
+        buttons.pack(fill="x", padx=10, pady=(4, 10))
+        tb.Button(buttons, text="Cancel Selected", bootstyle="danger", command=self.cancel_selected).pack(side="left")
+        tb.Button(buttons, text="Clear Finished", bootstyle="secondary", command=self.clear_finished).pack(side="left", padx=8)
+
+        self.refresh()
+
+    def exists(self):
+        return bool(self.win.winfo_exists())
+
+    def apply_max_running(self):
+        try:
+            self.executor.set_max_running(self.max_var.get())
+        except (tk.TclError, ValueError):
+            pass
+
+    def cancel_selected(self):
+        for item in self.tree.selection():
+            self.executor.cancel(int(item))
+
+    def clear_finished(self):
+        self.executor.clear_finished()
+        self.refresh(reschedule=False)
+
+    def refresh(self, reschedule=True):
+        if not self.exists():
+            return
+        jobs = self.executor.jobs()
+        shown = set(self.tree.get_children())
+        for job in jobs:
+            progress = job.progress.text() if job.status == "running" else ""
+            if job.status in ("failed", "cancelled") and job.error is not None:
+                progress = str(job.error)
+            values = (job.id, job.title, STATUS_TEXT.get(job.status, job.status), progress,
+                      _format_seconds(job.elapsed))
+            item = str(job.id)
+            if item in shown:
+                self.tree.item(item, values=values)
+                shown.discard(item)
+            else:
+                self.tree.insert("", "end", iid=item, values=values)
+        for item in shown:  # cleared
+            self.tree.delete(item)
+
+        counts = {}
+        for job in jobs:
+            counts[job.status] = counts.get(job.status, 0) + 1
+        self.summary_var.set(f"{counts.get('running', 0)} running, {counts.get('queued', 0)} queued")
+        if reschedule:
+            self.win.after(self.REFRESH_MS, self.refresh)
@@ -94,7 +94,7 @@ class HitrotechUI:
     def show_loading(self, title="Processing..."):
         popup = tb.Toplevel(self.root)
         popup.title(title)
-        popup.geometry("420x128")
+        popup.geometry("460x150")
         popup.resizable(False, False)
         popup.transient(self.root)
         popup.grab_set()
@@ -106,10 +106,28 @@ class HitrotechUI:
 
         tb.Label(popup, text=title, font=("Segoe UI", 12, "bold")).pack(pady=10)
         prog = tb.Progressbar(popup, mode="indeterminate", bootstyle="success-striped")
-        prog.pack(fill="x", padx=20, pady=10)
+        prog.pack(fill="x", padx=20, pady=(0, 6))
         prog.start(10)
+        popup.detail = tb.Label(popup, text="", font=("Segoe UI", 9), wraplength=420)
+        popup.detail.pack(padx=20)
         return popup, prog
 
+    def show_progress(self, popup, prog, state):
+        """Update a show_loading() popup from a ProgressState: % once there is a total, spinner until then."""
+        if not popup.winfo_exists():
+            return
+        percent = state.percent
+        if percent is None:
+            if str(prog["mode"]) != "indeterminate":
+                prog.configure(mode="indeterminate")
+                prog.start(10)
+        else:
+            if str(prog["mode"]) != "determinate":
+                prog.stop()
+                prog.configure(mode="determinate", maximum=100)
+            prog["value"] = percent
+        popup.detail.configure(text=state.text())
+
     def select_files(self, filetypes):
         return filedialog.askopenfilenames(filetypes=filetypes)
 
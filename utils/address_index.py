@@ -0,0 +1,277 @@
+# utils/address_index.py
+# Optional address index shared by every list of a run and by later runs (no Tk import).
+#
+#   with using_address_index(True):                 # UI checkbox / CLI --address-index
+#       process_directory(folder)                   # each step_03 consults and updates it
+#
+# step_03 moves rows whose normalized Property Address an earlier list already processed
+# (this run or a past one, within max_age_days) to "Previously Processed/<list>.xlsx" and
+# stages the addresses it keeps. They are recorded when the list's run finishes
+# (recording_list around each pipeline run), so a list that fails after step_03 records
+# nothing and its addresses are not skipped next time. Re-running a list the same day
+# does not count as a repeat.
+#
+# On disk, app_data_dir("address_index")/addresses.npz, sorted by key:
+#   keys   uint64  address_hashes() of the normalized address     8 bytes per address
+#   days   uint16  day last processed (days since 2020-01-01)     2 bytes
+#   lists  uint32  which list processed it (index into names)     4 bytes
+#   names  str     list names
+# Lookups go through a pandas hash index (O(1) per address). Saving merges with the file
+# as it is on disk then (another app or job may have saved meanwhile), keeps the newest
+# entry per address and evicts entries older than max_age_days.
+import os
+import time
+import contextvars
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from .dedupe import address_hashes, normalize_addresses
+from .helpers import app_data_dir
+
+INDEX_NAME = "addresses.npz"
+DEFAULT_MAX_AGE_DAYS = 180
+EPOCH = date(2020, 1, 1)
+LOCK_TIMEOUT_S = 60
+STALE_LOCK_S = 600  # a lock file this old was left by a crashed process
+
+_active = contextvars.ContextVar("address_index", default=None)
+
+
+def _today():
+    return (date.today() - EPOCH).days
+
+
+def _read(path):
+    """(keys, days, lists, names) from an index file, or None when there is none."""
+    if not os.path.exists(path):
+        return None
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            return (data["keys"].astype(np.uint64), data["days"].astype(np.uint16),
+                    data["lists"].astype(np.uint32), [str(n) for n in data["names"]])
+    except Exception as e:
+        print(f"⚠️ Address index {path} is unreadable, starting a new one: {e}")
+        return None
+
+
+def _stamp(path):
+    try:
+        st = os.stat(path)
+        return st.st_size, st.st_mtime_ns
+    except OSError:
+        return None
+
+
+@contextmanager
+def _locked(path, timeout=LOCK_TIMEOUT_S):
+    """Cross-process lock next to the index file (one writer at a time)."""
+    lock = path + ".lock"
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(lock) > STALE_LOCK_S:
+                    os.remove(lock)
+                    continue
+            except OSError:
+                continue
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Address index is locked by another run: {lock}")
+            time.sleep(0.1)
+    try:
+        yield
+    finally:
+        os.close(fd)
+        try:
+            os.remove(lock)
+        except OSError:
+            pass
+
+
+class AddressIndex:
+    def __init__(self, path=None, max_age_days=DEFAULT_MAX_AGE_DAYS):
+        self.path = path or os.path.join(app_data_dir("address_index"), INDEX_NAME)
+        self.max_age_days = max_age_days
+        self.today = _today()  # fixed for the whole run
+        self._stamp = _stamp(self.path)
+        loaded = _read(self.path)
+        if loaded is None:
+            loaded = (np.zeros(0, np.uint64), np.zeros(0, np.uint16), np.zeros(0, np.uint32), [])
+        self.keys, self.days, self.lists, self.names = loaded
+        self._codes = {name: code for code, name in enumerate(self.names)}
+        self._table = None  # pd.Index over keys, rebuilt after adds
+        self._pending = {}  # list name -> hashes staged until its run finishes
+        self._dirty = False
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _list_code(self, name):
+        if name not in self._codes:
+            self._codes[name] = len(self.names)
+            self.names.append(name)
+        return self._codes[name]
+
+    def _positions(self, hashes):
+        if self._table is None:
+            self._table = pd.Index(self.keys)
+        return self._table.get_indexer(hashes)
+
+    def lookup(self, hashes, list_name):
+        """
+        For address hashes: (seen mask, list that processed each, day it did).
+        Seen = processed within max_age_days by another list, or by this list on an earlier day.
+        """
+        if not len(self.keys):
+            none = np.full(len(hashes), -1, dtype=np.int64)
+            return np.zeros(len(hashes), dtype=bool), none, none
+        pos = self._positions(hashes)
+        found = pos >= 0
+        at = np.where(found, pos, 0)
+        days = np.where(found, self.days[at].astype(np.int64), -1)
+        lists = np.where(found, self.lists[at].astype(np.int64), -1)
+        code = self._codes.get(list_name, -1)
+        rerun = (lists == code) & (days == self.today)
+        seen = found & (days >= self.today - self.max_age_days) & ~rerun
+        return seen, lists, days
+
+    def record(self, hashes, list_name):
+        """Stage these addresses as processed today by list_name; commit(list_name) records them."""
+        if len(hashes):
+            self._pending.setdefault(list_name, []).append(hashes)
+
+    def commit(self, list_name):
+        """Record the addresses staged for list_name (its outputs are saved)."""
+        staged = self._pending.pop(list_name, [])
+        if staged:
+            self._add(np.concatenate(staged), list_name)
+
+    def discard(self, list_name):
+        """Drop the addresses staged for list_name (its run failed)."""
+        self._pending.pop(list_name, None)
+
+    def _add(self, hashes, list_name):
+        code = self._list_code(list_name)
+        pos = self._positions(hashes)
+        known = pos[pos >= 0]
+        self.days[known] = self.today
+        self.lists[known] = code
+        new = np.unique(hashes[pos < 0])
+        if len(new):
+            self.keys = np.concatenate([self.keys, new])
+            self.days = np.concatenate([self.days, np.full(len(new), self.today, np.uint16)])
+            self.lists = np.concatenate([self.lists, np.full(len(new), code, np.uint32)])
+            self._table = None
+        self._dirty = True
+
+    def list_name(self, code):
+        return self.names[code] if 0 <= code < len(self.names) else ""
+
+    def save(self):
+        """Merge with the file on disk, evict old entries and write it (atomically)."""
+        if not self._dirty:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with _locked(self.path):
+            keys, days, lists, names = self.keys, self.days, self.lists, list(self.names)
+            disk = _read(self.path) if _stamp(self.path) != self._stamp else None
+            if disk is not None:
+                d_keys, d_days, d_lists, d_names = disk
+                codes = {name: code for code, name in enumerate(names)}
+                for name in d_names:
+                    codes.setdefault(name, len(names))
+                    if codes[name] == len(names):
+                        names.append(name)
+                remap = np.array([codes[name] for name in d_names], dtype=np.uint32)
+                keys = np.concatenate([d_keys, keys])
+                days = np.concatenate([d_days, days])
+                lists = np.concatenate([remap[d_lists] if len(remap) else d_lists, lists])
+
+            # Newest entry per address (lexsort is stable: on equal days this run's entry wins)
+            order = np.lexsort((days, keys))
+            keys, days, lists = keys[order], days[order], lists[order]
+            newest = np.ones(len(keys), dtype=bool)
+            newest[:-1] = keys[1:] != keys[:-1]
+            fresh = days.astype(np.int64) >= self.today - self.max_age_days
+            keep = newest & fresh
+            keys, days, lists = keys[keep], days[keep], lists[keep]
+            used, lists = np.unique(lists, return_inverse=True)
+            names = [names[i] for i in used]
+
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                np.savez(f, keys=keys, days=days, lists=lists.astype(np.uint32),
+                         names=np.array(names, dtype=str))
+            os.replace(tmp_path, self.path)
+            self._stamp = _stamp(self.path)
+        self.keys, self.days, self.lists, self.names = keys, days, lists.astype(np.uint32), names
+        self._codes = {name: code for code, name in enumerate(names)}
+        self._table = None
+        self._dirty = False
+        print(f"🗂️ Address index saved: {len(keys):,} addresses -> {self.path}")
+
+
+@contextmanager
+def recording_list(list_name):
+    """
+    Around one list's run: the addresses its step_03 keeps are recorded in the active index
+    when the block finishes; a failed or cancelled run records none of them.
+    """
+    index = _active.get()
+    if index is None:
+        yield
+        return
+    try:
+        yield
+    except BaseException:
+        index.discard(list_name)
+        raise
+    index.commit(list_name)
+
+
+@contextmanager
+def using_address_index(enabled=True, max_age_days=DEFAULT_MAX_AGE_DAYS, path=None):
+    """Share one AddressIndex with every step_03 inside this block (in this thread); saved at the end."""
+    if not enabled or _active.get() is not None:  # off, or an outer block already has one
+        yield _active.get()
+        return
+    index = AddressIndex(path, max_age_days)
+    token = _active.set(index)
+    try:
+        yield index
+    finally:
+        _active.reset(token)
+        index.save()
+
+
+def split_previously_processed(df, list_name, column="Property Address"):
+    """
+    (rows to process, rows an earlier list already processed) using the active index; the first
+    part's addresses are staged for list_name (recorded at the end of its recording_list block).
+    Without an index or the column: (df, no rows).
+    Rows without an address are never matched.
+    """
+    index = _active.get()
+    if index is None or column not in df.columns or df.empty:
+        return df, df.iloc[:0]
+
+    normalized = normalize_addresses(df[column])
+    hashes = address_hashes(normalized)
+    has_address = (normalized != "").to_numpy()
+    seen, lists, days = index.lookup(hashes, list_name)
+    seen &= has_address
+    index.record(hashes[has_address & ~seen], list_name)
+    if not seen.any():
+        return df, df.iloc[:0]
+
+    previous = df[seen].copy()
+    previous["Previously Processed In"] = [index.list_name(code) for code in lists[seen]]
+    previous["Last Processed"] = [(EPOCH + timedelta(days=int(day))).isoformat() for day in days[seen]]
+    print(f"🗂️ {int(seen.sum()):,} address(es) already processed by earlier lists")
+    return df[~seen], previous
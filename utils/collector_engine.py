@@ -0,0 +1,184 @@
+# utils/collector_engine.py
+# Shared engine for the Record Collector and the Files Collector (no Tk import).
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .collector_manifest import CollectionManifest
+from .progress import report
+
+DEFAULT_WORKERS = 8
+LINK_MODES = (None, "hardlink", "reflink")
+
+FICLONE = 0x40049409  # Linux ioctl: share extents between two files (btrfs/xfs/...)
+
+
+# ---------------------------------------
+# Finding folders
+# ---------------------------------------
+def find_source_folders(base_directory, folder_name, target_folder, case_insensitive=False):
+    """
+    Folders named `folder_name` under base_directory (base included), in os.walk
+    top-down order. The target folder is pruned: never collected, never descended.
+    """
+    norm = os.path.normcase
+    wanted = folder_name.lower() if case_insensitive else folder_name
+    target = norm(os.path.abspath(target_folder))
+
+    def matches(name):
+        return (name.lower() if case_insensitive else name) == wanted
+
+    found = []
+    stack = [os.path.abspath(base_directory)]
+    while stack:
+        path = stack.pop()
+        if matches(os.path.basename(path)):
+            found.append(path)
+        try:
+            with os.scandir(path) as it:
+                subdirs = [e.path for e in it
+                           if e.is_dir(follow_symlinks=False) and norm(e.path) != target]
+        except OSError:
+            continue
+        stack.extend(reversed(subdirs))  # pop() then visits them in listing order
+    return found
+
+
+def list_files(folder):
+    """Files directly inside folder, in listing order (same as os.walk's `files`)."""
+    try:
+        with os.scandir(folder) as it:
+            return [e for e in it if not e.is_dir()]
+    except OSError:
+        return []
+
+
+# ---------------------------------------
+# Naming
+# ---------------------------------------
+class NameAllocator:
+    """Collision-free names in the target folder, tracked in memory instead of exists() probes."""
+
+    def __init__(self, target_folder):
+        self.taken = {os.path.normcase(n) for n in os.listdir(target_folder)}
+        self.next_suffix = {}
+
+    def claim(self, name):
+        if os.path.normcase(name) not in self.taken:
+            self.taken.add(os.path.normcase(name))
+            return name
+        base, ext = os.path.splitext(name)
+        key = os.path.normcase(name)
+        i = self.next_suffix.get(key, 1)
+        while os.path.normcase(f"{base}_{i}{ext}") in self.taken:
+            i += 1
+        self.next_suffix[key] = i + 1
+        candidate = f"{base}_{i}{ext}"
+        self.taken.add(os.path.normcase(candidate))
+        return candidate
+
+
+# ---------------------------------------
+# Copying
+# ---------------------------------------
+def _reflink(source_file, dest_file):
+    import fcntl
+
+    with open(source_file, "rb") as src, open(dest_file, "wb") as dst:
+        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+    shutil.copystat(source_file, dest_file)
+
+
+def copy_one(source_file, dest_file, link_mode=None, target_dev=None):
+    """
+    Copy one file (copy2 semantics). With link_mode and the same filesystem, hardlink or
+    reflink instead; falls back to a normal copy when the link is refused.
+    Returns "linked" or "copied".
+    """
+    if os.path.lexists(dest_file):
+        os.remove(dest_file)  # refreshing an earlier copy (may be a hardlink to the old source)
+    if link_mode and target_dev is not None:
+        try:
+            same_fs = os.stat(source_file).st_dev == target_dev
+        except OSError:
+            same_fs = False
+        if same_fs:
+            try:
+                if link_mode == "hardlink":
+                    os.link(source_file, dest_file)
+                else:
+                    _reflink(source_file, dest_file)
+                return "linked"
+            except (OSError, ImportError):
+                if os.path.exists(dest_file):
+                    os.remove(dest_file)
+    shutil.copy2(source_file, dest_file)
+    return "copied"
+
+
+def collect_folder_files(base_directory, folder_name, target_folder=None, case_insensitive=False,
+                         workers=DEFAULT_WORKERS, link_mode=None, incremental=False, log=None):
+    """
+    Copy every file from folders named `folder_name` into target_folder
+    (default: base_directory/folder_name) using a thread pool.
+    incremental=True keeps a manifest in the target: unchanged sources and
+    byte-identical duplicates are skipped, changed sources refresh their earlier copy.
+    log(message) receives one line per file, like the old print output.
+    Returns dict: target, folders, copied, linked, unchanged, duplicates, errors [(source, message)].
+    """
+    if link_mode not in LINK_MODES:
+        raise ValueError(f"link_mode must be one of {LINK_MODES}")
+    target_folder = target_folder or os.path.join(base_directory, folder_name)
+    os.makedirs(target_folder, exist_ok=True)
+    target_dev = os.stat(target_folder).st_dev
+
+    folders = find_source_folders(base_directory, folder_name, target_folder, case_insensitive)
+    names = NameAllocator(target_folder)
+
+    sources = [(entry.path, entry.name) for folder in folders for entry in list_files(folder)]
+    result = {"target": target_folder, "folders": len(folders), "copied": 0, "linked": 0,
+              "unchanged": 0, "duplicates": 0, "errors": []}
+
+    # Names are given out in walk order so suffixes match the one-by-one copy
+    manifest = None
+    if incremental:
+        manifest = CollectionManifest(target_folder)
+        planned, result["unchanged"], result["duplicates"] = manifest.plan(sources, names.claim, workers)
+        jobs = [(src, os.path.join(target_folder, dest), st, digest) for src, dest, st, digest in planned]
+    else:
+        jobs = [(src, os.path.join(target_folder, names.claim(name)), None, None) for src, name in sources]
+
+    lock = threading.Lock()
+
+    def run(job):
+        source_file, dest_file, st, digest = job
+        try:
+            how = copy_one(source_file, dest_file, link_mode, target_dev)
+        except Exception as e:
+            with lock:
+                result["errors"].append((source_file, str(e)))
+            if log:
+                log(f"❌ Error copying {source_file}: {e}")
+            return
+        with lock:
+            result[how] += 1
+            if manifest is not None and st is not None:
+                manifest.record(source_file, os.path.basename(dest_file), st, digest)
+        if log:
+            log(f"✅ {'Linked' if how == 'linked' else 'Copied'}: {source_file} -> {dest_file}")
+
+    # Progress is reported from this thread: the pool's threads do not see its sink
+    report(stage="Collecting files", done=0, total=len(jobs), unit="files")
+    if workers <= 1:
+        for done, job in enumerate(jobs, 1):
+            run(job)
+            report(stage="Collecting files", done=done, total=len(jobs), unit="files")
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for done, future in enumerate(as_completed([pool.submit(run, job) for job in jobs]), 1):
+                future.result()
+                report(stage="Collecting files", done=done, total=len(jobs), unit="files")
+    if manifest is not None:
+        manifest.save()
+    return result
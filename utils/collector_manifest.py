@@ -0,0 +1,139 @@
+# utils/collector_manifest.py
+# Incremental, content-deduplicating manifest for collected files (no Tk import).
+#
+# <target>/.collector_manifest.json
+#   "files":   {target file name: {"size", "hash" (blake2b, filled lazily), "source"}}
+#   "sources": {source path: {"dest", "size", "mtime_ns"}}
+#
+# Re-runs copy only new or changed sources; a source whose bytes equal a file that
+# is already in the target is recorded against that file instead of copied again.
+import os
+import json
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+MANIFEST_NAME = ".collector_manifest.json"
+HASH_CHUNK = 1024 * 1024
+
+
+def file_hash(path):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_CHUNK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class CollectionManifest:
+    def __init__(self, target_folder):
+        self.target = target_folder
+        self.path = os.path.join(target_folder, MANIFEST_NAME)
+        data = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            pass
+        self.files = data.get("files", {})
+        self.sources = data.get("sources", {})
+
+        # Files already in the target without a record (older runs, manual copies)
+        with os.scandir(target_folder) as it:
+            present = {e.name: e for e in it if e.is_file() and e.name != MANIFEST_NAME}
+        self.files = {name: rec for name, rec in self.files.items() if name in present}
+        for name, entry in present.items():
+            if name not in self.files:
+                self.files[name] = {"size": entry.stat().st_size, "hash": None, "source": None}
+        self.sources = {src: rec for src, rec in self.sources.items() if rec["dest"] in self.files}
+
+    def save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "files": self.files, "sources": self.sources}, f)
+        os.replace(tmp_path, self.path)
+
+    def plan(self, sources, claim, workers=8):
+        """
+        sources: [(source path, file name)] in walk order; claim(name) -> free target name.
+        Returns (copy jobs [(source, target name, stat, hash)], unchanged count, duplicate count).
+        """
+        stats = {}
+        for src, _ in sources:
+            try:
+                stats[src] = os.stat(src)
+            except OSError:
+                stats[src] = None
+
+        fresh = []
+        unchanged = 0
+        for src, name in sources:
+            st = stats[src]
+            rec = self.sources.get(src)
+            if st is not None and rec and rec["size"] == st.st_size and rec["mtime_ns"] == st.st_mtime_ns:
+                unchanged += 1
+                continue
+            fresh.append((src, name))
+
+        # Only sizes that collide with another file can be duplicates; hash just those
+        size_users = {}
+        for rec in self.files.values():
+            size_users[rec["size"]] = size_users.get(rec["size"], 0) + 1
+        for src, _ in fresh:
+            if stats[src] is not None:
+                size_users[stats[src].st_size] = size_users.get(stats[src].st_size, 0) + 1
+        to_hash = [src for src, _ in fresh if stats[src] is not None and size_users[stats[src].st_size] > 1]
+        unhashed = [name for name, rec in self.files.items()
+                    if rec["hash"] is None and size_users.get(rec["size"], 0) > 1]
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            hashes = dict(zip(to_hash, pool.map(file_hash, to_hash)))
+            target_paths = [os.path.join(self.target, name) for name in unhashed]
+            for name, digest in zip(unhashed, pool.map(file_hash, target_paths)):
+                self.files[name]["hash"] = digest
+
+        # (size, hash) -> target file with that content, and the reverse for refreshes
+        by_content = {}
+        content_of = {}
+        for name, rec in self.files.items():
+            if rec["hash"] is not None:
+                key = (rec["size"], rec["hash"])
+                if key not in by_content:
+                    by_content[key] = name
+                    content_of[name] = key
+
+        refs = {}
+        for rec in self.sources.values():
+            refs[rec["dest"]] = refs.get(rec["dest"], 0) + 1
+
+        jobs = []
+        duplicates = 0
+        for src, name in fresh:
+            st = stats[src]
+            if st is None:
+                jobs.append((src, claim(name), None, None))  # let the copy report the error
+                continue
+            digest = hashes.get(src)
+            same = by_content.get((st.st_size, digest)) if digest else None
+            if same is not None:
+                self.sources[src] = {"dest": same, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+                duplicates += 1
+                continue
+
+            # A changed source overwrites its own earlier copy unless other sources share it
+            old = self.sources.get(src)
+            if old and refs.get(old["dest"], 0) == 1:
+                dest = old["dest"]
+                stale = content_of.pop(dest, None)
+                if stale is not None:
+                    by_content.pop(stale, None)
+            else:
+                dest = claim(name)
+            if digest:
+                by_content[(st.st_size, digest)] = dest
+                content_of[dest] = (st.st_size, digest)
+            jobs.append((src, dest, st, digest))
+        return jobs, unchanged, duplicates
+
+    def record(self, src, dest, st, digest):
+        """Register a finished copy."""
+        self.files[dest] = {"size": st.st_size, "hash": digest, "source": src}
+        self.sources[src] = {"dest": dest, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
@@ -1,387 +1,57 @@
-import pandas as pd
 import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
+from tkinter import ttk, messagebox, scrolledtext, simpledialog
 import os
-import re
+import threading
 from .helpers import ensure_folder, save_excel
+from .mapping_core import (
+    REQUIRED_COLUMNS, AUTO_MAP_DICT, OPTIONAL_COLUMNS, TRANSFORMATION_OPTIONS, PREDEFINED_OPERATIONS,
+    auto_map_source, build_mapped_frame, read_preview, read_full,
+)
+from .mapping_profiles import save_profile
+from .progress import ProgressDispatcher, report, reporting
 
-# Standard schema - now editable
-# Updated REQUIRED_COLUMNS with phone types and email
-REQUIRED_COLUMNS = [
-    "First Name", "Last Name", "Property Address", "Property City", "Property State", "Property Zip",
-    "Mailing Address", "Mailing City", "Mailing State", "Mailing Zip",
-    "Phone1", "Type1", "Phone2", "Type2", "Phone3", "Type3", 
-    "Phone4", "Type4", "Phone5", "Type5", "Phone6", "Type6", 
-    "Email", "List"
-]
 
-# Expanded auto-map dictionary with variations for all required columns including phone types and email
-AUTO_MAP_DICT = {
-    # First Name variations (10)
-    'first_name': 'First Name',
-    'first name': 'First Name',
-    'firstname': 'First Name',
-    'fname': 'First Name',
-    'f_name': 'First Name',
-    'given_name': 'First Name',
-    'given name': 'First Name',
-    'givenname': 'First Name',
-    'first': 'First Name',
-    'fn': 'First Name',
-    
-    # Last Name variations (10)
-    'last_name': 'Last Name',
-    'last name': 'Last Name',
-    'lastname': 'Last Name',
-    'lname': 'Last Name',
-    'l_name': 'Last Name',
-    'surname': 'Last Name',
-    'family_name': 'Last Name',
-    'family name': 'Last Name',
-    'last': 'Last Name',
-    'ln': 'Last Name',
-    
-    # Property Address variations (10)
-    'associated_property_address_line_1': 'Property Address',
-    'property_address': 'Property Address',
-    'property address': 'Property Address',
-    'propertyaddress': 'Property Address',
-    'prop_address': 'Property Address',
-    'prop address': 'Property Address',
-    'property_street': 'Property Address',
-    'property street': 'Property Address',
-    'prop_street': 'Property Address',
-    'address': 'Property Address',
-    
-    # Property City variations (10)
-    'associated_property_address_city': 'Property City',
-    'property_city': 'Property City',
-    'property city': 'Property City',
-    'propertycity': 'Property City',
-    'prop_city': 'Property City',
-    'prop city': 'Property City',
-    'city': 'Property City',
-    'property_town': 'Property City',
-    'property town': 'Property City',
-    'prop_town': 'Property City',
-    
-    # Property State variations (10)
-    'associated_property_address_state': 'Property State',
-    'property_state': 'Property State',
-    'property state': 'Property State',
-    'propertystate': 'Property State',
-    'prop_state': 'Property State',
-    'prop state': 'Property State',
-    'state': 'Property State',
-    'property_province': 'Property State',
-    'property province': 'Property State',
-    'prop_province': 'Property State',
-    
-    # Property Zip variations (10)
-    'associated_property_address_zipcode': 'Property Zip',
-    'property_zip': 'Property Zip',
-    'property zip': 'Property Zip',
-    'propertyzip': 'Property Zip',
-    'prop_zip': 'Property Zip',
-    'prop zip': 'Property Zip',
-    'zip': 'Property Zip',
-    'property_zipcode': 'Property Zip',
-    'property zipcode': 'Property Zip',
-    'zipcode': 'Property Zip',
-    
-    # Mailing Address variations (10)
-    'primary_mailing_address': 'Mailing Address',
-    'mailing_address': 'Mailing Address',
-    'mailing address': 'Mailing Address',
-    'mailingaddress': 'Mailing Address',
-    'mail_address': 'Mailing Address',
-    'mail address': 'Mailing Address',
-    'mailing_street': 'Mailing Address',
-    'mailing street': 'Mailing Address',
-    'mail_street': 'Mailing Address',
-    'mailing_addr': 'Mailing Address',
-    
-    # Mailing City variations (10)
-    'primary_mailing_city': 'Mailing City',
-    'mailing_city': 'Mailing City',
-    'mailing city': 'Mailing City',
-    'mailingcity': 'Mailing City',
-    'mail_city': 'Mailing City',
-    'mail city': 'Mailing City',
-    'mailing_town': 'Mailing City',
-    'mailing town': 'Mailing City',
-    'mail_town': 'Mailing City',
-    'mailing_city_name': 'Mailing City',
-    
-    # Mailing State variations (10)
-    'primary_mailing_state': 'Mailing State',
-    'mailing_state': 'Mailing State',
-    'mailing state': 'Mailing State',
-    'mailingstate': 'Mailing State',
-    'mail_state': 'Mailing State',
-    'mail state': 'Mailing State',
-    'mailing_province': 'Mailing State',
-    'mailing province': 'Mailing State',
-    'mail_province': 'Mailing State',
-    'mailing_state_name': 'Mailing State',
-    
-    # Mailing Zip variations (10)
-    'primary_mailing_zip': 'Mailing Zip',
-    'mailing_zip': 'Mailing Zip',
-    'mailing zip': 'Mailing Zip',
-    'mailingzip': 'Mailing Zip',
-    'mail_zip': 'Mailing Zip',
-    'mail zip': 'Mailing Zip',
-    'mailing_zipcode': 'Mailing Zip',
-    'mailing zipcode': 'Mailing Zip',
-    'mail_zipcode': 'Mailing Zip',
-    'mailing_postal': 'Mailing Zip',
-    
-    # Phone1 variations (10)
-    'phone_1': 'Phone1',
-    'phone1': 'Phone1',
-    'phone 1': 'Phone1',
-    'primary_phone': 'Phone1',
-    'primary phone': 'Phone1',
-    'primaryphone': 'Phone1',
-    'main_phone': 'Phone1',
-    'main phone': 'Phone1',
-    'mainphone': 'Phone1',
-    'phone_primary': 'Phone1',
-    
-    # Type1 variations (10)
-    'phone_1_type': 'Type1',
-    'phone1_type': 'Type1',
-    'phone 1 type': 'Type1',
-    'phone_type_1': 'Type1',
-    'phonetype1': 'Type1',
-    'phone_type1': 'Type1',
-    'type_phone_1': 'Type1',
-    'type_phone1': 'Type1',
-    'phone1type': 'Type1',
-    'type1': 'Type1',
-    
-    # Phone2 variations (10)
-    'phone_2': 'Phone2',
-    'phone2': 'Phone2',
-    'phone 2': 'Phone2',
-    'secondary_phone': 'Phone2',
-    'secondary phone': 'Phone2',
-    'secondaryphone': 'Phone2',
-    'alt_phone': 'Phone2',
-    'alt phone': 'Phone2',
-    'altphone': 'Phone2',
-    'phone_secondary': 'Phone2',
-    
-    # Type2 variations (10)
-    'phone_2_type': 'Type2',
-    'phone2_type': 'Type2',
-    'phone 2 type': 'Type2',
-    'phone_type_2': 'Type2',
-    'phonetype2': 'Type2',
-    'phone_type2': 'Type2',
-    'type_phone_2': 'Type2',
-    'type_phone2': 'Type2',
-    'phone2type': 'Type2',
-    'type2': 'Type2',
-    
-    # Phone3 variations (10)
-    'phone_3': 'Phone3',
-    'phone3': 'Phone3',
-    'phone 3': 'Phone3',
-    'tertiary_phone': 'Phone3',
-    'tertiary phone': 'Phone3',
-    'tertiaryphone': 'Phone3',
-    'other_phone': 'Phone3',
-    'other phone': 'Phone3',
-    'otherphone': 'Phone3',
-    'phone_other': 'Phone3',
-    
-    # Type3 variations (10)
-    'phone_3_type': 'Type3',
-    'phone3_type': 'Type3',
-    'phone 3 type': 'Type3',
-    'phone_type_3': 'Type3',
-    'phonetype3': 'Type3',
-    'phone_type3': 'Type3',
-    'type_phone_3': 'Type3',
-    'type_phone3': 'Type3',
-    'phone3type': 'Type3',
-    'type3': 'Type3',
-    
-    # Phone4 variations (10)
-    'phone_4': 'Phone4',
-    'phone4': 'Phone4',
-    'phone 4': 'Phone4',
-    'phone_four': 'Phone4',
-    'phone four': 'Phone4',
-    'phonefour': 'Phone4',
-    'additional_phone': 'Phone4',
-    'additional phone': 'Phone4',
-    'additionalphone': 'Phone4',
-    'phone_additional': 'Phone4',
-    
-    # Type4 variations (10)
-    'phone_4_type': 'Type4',
-    'phone4_type': 'Type4',
-    'phone 4 type': 'Type4',
-    'phone_type_4': 'Type4',
-    'phonetype4': 'Type4',
-    'phone_type4': 'Type4',
-    'type_phone_4': 'Type4',
-    'type_phone4': 'Type4',
-    'phone4type': 'Type4',
-    'type4': 'Type4',
-    
-    # Phone5 variations (10)
-    'phone_5': 'Phone5',
-    'phone5': 'Phone5',
-    'phone 5': 'Phone5',
-    'phone_five': 'Phone5',
-    'phone five': 'Phone5',
-    'phonefive': 'Phone5',
-    'extra_phone': 'Phone5',
-    'extra phone': 'Phone5',
-    'extraphone': 'Phone5',
-    'phone_extra': 'Phone5',
-    
-    # Type5 variations (10)
-    'phone_5_type': 'Type5',
-    'phone5_type': 'Type5',
-    'phone 5 type': 'Type5',
-    'phone_type_5': 'Type5',
-    'phonetype5': 'Type5',
-    'phone_type5': 'Type5',
-    'type_phone_5': 'Type5',
-    'type_phone5': 'Type5',
-    'phone5type': 'Type5',
-    'type5': 'Type5',
-    
-    # Phone6 variations (10)
-    'phone_6': 'Phone6',
-    'phone6': 'Phone6',
-    'phone 6': 'Phone6',
-    'phone_six': 'Phone6',
-    'phone six': 'Phone6',
-    'phonesix': 'Phone6',
-    'backup_phone': 'Phone6',
-    'backup phone': 'Phone6',
-    'backupphone': 'Phone6',
-    'phone_backup': 'Phone6',
-    
-    # Type6 variations (10)
-    'phone_6_type': 'Type6',
-    'phone6_type': 'Type6',
-    'phone 6 type': 'Type6',
-    'phone_type_6': 'Type6',
-    'phonetype6': 'Type6',
-    'phone_type6': 'Type6',
-    'type_phone_6': 'Type6',
-    'type_phone6': 'Type6',
-    'phone6type': 'Type6',
-    'type6': 'Type6',
-    
-    # Email variations (10)
-    'email': 'Email',
-    'email_address': 'Email',
-    'email address': 'Email',
-    'emailaddress': 'Email',
-    'e_mail': 'Email',
-    'e mail': 'Email',
-    'email_addr': 'Email',
-    'email addr': 'Email',
-    'contact_email': 'Email',
-    'contact email': 'Email',
-    
-    # List variations (10)
-    'list': 'List',
-    'list_name': 'List',
-    'list name': 'List',
-    'listname': 'List',
-    'campaign': 'List',
-    'campaign_name': 'List',
-    'campaign name': 'List',
-    'campaignname': 'List',
-    'source': 'List',
-    'source_name': 'List',
-}
-
-
-# Additional optional columns that can be added
-OPTIONAL_COLUMNS = [
-    "Email", "Owner Occupied", "Property Type", "Bedrooms", "Bathrooms",
-    "Square Footage", "Lot Size", "Year Built", "Property Value", "Last Sale Date",
-    "Last Sale Price", "Estimated Equity", "LTV", "Mortgage Balance", "Tax Value"
-]
+def run_column_mapper(file, project_root=None):
+    # The window opens at once; the header and a small sample load in the background
+    # (the full file loads on Apply)
+    win = tk.Toplevel()
+    win.title("Advanced Column Mapper Tool")
+    win.geometry("1000x800")
 
-# Data transformation functions
-def to_pascal_case(text):
-    if pd.isna(text):
-        return text
-    return ' '.join(word.capitalize() for word in str(text).split())
+    status = tk.Label(win, text=f"Reading {os.path.basename(file)}...")
+    status.pack(pady=40)
+    outcome = {}
 
-def normalize_address(addr):
-    if pd.isna(addr):
-        return ""
-    addr = str(addr).strip().lower()
-    addr = re.sub(r"\s+", " ", addr)
-    return addr
+    def show_mapper():
+        if not win.winfo_exists():
+            return
+        status.destroy()
+        if "error" in outcome:
+            messagebox.showerror("Error", f"Failed to read file: {outcome['error']}")
+            win.destroy()
+            return
+        _build_mapper(win, file, *outcome["preview"])
 
-def extract_email_column(df):
-    """
-    Find and extract email column from input dataframe.
-    Looks for columns containing 'email' (case insensitive).
-    Returns the email column name and data if found.
-    """
-    email_columns = [col for col in df.columns if 'email' in str(col).lower()]
-    
-    if email_columns:
-        # Use the first email column found
-        email_col = email_columns[0]
-        return email_col, df[email_col].copy()
-    
-    return None, pd.Series([pd.NA] * len(df))
+    def show_progress(state):
+        if win.winfo_exists():
+            status.config(text=state.text())
 
-def split_owner_name(df):
-    """Split Owner Name column into First Name and Last Name if exists"""
-    if "Owner Name" in df.columns:
-        df["Owner Name"] = df["Owner Name"].astype(str).str.strip()
-        df["First Name"] = df["Owner Name"].apply(lambda x: x.split(" ", 1)[0] if x else "")
-        df["Last Name"] = df["Owner Name"].apply(lambda x: x.split(" ", 1)[1] if " " in x else "")
-    return df
+    dispatcher = ProgressDispatcher(win.master, show_progress, on_finish=show_mapper)
 
-# Transformation options for columns
-TRANSFORMATION_OPTIONS = {
-    "None": lambda x: x,
-    "Pascal Case": to_pascal_case,
-    "Normalize Address": normalize_address,
-    "Trim Whitespace": lambda x: x.strip() if isinstance(x, str) else x,
-    "Uppercase": lambda x: x.upper() if isinstance(x, str) else x,
-    "Lowercase": lambda x: x.lower() if isinstance(x, str) else x,
-    "Capitalize Words": lambda x: x.title() if isinstance(x, str) else x,
-    "Extract Email": lambda df: extract_email_column(df)[1],
-}
+    def worker():
+        try:
+            with reporting(dispatcher):
+                outcome["preview"] = read_preview(file)
+        except Exception as e:
+            outcome["error"] = e
+        finally:
+            dispatcher.finish()
 
-# Predefined operations that can be applied
-PREDEFINED_OPERATIONS = {
-    "Split Owner Name": split_owner_name,
-    "Standardize Mailing Address": lambda df: df.apply(
-        lambda col: col.apply(to_pascal_case) if col.name in ['Mailing Address', 'Mailing City'] else col
-    ),
-}
+    dispatcher.start()
+    threading.Thread(target=worker, daemon=True).start()
 
 
-def run_column_mapper(file, project_root=None):
-    try:
-        df = pd.read_csv(file) if file.endswith(".csv") else pd.read_excel(file)
-    except Exception as e:
-        messagebox.showerror("Error", f"Failed to read file: {e}")
-        return
-    
-    win = tk.Toplevel()
-    win.title("Advanced Column Mapper Tool")
-    win.geometry("1000x800")
-    
+def _build_mapper(win, file, df, est_rows):
     # Create notebook for tabs
     notebook = ttk.Notebook(win)
     notebook.pack(fill="both", expand=True, padx=10, pady=10)
@@ -472,10 +142,9 @@ def run_column_mapper(file, project_root=None):
         transform_combo.pack(side="left", padx=5)
         
         # Auto-map if found
-        for col in df.columns:
-            if col.lower() in AUTO_MAP_DICT and AUTO_MAP_DICT[col.lower()] == req:
-                combo.set(col)
-                break
+        auto_col = auto_map_source(df.columns, req, AUTO_MAP_DICT)
+        if auto_col is not None:
+            combo.set(auto_col)
         
         # Special case: List can also have custom text
         entry = None
@@ -552,7 +221,8 @@ def run_column_mapper(file, project_root=None):
     
     # Display first few rows and column info
     preview_info = f"File: {os.path.basename(file)}\n"
-    preview_info += f"Shape: {df.shape[0]} rows, {df.shape[1]} columns\n\n"
+    rows_info = f"~{est_rows:,} rows (estimated)" if est_rows is not None else "rows counted on Apply"
+    preview_info += f"Shape: {rows_info}, {df.shape[1]} columns (preview of first {len(df):,} rows)\n\n"
     preview_info += "Columns:\n" + ", ".join(df.columns.tolist()) + "\n\n"
     preview_info += "First 5 rows:\n" + str(df.head())
     
@@ -569,90 +239,126 @@ def run_column_mapper(file, project_root=None):
         rb.pack(anchor="w", padx=20)
     
     # --- Apply Mapping ---
-        # --- Apply Mapping ---
-    def apply_mapping():
-        new_df = pd.DataFrame()
-        operations_to_apply = []
+    def collect_mappings():
+        return [
+            {
+                "target": item["name_var"].get(),  # Use the editable column name
+                "source": item["combo"].get(),
+                "transform": item["transform_var"].get(),
+                "enabled": item["enabled"].get(),
+            }
+            for item in mapping_frames
+        ]
 
-        # Collect operations if any selected
-        if operations_var.get() != "None":
-            operations_to_apply.append(PREDEFINED_OPERATIONS[operations_var.get()])
-
-        for item in mapping_frames:
-            req = item["name_var"].get()  # Use the editable column name
-            if not item["enabled"].get():  # unchecked → skip
-                continue
-
-            if req == "List":
-                custom_val = custom_list_value.get().strip()
-                selected = item["combo"].get()
-
-                if custom_val:
-                    new_df[req] = [custom_val] * len(df)
-                elif selected and selected in df.columns:
-                    new_df[req] = df[selected]
-            else:
-                selected = item["combo"].get()
-                transform = item["transform_var"].get()
-                
-                if selected and selected in df.columns:
-                    # Apply transformation if selected
-                    if transform != "None":
-                        if transform == "Extract Email":
-                            _, email_data = extract_email_column(df)
-                            new_df[req] = email_data
-                        else:
-                            new_df[req] = df[selected].apply(TRANSFORMATION_OPTIONS[transform])
-                    else:
-                        new_df[req] = df[selected]
-
-        # ✅ Extra step: Auto transformations (Pascal + Zip cleaning)
-        if "First Name" in new_df.columns:
-            new_df["First Name"] = new_df["First Name"].apply(to_pascal_case)
-        if "Last Name" in new_df.columns:
-            new_df["Last Name"] = new_df["Last Name"].apply(to_pascal_case)
-        if "Property Address" in new_df.columns:
-            new_df["Property Address"] = new_df["Property Address"].apply(to_pascal_case)
-        if "Property City" in new_df.columns:
-            new_df["Property City"] = new_df["Property City"].apply(to_pascal_case)
-        if "Mailing Address" in new_df.columns:
-            new_df["Mailing Address"] = new_df["Mailing Address"].apply(to_pascal_case)
-        if "Mailing State" in new_df.columns:
-            new_df["Mailing State"] = new_df["Mailing State"].apply(to_pascal_case)
-
-        # ✅ Clean Zips (remove after "-")
-        for zip_col in ["Property Zip", "Mailing Zip"]:
-            if zip_col in new_df.columns:
-                new_df[zip_col] = new_df[zip_col].astype(str).str.split("-").str[0].str.strip()
+    def apply_mapping():
+        mappings = collect_mappings()
+        list_value = custom_list_value.get()
+        operation = operations_var.get()
 
-        # Check if we have any data
-        if new_df.empty:
+        # Nothing would be mapped -> warn before paying for the full load
+        if build_mapped_frame(df, mappings, list_value, operation).empty:
             messagebox.showwarning("Warning", "No columns were mapped. Please select at least one column to map.")
             return
 
-        # Apply predefined operations
-        for operation in operations_to_apply:
-            new_df = operation(new_df)
-
         # Save in the same directory as the input file
         input_dir = os.path.dirname(file)
         base_name = os.path.splitext(os.path.basename(file))[0]
         output_file = os.path.join(input_dir, f"{base_name}_mapped.xlsx")
 
-        try:
-            save_excel(new_df, output_file)
+        apply_btn.config(state="disabled")
+        progress.config(mode="indeterminate")
+        progress.start(10)
+        status_var.set("Loading full file...")
+        outcome = {}
+
+        # The worker only reports; the dispatcher updates the widgets on the Tk thread
+        def show_progress(state):
+            if not win.winfo_exists():
+                return
+            percent = state.percent
+            if percent is None:
+                if str(progress["mode"]) != "indeterminate":
+                    progress.config(mode="indeterminate")
+                    progress.start(10)
+            else:
+                if str(progress["mode"]) != "determinate":
+                    progress.stop()
+                    progress.config(mode="determinate")
+                progress.config(value=percent)
+            status_var.set(state.text())
+
+        def finish():
+            if not win.winfo_exists():
+                return
+            progress.stop()
+            error = outcome.get("error")
+            progress.config(mode="determinate", value=0 if error else 100)
+            apply_btn.config(state="normal")
+            if error:
+                status_var.set("")
+                messagebox.showerror("Error", error)
+                return
             messagebox.showinfo("✅ Done", f"Mapped file saved:\n{output_file}")
             win.destroy()
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to save file: {e}")
+
+        dispatcher = ProgressDispatcher(win.master, show_progress, on_finish=finish)
+
+        def work():
+            try:
+                full_df = read_full(file)
+            except Exception as e:
+                outcome["error"] = f"Failed to read file: {e}"
+                return
+            report(stage=f"Mapping {len(full_df):,} rows")
+            new_df = build_mapped_frame(full_df, mappings, list_value, operation)
+            report(stage="Saving")
+            try:
+                save_excel(new_df, output_file)
+            except Exception as e:
+                outcome["error"] = f"Failed to save file: {e}"
+
+        def worker():
+            try:
+                with reporting(dispatcher):
+                    work()
+            except Exception as e:
+                outcome["error"] = str(e)
+            finally:
+                dispatcher.finish()
+
+        dispatcher.start()
+        threading.Thread(target=worker, daemon=True).start()
 
 
     # Add apply button at the bottom
     button_frame = tk.Frame(win)
     button_frame.pack(fill="x", pady=10)
     
-    tk.Button(button_frame, text="Apply Mapping & Save", command=apply_mapping, bg="#4CAF50", fg="white", 
-              font=("Arial", 10, "bold")).pack(side="right", padx=10)
+    apply_btn = tk.Button(button_frame, text="Apply Mapping & Save", command=apply_mapping, bg="#4CAF50",
+                          fg="white", font=("Arial", 10, "bold"))
+    apply_btn.pack(side="right", padx=10)
+
+    # Full-load progress (shown while Apply runs in the background)
+    status_var = tk.StringVar()
+    progress = ttk.Progressbar(button_frame, orient="horizontal", mode="determinate", length=200)
+    progress.pack(side="right", padx=5)
+    tk.Label(button_frame, textvariable=status_var).pack(side="right", padx=5)
+
+    # Save the current mapping as a profile for headless batch runs
+    def save_as_profile():
+        name = simpledialog.askstring("Save Profile", "Profile name:", parent=win)
+        if not name or not name.strip():
+            return
+        try:
+            path = save_profile(name.strip(), list(df.columns), collect_mappings(),
+                                list_value=custom_list_value.get(), operation=operations_var.get(),
+                                auto_map=AUTO_MAP_DICT)
+            messagebox.showinfo("Profile Saved", f"Profile saved:\n{path}\n\n"
+                                "Files with the same header now map automatically in batch mode.")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to save profile: {e}")
+
+    tk.Button(button_frame, text="Save Profile", command=save_as_profile).pack(side="right", padx=10)
     
     # Add a button to add optional columns
     def add_optional_columns():
@@ -676,5 +382,3 @@ def run_column_mapper(file, project_root=None):
         tk.Button(opt_win, text="Add Selected", command=add_selected).pack(pady=10)
     
     tk.Button(button_frame, text="Add Optional Columns", command=add_optional_columns).pack(side="left", padx=10)
-
-    win.mainloop()
\ No newline at end of file
@@ -1,12 +1,17 @@
 import os
-import pandas as pd
 import tkinter as tk
 import ttkbootstrap as tb
 from tkinter import filedialog, messagebox, ttk
 import threading
 from pathlib import Path
 from datetime import datetime
-from collections import defaultdict
+
+from .solver import SOLVERS, DEFAULT_SOLVER, group_rows, plan_combinations, rows_for_groups
+from .streaming import (read_preview, run_streaming_combinations, write_combination_info,
+                        write_remaining_info)
+from .column_stats import column_stats
+from ..mapping_core import read_full
+from ..progress import ProgressDispatcher, report, reporting
 
 class FilesCombinationsTool:
     def __init__(self, parent):
@@ -16,6 +21,12 @@ class FilesCombinationsTool:
         self.output_path = None
         self.combination_entries = []
         self.progress = None
+        self.streaming = False  # df holds only a preview; rows are streamed on Run
+        self.tree_columns = {}  # tree item -> column name
+        self.column_stats = {}  # column name -> (unique, nulls, is_exact)
+        self.stats_pending = set()
+        self._stats_after = None
+        self.busy_buttons = []  # disabled while a load or a run is in the background
         
     def open_tool_window(self):
         self.win = tb.Toplevel(self.parent)
@@ -74,10 +85,13 @@ class FilesCombinationsTool:
         btn_frame = tb.Frame(file_select_frame)
         btn_frame.pack(side="right")
         
-        tb.Button(btn_frame, text="Browse", bootstyle="primary-outline", 
-                 command=self.browse_file, width=8).pack(side="left", padx=(0, 4))
-        tb.Button(btn_frame, text="Load", bootstyle="success", 
-                 command=self.load_file, width=6).pack(side="left")
+        browse_btn = tb.Button(btn_frame, text="Browse", bootstyle="primary-outline", 
+                               command=self.browse_file, width=8)
+        browse_btn.pack(side="left", padx=(0, 4))
+        self.load_btn = tb.Button(btn_frame, text="Load", bootstyle="success", 
+                                  command=self.load_file, width=6)
+        self.load_btn.pack(side="left")
+        self.busy_buttons += [browse_btn, self.load_btn]
         
         # Output directory section
         output_frame = tb.LabelFrame(parent, text="📂 Output Location", bootstyle="info", padding=10)
@@ -94,6 +108,10 @@ class FilesCombinationsTool:
         
         tb.Button(output_select_frame, text="Browse", bootstyle="info-outline", 
                  command=self.browse_output, width=8).pack(side="right")
+
+        self.stream_var = tk.BooleanVar(value=False)
+        tb.Checkbutton(output_frame, text="Streaming mode (very large files: rows are never loaded into memory)",
+                       variable=self.stream_var, bootstyle="round-toggle").pack(anchor="w", pady=(8, 0))
         
         # File info section
         info_frame = tb.LabelFrame(parent, text="📊 File Information", bootstyle="secondary", padding=10)
@@ -129,6 +147,12 @@ class FilesCombinationsTool:
         self.column_combo = ttk.Combobox(col_select_frame, textvariable=self.column_var, 
                                        state="readonly", width=25, font=("Segoe UI", 9))
         self.column_combo.pack(side="left", padx=(8, 0))
+        self.column_combo.bind("<<ComboboxSelected>>", lambda e: self.request_stats([self.column_var.get()], exact=True))
+
+        tb.Label(col_select_frame, text="Fit:", font=("Segoe UI", 10, "bold")).pack(side="left", padx=(16, 0))
+        self.solver_var = tk.StringVar(value=DEFAULT_SOLVER)
+        ttk.Combobox(col_select_frame, textvariable=self.solver_var, values=list(SOLVERS),
+                     state="readonly", width=30, font=("Segoe UI", 9)).pack(side="left", padx=(8, 0))
         
         # Treeview for columns
         tree_frame = tb.Frame(columns_frame)
@@ -148,7 +172,12 @@ class FilesCombinationsTool:
         
         vsb = ttk.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
         hsb = ttk.Scrollbar(tree_frame, orient="horizontal", command=self.tree.xview)
-        self.tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
+        def on_scroll(first, last):
+            vsb.set(first, last)
+            self.schedule_visible_stats()
+
+        self.tree.configure(yscrollcommand=on_scroll, xscrollcommand=hsb.set)
+        self.tree.bind("<Configure>", lambda e: self.schedule_visible_stats())
         
         self.tree.grid(row=0, column=0, sticky="nsew")
         vsb.grid(row=0, column=1, sticky="ns")
@@ -211,8 +240,10 @@ class FilesCombinationsTool:
         right_frame = tb.Frame(action_frame)
         right_frame.pack(side="right")
         
-        tb.Button(right_frame, text="▶️ Run", bootstyle="success",
-                 command=self.start_combination, width=8).pack(side="left", padx=(0, 6))
+        self.run_btn = tb.Button(right_frame, text="▶️ Run", bootstyle="success",
+                                 command=self.start_combination, width=8)
+        self.run_btn.pack(side="left", padx=(0, 6))
+        self.busy_buttons.append(self.run_btn)
         tb.Button(right_frame, text="❌ Close", bootstyle="danger",
                  command=self.win.destroy, width=8).pack(side="left")
     
@@ -240,41 +271,101 @@ class FilesCombinationsTool:
             self.output_path_var.set(output_path)
             self.output_path = output_path
     
+    # ---- background work: workers only report(); the dispatcher updates the window on the Tk thread
+    def run_in_background(self, work, on_done, on_error):
+        """work() runs in a thread; on_done(result) / on_error(message) run on the Tk thread."""
+        outcome = {}
+
+        def finished():
+            if not self.win.winfo_exists():
+                return
+            if self.progress:
+                self.progress.stop()
+                self.progress.config(mode="indeterminate", value=0)
+            for button in self.busy_buttons:
+                button.config(state="normal")
+            if "error" in outcome:
+                on_error(outcome["error"])
+            else:
+                on_done(outcome["result"])
+
+        dispatcher = ProgressDispatcher(self.parent, self.show_progress, on_finish=finished)
+
+        def worker():
+            try:
+                with reporting(dispatcher):
+                    outcome["result"] = work()
+            except Exception as e:
+                outcome["error"] = str(e)
+            finally:
+                dispatcher.finish()
+
+        for button in self.busy_buttons:
+            button.config(state="disabled")
+        if self.progress:
+            self.progress.config(mode="indeterminate")
+            self.progress.start()
+        dispatcher.start()
+        threading.Thread(target=worker, daemon=True).start()
+
+    def show_progress(self, state):
+        if not self.win.winfo_exists():
+            return
+        percent = state.percent
+        if self.progress:
+            if percent is None:
+                if str(self.progress["mode"]) != "indeterminate":
+                    self.progress.config(mode="indeterminate")
+                    self.progress.start()
+            else:
+                if str(self.progress["mode"]) != "determinate":
+                    self.progress.stop()
+                    self.progress.config(mode="determinate")
+                self.progress.config(value=percent)
+        self.status_label.config(text=state.text())
+
     def load_file(self):
         if not self.file_path_var.get():
             messagebox.showerror("Error", "Please select a file first")
             return
         
-        try:
-            if self.progress:
-                self.progress.start()
-            self.status_label.config(text="Loading file...")
-            
-            file_path = self.file_path_var.get()
-            
-            if file_path.endswith('.csv'):
-                self.df = pd.read_csv(file_path, encoding='utf-8')
-            else:
-                self.df = pd.read_excel(file_path)
-            
-            # Update file info
-            self.update_file_info(file_path)
-            
-            # Populate columns tree
-            self.populate_columns_tree()
-            
-            # Enable combinations tab
-            self.notebook.tab(1, state="normal")
-            self.notebook.select(1)  # Switch to combinations tab
-            
+        file_path = self.file_path_var.get()
+        streaming = self.stream_var.get()
+        self.status_label.config(text="Loading file...")
+
+        def load():
+            if streaming:
+                return read_preview(file_path)
+            # CSVs load in chunks so the progress bar can follow the bytes read
+            return read_full(file_path, stage="Loading file")
+
+        self.run_in_background(load, lambda df: self.load_finished(file_path, df, streaming), self.load_failed)
+
+    def load_failed(self, error_msg):
+        messagebox.showerror("Error", f"Failed to load file: {error_msg}")
+        self.status_label.config(text="Error loading file")
+
+    def load_finished(self, file_path, df, streaming):
+        self.df = df
+        self.streaming = streaming
+        self.column_stats = {}
+        self.stats_pending = set()
+
+        # Update file info
+        self.update_file_info(file_path)
+        
+        # Populate columns tree
+        self.populate_columns_tree()
+        
+        # Enable combinations tab
+        self.notebook.tab(1, state="normal")
+        self.notebook.select(1)  # Switch to combinations tab
+        self.update_summary()
+        
+        if self.streaming:
+            self.status_label.config(text=f"Streaming mode: previewing first {len(self.df):,} records")
+        else:
             self.status_label.config(text=f"Loaded {len(self.df):,} records successfully")
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load file: {str(e)}")
-            self.status_label.config(text="Error loading file")
-        finally:
-            if self.progress:
-                self.progress.stop()
     
     def update_file_info(self, file_path):
         # Get file stats
@@ -283,7 +374,10 @@ class FilesCombinationsTool:
         modified_time = datetime.fromtimestamp(file_stats.st_mtime)
         
         # Update info labels
-        self.info_labels['records'].config(text=f"Total Records: {len(self.df):,}")
+        if self.streaming:
+            self.info_labels['records'].config(text="Total Records: counted on Run (streaming)")
+        else:
+            self.info_labels['records'].config(text=f"Total Records: {len(self.df):,}")
         self.info_labels['columns'].config(text=f"Total Columns: {len(self.df.columns):,}")
         self.info_labels['size'].config(text=f"File Size: {file_size/1024/1024:.2f} MB")
         self.info_labels['modified'].config(text=f"Last Modified: {modified_time.strftime('%Y-%m-%d %H:%M:%S')}")
@@ -292,21 +386,86 @@ class FilesCombinationsTool:
         # Clear existing tree items
         for item in self.tree.get_children():
             self.tree.delete(item)
+        self.tree_columns = {}
         
-        # Populate tree with column info
+        # Names and types right away; counts are filled in for visible rows only
         columns = []
         for col in self.df.columns:
             dtype = str(self.df[col].dtype)
-            unique_count = self.df[col].nunique()
-            null_count = self.df[col].isnull().sum()
-            
-            self.tree.insert("", "end", text=col, values=(dtype, f"{unique_count:,}", f"{null_count:,}"))
+            item = self.tree.insert("", "end", text=col, values=(dtype, "…", "…"))
+            self.tree_columns[item] = col
             columns.append(col)
         
         # Update column combo
         self.column_combo['values'] = columns
         if columns:
             self.column_var.set(columns[0])
+            self.request_stats([columns[0]], exact=True)
+        self.schedule_visible_stats()
+
+    def schedule_visible_stats(self):
+        if self._stats_after is None and self.df is not None:
+            self._stats_after = self.parent.after(150, self._stats_for_visible_rows)
+
+    def _stats_for_visible_rows(self):
+        self._stats_after = None
+        visible = [col for item, col in self.tree_columns.items() if self.tree.bbox(item)]
+        self.request_stats(visible)
+
+    def request_stats(self, columns, exact=False):
+        """Compute column counts on a worker thread (estimates for large files unless exact)."""
+        if self.df is None:
+            return
+        todo = []
+        for col in columns:
+            known = self.column_stats.get(col)
+            if (known and (known[2] or not exact)) or (col, exact) in self.stats_pending:
+                continue
+            self.stats_pending.add((col, exact))
+            todo.append(col)
+        if not todo:
+            return
+
+        df = self.df
+        results = []  # (column, stats) from the worker, shown on the Tk thread
+
+        def show_results(state=None):
+            while results:
+                col, stats = results.pop(0)
+                self._show_stats(df, col, exact, stats)
+
+        def finished():
+            show_results()
+            for col in todo:  # failed columns can be requested again
+                self.stats_pending.discard((col, exact))
+
+        # No progress bar here: counts fill in as they arrive
+        dispatcher = ProgressDispatcher(self.parent, show_results, on_finish=finished)
+
+        def worker():
+            try:
+                with reporting(dispatcher):
+                    for i, col in enumerate(todo, 1):
+                        results.append((col, column_stats(df[col], exact=exact)))
+                        report(stage="Column counts", done=i, total=len(todo), unit="columns")
+            finally:
+                dispatcher.finish()
+
+        dispatcher.start()
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _show_stats(self, df, col, exact, stats):
+        self.stats_pending.discard((col, exact))
+        if df is not self.df:
+            return  # a different file was loaded meanwhile
+        known = self.column_stats.get(col)
+        if known and known[2] and not stats[2]:
+            return  # never replace an exact count with an estimate
+        self.column_stats[col] = stats
+        for item, name in self.tree_columns.items():
+            if name == col:
+                self.tree.set(item, "Unique", stats[0])
+                self.tree.set(item, "Nulls", stats[1])
     
     def add_combination_entry(self):
         entry_num = len(self.combination_entries) + 1
@@ -357,6 +516,11 @@ class FilesCombinationsTool:
             except ValueError:
                 pass
         
+        if self.streaming:
+            self.summary_label.config(text=f"Total requested: {total:,} records (Available: counted on Run)",
+                                      bootstyle="info")
+            return
+
         available = len(self.df) if self.df is not None else 0
         self.summary_label.config(text=f"Total requested: {total:,} records (Available: {available:,})")
         
@@ -400,150 +564,87 @@ class FilesCombinationsTool:
             messagebox.showerror("Error", "Please specify at least one combination requirement")
             return
         
-        if total_requested > len(self.df):
+        if not self.streaming and total_requested > len(self.df):
             if not messagebox.askyesno("Warning", 
                 f"Total requested records ({total_requested:,}) exceed available records ({len(self.df):,}). "
                 "Do you want to continue with maximum available records?"):
                 return
         
-        # Start processing
-        if self.progress:
-            self.progress.start()
+        # Start processing (Tk variables are read here, not in the worker)
         self.status_label.config(text="Processing combinations...")
-        
-        thread = threading.Thread(
-            target=self.process_combinations,
-            args=(comb_requirements,)
-        )
-        thread.daemon = True
-        thread.start()
+        column, solver = self.column_var.get(), self.solver_var.get()
+        if self.streaming:
+            work = lambda: self.process_streaming(comb_requirements, column, solver)
+        else:
+            work = lambda: self.process_combinations(comb_requirements, column, solver)
+        self.run_in_background(work, lambda result: self.combination_complete(*result), self.combination_error)
     
-    def process_combinations(self, comb_requirements):
-        try:
-            selected_column = self.column_var.get()
-            base_name = Path(self.file_path).stem
-            output_dir = Path(self.output_path)
-            processed_dir = output_dir / f"{base_name}_combinations"
-            processed_dir.mkdir(parents=True, exist_ok=True)
+    def process_combinations(self, comb_requirements, selected_column, solver):
+        """In-memory run (worker thread). Returns (results {name: rows}, output dir)."""
+        base_name = Path(self.file_path).stem
+        output_dir = Path(self.output_path)
+        processed_dir = output_dir / f"{base_name}_combinations"
+        processed_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Group records by the selected column value (positional row indices)
+        report(stage="Grouping records")
+        keys, sizes, rows = group_rows(self.df, selected_column)
+        total_groups = len(keys)
+
+        plan, remaining_ids = plan_combinations(sizes, comb_requirements, solver)
+        results = {}
+
+        for i, (name, requested_count, group_ids) in enumerate(plan):
+            report(stage="Writing combinations", done=i, total=len(plan), unit="files")
+            if len(group_ids) == 0:
+                continue
+            selected_groups = [(keys[g], int(sizes[g])) for g in group_ids]
+            selected_indices = rows_for_groups(rows, group_ids)
+
+            # Create the combination
+            combined_sample = self.df.iloc[selected_indices]
+            actual_count = len(combined_sample)
             
-            # Group records by the selected column value
-            grouped_records = defaultdict(list)
-            for idx, row in self.df.iterrows():
-                group_key = row[selected_column]
-                grouped_records[group_key].append(idx)
+            # Save the combination
+            comb_dir = processed_dir / f"{name}_{actual_count}_records"
+            comb_dir.mkdir(exist_ok=True)
             
-            # Convert to list of (group_key, record_count, record_indices)
-            groups = []
-            for key, indices in grouped_records.items():
-                groups.append((key, len(indices), indices))
+            output_file = comb_dir / f"{base_name}_{name}.csv"
+            combined_sample.to_csv(output_file, index=False)
             
-            # Sort groups by size (largest first for better fitting)
-            groups.sort(key=lambda x: x[1], reverse=True)
+            # Create detailed info file
+            write_combination_info(comb_dir, self.file_path, name, requested_count, actual_count,
+                                   selected_column, selected_groups, total_groups)
             
-            remaining_groups = groups.copy()
-            results = {}
+            results[name] = actual_count
+        
+        # Save remaining records if any
+        if len(remaining_ids):
+            report(stage="Writing remaining records")
+            remaining_indices = rows_for_groups(rows, remaining_ids)
             
-            for name, requested_count in comb_requirements:
-                if not remaining_groups:
-                    break
-                
-                selected_indices = []
-                current_count = 0
-                selected_groups = []
-                
-                # Try to find the best combination of groups that fits the requested count
-                for i, (key, count, indices) in enumerate(remaining_groups):
-                    if current_count + count <= requested_count:
-                        selected_indices.extend(indices)
-                        current_count += count
-                        selected_groups.append((key, count))
-                    elif current_count == 0 and count > requested_count:
-                        # If a single group is larger than requested, take it anyway
-                        selected_indices.extend(indices)
-                        current_count = count
-                        selected_groups.append((key, count))
-                        break
-                
-                # Remove selected groups from remaining
-                if selected_groups:
-                    # Create a mask for groups to keep
-                    groups_to_keep = []
-                    for group in remaining_groups:
-                        keep = True
-                        for selected_key, selected_count in selected_groups:
-                            if group[0] == selected_key and group[1] == selected_count:
-                                keep = False
-                                break
-                        if keep:
-                            groups_to_keep.append(group)
-                    remaining_groups = groups_to_keep
-                
-                if not selected_indices:
-                    continue
-                
-                # Create the combination
-                combined_sample = self.df.loc[selected_indices]
-                actual_count = len(combined_sample)
-                
-                # Save the combination
-                comb_dir = processed_dir / f"{name}_{actual_count}_records"
-                comb_dir.mkdir(exist_ok=True)
+            if len(remaining_indices):
+                remaining_df = self.df.iloc[remaining_indices]
+                remaining_dir = processed_dir / "Remaining_Records"
+                remaining_dir.mkdir(exist_ok=True)
                 
-                output_file = comb_dir / f"{base_name}_{name}.csv"
-                combined_sample.to_csv(output_file, index=False)
+                remaining_file = remaining_dir / f"{base_name}_remaining.csv"
+                remaining_df.to_csv(remaining_file, index=False)
                 
-                # Create detailed info file
-                info_file = comb_dir / "combination_info.txt"
-                with open(info_file, 'w', encoding='utf-8') as f:
-                    f.write(f"Combination Analysis Report\n")
-                    f.write(f"{'='*50}\n\n")
-                    f.write(f"Source File: {self.file_path}\n")
-                    f.write(f"Combination Name: {name}\n")
-                    f.write(f"Requested Records: {requested_count:,}\n")
-                    f.write(f"Actual Records: {actual_count:,}\n")
-                    f.write(f"Source Column: {selected_column}\n")
-                    f.write(f"Unique Groups: {len(selected_groups):,}\n")
-                    f.write(f"Total Groups: {len(groups):,}\n")
-                    f.write(f"Groups Used:\n")
-                    for key, count in selected_groups:
-                        f.write(f"  - {key}: {count} records\n")
-                    f.write(f"Processing Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                
-                results[name] = actual_count
-            
-            # Save remaining records if any
-            if remaining_groups:
-                remaining_indices = []
-                for key, count, indices in remaining_groups:
-                    remaining_indices.extend(indices)
-                
-                if remaining_indices:
-                    remaining_df = self.df.loc[remaining_indices]
-                    remaining_dir = processed_dir / "Remaining_Records"
-                    remaining_dir.mkdir(exist_ok=True)
-                    
-                    remaining_file = remaining_dir / f"{base_name}_remaining.csv"
-                    remaining_df.to_csv(remaining_file, index=False)
-                    
-                    info_file = remaining_dir / "remaining_info.txt"
-                    with open(info_file, 'w', encoding='utf-8') as f:
-                        f.write(f"Remaining Records Analysis\n")
-                        f.write(f"{'='*40}\n\n")
-                        f.write(f"Total Remaining: {len(remaining_df):,} records\n")
-                        f.write(f"Remaining Groups: {len(remaining_groups):,}\n")
-                        f.write(f"Source Column: {selected_column}\n")
-                        f.write(f"Processing Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            
-            # Update UI in main thread
-            self.parent.after(0, self.combination_complete, results, str(processed_dir))
-            
-        except Exception as e:
-            self.parent.after(0, self.combination_error, str(e))
-    
-    def combination_complete(self, results, output_dir):
-        if self.progress:
-            self.progress.stop()
+                write_remaining_info(remaining_dir, len(remaining_df), len(remaining_ids), selected_column)
         
+        return results, str(processed_dir)
+    
+    def process_streaming(self, comb_requirements, column, solver):
+        """Streaming run (worker thread). Returns (results, output dir, total rows)."""
+        def progress(stage, rows):
+            label = "Counting groups" if stage == "count" else "Writing combinations"
+            report(stage=label, done=rows, unit="records")
+
+        return run_streaming_combinations(self.file_path, column, comb_requirements, self.output_path,
+                                          solver=solver, progress_callback=progress)
+
+    def combination_complete(self, results, output_dir, total_rows=None):
         result_text = "✅ Combination completed successfully!\n\n"
         result_text += f"📁 Output directory: {output_dir}\n\n"
         result_text += "📊 Results:\n"
@@ -555,16 +656,16 @@ class FilesCombinationsTool:
         
         result_text += f"\n📈 Total processed: {total_processed:,} records\n"
         
-        if self.df is not None:
-            remaining = len(self.df) - total_processed
+        if total_rows is None and self.df is not None:
+            total_rows = len(self.df)
+        if total_rows:
+            remaining = total_rows - total_processed
             result_text += f"📉 Remaining: {remaining:,} records\n"
-            result_text += f"🎯 Efficiency: {(total_processed/len(self.df)*100):.1f}%"
+            result_text += f"🎯 Efficiency: {(total_processed/total_rows*100):.1f}%"
         
         self.status_label.config(text="Processing completed")
         messagebox.showinfo("Success", result_text)
     
     def combination_error(self, error_msg):
-        if self.progress:
-            self.progress.stop()
         self.status_label.config(text="Error during processing")
         messagebox.showerror("Error", f"Processing failed:\n{error_msg}")
\ No newline at end of file
@@ -0,0 +1,171 @@
+# utils/combinations/solver.py
+# Group sizing + bin-filling solvers for the Files Combinations tool (no Tk import).
+import numpy as np
+
+# Largest remaining capacity handed to the exact subset-sum step. Above it the
+# biggest groups are taken best-fit first (no backtracking) until the gap is small enough.
+DP_MAX_CAPACITY = 250_000
+
+
+def group_rows(df, column):
+    """
+    Positional row indices per distinct value of `column` (NaN is one group).
+    Returns (keys, sizes int64 array, list of row-index arrays), in first-seen order.
+    """
+    indices = df.groupby(column, dropna=False, sort=False).indices
+    keys = list(indices.keys())
+    rows = [indices[k] for k in keys]
+    sizes = np.fromiter((len(r) for r in rows), dtype=np.int64, count=len(rows))
+    return keys, sizes, rows
+
+
+# ---------------------------------------
+# Solvers
+# ---------------------------------------
+# A solver takes (sizes, requested counts) and returns one array of group ids per
+# request. Groups are used at most once; whatever is left is the remainder.
+
+def solve_greedy(sizes, requests):
+    """The original single pass: largest first, oversized group only if nothing was taken."""
+    order = np.argsort(-sizes, kind="stable")
+    used = np.zeros(len(sizes), dtype=bool)
+    picks = []
+    for requested in requests:
+        if used.all():
+            break
+        chosen = []
+        current = 0
+        for g in order:
+            if used[g]:
+                continue
+            count = sizes[g]
+            if current + count <= requested:
+                chosen.append(g)
+                current += count
+            elif current == 0 and count > requested:
+                chosen.append(g)
+                break
+        used[chosen] = True
+        picks.append(np.asarray(chosen, dtype=np.int64))
+    return picks
+
+
+def _subset_sum(values, counts, capacity):
+    """
+    Bounded subset-sum over (value, multiplicity) pairs.
+    Returns ({value: how many to take}, best reachable total <= capacity).
+    """
+    # Binary splitting turns "up to c copies of v" into log2(c) 0/1 items
+    item_value, item_base, item_mult = [], [], []
+    for v, c in zip(values, counts):
+        k = 1
+        while c > 0:
+            take = min(k, c)
+            item_value.append(v * take)
+            item_base.append(v)
+            item_mult.append(take)
+            c -= take
+            k *= 2
+
+    reach = np.zeros(capacity + 1, dtype=bool)
+    reach[0] = True
+    # item that first reached each total; walking back through it never reuses an item
+    first_item = np.full(capacity + 1, -1, dtype=np.int32)
+    for i, w in enumerate(item_value):
+        if w > capacity:
+            continue
+        new = reach[:-w] & ~reach[w:]
+        if new.any():
+            hit = np.flatnonzero(new) + w
+            reach[hit] = True
+            first_item[hit] = i
+        if reach[capacity]:
+            break
+
+    best = int(np.flatnonzero(reach)[-1])
+    taken = {}
+    total = best
+    while total > 0:
+        i = first_item[total]
+        taken[item_base[i]] = taken.get(item_base[i], 0) + item_mult[i]
+        total -= item_value[i]
+    return taken, best
+
+
+def solve_exact(sizes, requests, dp_max_capacity=DP_MAX_CAPACITY):
+    """
+    Best-fit decreasing for the large groups, then an exact bounded subset-sum over
+    what is left. A request up to dp_max_capacity is met exactly whenever some set of
+    unused groups adds up to it; above that, only the gap left after the best-fit groups
+    is filled exactly (350k + 300k + 300k for 600k takes 350k, not 300k + 300k).
+    If no unused group fits at all, the smallest oversized group is taken (closest overshoot).
+    """
+    used = np.zeros(len(sizes), dtype=bool)
+    order = np.argsort(-sizes, kind="stable")
+    picks = []
+    for requested in requests:
+        if used.all():
+            break
+        chosen = []
+        capacity = int(requested)
+
+        # Best-fit decreasing until the gap is small enough for the DP
+        if capacity > dp_max_capacity:
+            for g in order:
+                if capacity <= dp_max_capacity:
+                    break
+                if not used[g] and sizes[g] <= capacity:
+                    chosen.append(g)
+                    used[g] = True
+                    capacity -= int(sizes[g])
+
+        # Exact fill of the remaining gap
+        cand = np.flatnonzero(~used & (sizes <= capacity) & (sizes > 0))
+        if len(cand) and capacity > 0:
+            cand = cand[np.argsort(sizes[cand], kind="stable")]
+            cand_sizes = sizes[cand]
+            values, starts, counts = np.unique(cand_sizes, return_index=True, return_counts=True)
+            taken, _ = _subset_sum(values.tolist(), counts.tolist(), capacity)
+            for v, start in zip(values.tolist(), starts.tolist()):
+                k = taken.get(v, 0)
+                if k:
+                    ids = cand[start:start + k]
+                    chosen.extend(ids.tolist())
+                    used[ids] = True
+
+        if not chosen:
+            over = np.flatnonzero(~used & (sizes > requested))
+            if len(over):
+                g = over[np.argmin(sizes[over])]
+                chosen.append(g)
+                used[g] = True
+
+        picks.append(np.asarray(chosen, dtype=np.int64))
+    return picks
+
+
+SOLVERS = {
+    "Exact fit (best-fit + subset-sum)": solve_exact,
+    "Greedy (largest first)": solve_greedy,
+}
+DEFAULT_SOLVER = "Exact fit (best-fit + subset-sum)"
+
+
+def plan_combinations(sizes, comb_requirements, solver=DEFAULT_SOLVER):
+    """
+    comb_requirements: [(name, requested_count), ...]
+    Returns ([(name, requested, group ids)], remaining group ids).
+    """
+    picks = SOLVERS[solver](sizes, [count for _, count in comb_requirements])
+    plan = [(name, requested, ids) for (name, requested), ids in zip(comb_requirements, picks)]
+    used = np.zeros(len(sizes), dtype=bool)
+    for _, _, ids in plan:
+        used[ids] = True
+    return plan, np.flatnonzero(~used)
+
+
+def rows_for_groups(rows, group_ids):
+    """Concatenate the row positions of the given groups (selection order)."""
+    if len(group_ids) == 0:
+        return np.empty(0, dtype=np.int64)
+    return np.concatenate([rows[g] for g in group_ids])
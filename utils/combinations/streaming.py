@@ -0,0 +1,188 @@
+# utils/combinations/streaming.py
+# Two-pass combinations for files too large to load (no Tk import).
+#
+#   pass 1: per-group counts, chunk by chunk
+#   solver: groups -> combination / remaining
+#   pass 2: every chunk's rows go straight to the matching CSV writer
+#
+# Memory depends on the number of groups, not on the number of rows.
+from pathlib import Path
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from .solver import DEFAULT_SOLVER, plan_combinations
+
+CHUNK_ROWS = 200_000
+PREVIEW_ROWS = 1_000
+NA_KEY = "\x00<NA>"  # one group for all empty cells (NaN != NaN as a dict key)
+
+
+# ---------------------------------------
+# Chunked readers
+# ---------------------------------------
+def _excel_chunks(file_path, chunksize, nrows=None):
+    from openpyxl import load_workbook
+
+    wb = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        ws = wb.active
+        row_iter = ws.iter_rows(values_only=True)
+        header = next(row_iter, None)
+        if header is None:
+            return
+        header = [str(h) if h is not None else f"Unnamed: {i}" for i, h in enumerate(header)]
+        batch = []
+        seen = 0
+        for values in row_iter:
+            if nrows is not None and seen >= nrows:
+                break
+            batch.append(values)
+            seen += 1
+            if len(batch) >= chunksize:
+                yield pd.DataFrame(batch, columns=header)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=header)
+    finally:
+        wb.close()
+
+
+def iter_chunks(file_path, chunksize=CHUNK_ROWS, nrows=None):
+    """Yield DataFrame chunks. CSV cells stay text so keys never change type between chunks."""
+    if file_path.endswith(".csv"):
+        yield from pd.read_csv(file_path, encoding="utf-8", dtype=str, chunksize=chunksize, nrows=nrows)
+    else:
+        yield from _excel_chunks(file_path, chunksize, nrows)
+
+
+def read_preview(file_path, nrows=PREVIEW_ROWS):
+    """First rows only (columns tree / summary in streaming mode)."""
+    chunks = list(iter_chunks(file_path, chunksize=nrows, nrows=nrows))
+    return chunks[0] if chunks else pd.DataFrame()
+
+
+def _group_keys(chunk, column):
+    return chunk[column].astype(object).where(chunk[column].notna(), NA_KEY)
+
+
+# ---------------------------------------
+# Info files (shared with the in-memory mode)
+# ---------------------------------------
+def write_combination_info(comb_dir, source_file, name, requested_count, actual_count,
+                           column, selected_groups, total_groups):
+    info_file = Path(comb_dir) / "combination_info.txt"
+    with open(info_file, 'w', encoding='utf-8') as f:
+        f.write("Combination Analysis Report\n")
+        f.write(f"{'='*50}\n\n")
+        f.write(f"Source File: {source_file}\n")
+        f.write(f"Combination Name: {name}\n")
+        f.write(f"Requested Records: {requested_count:,}\n")
+        f.write(f"Actual Records: {actual_count:,}\n")
+        f.write(f"Source Column: {column}\n")
+        f.write(f"Unique Groups: {len(selected_groups):,}\n")
+        f.write(f"Total Groups: {total_groups:,}\n")
+        f.write("Groups Used:\n")
+        for key, count in selected_groups:
+            f.write(f"  - {key}: {count} records\n")
+        f.write(f"Processing Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+
+
+def write_remaining_info(remaining_dir, total_remaining, remaining_groups, column):
+    info_file = Path(remaining_dir) / "remaining_info.txt"
+    with open(info_file, 'w', encoding='utf-8') as f:
+        f.write("Remaining Records Analysis\n")
+        f.write(f"{'='*40}\n\n")
+        f.write(f"Total Remaining: {total_remaining:,} records\n")
+        f.write(f"Remaining Groups: {remaining_groups:,}\n")
+        f.write(f"Source Column: {column}\n")
+        f.write(f"Processing Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+
+
+# ---------------------------------------
+# Two-pass run
+# ---------------------------------------
+def count_groups(file_path, column, chunksize=CHUNK_ROWS, progress_callback=None):
+    """Pass 1: {group key: rows} in first-seen order, plus total rows."""
+    counts = {}
+    total_rows = 0
+    for chunk in iter_chunks(file_path, chunksize):
+        if column not in chunk.columns:
+            raise ValueError(f"Column '{column}' not found in file")
+        for key, n in _group_keys(chunk, column).value_counts(sort=False).items():
+            counts[key] = counts.get(key, 0) + int(n)
+        total_rows += len(chunk)
+        if progress_callback:
+            progress_callback("count", total_rows)
+    return counts, total_rows
+
+
+def run_streaming_combinations(file_path, column, comb_requirements, output_path,
+                               solver=DEFAULT_SOLVER, chunksize=CHUNK_ROWS, progress_callback=None):
+    """
+    Same outputs as FilesCombinationsTool.process_combinations, without loading the file.
+    Returns (results {name: rows}, processed_dir, total_rows).
+    """
+    base_name = Path(file_path).stem
+    processed_dir = Path(output_path) / f"{base_name}_combinations"
+    processed_dir.mkdir(parents=True, exist_ok=True)
+
+    counts, total_rows = count_groups(file_path, column, chunksize, progress_callback)
+    keys = list(counts)
+    sizes = np.fromiter(counts.values(), dtype=np.int64, count=len(keys))
+    plan, remaining_ids = plan_combinations(sizes, comb_requirements, solver)
+
+    # group key -> output file slot (remaining records get the last slot)
+    destination = {}
+    targets = []
+    results = {}
+    for name, requested_count, group_ids in plan:
+        if len(group_ids) == 0:
+            continue
+        slot = len(targets)
+        actual_count = int(sizes[group_ids].sum())
+        comb_dir = processed_dir / f"{name}_{actual_count}_records"
+        comb_dir.mkdir(exist_ok=True)
+        targets.append(comb_dir / f"{base_name}_{name}.csv")
+        for g in group_ids:
+            destination[keys[g]] = slot
+
+        selected_groups = [(_display_key(keys[g]), int(sizes[g])) for g in group_ids]
+        write_combination_info(comb_dir, file_path, name, requested_count, actual_count,
+                               column, selected_groups, len(keys))
+        results[name] = actual_count
+
+    remaining_rows = int(sizes[remaining_ids].sum()) if len(remaining_ids) else 0
+    if remaining_rows:
+        remaining_dir = processed_dir / "Remaining_Records"
+        remaining_dir.mkdir(exist_ok=True)
+        remaining_slot = len(targets)
+        targets.append(remaining_dir / f"{base_name}_remaining.csv")
+        for g in remaining_ids:
+            destination[keys[g]] = remaining_slot
+        write_remaining_info(remaining_dir, remaining_rows, len(remaining_ids), column)
+
+    # Pass 2: route rows chunk by chunk
+    handles = [open(t, "w", encoding="utf-8", newline="") for t in targets]
+    try:
+        written = [False] * len(handles)
+        done_rows = 0
+        for chunk in iter_chunks(file_path, chunksize):
+            slots = _group_keys(chunk, column).map(destination)
+            for slot, part in chunk.groupby(slots, sort=False):
+                slot = int(slot)
+                part.to_csv(handles[slot], index=False, header=not written[slot])
+                written[slot] = True
+            done_rows += len(chunk)
+            if progress_callback:
+                progress_callback("write", done_rows)
+    finally:
+        for handle in handles:
+            handle.close()
+
+    return results, str(processed_dir), total_rows
+
+
+def _display_key(key):
+    return "nan" if key == NA_KEY else key
@@ -1,10 +1,12 @@
 import pandas as pd
 import os
 from .helpers import save_excel
+from .progress import open_reporting
 
 def csv_to_excel(file, out_folder):
     # Read all as string to avoid Excel guessing
-    df = pd.read_csv(file, dtype=str)
+    with open_reporting(file) as f:
+        df = pd.read_csv(f, dtype=str)
     filename = os.path.splitext(os.path.basename(file))[0] + ".xlsx"
 
     excel_converted_folder = os.path.join(os.path.dirname(file), 'Excel Converted')
@@ -16,7 +18,8 @@ def csv_to_excel(file, out_folder):
 
 def excel_to_csv(file, out_folder):
     # Read all as string to preserve formatting (ZIP, codes, etc.)
-    df = pd.read_excel(file, dtype=str)
+    with open_reporting(file) as f:
+        df = pd.read_excel(f, dtype=str)
     filename = os.path.splitext(os.path.basename(file))[0] + ".csv"
 
     csv_converted_folder = os.path.join(os.path.dirname(file), 'CSV Converted')
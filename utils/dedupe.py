@@ -0,0 +1,120 @@
+# utils/dedupe.py
+# Keep-first dedupe for the pipelines' step_03, in one pass (no Tk import).
+#
+#   df, repeated_rows, repeated_addresses = dedupe_keep_first(df, "Property Address", count_rows=True)
+#
+# gives the same rows, in the same order, as the two passes it replaces:
+#   df = df.drop_duplicates()
+#   df["normalized_address"] = df["Property Address"].apply(normalize_address)
+#   df = df.drop_duplicates(subset=["normalized_address"])
+# An identical row repeats its address, so when the address column holds only text the
+# address rule alone selects the rows, and the identical-row rule (one 64-bit hash per
+# row) runs only for its count, on rows whose address repeats. Numbers in the column
+# (1 and 1.0: one value to drop_duplicates, two addresses) bring both rules back, as do
+# missing values in a raw key (None and NaN: one value in a row, two as the key).
+# Each distinct address is normalized once.
+import numpy as np
+import pandas as pd
+
+from .mapping_core import transform_series
+
+_PRIME = np.uint64(0x100000001B3)
+_M1 = np.uint64(0xBF58476D1CE4E5B9)
+_M2 = np.uint64(0x94D049BB133111EB)
+
+
+def normalize_addresses(series):
+    """normalize_address() for a whole column: trimmed, lowercase, single spaces; missing -> ""."""
+    return transform_series(series, "Normalize Address")
+
+
+def address_hashes(normalized):
+    """Stable 64-bit hash of each normalized address (the same value in every run and process)."""
+    codes, uniques = pd.factorize(np.asarray(normalized, dtype=object))
+    return pd.util.hash_array(np.asarray(uniques, dtype=object))[codes]
+
+
+# ---------------------------------------
+# Hashing helpers
+# ---------------------------------------
+def _mix(h):
+    """splitmix64 finalizer: every input bit affects every output bit."""
+    h = (h ^ (h >> np.uint64(30))) * _M1
+    h = (h ^ (h >> np.uint64(27))) * _M2
+    return h ^ (h >> np.uint64(31))
+
+
+def _first_seen(codes):
+    """For factorize codes (numbered in order of first appearance): is-first mask, first row per code."""
+    first = np.ones(len(codes), dtype=bool)
+    if len(codes) > 1:
+        first[1:] = codes[1:] > np.maximum.accumulate(codes)[:-1]
+    return first, np.flatnonzero(first)
+
+
+def row_hashes(df):
+    """
+    One 64-bit hash per row (equal rows -> equal hashes, missing cells equal each other as in
+    drop_duplicates), plus the per-column factorize codes it was built from.
+    """
+    h = np.zeros(len(df), dtype=np.uint64)
+    codes = []
+    for i in range(df.shape[1]):
+        col_codes, _ = pd.factorize(df.iloc[:, i])
+        codes.append(col_codes)
+        h = h * _PRIME + col_codes.view(np.uint64)
+    return _mix(h), codes
+
+
+def repeated_rows(df):
+    """Boolean array: row is identical to an earlier row (df.duplicated(), keep="first")."""
+    if df.shape[1] <= 1 or len(df) == 0:
+        # One column: pandas checks the Series, where None and NaN differ
+        return df.duplicated().to_numpy(copy=True)
+    h, codes = row_hashes(df)
+    hash_codes, _ = pd.factorize(h)
+    first, first_rows = _first_seen(hash_codes)
+    repeats = np.flatnonzero(~first)
+    earlier = first_rows[hash_codes[repeats]]
+    # A hash match is only a repeat if every column matches; a collision falls back to pandas
+    for col_codes in codes:
+        if not np.array_equal(col_codes[repeats], col_codes[earlier]):
+            return df.duplicated().to_numpy(copy=True)
+    return ~first
+
+
+def dedupe_keep_first(df, key_column=None, normalize=True, count_rows=False):
+    """
+    Rows of df without repeats, first occurrence kept, filtered once:
+      key_column None -> df.drop_duplicates()
+      key_column      -> df.drop_duplicates(), then rows whose key was already seen are dropped;
+                         the key is the column normalized like normalize_address() (normalize)
+                         or its raw values.
+    Returns (df, identical rows removed, repeated keys removed). With a key, the first count
+    is None unless count_rows is set (it costs the row hash); the second then counts every
+    row removed.
+    """
+    if key_column is None:
+        drop = repeated_rows(df)
+        return df[~drop], int(drop.sum()), 0
+
+    raw = df[key_column]
+    key = normalize_addresses(raw) if normalize else raw
+    identical = None
+    # Raw keys: identical rows treat None and NaN as one value, the key rule does not
+    text_key = (pd.api.types.infer_dtype(raw, skipna=True) in ("string", "empty") if normalize
+                else not raw.hasnans)
+    if text_key:
+        # Identical rows share the key, so the key rule alone selects the rows
+        drop = key.duplicated().to_numpy()
+        if count_rows:
+            # An identical earlier row has the same key: only rows whose key repeats can match
+            shared = key.duplicated(keep=False).to_numpy()
+            identical = int(repeated_rows(df[shared]).sum())
+    else:
+        drop = repeated_rows(df)
+        identical = int(drop.sum())
+        kept = np.flatnonzero(~drop)
+        drop[kept[key.iloc[kept].duplicated().to_numpy()]] = True
+    removed = int(drop.sum())
+    return df[~drop], identical, removed - (identical or 0)
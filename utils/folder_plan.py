@@ -0,0 +1,221 @@
+# utils/folder_plan.py
+# Planned folder reorganization for Record Extractor Script 3 (no Tk import).
+#
+# One os.scandir pass builds an in-memory tree. The three legacy passes
+# (move "Week-Year-Absentee-...-City-State" folders into State/City/Week/Absentee,
+# prune empty folders, delete .txt files) are replayed on that tree in the same
+# order to produce a plan, which is then executed with plain renames.
+import os
+import errno
+import shutil
+
+FILE = "file"
+LINKED_DIR = "linked dir"  # symlink/junction to a folder: never entered, kept as-is
+
+
+class _Dir:
+    __slots__ = ("name", "parent", "children")
+
+    def __init__(self, name, parent=None):
+        self.name = name
+        self.parent = parent
+        self.children = {}  # name -> _Dir, FILE or LINKED_DIR, in listing order
+
+    def path(self, base_dir):
+        names = []
+        node = self
+        while node.parent is not None:
+            names.append(node.name)
+            node = node.parent
+        return os.path.join(base_dir, *reversed(names))
+
+
+class OrganizePlan:
+    def __init__(self, base_dir):
+        self.base_dir = base_dir
+        self.steps = []        # pass 1 in order: ("mkdir", path) / ("move", src, dst) / ("rmdir", path)
+        self.pruned = []       # empty folders to remove, deepest first
+        self.deleted = []      # .txt files to delete
+        self.conflicts = []    # (source, destination, reason): plan cannot run
+
+    def count(self, op):
+        return sum(1 for step in self.steps if step[0] == op)
+
+    def summary(self):
+        return (f"{self.count('move'):,} moves, {self.count('mkdir'):,} new folders, "
+                f"{self.count('rmdir') + len(self.pruned):,} folders removed, "
+                f"{len(self.deleted):,} .txt files deleted, {len(self.conflicts):,} conflicts")
+
+    def report(self):
+        rel = lambda p: os.path.relpath(p, self.base_dir)
+        lines = [f"Organize plan for {self.base_dir}", self.summary(), ""]
+        lines += [f"CONFLICT {rel(src)} -> {rel(dst)}: {reason}" for src, dst, reason in self.conflicts]
+        for op, *paths in self.steps:
+            lines.append(f"{op.upper():<8} " + " -> ".join(rel(p) for p in paths))
+        lines += [f"RMDIR    {rel(p)}" for p in self.pruned]
+        lines += [f"DELETE   {rel(p)}" for p in self.deleted]
+        return "\n".join(lines)
+
+
+# ---------------------------------------
+# Scan
+# ---------------------------------------
+def scan_tree(base_dir):
+    """Single scandir pass. Returns (root node, folders in os.walk bottom-up order)."""
+    root = _Dir(os.path.basename(base_dir))
+    order = []
+    # Iterative post-order: (node, path, child folders still to visit)
+    stack = [(root, base_dir, None)]
+    while stack:
+        node, path, pending = stack.pop()
+        if pending is None:
+            try:
+                with os.scandir(path) as it:
+                    for e in it:
+                        if e.is_dir(follow_symlinks=False):
+                            node.children[e.name] = _Dir(e.name, node)
+                        elif e.is_dir():
+                            node.children[e.name] = LINKED_DIR
+                        else:
+                            node.children[e.name] = FILE
+            except OSError:
+                pass
+            pending = [c for c in node.children.values() if isinstance(c, _Dir)]
+            pending.reverse()
+        if pending:
+            child = pending.pop()
+            stack.append((node, path, pending))
+            stack.append((child, os.path.join(path, child.name), None))
+        else:
+            order.append(node)
+    return root, order
+
+
+# ---------------------------------------
+# Plan
+# ---------------------------------------
+def _ensure_dir(plan, parent, name):
+    child = parent.children.get(name)
+    if isinstance(child, _Dir):
+        return child
+    path = os.path.join(parent.path(plan.base_dir), name)
+    if child is not None:
+        plan.conflicts.append((path, path, "a file is in the way of this folder"))
+        return None
+    child = _Dir(name, parent)
+    parent.children[name] = child
+    plan.steps.append(("mkdir", path))
+    return child
+
+
+def _is_inside(node, ancestor):
+    while node is not None:
+        if node is ancestor:
+            return True
+        node = node.parent
+    return False
+
+
+def _plan_folder(plan, root, folder):
+    parts = folder.name.split('-')
+    week, absentee, city, state = parts[0], parts[2], parts[-2], parts[-1]
+    target = root
+    for name in (state, city, week, absentee):
+        target = _ensure_dir(plan, target, name)
+        if target is None:
+            return
+    folder_path = folder.path(plan.base_dir)
+    if _is_inside(target, folder):
+        plan.conflicts.append((folder_path, target.path(plan.base_dir), "destination is inside the folder"))
+        return
+
+    for name, item in list(folder.children.items()):
+        src = os.path.join(folder_path, name)
+        dest_parent = target
+        existing = target.children.get(name)
+        # shutil.move semantics: an existing folder at the destination receives the item
+        if isinstance(existing, _Dir):
+            dest_parent = existing
+            existing = existing.children.get(name)
+            if existing is not None:
+                plan.conflicts.append((src, os.path.join(dest_parent.path(plan.base_dir), name),
+                                       "destination path already exists"))
+                continue
+        elif existing is not None and item is not FILE:
+            plan.conflicts.append((src, os.path.join(target.path(plan.base_dir), name),
+                                   "a file is in the way of this folder"))
+            continue
+        plan.steps.append(("move", src, os.path.join(dest_parent.path(plan.base_dir), name)))
+        del folder.children[name]
+        dest_parent.children[name] = item
+        if isinstance(item, _Dir):
+            item.parent = dest_parent
+
+    if not folder.children:
+        del folder.parent.children[folder.name]
+        plan.steps.append(("rmdir", folder_path))
+
+
+def plan_organization(base_dir):
+    """Build the full move / remove / delete plan without touching the disk."""
+    base_dir = os.path.abspath(base_dir)
+    plan = OrganizePlan(base_dir)
+    root, order = scan_tree(base_dir)
+
+    # Pass 1: each folder's matching subfolders as listed by the scan,
+    # deepest folders first (os.walk topdown=False)
+    listed = [(node, [c for c in node.children.values() if isinstance(c, _Dir)]) for node in order]
+    for node, subfolders in listed:
+        for child in subfolders:
+            if len(child.name.split('-')) >= 4 and node.children.get(child.name) is child:
+                _plan_folder(plan, root, child)
+
+    # Pass 2: empty folders, bottom-up so emptied parents go too (.txt files still count)
+    def prune(node):
+        for child in [c for c in node.children.values() if isinstance(c, _Dir)]:
+            prune(child)
+            if not child.children:
+                plan.pruned.append(child.path(base_dir))
+                del node.children[child.name]
+
+    # Pass 3: .txt files anywhere in what is left
+    def collect_txt(node, path):
+        for name, child in node.children.items():
+            if isinstance(child, _Dir):
+                collect_txt(child, os.path.join(path, name))
+            elif child is FILE and name.lower().endswith(".txt"):
+                plan.deleted.append(os.path.join(path, name))
+
+    prune(root)
+    collect_txt(root, base_dir)
+    return plan
+
+
+# ---------------------------------------
+# Execute
+# ---------------------------------------
+def _move(src, dst):
+    try:
+        os.replace(src, dst)  # same filesystem: a rename, overwriting a file like shutil.move
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.move(src, dst)  # across devices: copy + delete
+
+
+def execute_plan(plan):
+    """Apply a plan from plan_organization(). Refuses to start if it has conflicts."""
+    if plan.conflicts:
+        src, dst, reason = plan.conflicts[0]
+        raise shutil.Error(f"{len(plan.conflicts)} conflict(s), nothing changed. First: {src} -> {dst}: {reason}")
+    for op, *paths in plan.steps:
+        if op == "mkdir":
+            os.makedirs(paths[0], exist_ok=True)
+        elif op == "move":
+            _move(*paths)
+        else:
+            shutil.rmtree(paths[0], ignore_errors=True)
+    for path in plan.pruned:
+        os.rmdir(path)
+    for path in plan.deleted:
+        os.remove(path)
@@ -1,12 +1,13 @@
 # utils/gen_coloumns_adder.py
 import os
+import numpy as np
 import pandas as pd
-import tkinter as tk
-from tkinter import filedialog, ttk
-import ttkbootstrap as tb
 from openpyxl import load_workbook
 from openpyxl.styles import Font, Border
 
+from .master_cache import MasterCache
+from .progress import open_reporting, report
+
 # ---------------------------------------
 # Helpers
 # ---------------------------------------
@@ -76,27 +77,120 @@ def save_file(df, file_path, new_columns=None):
 def load_file(file_path):
     """Load CSV or Excel into DataFrame."""
     ext = os.path.splitext(file_path)[1].lower()
-    if ext == ".csv":
-        return pd.read_csv(file_path, dtype=str).fillna("")
-    else:
-        return pd.read_excel(file_path, dtype=str).fillna("")
+    with open_reporting(file_path) as f:
+        if ext == ".csv":
+            return pd.read_csv(f, dtype=str).fillna("")
+        else:
+            return pd.read_excel(f, dtype=str).fillna("")
+
+
+# ---------------------------------------
+# Composite-key join
+# ---------------------------------------
+JOIN_MODES = {
+    "First matching pair": "single",
+    "Composite key (all pairs)": "composite",
+}
+DUPLICATE_POLICIES = ["last", "first", "error"]
+
+
+def hash_key_columns(df, columns):
+    """One uint64 hash per row for the given key columns (compared as strings)."""
+    keys = df[list(columns)].astype(str)
+    keys.columns = range(len(keys.columns))
+    return pd.util.hash_pandas_object(keys, index=False).to_numpy()
+
+
+class CompositeKeyIndex:
+    """
+    Hash index over the master's key columns, built once per run.
+    duplicate_policy decides which master row wins when a key repeats:
+    'last' (old dict behaviour), 'first', or 'error' (raise ValueError).
+    """
+
+    def __init__(self, master_df, master_keys, source_cols, duplicate_policy="last"):
+        if duplicate_policy not in DUPLICATE_POLICIES:
+            raise ValueError(f"duplicate_policy must be one of {DUPLICATE_POLICIES}")
+        self.source_cols = list(source_cols)
+
+        key_hash = pd.Series(hash_key_columns(master_df, master_keys))
+        repeated = key_hash.duplicated(keep=False).to_numpy()
+        if duplicate_policy == "error" and repeated.any():
+            n_keys = key_hash[repeated].nunique()
+            raise ValueError(f"{n_keys} key(s) repeat across {int(repeated.sum())} master rows "
+                             f"({' + '.join(master_keys)})")
+
+        # 'error' got here only if no key repeats: any keep works
+        keep = "last" if duplicate_policy == "last" else "first"
+        winners = ~key_hash.duplicated(keep=keep).to_numpy()
+        self.lookup = pd.Index(key_hash.to_numpy()[winners])
+        self.ambiguous = pd.Index(key_hash.to_numpy()[repeated]).unique()
+        self.values = master_df.loc[winners, self.source_cols].astype(str).to_numpy(dtype=object)
+
+    def join(self, df, folder_keys):
+        """Return (values array aligned to df rows, stats dict)."""
+        row_hash = hash_key_columns(df, folder_keys)
+        pos = self.lookup.get_indexer(row_hash)
+        found = pos >= 0
+
+        out = np.full((len(df), len(self.source_cols)), "", dtype=object)
+        out[found] = self.values[pos[found]]
+
+        stats = {
+            "matched": int(found.sum()),
+            "missed": int((~found).sum()),
+            "ambiguous": int((self.ambiguous.get_indexer(row_hash[found]) >= 0).sum()),
+        }
+        return out, stats
+
+
+def _place_column(df, new_col_name, after_col, before_col):
+    cols = list(df.columns)
+    if after_col and after_col in cols:
+        cols.remove(new_col_name)
+        insert_at = cols.index(after_col) + 1
+        cols.insert(insert_at, new_col_name)
+        df = df[cols]
+    if before_col and before_col in cols:
+        cols.remove(new_col_name)
+        insert_at = cols.index(before_col)
+        cols.insert(insert_at, new_col_name)
+        df = df[cols]
+    return df
 
 
 # ---------------------------------------
 # Core Logic
 # ---------------------------------------
-def apply_column_addition(master_file, folder, mapped_pairs, new_columns, progress_callback=None):
-    """Apply new columns from master file to all Excel/CSV files in folder recursively."""
+def load_master(master_file, mapped_pairs, new_columns, use_cache=True):
+    """Load only the master columns the run needs, via the persistent cache.
+    Returns (master_df, cache_hit)."""
+    if not use_cache:
+        return load_file(master_file), False
+    needed = {m for m, _ in mapped_pairs}
+    needed.update(src for src, *_ in new_columns if src)
+    return MasterCache().load(master_file, columns=needed)
+
+
+def apply_column_addition(master_file, folder, mapped_pairs, new_columns, progress_callback=None,
+                          use_cache=True, cache_callback=None, join_mode="single", duplicate_policy="last"):
+    """Apply new columns from master file to all Excel/CSV files in folder recursively.
+
+    join_mode="single" maps each column through the first usable (master, target) pair;
+    join_mode="composite" matches on ALL mapped pairs at once and adds every column in one join.
+    """
     try:
-        master_df = load_file(master_file)
+        master_df, cache_hit = load_master(master_file, mapped_pairs, new_columns, use_cache)
     except Exception as e:
         return f"❌ Failed to read master file: {e}"
+    if cache_callback:
+        cache_callback(cache_hit)
 
-    files = []
-    for root_dir, _, fs in os.walk(folder):
-        for fname in fs:
-            if fname.lower().endswith((".xlsx", ".csv")):
-                files.append(os.path.join(root_dir, fname))
+    if join_mode == "composite":
+        return _apply_composite(master_df, folder, mapped_pairs, new_columns,
+                                duplicate_policy, progress_callback)
+
+    files = _find_target_files(folder)
 
     total_files = len(files)
     if total_files == 0:
@@ -131,31 +225,89 @@ def apply_column_addition(master_file, folder, mapped_pairs, new_columns, progre
                 added_cols.append(new_col_name)
 
             # Reorder columns
-            cols = list(df.columns)
-            if after_col and after_col in cols:
-                cols.remove(new_col_name)
-                insert_at = cols.index(after_col) + 1
-                cols.insert(insert_at, new_col_name)
-                df = df[cols]
-            if before_col and before_col in cols:
-                cols.remove(new_col_name)
-                insert_at = cols.index(before_col)
-                cols.insert(insert_at, new_col_name)
-                df = df[cols]
+            df = _place_column(df, new_col_name, after_col, before_col)
 
         # Save cleaned
         save_file(df, file_path, new_columns=added_cols)
 
+        report(stage="Adding columns", done=i, total=total_files, unit="files")
         if progress_callback:
             progress_callback(i, total_files)
 
     return f"✅ Done — processed {total_files} file(s) recursively in folder."
 
 
+def _find_target_files(folder):
+    files = []
+    for root_dir, _, fs in os.walk(folder):
+        for fname in fs:
+            if fname.lower().endswith((".xlsx", ".csv")):
+                files.append(os.path.join(root_dir, fname))
+    return files
+
+
+def _apply_composite(master_df, folder, mapped_pairs, new_columns, duplicate_policy, progress_callback):
+    master_keys = [m for m, _ in mapped_pairs]
+    folder_keys = [f for _, f in mapped_pairs]
+    missing = [c for c in master_keys if c not in master_df.columns]
+    if missing:
+        return f"❌ Master file has no column(s): {', '.join(missing)}"
+
+    specs = [spec for spec in new_columns if spec[0] and spec[1]]
+    source_cols = [src for src, *_ in specs if src in master_df.columns]
+    try:
+        index = CompositeKeyIndex(master_df, master_keys, source_cols, duplicate_policy)
+    except ValueError as e:
+        return f"❌ Duplicate master keys: {e}"
+
+    files = _find_target_files(folder)
+    total_files = len(files)
+    if total_files == 0:
+        return "⚠️ No CSV/Excel files found in target folder."
+
+    totals = {"matched": 0, "missed": 0, "ambiguous": 0}
+    for i, file_path in enumerate(files, start=1):
+        try:
+            df = load_file(file_path)
+        except Exception:
+            continue
+
+        if all(c in df.columns for c in folder_keys):
+            joined, stats = index.join(df, folder_keys)
+        else:
+            joined = np.full((len(df), len(source_cols)), "", dtype=object)
+            stats = {"matched": 0, "missed": len(df), "ambiguous": 0}
+        for key in totals:
+            totals[key] += stats[key]
+
+        # One join per file: every requested column comes from the same row lookup
+        by_source = {src: joined[:, j] for j, src in enumerate(source_cols)}
+        added_cols = []
+        for source_master_col, new_col_name, after_col, before_col in specs:
+            df[new_col_name] = by_source.get(source_master_col, "")
+            added_cols.append(new_col_name)
+            df = _place_column(df, new_col_name, after_col, before_col)
+
+        save_file(df, file_path, new_columns=added_cols)
+
+        report(stage="Adding columns", done=i, total=total_files, unit="files")
+        if progress_callback:
+            progress_callback(i, total_files)
+
+    return (f"✅ Done — processed {total_files} file(s) on key {' + '.join(folder_keys)}. "
+            f"Rows matched: {totals['matched']:,}, missed: {totals['missed']:,}, "
+            f"ambiguous: {totals['ambiguous']:,}")
+
+
 # ---------------------------------------
 # Dashboard
 # ---------------------------------------
 def run_column_adder(root):
+    # Tk is imported here so the CLI can use apply_column_addition headless
+    import tkinter as tk
+    from tkinter import filedialog, ttk
+    import ttkbootstrap as tb
+
     win = tb.Toplevel(root)
     win.title("Column Adder Dashboard")
     win.geometry("1200x800")
@@ -164,6 +316,10 @@ def run_column_adder(root):
     master_var = tk.StringVar()
     folder_var = tk.StringVar()
     status_var = tk.StringVar(value="Ready")
+    use_cache_var = tk.BooleanVar(value=True)
+    join_mode_var = tk.StringVar(value=list(JOIN_MODES)[0])
+    dup_policy_var = tk.StringVar(value=DUPLICATE_POLICIES[0])
+    cache_var = tk.StringVar(value="Master cache: —")
 
     master_cols = []
     target_cols = []
@@ -292,18 +448,41 @@ def run_column_adder(root):
             progress["value"] = done
             win.update_idletasks()
 
+        def update_cache(hit):
+            if hit:
+                cache_var.set("⚡ Master cache: HIT (loaded from cache)")
+            elif use_cache_var.get():
+                cache_var.set("💾 Master cache: miss (parsed and cached)")
+            else:
+                cache_var.set("Master cache: off")
+            win.update_idletasks()
+
         status_var.set("⏳ Processing...")
         win.update_idletasks()
         result = apply_column_addition(master_var.get(), folder_var.get(),
-                                       mapped_pairs, new_columns, progress_callback=update_progress)
+                                       mapped_pairs, new_columns, progress_callback=update_progress,
+                                       use_cache=use_cache_var.get(), cache_callback=update_cache,
+                                       join_mode=JOIN_MODES[join_mode_var.get()],
+                                       duplicate_policy=dup_policy_var.get())
         status_var.set(result)
 
-    tb.Button(win, text="▶ Run Column Addition", bootstyle="primary",
-              width=24, command=run_action).pack(pady=10)
+    run_frame = tb.Frame(win)
+    run_frame.pack(pady=10)
+    tb.Button(run_frame, text="▶ Run Column Addition", bootstyle="primary",
+              width=24, command=run_action).pack(side="left", padx=6)
+    tb.Checkbutton(run_frame, text="Use master cache", variable=use_cache_var,
+                   bootstyle="round-toggle").pack(side="left", padx=6)
+    tb.Label(run_frame, text="Join:").pack(side="left", padx=(12, 2))
+    ttk.Combobox(run_frame, textvariable=join_mode_var, values=list(JOIN_MODES),
+                 state="readonly", width=24).pack(side="left")
+    tb.Label(run_frame, text="Duplicate master keys:").pack(side="left", padx=(12, 2))
+    ttk.Combobox(run_frame, textvariable=dup_policy_var, values=DUPLICATE_POLICIES,
+                 state="readonly", width=8).pack(side="left")
 
     status_bar = tb.Frame(win)
     status_bar.pack(fill="x", pady=(4,0))
     tb.Label(status_bar, textvariable=status_var, anchor="w").pack(fill="x")
+    tb.Label(status_bar, textvariable=cache_var, anchor="w", bootstyle="info").pack(fill="x")
 
     # ---------- Helpers ----------
     def refresh_listboxes():
@@ -323,7 +502,7 @@ def run_column_adder(root):
         if path:
             master_var.set(path)
             try:
-                cols = list(load_file(path).columns.astype(str))
+                cols = MasterCache().header(path)
             except Exception:
                 cols = []
             master_cols.clear()
@@ -1,6 +1,7 @@
 import pandas as pd
 import os
 from .helpers import ensure_folder
+from .progress import open_reporting, report
 
 def step_05_reshape(df):
     def extract_numeric_phone(phone):
@@ -11,7 +12,9 @@ def step_05_reshape(df):
     phone_cols = [col for col in df.columns if col.lower().startswith("phone")]
 
     output_rows = []
-    for _, row in df.iterrows():
+    for i, (_, row) in enumerate(df.iterrows()):
+        if i % 500 == 0:
+            report(stage="Reshaping for GHL", done=i, total=len(df), unit="rows")
         # collect valid phones
         phone_numbers = []
         for phone_col in phone_cols:
@@ -33,6 +36,7 @@ def step_05_reshape(df):
             new_row["Phone"] = phone
             output_rows.append(new_row)
 
+    report(stage="Reshaping for GHL", done=len(df), total=len(df), unit="rows")
     reshaped = pd.DataFrame(output_rows)
 
     # 🔎 Reorder columns
@@ -58,7 +62,8 @@ def run_step05_pipeline(input_file):
     input_dir = os.path.dirname(input_file)
 
     # read input
-    df = pd.read_csv(input_file) if input_file.endswith(".csv") else pd.read_excel(input_file)
+    with open_reporting(input_file) as f:
+        df = pd.read_csv(f) if input_file.endswith(".csv") else pd.read_excel(f)
 
     # reshape
     reshaped = step_05_reshape(df)
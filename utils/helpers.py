@@ -15,3 +15,11 @@ def save_excel(df, filepath):
         fmt = workbook.add_format({"border": 0})
         for col, val in enumerate(df_to_save.columns):
             worksheet.write(0, col, val, fmt)
+
+
+def app_data_dir(*parts):
+    """Per-user folder for caches/profiles (override with HITROTECH_DATA_DIR)."""
+    base = os.environ.get("HITROTECH_DATA_DIR") or os.path.join(os.path.expanduser("~"), ".hitrotech")
+    folder = os.path.join(base, *parts)
+    os.makedirs(folder, exist_ok=True)
+    return folder
@@ -0,0 +1,258 @@
+# utils/instrumentation.py
+# Per-step timing / memory metrics and buffered text logs for the pipelines (no Tk import).
+#
+#   @instrument()                       step function: rows in = first DataFrame argument,
+#   def step_03_dedupe_and_cleanup(df, ...)   rows out = returned DataFrame (or its first item)
+#
+# Metrics go to the active PipelineRun (utils/run_tracking.py); with no run active
+# the wrapper just calls the function. Each metric: wall / CPU seconds, peak RSS
+# growth, rows in / out and rows per second. Each measured step is also a progress
+# stage (utils/progress.py): 0 of rows in when it starts, all of them when it ends.
+import os
+import sys
+import time
+import atexit
+import functools
+import threading
+import contextvars
+
+from .progress import report
+
+_active = contextvars.ContextVar("instrumentation_collector", default=None)
+
+
+# ---------------------------------------
+# Process / system memory
+# ---------------------------------------
+if sys.platform == "win32":
+    import ctypes
+    from ctypes import wintypes
+
+    class _MemoryCounters(ctypes.Structure):
+        _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                    ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                    ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                    ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+    def peak_rss():
+        """Peak resident set size of this process in bytes (None where unknown)."""
+        counters = _MemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        try:
+            ok = ctypes.windll.psapi.GetProcessMemoryInfo(
+                ctypes.windll.kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb)
+        except (AttributeError, OSError):
+            return None
+        return counters.PeakWorkingSetSize if ok else None
+
+    class _MemoryStatus(ctypes.Structure):
+        _fields_ = [("dwLength", wintypes.DWORD), ("dwMemoryLoad", wintypes.DWORD),
+                    ("ullTotalPhys", ctypes.c_ulonglong), ("ullAvailPhys", ctypes.c_ulonglong),
+                    ("ullTotalPageFile", ctypes.c_ulonglong), ("ullAvailPageFile", ctypes.c_ulonglong),
+                    ("ullTotalVirtual", ctypes.c_ulonglong), ("ullAvailVirtual", ctypes.c_ulonglong),
+                    ("ullAvailExtendedVirtual", ctypes.c_ulonglong)]
+
+    def available_memory():
+        """Physical memory free for new work in bytes (None where unknown)."""
+        status = _MemoryStatus()
+        status.dwLength = ctypes.sizeof(status)
+        try:
+            ok = ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status))
+        except (AttributeError, OSError):
+            return None
+        return status.ullAvailPhys if ok else None
+else:
+    try:
+        import resource
+    except ImportError:
+        resource = None
+    _RSS_UNIT = 1 if sys.platform == "darwin" else 1024  # ru_maxrss: bytes on macOS, KiB on Linux
+
+    def peak_rss():
+        """Peak resident set size of this process in bytes (None where unknown)."""
+        if resource is None:
+            return None
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _RSS_UNIT
+
+    def available_memory():
+        """Physical memory free for new work in bytes (None where unknown)."""
+        try:
+            with open("/proc/meminfo") as f:
+                for line in f:
+                    if line.startswith("MemAvailable:"):
+                        return int(line.split()[1]) * 1024
+        except (OSError, ValueError, IndexError):
+            pass
+        return None
+
+
+# ---------------------------------------
+# Metrics
+# ---------------------------------------
+def _rows(value):
+    if isinstance(value, tuple) and value:
+        value = value[0]
+    return len(value) if hasattr(value, "columns") else None
+
+
+class Stage:
+    """One measured call; use as a context manager and set rows_out before it closes."""
+
+    def __init__(self, name, rows_in=None):
+        self.name = name
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.metrics = None
+
+    def __enter__(self):
+        report(stage=self.name, done=0 if self.rows_in is not None else None, total=self.rows_in, unit="rows")
+        self._rss = peak_rss()
+        self._cpu = time.process_time()
+        self._wall = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self._wall
+        cpu = time.process_time() - self._cpu
+        rss = peak_rss()
+        rows = self.rows_in if self.rows_in is not None else self.rows_out
+        self.metrics = {
+            "name": self.name,
+            "wall_seconds": round(wall, 4),
+            "cpu_seconds": round(cpu, 4),
+            "peak_rss_delta_mb": round((rss - self._rss) / 2**20, 1) if rss is not None and self._rss is not None else None,
+            "peak_rss_mb": round(rss / 2**20, 1) if rss is not None else None,
+            "rows_in": self.rows_in,
+            "rows_out": self.rows_out,
+            "rows_per_s": round(rows / wall) if rows and wall > 0 else None,
+            "ok": exc_type is None,
+        }
+        collector = _active.get()
+        if collector is not None:
+            collector.add_metric(self.metrics)
+        if exc_type is None and rows is not None:
+            report(stage=self.name, done=rows, total=rows, unit="rows")
+        return False
+
+
+def instrument(name=None, describe=None):
+    """
+    Decorator: measure each call while a collector is active.
+    describe(*args, **kwargs) -> text appended to the name, e.g. the target folder.
+    """
+    def decorate(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _active.get() is None:
+                return func(*args, **kwargs)
+            stage_name = label
+            if describe is not None:
+                try:
+                    stage_name = f"{label} ({describe(*args, **kwargs)})"
+                except Exception:
+                    pass
+            rows_in = next((len(a) for a in args if hasattr(a, "columns")), None)
+            with Stage(stage_name, rows_in) as stage:
+                result = func(*args, **kwargs)
+                stage.rows_out = _rows(result)
+            return result
+        return wrapper
+    return decorate
+
+
+def output_folder_name(df, folder, *args, **kwargs):
+    """describe= for save_to_folder(df, folder, ...): the output folder's name."""
+    return os.path.basename(folder)
+
+
+def file_folder_name(path, *args, **kwargs):
+    """describe= for helpers that rewrite one file: the name of its folder."""
+    return os.path.basename(os.path.dirname(path))
+
+
+def activate(collector):
+    """Route metrics to collector (anything with add_metric(dict)); returns a token for deactivate()."""
+    return _active.set(collector)
+
+
+def deactivate(token):
+    _active.reset(token)
+
+
+def format_metric(m):
+    """One tracker line. No "label: number" pair, so the record count parsers skip it."""
+    parts = [f"[perf] {m['name']}", f"{m['wall_seconds']:.3f}s wall", f"{m['cpu_seconds']:.3f}s cpu"]
+    if m.get("peak_rss_delta_mb") is not None:
+        parts.append(f"+{m['peak_rss_delta_mb']:.1f} MB peak RSS")
+    if m.get("rows_in") is not None or m.get("rows_out") is not None:
+        rows_in = "-" if m.get("rows_in") is None else f"{m['rows_in']:,}"
+        rows_out = "-" if m.get("rows_out") is None else f"{m['rows_out']:,}"
+        parts.append(f"{rows_in} -> {rows_out} rows")
+    if m.get("rows_per_s"):
+        parts.append(f"{m['rows_per_s']:,} rows/s")
+    if not m.get("ok", True):
+        parts.append("FAILED")
+    return " | ".join(parts)
+
+
+# ---------------------------------------
+# Buffered text logs
+# ---------------------------------------
+class BufferedLog:
+    """Text log kept in memory and appended to disk in one write per flush."""
+
+    def __init__(self, path, limit=256):
+        self.path = path
+        self.limit = limit
+        self.lines = []
+
+    def write(self, text):
+        with _logs_lock:
+            self.lines.append(text)
+            full = len(self.lines) >= self.limit
+        if full:
+            self.flush()
+
+    def flush(self):
+        with _logs_lock:
+            lines, self.lines = self.lines, []
+        if not lines:
+            return
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(self.path, "a") as f:
+            f.write("".join(lines))
+
+
+_logs = {}
+_logs_lock = threading.Lock()
+
+
+def buffered_log(path):
+    """The shared BufferedLog for path (created on first use)."""
+    key = os.path.abspath(path)
+    with _logs_lock:
+        log = _logs.get(key)
+        if log is None:
+            log = _logs[key] = BufferedLog(path)
+    return log
+
+
+def flush_logs(path=None):
+    """Write out pending lines for one log, or for all of them."""
+    with _logs_lock:
+        if path is None:
+            logs = list(_logs.values())
+            _logs.clear()
+        else:
+            log = _logs.pop(os.path.abspath(path), None)
+            logs = [log] if log is not None else []
+    for log in logs:
+        log.flush()
+
+
+atexit.register(flush_logs)
@@ -0,0 +1,268 @@
+# utils/job_executor.py
+# Process-pool job queue for the GUI's heavy actions (no Tk import).
+#
+#   jobs = JobExecutor(max_running=2)
+#   jobs.submit("Listbuilding: Drop 12", "pipeline.listbuilding_pipeline:process_directory", folder,
+#               memory_mb=estimate_memory_mb(files), on_done=..., on_error=...)
+#   root.after(150, poll)  ->  jobs.poll()   # on the Tk thread: updates jobs, runs callbacks
+#
+# Targets are "module:function" strings, so a job never pickles a closure or a widget.
+# Jobs wait in a visible queue and start while fewer than max_running are running and the
+# machine has memory for them (estimate_memory_mb). Inside a job, utils.progress.report()
+# events reach the app (Job.progress, a ProgressState) and checkpoint() ends the job with
+# JobCancelled once it was cancelled; PipelineRun.lap() calls it, so every pipeline stage
+# is a cancellation point. Callbacks run in poll(), i.e. on whatever thread calls poll().
+import os
+import time
+import queue
+import itertools
+import importlib
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from .instrumentation import available_memory
+from .profiling import profiling
+from .progress import ProgressState, reporting
+
+DEFAULT_MAX_RUNNING = 2
+MEMORY_RESERVE_MB = 1024     # left free for the app and the OS
+# Peak memory of a pipeline run per MB of input (pandas frames + Excel writer buffers)
+MEMORY_FACTOR = {".csv": 6, ".xlsx": 25}
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+
+# Fresh worker processes on every OS: forking a process that runs Tk and threads is unsafe
+_CONTEXT = multiprocessing.get_context("spawn")
+
+
+class JobCancelled(BaseException):
+    """Raised by checkpoint() in a cancelled job. BaseException, so the pipelines'
+    `except Exception` per-file handlers do not swallow it and carry on."""
+
+
+# ---------------------------------------
+# Worker side
+# ---------------------------------------
+_current = None  # (job id, event queue, cancelled ids) while a job runs in this process
+
+
+def _run_job(job_id, target, args, kwargs, profile, events, cancelled):
+    global _current
+    _current = (job_id, events, cancelled)
+    try:
+        module_name, func_name = target.split(":")
+        func = getattr(importlib.import_module(module_name), func_name)
+        with profiling(profile), reporting(report_progress):
+            return func(*args, **kwargs)
+    finally:
+        _current = None
+
+
+def report_progress(event):
+    """Progress sink of a running job: send the event to the app; no-op outside a job."""
+    if _current is None:
+        return
+    job_id, events, _ = _current
+    try:
+        events.put((job_id, event))
+    except (OSError, EOFError):  # app closed while the job ran
+        pass
+
+
+def checkpoint():
+    """End the running job if it was cancelled; no-op outside a job."""
+    if _current is None:
+        return
+    job_id, _, cancelled = _current
+    try:
+        stop = job_id in cancelled
+    except (OSError, EOFError):
+        return
+    if stop:
+        raise JobCancelled("Job cancelled")
+
+
+# ---------------------------------------
+# App side
+# ---------------------------------------
+def estimate_memory_mb(paths):
+    """Rough peak memory of processing these input files."""
+    total = 0
+    for path in paths:
+        try:
+            size_mb = os.path.getsize(path) / 2**20
+        except OSError:
+            continue
+        total += size_mb * MEMORY_FACTOR.get(os.path.splitext(path)[1].lower(), 10)
+    return int(total)
+
+
+class Job:
+    def __init__(self, job_id, title, target, args, kwargs, memory_mb, profile, on_done, on_error):
+        self.id = job_id
+        self.title = title
+        self.target = target
+        self.args = args
+        self.kwargs = kwargs
+        self.memory_mb = memory_mb
+        self.profile = profile
+        self.on_done = on_done
+        self.on_error = on_error
+        self.status = QUEUED
+        self.progress = ProgressState()
+        self.result = None
+        self.error = None
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self.future = None
+
+    @property
+    def elapsed(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+
+class JobExecutor:
+    """Queue + admission in front of a process pool; see the module comment."""
+
+    def __init__(self, max_running=DEFAULT_MAX_RUNNING, memory_reserve_mb=MEMORY_RESERVE_MB):
+        self.max_running = max(1, max_running)
+        self.memory_reserve_mb = memory_reserve_mb
+        self._jobs = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.RLock()
+        self._finished = queue.Queue()  # jobs whose callbacks poll() still has to run
+        self._pool = None
+        self._manager = None
+        self._events = None
+        self._cancelled = None
+
+    # ---- public
+    def submit(self, title, target, *args, memory_mb=0, profile=False, on_done=None, on_error=None, **kwargs):
+        with self._lock:
+            job = Job(next(self._ids), title, target, args, kwargs, memory_mb, profile, on_done, on_error)
+            self._jobs[job.id] = job
+            self._schedule()
+        return job
+
+    def cancel(self, job_id):
+        """Queued jobs are dropped at once; running jobs stop at their next checkpoint()."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status not in (QUEUED, RUNNING):
+                return False
+            if job.status == QUEUED:
+                self._finish(job, CANCELLED, error=JobCancelled("Cancelled before it started"))
+            else:
+                self._cancelled[job.id] = True
+        return True
+
+    def set_max_running(self, value):
+        with self._lock:
+            self.max_running = max(1, int(value))
+            self._schedule()
+
+    def jobs(self):
+        with self._lock:
+            return list(self._jobs.values())
+
+    def active(self):
+        return [job for job in self.jobs() if job.status in (QUEUED, RUNNING)]
+
+    def clear_finished(self):
+        with self._lock:
+            for job_id in [j.id for j in self._jobs.values() if j.status not in (QUEUED, RUNNING)]:
+                del self._jobs[job_id]
+
+    def poll(self):
+        """Apply progress from the workers and run finished jobs' callbacks (call on the UI thread)."""
+        if self._events is not None:
+            while True:
+                try:
+                    job_id, info = self._events.get_nowait()
+                except (queue.Empty, OSError, EOFError):
+                    break
+                job = self._jobs.get(job_id)
+                if job is not None:
+                    job.progress.update(info)
+        while True:
+            try:
+                job = self._finished.get_nowait()
+            except queue.Empty:
+                break
+            callback = job.on_done if job.status == DONE else job.on_error
+            if callback is not None:
+                callback(job)
+
+    def shutdown(self):
+        with self._lock:
+            for job in self._jobs.values():
+                if job.status == QUEUED:
+                    job.status = CANCELLED
+                elif job.status == RUNNING:
+                    self._cancelled[job.id] = True
+        if self._pool is not None:
+            # The manager stays up: at exit the pool waits for running jobs, which need
+            # it to see their cancel flag at the next checkpoint()
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+    # ---- internals (called with the lock held)
+    def _start_pool(self):
+        self._manager = _CONTEXT.Manager()
+        self._events = self._manager.Queue()
+        self._cancelled = self._manager.dict()
+        # Sized for the largest max_running; processes only start when jobs need them
+        self._pool = ProcessPoolExecutor(max_workers=max(os.cpu_count() or 1, self.max_running), mp_context=_CONTEXT)
+
+    def _admit(self, job, running):
+        if not running:
+            return True  # never stall the queue: one job always runs
+        free = available_memory()
+        if free is None or not job.memory_mb:
+            return True
+        reserved = sum(j.memory_mb for j in running)  # running jobs may not have reached their peak yet
+        return job.memory_mb + reserved <= free / 2**20 - self.memory_reserve_mb
+
+    def _schedule(self):
+        running = [j for j in self._jobs.values() if j.status == RUNNING]
+        for job in sorted(self._jobs.values(), key=lambda j: j.id):
+            if job.status != QUEUED:
+                continue
+            if len(running) >= self.max_running or not self._admit(job, running):
+                break  # first come, first served
+            if self._pool is None:
+                self._start_pool()
+            try:
+                future = self._pool.submit(_run_job, job.id, job.target, job.args, job.kwargs,
+                                           job.profile, self._events, self._cancelled)
+            except RuntimeError:  # the pool was shut down (app closing / interpreter exit)
+                self._finish(job, CANCELLED, error=JobCancelled("The app was closing"))
+                continue
+            job.status = RUNNING
+            job.started = time.time()
+            job.future = future
+            job.future.add_done_callback(lambda future, job=job: self._on_future_done(job, future))
+            running.append(job)
+
+    def _finish(self, job, status, result=None, error=None):
+        job.status = status
+        job.result = result
+        job.error = error
+        job.finished = time.time()
+        self._finished.put(job)
+
+    def _on_future_done(self, job, future):
+        with self._lock:
+            error = future.exception() if not future.cancelled() else JobCancelled("Cancelled")
+            if error is None:
+                self._finish(job, DONE, result=future.result())
+            elif isinstance(error, JobCancelled):
+                self._finish(job, CANCELLED, error=error)
+            else:
+                self._finish(job, FAILED, error=error)
+            if self._cancelled is not None:
+                self._cancelled.pop(job.id, None)
+            self._schedule()
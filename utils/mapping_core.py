@@ -0,0 +1,557 @@
+# utils/mapping_core.py
+# Tk-free mapping logic shared by the Column Mapper window and headless batch runs.
+import os
+import re
+import numpy as np
+import pandas as pd
+
+from .progress import open_reporting, report
+
+# Standard schema - now editable
+# Updated REQUIRED_COLUMNS with phone types and email
+REQUIRED_COLUMNS = [
+    "First Name", "Last Name", "Property Address", "Property City", "Property State", "Property Zip",
+    "Mailing Address", "Mailing City", "Mailing State", "Mailing Zip",
+    "Phone1", "Type1", "Phone2", "Type2", "Phone3", "Type3", 
+    "Phone4", "Type4", "Phone5", "Type5", "Phone6", "Type6", 
+    "Email", "List"
+]
+
+# Expanded auto-map dictionary with variations for all required columns including phone types and email
+AUTO_MAP_DICT = {
+    # First Name variations (10)
+    'first_name': 'First Name',
+    'first name': 'First Name',
+    'firstname': 'First Name',
+    'fname': 'First Name',
+    'f_name': 'First Name',
+    'given_name': 'First Name',
+    'given name': 'First Name',
+    'givenname': 'First Name',
+    'first': 'First Name',
+    'fn': 'First Name',
+    
+    # Last Name variations (10)
+    'last_name': 'Last Name',
+    'last name': 'Last Name',
+    'lastname': 'Last Name',
+    'lname': 'Last Name',
+    'l_name': 'Last Name',
+    'surname': 'Last Name',
+    'family_name': 'Last Name',
+    'family name': 'Last Name',
+    'last': 'Last Name',
+    'ln': 'Last Name',
+    
+    # Property Address variations (10)
+    'associated_property_address_line_1': 'Property Address',
+    'property_address': 'Property Address',
+    'property address': 'Property Address',
+    'propertyaddress': 'Property Address',
+    'prop_address': 'Property Address',
+    'prop address': 'Property Address',
+    'property_street': 'Property Address',
+    'property street': 'Property Address',
+    'prop_street': 'Property Address',
+    'address': 'Property Address',
+    
+    # Property City variations (10)
+    'associated_property_address_city': 'Property City',
+    'property_city': 'Property City',
+    'property city': 'Property City',
+    'propertycity': 'Property City',
+    'prop_city': 'Property City',
+    'prop city': 'Property City',
+    'city': 'Property City',
+    'property_town': 'Property City',
+    'property town': 'Property City',
+    'prop_town': 'Property City',
+    
+    # Property State variations (10)
+    'associated_property_address_state': 'Property State',
+    'property_state': 'Property State',
+    'property state': 'Property State',
+    'propertystate': 'Property State',
+    'prop_state': 'Property State',
+    'prop state': 'Property State',
+    'state': 'Property State',
+    'property_province': 'Property State',
+    'property province': 'Property State',
+    'prop_province': 'Property State',
+    
+    # Property Zip variations (10)
+    'associated_property_address_zipcode': 'Property Zip',
+    'property_zip': 'Property Zip',
+    'property zip': 'Property Zip',
+    'propertyzip': 'Property Zip',
+    'prop_zip': 'Property Zip',
+    'prop zip': 'Property Zip',
+    'zip': 'Property Zip',
+    'property_zipcode': 'Property Zip',
+    'property zipcode': 'Property Zip',
+    'zipcode': 'Property Zip',
+    
+    # Mailing Address variations (10)
+    'primary_mailing_address': 'Mailing Address',
+    'mailing_address': 'Mailing Address',
+    'mailing address': 'Mailing Address',
+    'mailingaddress': 'Mailing Address',
+    'mail_address': 'Mailing Address',
+    'mail address': 'Mailing Address',
+    'mailing_street': 'Mailing Address',
+    'mailing street': 'Mailing Address',
+    'mail_street': 'Mailing Address',
+    'mailing_addr': 'Mailing Address',
+    
+    # Mailing City variations (10)
+    'primary_mailing_city': 'Mailing City',
+    'mailing_city': 'Mailing City',
+    'mailing city': 'Mailing City',
+    'mailingcity': 'Mailing City',
+    'mail_city': 'Mailing City',
+    'mail city': 'Mailing City',
+    'mailing_town': 'Mailing City',
+    'mailing town': 'Mailing City',
+    'mail_town': 'Mailing City',
+    'mailing_city_name': 'Mailing City',
+    
+    # Mailing State variations (10)
+    'primary_mailing_state': 'Mailing State',
+    'mailing_state': 'Mailing State',
+    'mailing state': 'Mailing State',
+    'mailingstate': 'Mailing State',
+    'mail_state': 'Mailing State',
+    'mail state': 'Mailing State',
+    'mailing_province': 'Mailing State',
+    'mailing province': 'Mailing State',
+    'mail_province': 'Mailing State',
+    'mailing_state_name': 'Mailing State',
+    
+    # Mailing Zip variations (10)
+    'primary_mailing_zip': 'Mailing Zip',
+    'mailing_zip': 'Mailing Zip',
+    'mailing zip': 'Mailing Zip',
+    'mailingzip': 'Mailing Zip',
+    'mail_zip': 'Mailing Zip',
+    'mail zip': 'Mailing Zip',
+    'mailing_zipcode': 'Mailing Zip',
+    'mailing zipcode': 'Mailing Zip',
+    'mail_zipcode': 'Mailing Zip',
+    'mailing_postal': 'Mailing Zip',
+    
+    # Phone1 variations (10)
+    'phone_1': 'Phone1',
+    'phone1': 'Phone1',
+    'phone 1': 'Phone1',
+    'primary_phone': 'Phone1',
+    'primary phone': 'Phone1',
+    'primaryphone': 'Phone1',
+    'main_phone': 'Phone1',
+    'main phone': 'Phone1',
+    'mainphone': 'Phone1',
+    'phone_primary': 'Phone1',
+    
+    # Type1 variations (10)
+    'phone_1_type': 'Type1',
+    'phone1_type': 'Type1',
+    'phone 1 type': 'Type1',
+    'phone_type_1': 'Type1',
+    'phonetype1': 'Type1',
+    'phone_type1': 'Type1',
+    'type_phone_1': 'Type1',
+    'type_phone1': 'Type1',
+    'phone1type': 'Type1',
+    'type1': 'Type1',
+    
+    # Phone2 variations (10)
+    'phone_2': 'Phone2',
+    'phone2': 'Phone2',
+    'phone 2': 'Phone2',
+    'secondary_phone': 'Phone2',
+    'secondary phone': 'Phone2',
+    'secondaryphone': 'Phone2',
+    'alt_phone': 'Phone2',
+    'alt phone': 'Phone2',
+    'altphone': 'Phone2',
+    'phone_secondary': 'Phone2',
+    
+    # Type2 variations (10)
+    'phone_2_type': 'Type2',
+    'phone2_type': 'Type2',
+    'phone 2 type': 'Type2',
+    'phone_type_2': 'Type2',
+    'phonetype2': 'Type2',
+    'phone_type2': 'Type2',
+    'type_phone_2': 'Type2',
+    'type_phone2': 'Type2',
+    'phone2type': 'Type2',
+    'type2': 'Type2',
+    
+    # Phone3 variations (10)
+    'phone_3': 'Phone3',
+    'phone3': 'Phone3',
+    'phone 3': 'Phone3',
+    'tertiary_phone': 'Phone3',
+    'tertiary phone': 'Phone3',
+    'tertiaryphone': 'Phone3',
+    'other_phone': 'Phone3',
+    'other phone': 'Phone3',
+    'otherphone': 'Phone3',
+    'phone_other': 'Phone3',
+    
+    # Type3 variations (10)
+    'phone_3_type': 'Type3',
+    'phone3_type': 'Type3',
+    'phone 3 type': 'Type3',
+    'phone_type_3': 'Type3',
+    'phonetype3': 'Type3',
+    'phone_type3': 'Type3',
+    'type_phone_3': 'Type3',
+    'type_phone3': 'Type3',
+    'phone3type': 'Type3',
+    'type3': 'Type3',
+    
+    # Phone4 variations (10)
+    'phone_4': 'Phone4',
+    'phone4': 'Phone4',
+    'phone 4': 'Phone4',
+    'phone_four': 'Phone4',
+    'phone four': 'Phone4',
+    'phonefour': 'Phone4',
+    'additional_phone': 'Phone4',
+    'additional phone': 'Phone4',
+    'additionalphone': 'Phone4',
+    'phone_additional': 'Phone4',
+    
+    # Type4 variations (10)
+    'phone_4_type': 'Type4',
+    'phone4_type': 'Type4',
+    'phone 4 type': 'Type4',
+    'phone_type_4': 'Type4',
+    'phonetype4': 'Type4',
+    'phone_type4': 'Type4',
+    'type_phone_4': 'Type4',
+    'type_phone4': 'Type4',
+    'phone4type': 'Type4',
+    'type4': 'Type4',
+    
+    # Phone5 variations (10)
+    'phone_5': 'Phone5',
+    'phone5': 'Phone5',
+    'phone 5': 'Phone5',
+    'phone_five': 'Phone5',
+    'phone five': 'Phone5',
+    'phonefive': 'Phone5',
+    'extra_phone': 'Phone5',
+    'extra phone': 'Phone5',
+    'extraphone': 'Phone5',
+    'phone_extra': 'Phone5',
+    
+    # Type5 variations (10)
+    'phone_5_type': 'Type5',
+    'phone5_type': 'Type5',
+    'phone 5 type': 'Type5',
+    'phone_type_5': 'Type5',
+    'phonetype5': 'Type5',
+    'phone_type5': 'Type5',
+    'type_phone_5': 'Type5',
+    'type_phone5': 'Type5',
+    'phone5type': 'Type5',
+    'type5': 'Type5',
+    
+    # Phone6 variations (10)
+    'phone_6': 'Phone6',
+    'phone6': 'Phone6',
+    'phone 6': 'Phone6',
+    'phone_six': 'Phone6',
+    'phone six': 'Phone6',
+    'phonesix': 'Phone6',
+    'backup_phone': 'Phone6',
+    'backup phone': 'Phone6',
+    'backupphone': 'Phone6',
+    'phone_backup': 'Phone6',
+    
+    # Type6 variations (10)
+    'phone_6_type': 'Type6',
+    'phone6_type': 'Type6',
+    'phone 6 type': 'Type6',
+    'phone_type_6': 'Type6',
+    'phonetype6': 'Type6',
+    'phone_type6': 'Type6',
+    'type_phone_6': 'Type6',
+    'type_phone6': 'Type6',
+    'phone6type': 'Type6',
+    'type6': 'Type6',
+    
+    # Email variations (10)
+    'email': 'Email',
+    'email_address': 'Email',
+    'email address': 'Email',
+    'emailaddress': 'Email',
+    'e_mail': 'Email',
+    'e mail': 'Email',
+    'email_addr': 'Email',
+    'email addr': 'Email',
+    'contact_email': 'Email',
+    'contact email': 'Email',
+    
+    # List variations (10)
+    'list': 'List',
+    'list_name': 'List',
+    'list name': 'List',
+    'listname': 'List',
+    'campaign': 'List',
+    'campaign_name': 'List',
+    'campaign name': 'List',
+    'campaignname': 'List',
+    'source': 'List',
+    'source_name': 'List',
+}
+
+
+# Additional optional columns that can be added
+OPTIONAL_COLUMNS = [
+    "Email", "Owner Occupied", "Property Type", "Bedrooms", "Bathrooms",
+    "Square Footage", "Lot Size", "Year Built", "Property Value", "Last Sale Date",
+    "Last Sale Price", "Estimated Equity", "LTV", "Mortgage Balance", "Tax Value"
+]
+
+# Data transformation functions
+def to_pascal_case(text):
+    if pd.isna(text):
+        return text
+    return ' '.join(word.capitalize() for word in str(text).split())
+
+def normalize_address(addr):
+    if pd.isna(addr):
+        return ""
+    addr = str(addr).strip().lower()
+    addr = re.sub(r"\s+", " ", addr)
+    return addr
+
+def extract_email_column(df):
+    """
+    Find and extract email column from input dataframe.
+    Looks for columns containing 'email' (case insensitive).
+    Returns the email column name and data if found.
+    """
+    email_columns = [col for col in df.columns if 'email' in str(col).lower()]
+    
+    if email_columns:
+        # Use the first email column found
+        email_col = email_columns[0]
+        return email_col, df[email_col].copy()
+    
+    return None, pd.Series([pd.NA] * len(df))
+
+def split_owner_name(df):
+    """Split Owner Name column into First Name and Last Name if exists"""
+    if "Owner Name" in df.columns:
+        df["Owner Name"] = df["Owner Name"].astype(str).str.strip()
+        # partition == split(" ", 1): no space -> empty last name
+        parts = df["Owner Name"].str.partition(" ")
+        df["First Name"] = parts[0]
+        df["Last Name"] = parts[2]
+    return df
+
+# Transformation options for columns
+TRANSFORMATION_OPTIONS = {
+    "None": lambda x: x,
+    "Pascal Case": to_pascal_case,
+    "Normalize Address": normalize_address,
+    "Trim Whitespace": lambda x: x.strip() if isinstance(x, str) else x,
+    "Uppercase": lambda x: x.upper() if isinstance(x, str) else x,
+    "Lowercase": lambda x: x.lower() if isinstance(x, str) else x,
+    "Capitalize Words": lambda x: x.title() if isinstance(x, str) else x,
+    "Extract Email": lambda df: extract_email_column(df)[1],
+}
+
+# ---------------------------------------
+# Vectorized transforms
+# ---------------------------------------
+# Same results as the per-cell functions above, but each one runs as a Series
+# string operation over the column's unique values only, then is mapped back.
+_WORD = re.compile(r"\S+")
+_SPACES = re.compile(r"\s+")
+_NON_TEXT_KINDS = {"integer", "floating", "mixed-integer-float", "decimal", "complex", "boolean",
+                   "datetime64", "datetime", "date", "timedelta64", "timedelta", "time", "period"}
+
+
+def _vec_pascal_case(s):
+    # str.split() + ' '.join collapses whitespace; capitalize() each word
+    return s.str.replace(_WORD, lambda m: m.group(0).capitalize(), regex=True) \
+            .str.replace(_SPACES, " ", regex=True).str.strip()
+
+
+def _vec_normalize_address(s):
+    return s.str.strip().str.lower().str.replace(_SPACES, " ", regex=True)
+
+
+# name -> (string op, value for missing cells, non-strings converted with str())
+#   na="keep": missing cells pass through unchanged
+#   stringify=False: numbers/dates pass through like the isinstance(x, str) lambdas
+VECTORIZED_TRANSFORMS = {
+    "Pascal Case": (_vec_pascal_case, "keep", True),
+    "Normalize Address": (_vec_normalize_address, "", True),
+    "Trim Whitespace": (lambda s: s.str.strip(), "keep", False),
+    "Uppercase": (lambda s: s.str.upper(), "keep", False),
+    "Lowercase": (lambda s: s.str.lower(), "keep", False),
+    "Capitalize Words": (lambda s: s.str.title(), "keep", False),
+}
+
+
+def transform_series(series, name):
+    """Apply TRANSFORMATION_OPTIONS[name] to a column, vectorized when possible."""
+    if name == "None":
+        return series
+    if name not in VECTORIZED_TRANSFORMS:
+        return series.apply(TRANSFORMATION_OPTIONS[name])
+
+    func, na_value, stringify = VECTORIZED_TRANSFORMS[name]
+    kind = pd.api.types.infer_dtype(series, skipna=True)
+    extension = isinstance(series.dtype, pd.api.extensions.ExtensionDtype)
+    if kind == "empty" or (extension and not pd.api.types.is_string_dtype(series.dtype)):
+        return series.apply(TRANSFORMATION_OPTIONS[name])
+    if kind != "string":
+        if not stringify and kind in _NON_TEXT_KINDS and series.dtype != object:
+            return series.copy()  # no strings at all -> every cell passes through
+        if not (stringify and kind == "integer"):
+            # Mixed or float/date cells: str() of those is not safe to dedupe, keep per-cell
+            # (and numbers in an object column get apply()'s dtype inference, 10/None -> 10.0/NaN)
+            return series.apply(TRANSFORMATION_OPTIONS[name])
+
+    na_mask = series.isna().to_numpy()
+    present = series[~na_mask]
+    if kind == "integer":
+        present = present.astype(str)
+
+    codes, uniques = pd.factorize(present.to_numpy(dtype=object))
+    done = func(pd.Series(uniques, dtype=object)).to_numpy(dtype=object)
+
+    out = np.empty(len(series), dtype=object)
+    out[~na_mask] = done[codes]
+    if na_mask.any():
+        out[na_mask] = series.to_numpy(dtype=object)[na_mask] if na_value == "keep" else na_value
+    return pd.Series(out, index=series.index, name=series.name)
+
+
+# Predefined operations that can be applied
+PREDEFINED_OPERATIONS = {
+    "Split Owner Name": split_owner_name,
+    "Standardize Mailing Address": lambda df: df.apply(
+        lambda col: transform_series(col, "Pascal Case") if col.name in ['Mailing Address', 'Mailing City'] else col
+    ),
+}
+
+
+# ---------------------------------------
+# Reading input files
+# ---------------------------------------
+PREVIEW_ROWS = 500
+CSV_CHUNK_ROWS = 200_000
+
+
+def read_preview(file, nrows=PREVIEW_ROWS):
+    """
+    Header + first `nrows` rows, without touching the rest of the file.
+    Returns (sample DataFrame, estimated total rows or None for Excel).
+    """
+    if not file.endswith(".csv"):
+        # openpyxl still loads the whole workbook, so report its bytes
+        with open_reporting(file, "Reading preview") as fh:
+            return pd.read_excel(fh, nrows=nrows), None
+
+    sample = pd.read_csv(file, nrows=nrows)
+    size = os.path.getsize(file)
+    with open(file, "rb") as fh:
+        head = fh.read(1024 * 1024)
+    lines = head.count(b"\n") or 1
+    if len(head) >= size:
+        return sample, max(lines - 1, len(sample))
+    return sample, int(size / (len(head) / lines)) - 1
+
+
+def read_full(file, stage="Loading full file"):
+    """Full read (same dtypes rules as before); bytes read go to utils.progress.report() as stage."""
+    if not file.endswith(".csv"):
+        with open_reporting(file, stage) as fh:
+            return pd.read_excel(fh)
+
+    size = os.path.getsize(file) or 1
+    chunks = []
+    with open(file, "rb") as fh:
+        for chunk in pd.read_csv(fh, chunksize=CSV_CHUNK_ROWS):
+            chunks.append(chunk)
+            report(stage=stage, bytes_read=min(fh.tell(), size), bytes_total=size)
+    if not chunks:
+        return pd.read_csv(file)
+    return pd.concat(chunks, ignore_index=True)
+
+
+def auto_map_source(columns, target, auto_map=None):
+    """First input column whose lowercase name auto-maps to `target`, or None."""
+    auto_map = AUTO_MAP_DICT if auto_map is None else auto_map
+    for col in columns:
+        if str(col).lower() in auto_map and auto_map[str(col).lower()] == target:
+            return col
+    return None
+
+
+# Columns that always get Pascal Case after mapping
+AUTO_PASCAL_COLUMNS = [
+    "First Name", "Last Name", "Property Address", "Property City", "Mailing Address", "Mailing State",
+]
+ZIP_COLUMNS = ["Property Zip", "Mailing Zip"]
+
+
+def build_mapped_frame(df, mappings, list_value="", operation="None"):
+    """
+    Build the mapped output exactly like the mapper's Apply button.
+    mappings: list of {"target", "source", "transform", "enabled"} in output order.
+    """
+    new_df = pd.DataFrame()
+
+    for item in mappings:
+        req = item["target"]
+        if not item.get("enabled", True):  # unchecked → skip
+            continue
+
+        selected = item.get("source")
+        if req == "List":
+            custom_val = (list_value or "").strip()
+            if custom_val:
+                new_df[req] = [custom_val] * len(df)
+            elif selected and selected in df.columns:
+                new_df[req] = df[selected]
+        else:
+            transform = item.get("transform") or "None"
+
+            if selected and selected in df.columns:
+                # Apply transformation if selected
+                if transform != "None":
+                    if transform == "Extract Email":
+                        _, email_data = extract_email_column(df)
+                        new_df[req] = email_data
+                    else:
+                        new_df[req] = transform_series(df[selected], transform)
+                else:
+                    new_df[req] = df[selected]
+
+    # ✅ Extra step: Auto transformations (Pascal + Zip cleaning)
+    for col in AUTO_PASCAL_COLUMNS:
+        if col in new_df.columns:
+            new_df[col] = transform_series(new_df[col], "Pascal Case")
+
+    # ✅ Clean Zips (remove after "-")
+    for zip_col in ZIP_COLUMNS:
+        if zip_col in new_df.columns:
+            new_df[zip_col] = new_df[zip_col].astype(str).str.split("-").str[0].str.strip()
+
+    if new_df.empty:
+        return new_df
+
+    # Apply predefined operations
+    if operation and operation != "None":
+        new_df = PREDEFINED_OPERATIONS[operation](new_df)
+
+    return new_df
@@ -0,0 +1,278 @@
+# utils/mapping_profiles.py
+# Saved Column Mapper profiles + headless batch mapping (no Tk import).
+#
+#   python -m utils.mapping_profiles <folder> [--profile NAME] [--workers N] [--output DIR]
+#   python -m utils.mapping_profiles --list
+import os
+import re
+import json
+import hashlib
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from .helpers import app_data_dir, save_excel
+from .mapping_core import REQUIRED_COLUMNS, AUTO_MAP_DICT, auto_map_source, build_mapped_frame
+
+INDEX_NAME = "index.json"
+MAPPED_SUFFIX = "_mapped.xlsx"
+
+
+# ---------------------------------------
+# Profile storage
+# ---------------------------------------
+def profiles_dir():
+    return app_data_dir("mapping_profiles")
+
+
+def header_signature(columns):
+    """Order-insensitive fingerprint of a header (case/whitespace ignored)."""
+    names = sorted(str(c).strip().lower() for c in columns)
+    return hashlib.sha1("\x1f".join(names).encode("utf-8")).hexdigest()
+
+
+def _profile_path(name):
+    slug = re.sub(r"[^A-Za-z0-9_-]+", "_", name).strip("_") or "profile"
+    return os.path.join(profiles_dir(), f"{slug}.json")
+
+
+def _read_json(path, default):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def _write_json(path, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def load_index():
+    """{header signature: profile name}; rebuilt from the profile files if missing."""
+    index_path = os.path.join(profiles_dir(), INDEX_NAME)
+    index = _read_json(index_path, None)
+    if index is None:
+        index = {p["signature"]: p["name"] for p in list_profiles()}
+        _write_json(index_path, index)
+    return index
+
+
+def list_profiles():
+    profiles = []
+    for fname in sorted(os.listdir(profiles_dir())):
+        if fname.endswith(".json") and fname != INDEX_NAME:
+            profile = _read_json(os.path.join(profiles_dir(), fname), None)
+            if profile and "signature" in profile:
+                profiles.append(profile)
+    return profiles
+
+
+def load_profile(name):
+    profile = _read_json(_profile_path(name), None)
+    if profile is None:
+        raise FileNotFoundError(f"No mapping profile named '{name}'")
+    return profile
+
+
+def save_profile(name, header, mappings, list_value="", operation="None", auto_map=None):
+    """
+    Save a mapping profile and register its header signature. Returns the profile path.
+    auto_map (the mapper's auto-map settings) finds sources a later file names differently.
+    """
+    profile = {
+        "name": name,
+        "signature": header_signature(header),
+        "header": [str(c) for c in header],
+        "mappings": mappings,
+        "list_value": list_value or "",
+        "operation": operation or "None",
+        "auto_map": dict(auto_map or AUTO_MAP_DICT),
+        "saved_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    path = _profile_path(name)
+    _write_json(path, profile)
+
+    index = load_index()
+    # One profile per layout: the newest save wins
+    index = {sig: n for sig, n in index.items() if n != name}
+    index[profile["signature"]] = name
+    _write_json(os.path.join(profiles_dir(), INDEX_NAME), index)
+    return path
+
+
+def auto_profile(header, required_columns=None, auto_map=None):
+    """Profile built from the auto-map dictionary, like a freshly opened mapper window."""
+    required_columns = required_columns or REQUIRED_COLUMNS
+    mappings = [
+        {"target": req, "source": auto_map_source(header, req, auto_map) or "",
+         "transform": "None", "enabled": True}
+        for req in required_columns
+    ]
+    return {"name": "(auto-map)", "signature": header_signature(header), "mappings": mappings,
+            "list_value": "", "operation": "None", "auto_map": dict(auto_map or AUTO_MAP_DICT)}
+
+
+def profile_mappings(profile, header):
+    """
+    The profile's mappings for a file with this header. A source the file does not have
+    (a forced profile, or a header that matched ignoring case/whitespace) is looked up
+    ignoring case/whitespace, then through the profile's auto_map.
+    """
+    columns = set(header)
+    by_name = {str(c).strip().lower(): c for c in header}
+    auto_map = profile.get("auto_map") or AUTO_MAP_DICT
+    mappings = []
+    for item in profile["mappings"]:
+        source = item.get("source")
+        if source and source not in columns:
+            resolved = by_name.get(str(source).strip().lower()) or auto_map_source(header, item["target"], auto_map)
+            if resolved is not None:
+                item = dict(item, source=resolved)
+        mappings.append(item)
+    return mappings
+
+
+# ---------------------------------------
+# Batch mapping
+# ---------------------------------------
+def _read_input(file_path):
+    if os.path.splitext(file_path)[1].lower() == ".csv":
+        return pd.read_csv(file_path)
+    return pd.read_excel(file_path)
+
+
+def map_file(file_path, profiles_by_signature, forced_profile=None, output_dir=None, auto_fallback=False):
+    """
+    Map one file with its profile (worker entry point; must stay importable without Tk).
+    Returns a result dict: file, status (ok/skipped/error), profile, rows, output, message.
+    """
+    result = {"file": file_path, "status": "error", "profile": None, "rows": 0, "output": None, "message": ""}
+    try:
+        df = _read_input(file_path)
+        profile = forced_profile or profiles_by_signature.get(header_signature(df.columns))
+        if profile is None and auto_fallback:
+            profile = auto_profile(list(df.columns))
+        if profile is None:
+            result["status"] = "skipped"
+            result["message"] = "no profile matches this header"
+            return result
+        result["profile"] = profile["name"]
+
+        new_df = build_mapped_frame(df, profile_mappings(profile, list(df.columns)), profile.get("list_value", ""),
+                                    profile.get("operation", "None"))
+        if new_df.empty:
+            result["status"] = "skipped"
+            result["message"] = "no columns were mapped"
+            return result
+
+        base_name = os.path.splitext(os.path.basename(file_path))[0]
+        out_folder = output_dir or os.path.dirname(file_path)
+        output_file = os.path.join(out_folder, f"{base_name}{MAPPED_SUFFIX}")
+        save_excel(new_df, output_file)
+
+        result.update(status="ok", rows=len(new_df), output=output_file)
+    except Exception as e:
+        result["message"] = str(e)
+    return result
+
+
+def find_input_files(folder, recursive=False):
+    files = []
+    for root_dir, dirs, fs in os.walk(folder):
+        for fname in sorted(fs):
+            lower = fname.lower()
+            if lower.endswith((".csv", ".xlsx", ".xls")) and not lower.endswith(MAPPED_SUFFIX) \
+                    and not fname.startswith("~$"):
+                files.append(os.path.join(root_dir, fname))
+        if not recursive:
+            break
+    return files
+
+
+def run_batch(folder, profile_name=None, output_dir=None, workers=None, recursive=False,
+              auto_fallback=False, progress_callback=None):
+    """Map every CSV/Excel file in folder in parallel worker processes. Returns result dicts."""
+    files = find_input_files(folder, recursive)
+    if not files:
+        return []
+
+    forced = load_profile(profile_name) if profile_name else None
+    index = load_index()
+    by_signature = {}
+    for profile in list_profiles():
+        if index.get(profile["signature"]) == profile["name"]:
+            by_signature[profile["signature"]] = profile
+
+    workers = workers or min(len(files), os.cpu_count() or 1)
+    results = []
+    if workers <= 1:
+        for i, file_path in enumerate(files, start=1):
+            results.append(map_file(file_path, by_signature, forced, output_dir, auto_fallback))
+            if progress_callback:
+                progress_callback(i, len(files), results[-1])
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(map_file, f, by_signature, forced, output_dir, auto_fallback) for f in files]
+        for i, future in enumerate(as_completed(futures), start=1):
+            results.append(future.result())
+            if progress_callback:
+                progress_callback(i, len(files), results[-1])
+    order = {f: i for i, f in enumerate(files)}
+    results.sort(key=lambda r: order[r["file"]])
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply saved Column Mapper profiles to a folder of files")
+    parser.add_argument("folder", nargs="?", help="Folder with CSV/Excel files to map")
+    parser.add_argument("--profile", "-p", help="Use this profile for every file (default: match by header)")
+    parser.add_argument("--output", "-o", help="Output folder (default: next to each input file)")
+    parser.add_argument("--workers", "-w", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--recursive", "-r", action="store_true", help="Include sub-folders")
+    parser.add_argument("--auto", action="store_true",
+                        help="Fall back to the auto-map dictionary when no profile matches")
+    parser.add_argument("--list", action="store_true", help="List saved profiles and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        profiles = list_profiles()
+        if not profiles:
+            print("No saved profiles.")
+        for profile in profiles:
+            print(f"📋 {profile['name']}  ({len(profile['header'])} columns, saved {profile.get('saved_at', '?')})")
+        return
+
+    if not args.folder or not os.path.isdir(args.folder):
+        print(f"❌ Error: Folder not found: {args.folder}")
+        return
+
+    start = time.time()
+
+    def report(i, total, result):
+        icon = {"ok": "✅", "skipped": "⚠️"}.get(result["status"], "❌")
+        detail = f"{result['rows']} rows → {result['output']}" if result["status"] == "ok" else result["message"]
+        print(f"{icon} [{i}/{total}] {os.path.basename(result['file'])} ({result['profile'] or '-'}): {detail}")
+
+    try:
+        results = run_batch(args.folder, args.profile, args.output, args.workers, args.recursive,
+                            args.auto, progress_callback=report)
+    except FileNotFoundError as e:
+        print(f"❌ Error: {e}")
+        return
+
+    if not results:
+        print(f"❌ No CSV/Excel files found in: {args.folder}")
+        return
+    ok = sum(1 for r in results if r["status"] == "ok")
+    print(f"📊 Mapped {ok}/{len(results)} file(s) in {time.time() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
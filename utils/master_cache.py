@@ -0,0 +1,205 @@
+# utils/master_cache.py
+import os
+import json
+import time
+import mmap
+import shutil
+import hashlib
+import numpy as np
+import pandas as pd
+
+from .helpers import app_data_dir
+
+# ---------------------------------------
+# Persistent master-file cache
+# ---------------------------------------
+# Each cached master lives in its own folder keyed by (path, size, mtime):
+#   meta.json        -> source info, header, rows, cached columns, last use
+#   c<N>.bin         -> UTF-8 text of column N, cells separated by NUL
+#   c<N>.off.npy     -> only when a cell itself holds a NUL: int64 byte offsets of
+#                       the concatenated cells (rows + 1)
+# A blob is memory-mapped and decoded in one call, then split on NUL (both in C), so
+# later runs never re-parse the xlsx nor touch each cell from Python.
+
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3  # 2 GB across all cached masters
+META_NAME = "meta.json"
+CACHE_FORMAT = 3  # 3: NUL-separated cells (2: byte offsets, 1: character offsets)
+SEPARATOR = "\x00"
+
+
+def _cache_key(file_path):
+    st = os.stat(file_path)
+    raw = f"{os.path.abspath(file_path)}|{st.st_size}|{st.st_mtime_ns}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest(), st
+
+
+def read_header(file_path):
+    """Return the column names of a CSV/Excel file without loading its rows."""
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext == ".csv":
+        return list(pd.read_csv(file_path, nrows=0, dtype=str).columns.astype(str))
+    return list(pd.read_excel(file_path, nrows=0, dtype=str).columns.astype(str))
+
+
+def _read_columns(file_path, header, columns):
+    """
+    Parse only the given columns as strings (same rules as load_file). Columns are picked
+    by position in header: the file's own names may be numbers or dates, not strings.
+    """
+    positions = sorted(header.index(c) for c in columns)
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext == ".csv":
+        df = pd.read_csv(file_path, dtype=str, usecols=positions)
+    else:
+        df = pd.read_excel(file_path, dtype=str, usecols=positions)
+    df.columns = [header[i] for i in positions]
+    return df.fillna("")
+
+
+class MasterCache:
+    def __init__(self, root=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = root or app_data_dir("master_cache")
+        self.max_bytes = max_bytes
+        os.makedirs(self.root, exist_ok=True)
+
+    # ---------- meta helpers ----------
+    def _entry_dir(self, key):
+        return os.path.join(self.root, key)
+
+    def _read_meta(self, key):
+        meta_path = os.path.join(self._entry_dir(key), META_NAME)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # Entries of an older layout read as missing: re-parsed by load(), dropped by _evict()
+        return meta if meta.get("format") == CACHE_FORMAT else None
+
+    def _write_meta(self, key, meta):
+        entry = self._entry_dir(key)
+        tmp_path = os.path.join(entry, META_NAME + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, os.path.join(entry, META_NAME))
+
+    # ---------- column blobs ----------
+    def _write_column(self, entry, slot, values):
+        text = SEPARATOR.join(values)
+        if text.count(SEPARATOR) == max(len(values) - 1, 0):
+            data, offsets_bytes = text.encode("utf-8"), 0
+        else:
+            # A cell holds the separator itself: keep every cell's byte range instead
+            parts = [val.encode("utf-8") for val in values]
+            offsets = np.zeros(len(parts) + 1, dtype=np.int64)
+            np.cumsum([len(part) for part in parts], out=offsets[1:])
+            data, offsets_bytes = b"".join(parts), offsets.nbytes
+            np.save(os.path.join(entry, f"c{slot}.off.npy"), offsets)
+        with open(os.path.join(entry, f"c{slot}.bin"), "wb") as f:
+            f.write(data)
+        return len(data) + offsets_bytes
+
+    def _read_column(self, entry, slot, rows):
+        if rows == 0:
+            return []
+        bin_path = os.path.join(entry, f"c{slot}.bin")
+        if os.path.getsize(bin_path) == 0:
+            return [""] * rows
+        off_path = os.path.join(entry, f"c{slot}.off.npy")
+        with open(bin_path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if not os.path.exists(off_path):
+                    return str(mm, "utf-8").split(SEPARATOR)
+                bounds = np.load(off_path).tolist()
+                return [mm[bounds[i]:bounds[i + 1]].decode("utf-8") for i in range(rows)]
+
+    # ---------- public API ----------
+    def header(self, file_path):
+        """Cached header for file_path, falling back to a cheap header probe."""
+        key, _ = _cache_key(file_path)
+        meta = self._read_meta(key)
+        if meta:
+            return list(meta["header"])
+        return read_header(file_path)
+
+    def load(self, file_path, columns=None):
+        """
+        Return (DataFrame of str columns, cache_hit).
+        Only `columns` are loaded/cached when given; otherwise every column.
+        """
+        key, st = _cache_key(file_path)
+        entry = self._entry_dir(key)
+        meta = self._read_meta(key)
+
+        header = list(meta["header"]) if meta else read_header(file_path)
+        if columns is None:
+            wanted = header
+        else:
+            requested = set(columns)
+            wanted = [c for c in header if c in requested]
+
+        cached = meta["columns"] if meta else {}
+        missing = [c for c in wanted if c not in cached]
+        cache_hit = meta is not None and not missing
+
+        if missing:
+            parsed = _read_columns(file_path, header, missing)
+            if meta is None:
+                shutil.rmtree(entry, ignore_errors=True)  # unreadable or older-format entry
+                os.makedirs(entry, exist_ok=True)
+                meta = {
+                    "format": CACHE_FORMAT,
+                    "source": os.path.abspath(file_path),
+                    "size": st.st_size,
+                    "mtime_ns": st.st_mtime_ns,
+                    "header": header,
+                    "rows": len(parsed),
+                    "columns": {},
+                    "bytes": 0,
+                }
+            next_slot = len(meta["columns"])
+            for offset, col in enumerate(missing):
+                slot = next_slot + offset
+                meta["bytes"] += self._write_column(entry, slot, parsed[col].tolist())
+                meta["columns"][col] = slot
+
+        if meta is None:
+            # Cold cache and none of the requested columns is in the file: nothing to cache;
+            # callers report the missing columns as they do for any master without them
+            return pd.DataFrame(columns=wanted, dtype=object), False
+
+        meta["last_used"] = time.time()
+        self._write_meta(key, meta)
+
+        data = {col: self._read_column(entry, meta["columns"][col], meta["rows"]) for col in wanted}
+        df = pd.DataFrame(data, columns=wanted, dtype=object)
+
+        if not cache_hit:
+            self._evict(keep=key, source=meta["source"])
+        return df, cache_hit
+
+    def _evict(self, keep=None, source=None):
+        """Drop stale versions of `source`, then oldest entries above max_bytes."""
+        entries = []
+        for name in os.listdir(self.root):
+            meta = self._read_meta(name)
+            if meta is None:
+                shutil.rmtree(self._entry_dir(name), ignore_errors=True)
+                continue
+            if name != keep and source and meta.get("source") == source:
+                shutil.rmtree(self._entry_dir(name), ignore_errors=True)
+                continue
+            entries.append((meta.get("last_used", 0), name, meta.get("bytes", 0)))
+
+        total = sum(size for _, _, size in entries)
+        for _, name, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if name == keep:
+                continue
+            shutil.rmtree(self._entry_dir(name), ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+        os.makedirs(self.root, exist_ok=True)
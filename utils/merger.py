@@ -1,8 +1,62 @@
 import os
 import pandas as pd
-import tkinter as tk
-from tkinter import filedialog, ttk
-import ttkbootstrap as tb
+
+from .progress import open_reporting, report
+
+# ----------------------------
+# Merge (no UI)
+# ----------------------------
+def merge_files(files, key_col, folder=None):
+    """
+    Stack files (CSV/Excel) aligned on key_col and write merged_output.xlsx and
+    Merger Records.txt into folder (default: the first file's folder).
+    Returns (output xlsx path, total records, {file name: records}).
+    """
+    dfs, record_counts = [], {}
+    for i, f in enumerate(files, 1):
+        report(item=i, items=len(files))
+        with open_reporting(f) as handle:
+            df = pd.read_csv(handle) if f.lower().endswith(".csv") else pd.read_excel(handle)
+        record_counts[os.path.basename(f)] = len(df)
+        if key_col in df.columns:
+            df = df.set_index(key_col)
+        dfs.append(df)
+
+    merged = pd.concat(dfs, axis=0, ignore_index=False)
+    if key_col in merged.index.names:
+        merged.reset_index(inplace=True)
+
+    folder = folder or os.path.dirname(files[0])
+    output_xlsx = os.path.join(folder, "merged_output.xlsx")
+
+    # Save Excel with plain headers (no bold, no border)
+    report(stage="Writing merged_output.xlsx", done=0, total=len(merged), unit="rows")
+    with pd.ExcelWriter(output_xlsx, engine="xlsxwriter") as writer:
+        merged.to_excel(writer, index=False, header=False, sheet_name="Sheet1", startrow=1)
+        workbook = writer.book
+        worksheet = writer.sheets["Sheet1"]
+        plain_fmt = workbook.add_format({"bold": False, "border": 0})
+        for col_idx, name in enumerate(merged.columns):
+            worksheet.write(0, col_idx, name, plain_fmt)
+
+    report(stage="Writing merged_output.xlsx", done=len(merged), total=len(merged), unit="rows")
+
+    # Create Merger Records.txt
+    output_txt = os.path.join(folder, "Merger Records.txt")
+    total_records = len(merged)
+    sum_files = sum(record_counts.values())
+    with open(output_txt, "w", encoding="utf-8") as f:
+        f.write("MERGER RECORDS SUMMARY\n")
+        f.write("="*50 + "\n\n")
+        f.write(f"Total Records After Merger: {total_records}\n\n")
+        for file, count in record_counts.items():
+            f.write(f"{file}: {count} records\n")
+        f.write("-"*50 + "\n")
+        f.write(f"--- Sum of All Files Records = {sum_files}\n")
+        f.write(f"--- Total Records After Merger = {total_records}\n")
+
+    return output_xlsx, total_records, record_counts
+
 
 def open_merger_tool(root, ui=None):
     """
@@ -14,6 +68,13 @@ def open_merger_tool(root, ui=None):
     - Plain headers (no bold, no border)
     - Merger Records.txt summary
     """
+    # Tk is imported here so the CLI can use merge_files headless
+    import threading
+    import tkinter as tk
+    from tkinter import filedialog, ttk
+    import ttkbootstrap as tb
+    from .progress import ProgressDispatcher, reporting
+
     win = tb.Toplevel(root)
     win.title("Advanced Merge CSV/Excel Files")
     win.geometry("1000x650")
@@ -39,7 +100,8 @@ def open_merger_tool(root, ui=None):
                 first_folder_path["path"] = folder  # set first folder as output
             load_headers(folder)
 
-    tb.Button(frame_path, text="Browse", bootstyle="secondary", command=browse_folder).pack(side="left")
+    browse_btn = tb.Button(frame_path, text="Browse", bootstyle="secondary", command=browse_folder)
+    browse_btn.pack(side="left")
 
     # ----------------------------
     # File TreeView
@@ -54,9 +116,62 @@ def open_merger_tool(root, ui=None):
     files_list = []
     file_columns = {}  # store columns of each file
 
+    # ----------------------------
+    # Background work: reads and the merge run in a worker thread,
+    # the dispatcher updates the widgets on the Tk thread
+    # ----------------------------
+    buttons = []
+    status_var = tk.StringVar()
+
+    def show_progress(state):
+        if not win.winfo_exists():
+            return
+        percent = state.percent
+        if percent is None:
+            if str(progress["mode"]) != "indeterminate":
+                progress.configure(mode="indeterminate")
+                progress.start(10)
+        else:
+            if str(progress["mode"]) != "determinate":
+                progress.stop()
+                progress.configure(mode="determinate", maximum=100)
+            progress["value"] = percent
+        status_var.set(state.text())
+
+    def run_in_background(work, on_finish):
+        """work() runs in a thread (no Tk calls); on_finish(result, error) runs on the Tk thread."""
+        outcome = {"result": None, "error": None}
+
+        def finished():
+            if not win.winfo_exists():  # closed while the work ran
+                return
+            progress.stop()
+            progress.configure(mode="determinate", value=0)
+            status_var.set("")
+            for button in buttons:
+                button.configure(state="normal")
+            on_finish(outcome["result"], outcome["error"])
+
+        dispatcher = ProgressDispatcher(root, show_progress, on_finish=finished)
+
+        def worker():
+            try:
+                with reporting(dispatcher):
+                    outcome["result"] = work()
+            except Exception as e:
+                outcome["error"] = e
+            finally:
+                dispatcher.finish()
+
+        for button in buttons:
+            button.configure(state="disabled")
+        progress.configure(mode="indeterminate")
+        progress.start(10)
+        dispatcher.start()
+        threading.Thread(target=worker, daemon=True).start()
+
     # Load headers from folder
     def load_headers(folder):
-        nonlocal files_list, file_columns
         new_files = [os.path.join(folder, f)
                      for f in os.listdir(folder)
                      if f.lower().endswith(('.csv', '.xlsx', '.xls'))]
@@ -65,18 +180,30 @@ def open_merger_tool(root, ui=None):
         for f in new_files:
             if f not in files_list:
                 files_list.append(f)
+        files = list(files_list)
 
-        tree.delete(*tree.get_children())
-        file_columns = {}
+        def read_headers():
+            columns = {}
+            for i, f in enumerate(files, 1):
+                report(stage="Reading headers", done=i - 1, total=len(files), unit="files")
+                try:
+                    df = pd.read_csv(f, nrows=0) if f.lower().endswith(".csv") else pd.read_excel(f, nrows=0)
+                    columns[f] = list(df.columns)
+                except Exception as e:
+                    columns[f] = [f"ERROR: {e}"]
+            return columns
 
-        for f in files_list:
-            try:
-                df = pd.read_csv(f, nrows=0) if f.lower().endswith(".csv") else pd.read_excel(f, nrows=0)
-                cols = list(df.columns)
-            except Exception as e:
-                cols = [f"ERROR: {e}"]
-            file_columns[f] = cols
-            tree.insert("", "end", values=(os.path.basename(f), ", ".join(cols)))
+        def show_headers(columns, error):
+            if error is not None:
+                if ui: ui.show_error("Error", f"Failed to read headers: {error}")
+                return
+            tree.delete(*tree.get_children())
+            file_columns.clear()
+            for f in files:
+                file_columns[f] = columns[f]
+                tree.insert("", "end", values=(os.path.basename(f), ", ".join(columns[f])))
+
+        run_in_background(read_headers, show_headers)
 
     # ----------------------------
     # File remove button
@@ -91,7 +218,8 @@ def open_merger_tool(root, ui=None):
                 file_columns.pop(full_path, None)
             tree.delete(item)
 
-    tb.Button(win, text="Remove Selected File", bootstyle="danger", command=remove_selected_file).pack(pady=5)
+    remove_btn = tb.Button(win, text="Remove Selected File", bootstyle="danger", command=remove_selected_file)
+    remove_btn.pack(pady=5)
 
     # ----------------------------
     # Column mapping
@@ -108,12 +236,13 @@ def open_merger_tool(root, ui=None):
             all_cols.update(cols)
         key_col_menu['values'] = list(all_cols)
 
-    tb.Button(win, text="Refresh Columns", bootstyle="info", command=refresh_key_columns).pack(pady=5)
+    refresh_btn = tb.Button(win, text="Refresh Columns", bootstyle="info", command=refresh_key_columns)
+    refresh_btn.pack(pady=5)
 
     # ----------------------------
     # Merge function
     # ----------------------------
-    def merge_files():
+    def on_merge():
         key_col = key_col_var.get().strip()
         if not files_list:
             if ui: ui.show_error("Error", "No files selected!")
@@ -122,45 +251,25 @@ def open_merger_tool(root, ui=None):
             if ui: ui.show_error("Error", "Select a key column first!")
             return
 
-        dfs, record_counts = [], {}
-        for f in files_list:
-            df = pd.read_csv(f) if f.lower().endswith(".csv") else pd.read_excel(f)
-            record_counts[os.path.basename(f)] = len(df)
-            if key_col in df.columns:
-                df = df.set_index(key_col)
-            dfs.append(df)
+        folder = first_folder_path["path"] if first_folder_path["path"] else os.path.dirname(files_list[0])
 
-        merged = pd.concat(dfs, axis=0, ignore_index=False)
-        if key_col in merged.index.names:
-            merged.reset_index(inplace=True)
+        def merged(result, error):
+            if error is not None:
+                if ui: ui.show_error("Error", f"Merge failed: {error}")
+                return
+            if ui:
+                ui.show_info("Success", f"Files merged!\nSaved in {folder}")
 
-        folder = first_folder_path["path"] if first_folder_path["path"] else os.path.dirname(files_list[0])
-        output_xlsx = os.path.join(folder, "merged_output.xlsx")
-
-        # Save Excel with plain headers (no bold, no border)
-        with pd.ExcelWriter(output_xlsx, engine="xlsxwriter") as writer:
-            merged.to_excel(writer, index=False, header=False, sheet_name="Sheet1", startrow=1)
-            workbook = writer.book
-            worksheet = writer.sheets["Sheet1"]
-            plain_fmt = workbook.add_format({"bold": False, "border": 0})
-            for col_idx, name in enumerate(merged.columns):
-                worksheet.write(0, col_idx, name, plain_fmt)
-
-        # Create Merger Records.txt
-        output_txt = os.path.join(folder, "Merger Records.txt")
-        total_records = len(merged)
-        sum_files = sum(record_counts.values())
-        with open(output_txt, "w", encoding="utf-8") as f:
-            f.write("MERGER RECORDS SUMMARY\n")
-            f.write("="*50 + "\n\n")
-            f.write(f"Total Records After Merger: {total_records}\n\n")
-            for file, count in record_counts.items():
-                f.write(f"{file}: {count} records\n")
-            f.write("-"*50 + "\n")
-            f.write(f"--- Sum of All Files Records = {sum_files}\n")
-            f.write(f"--- Total Records After Merger = {total_records}\n")
-
-        if ui:
-            ui.show_info("Success", f"Files merged!\nSaved in {folder}")
-
-    tb.Button(win, text="Merge Files", bootstyle="success", width=20, command=merge_files).pack(pady=12)
+        files = list(files_list)
+        run_in_background(lambda: merge_files(files, key_col, folder), merged)
+
+    merge_btn = tb.Button(win, text="Merge Files", bootstyle="success", width=20, command=on_merge)
+    merge_btn.pack(pady=12)
+
+    # Progress of header reads and merges
+    progress_frame = tb.Frame(win)
+    progress_frame.pack(fill="x", padx=10, pady=(0, 10))
+    progress = ttk.Progressbar(progress_frame, mode="determinate", length=300)
+    progress.pack(side="left")
+    tb.Label(progress_frame, textvariable=status_var, background="#fff3e0").pack(side="left", padx=8)
+    buttons.extend([browse_btn, remove_btn, refresh_btn, merge_btn])
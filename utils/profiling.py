@@ -0,0 +1,124 @@
+# utils/profiling.py
+# Opt-in per-run profiles for the pipelines (no Tk import).
+#
+#   with profiling(True):          # UI checkbox / CLI --profile
+#       run_pipeline(...)          # every PipelineRun opened inside is profiled
+#
+# Each profiled list gets, next to "List Building Records.txt":
+#   List Building Profile.pstats       cProfile data (python -m pstats / snakeviz)
+#   List Building Profile.folded.txt   sampled stacks, "root;caller;callee count" per line,
+#                                      the input format of flamegraph.pl / speedscope
+# and a top-20 hot function summary appended to the tracker.
+import os
+import sys
+import pstats
+import cProfile
+import threading
+import contextvars
+from contextlib import contextmanager
+
+PSTATS_NAME = "List Building Profile.pstats"
+FOLDED_NAME = "List Building Profile.folded.txt"
+SAMPLE_INTERVAL = 0.005  # seconds between stack samples
+TOP_N = 20
+
+_requested = contextvars.ContextVar("profile_runs", default=False)
+_busy = threading.Lock()  # one cProfile at a time per process
+
+
+@contextmanager
+def profiling(enabled=True):
+    """Profile every PipelineRun opened inside this block (in this thread)."""
+    token = _requested.set(bool(enabled))
+    try:
+        yield
+    finally:
+        _requested.reset(token)
+
+
+def requested():
+    return _requested.get()
+
+
+class _StackSampler(threading.Thread):
+    """Samples one thread's Python stack at a fixed interval into collapsed-stack counts."""
+
+    def __init__(self, thread_id, interval):
+        super().__init__(name="stack-sampler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts = {}
+        self._stop_event = threading.Event()
+
+    def run(self):
+        labels = {}
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                label = labels.get(code)
+                if label is None:
+                    label = labels[code] = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+                stack.append(label)
+                frame = frame.f_back
+            if stack:
+                key = ";".join(reversed(stack))
+                self.counts[key] = self.counts.get(key, 0) + 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+class RunProfiler:
+    """cProfile for exact call stats plus a stack sampler for the flamegraph."""
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self.profile = None
+        self.sampler = None
+
+    def start(self):
+        """False when another run in this process is already being profiled."""
+        if not _busy.acquire(blocking=False):
+            return False
+        try:
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+        except ValueError:  # another profiler (debugger, IDE) owns the hook
+            self.profile = None
+            _busy.release()
+            return False
+        self.sampler = _StackSampler(threading.get_ident(), self.interval)
+        self.sampler.start()
+        return True
+
+    def stop(self):
+        if self.profile is None:
+            return
+        self.profile.disable()
+        self.sampler.stop()
+        _busy.release()
+
+    def save(self, folder):
+        """Write the pstats and folded-stack files into folder; returns their paths."""
+        os.makedirs(folder, exist_ok=True)
+        pstats_path = os.path.join(folder, PSTATS_NAME)
+        folded_path = os.path.join(folder, FOLDED_NAME)
+        self.profile.dump_stats(pstats_path)
+        with open(folded_path, "w", encoding="utf-8") as f:
+            for stack, count in sorted(self.sampler.counts.items()):
+                f.write(f"{stack} {count}\n")
+        return {"pstats": pstats_path, "folded": folded_path}
+
+    def summary_lines(self, n=TOP_N):
+        """Top n functions by own time, one line each (no "label: number" lines for the tracker parsers)."""
+        stats = pstats.Stats(self.profile)
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:n]
+        lines = [f"Profile - top {len(rows)} functions by own time (own s | cumulative s | calls | function)"]
+        for (filename, lineno, func), (cc, nc, tt, ct, callers) in rows:
+            where = f"{os.path.basename(filename)}:{lineno}" if lineno else filename
+            lines.append(f"[profile] {tt:8.3f} | {ct:8.3f} | {nc:>9,} | {func} ({where})")
+        return lines
+
@@ -0,0 +1,267 @@
+# utils/progress.py
+# Determinate progress events for the pipelines and tools (no Tk import).
+#
+#   report(stage="Separating", done=12, total=40, unit="groups")     # from any step or tool
+#   report(list_name="Drop 12", item=2, items=5)                      # which list of how many
+#   with open_reporting(path) as f: df = pd.read_csv(f)               # bytes read while pandas parses
+#
+# Events go to the sink of the current context and are dropped when there is none:
+#   GUI thread tool  -> ProgressDispatcher -> loader popup (on the Tk thread, via root.after)
+#   GUI job          -> job executor queue -> Jobs window (utils/job_executor.py)
+# report() is throttled per sink, so calling it per chunk or per file is cheap.
+# Every @instrument-ed step reports its rows in/out (utils/instrumentation.py).
+import io
+import os
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+
+THROTTLE_S = 0.1      # at most one event per sink per interval (stage changes always pass)
+DISPATCH_MS = 100     # how often the Tk thread drains events
+
+_sink = contextvars.ContextVar("progress_sink", default=None)
+
+# Keys that describe one stage; a new stage starts without the previous one's counts
+STAGE_KEYS = ("done", "total", "unit", "bytes_read", "bytes_total")
+
+
+class _Throttled:
+    """Forwards an event when its list or stage changed, when it completes a count, or once per interval."""
+
+    def __init__(self, sink, interval):
+        self.sink = sink
+        self.interval = interval
+        self._last = 0.0
+        self._current = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        finished = (event.get("done") is not None and event.get("done") == event.get("total")) or \
+                   (event.get("bytes_read") is not None and event.get("bytes_read") == event.get("bytes_total"))
+        with self._lock:
+            now = time.monotonic()
+            changed = [key for key in ("list_name", "item", "stage")
+                       if key in event and event[key] != self._current.get(key)]
+            if not (changed or finished or now - self._last >= self.interval):
+                return
+            self._last = now
+            for key in changed:
+                self._current[key] = event[key]
+        self.sink(event)
+
+
+@contextmanager
+def reporting(sink, interval=THROTTLE_S):
+    """Send report() events made inside this block (in this thread) to sink(event dict)."""
+    token = _sink.set(_Throttled(sink, interval) if interval else sink)
+    try:
+        yield
+    finally:
+        _sink.reset(token)
+
+
+def report(**info):
+    """
+    One progress event. Known keys: stage, done, total, unit ("rows", "files", ...),
+    bytes_read, bytes_total, list_name, item, items. None values are left out.
+    """
+    sink = _sink.get()
+    if sink is None:
+        return
+    event = {key: value for key, value in info.items() if value is not None}
+    event["time"] = time.time()
+    sink(event)
+
+
+# ---------------------------------------
+# Reading with byte progress
+# ---------------------------------------
+class _ReportingRaw(io.RawIOBase):
+    """Raw file that reports how much of it has been read (bytes read, not the position:
+    Excel readers jump to the zip directory at the end first)."""
+
+    def __init__(self, path, stage):
+        self._file = open(path, "rb")
+        self.stage = stage
+        self.total = os.fstat(self._file.fileno()).st_size
+        self.read_bytes = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        count = self._file.readinto(buffer)
+        self.read_bytes = min(self.read_bytes + (count or 0), self.total)
+        report(stage=self.stage, bytes_read=self.read_bytes, bytes_total=self.total)
+        return count
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        return self._file.seek(offset, whence)
+
+    def tell(self):
+        return self._file.tell()
+
+    def close(self):
+        if not self.closed:
+            self._file.close()
+        super().close()
+
+
+def open_reporting(path, stage=None):
+    """Binary file for pandas (read_csv / read_excel) that reports bytes read as stage."""
+    return io.BufferedReader(_ReportingRaw(path, stage or f"Reading {os.path.basename(path)}"))
+
+
+# ---------------------------------------
+# Consumer side
+# ---------------------------------------
+class ProgressState:
+    """The latest progress of one task, merged from events; knows its % and throughput."""
+
+    def __init__(self):
+        self.info = {}
+        self._stage_started = None
+        self._stage_done = 0
+        self._stage_bytes = 0
+
+    def update(self, event):
+        event = dict(event)
+        at = event.pop("time", time.time())
+        new_item = any(key in event and event[key] != self.info.get(key) for key in ("list_name", "item"))
+        if new_item and "stage" not in event:
+            self.info.pop("stage", None)
+        if new_item or ("stage" in event and event["stage"] != self.info.get("stage")):
+            for key in STAGE_KEYS:
+                self.info.pop(key, None)
+            self._stage_started = at
+            self._stage_done = event.get("done", 0)
+            self._stage_bytes = event.get("bytes_read", 0)
+        self.info.update(event)
+        self.info["time"] = at
+
+    def get(self, key, default=None):
+        return self.info.get(key, default)
+
+    @property
+    def percent(self):
+        """0-100 for the current stage, or None while it has no total."""
+        done, total = self.info.get("done"), self.info.get("total")
+        if done is None or not total:
+            done, total = self.info.get("bytes_read"), self.info.get("bytes_total")
+        if done is None or not total:
+            return None
+        return max(0.0, min(100.0, 100.0 * done / total))
+
+    @property
+    def overall_percent(self):
+        """0-100 across all items (item / items), for tools that do one stage per item."""
+        items = self.info.get("items")
+        if not items:
+            return self.percent
+        done_items = max(self.info.get("item", 1) - 1, 0)
+        return min(100.0, (done_items + (self.percent or 0) / 100) / items * 100)
+
+    def _elapsed(self):
+        if self._stage_started is None:
+            return 0.0
+        return self.info.get("time", self._stage_started) - self._stage_started
+
+    @property
+    def rate(self):
+        """Items per second in the current stage (rows/s for row counts), or None."""
+        elapsed = self._elapsed()
+        if self.info.get("done") is None or elapsed <= 0:
+            return None
+        return (self.info["done"] - self._stage_done) / elapsed
+
+    @property
+    def byte_rate(self):
+        elapsed = self._elapsed()
+        if self.info.get("bytes_read") is None or elapsed <= 0:
+            return None
+        return (self.info["bytes_read"] - self._stage_bytes) / elapsed
+
+    def text(self):
+        """One line, e.g. "[2/5] Drop 12: step_03 — 40% · 1,200/3,000 rows · 8,500 rows/s"."""
+        info = self.info
+        head = []
+        if info.get("items"):
+            head.append(f"[{info.get('item', 0)}/{info['items']}]")
+        if info.get("list_name"):
+            head.append(f"{info['list_name']}:" if info.get("stage") else info["list_name"])
+        if info.get("stage"):
+            head.append(info["stage"])
+        parts = [" ".join(head)]
+        percent = self.percent
+        if percent is not None:
+            parts.append(f"{percent:.0f}%")
+        unit = info.get("unit", "")
+        if info.get("done") is not None:
+            count = f"{info['done']:,}"
+            if info.get("total"):
+                count += f"/{info['total']:,}"
+            parts.append(f"{count} {unit}".rstrip())
+            rate = self.rate
+            if rate:
+                parts.append(f"{rate:,.0f} {unit or 'items'}/s")
+        elif info.get("bytes_read") is not None:
+            parts.append(f"{info['bytes_read'] / 2**20:,.1f}/{info.get('bytes_total', 0) / 2**20:,.1f} MB")
+            byte_rate = self.byte_rate
+            if byte_rate:
+                parts.append(f"{byte_rate / 2**20:,.1f} MB/s")
+        return " — ".join(p for p in parts[:2] if p) + "".join(f" · {p}" for p in parts[2:])
+
+
+class ProgressDispatcher:
+    """
+    Sink for events from any thread; on the Tk thread it drains them every interval_ms
+    (root.after) and calls on_progress(ProgressState). finish() (from any thread) drains
+    the rest and calls on_finish on the Tk thread. No Tk call is made off the Tk thread.
+        dispatcher = ProgressDispatcher(root, loader.show_progress, loader.destroy)
+        dispatcher.start()                       # on the Tk thread
+        with reporting(dispatcher): work()       # in the worker thread, then dispatcher.finish()
+    """
+
+    def __init__(self, root, on_progress, on_finish=None, interval_ms=DISPATCH_MS):
+        self.root = root
+        self.on_progress = on_progress
+        self.on_finish = on_finish
+        self.interval_ms = interval_ms
+        self.state = ProgressState()
+        self._pending = []
+        self._finished = False
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        with self._lock:
+            self._pending.append(event)
+
+    def finish(self):
+        with self._lock:
+            self._finished = True
+
+    def start(self):
+        self.root.after(self.interval_ms, self._drain)
+
+    def _drain(self):
+        with self._lock:
+            events, self._pending = self._pending, []
+            finished = self._finished
+        for event in events:
+            self.state.update(event)
+        try:
+            if events:
+                self.on_progress(self.state)
+            if finished:
+                if self.on_finish is not None:
+                    self.on_finish()
+                return
+        except Exception as e:  # a closed window must not stop the worker's messages
+            print(f"⚠️ Progress display error: {e}")
+            if finished:
+                return
+        self.root.after(self.interval_ms, self._drain)
@@ -3,10 +3,18 @@
 # ======================================================================
 import os
 import re
+import json
 import shutil
-import zipfile
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 
+from .helpers import app_data_dir
+from .zip_writer import write_zip
+from .folder_plan import plan_organization, execute_plan
+from .run_tracking import SIDECAR_NAME, load_sidecar, tracked_tool
+from . import run_catalog
+from .progress import report
+
 # ---------- CONFIG (Script 01) ----------
 TXT_NAME = "List Building Records.txt"
 TARGET_COL = "List"  # the column we count for "All Records (List)"
@@ -29,6 +37,9 @@ KEY_ALIASES = {
     "NOHITFILE": "No Hit File",
 }
 
+# Record counts are cached per (path, size, mtime) between runs
+COUNT_CACHE_NAME = "record_counts.json"
+
 # Regex to capture "Key : 123" or "Key: 1,234" with optional quotes after key
 VALUE_RE = re.compile(r"""^(.+?)['"]?\s*:\s*([0-9,]+)\s*$""")
 
@@ -66,22 +77,48 @@ def parse_txt_counts(txt_path):
     return results
 
 
+def _finished_run(folder):
+    """The folder's run sidecar if that run completed (failed runs have no counts)."""
+    record = load_sidecar(folder)
+    return record if record is not None and record.get("status") == "ok" else None
+
+
+def folder_stage_counts(folder):
+    """
+    (counts by normalized key, found) for a list folder: the pipeline's JSON sidecar
+    when there is one, else the regex-parsed TXT tracker (older runs).
+    """
+    record = _finished_run(folder)
+    if record is not None:
+        results = {v: 0 for v in set(KEY_ALIASES.values())}
+        for label, count in record.get("counts", {}).items():
+            key = KEY_ALIASES.get(re.sub(r"\s+", " ", label).strip().upper())
+            if key:
+                results[key] = int(count)
+        return results, True
+    txt_path = os.path.join(folder, TXT_NAME)
+    if os.path.exists(txt_path):
+        return parse_txt_counts(txt_path), True
+    return {v: 0 for v in set(KEY_ALIASES.values())}, False
+
+
+def _read_target_column(csv_path, usecols):
+    """One parse as UTF-8; only a file that is not UTF-8 (rare) is parsed again as latin-1."""
+    try:
+        return pd.read_csv(csv_path, encoding="utf-8", usecols=usecols)
+    except UnicodeDecodeError:
+        return pd.read_csv(csv_path, encoding="latin-1", usecols=usecols)
+
+
 def count_all_records_in_csv(csv_path, target_col=TARGET_COL):
     try:
-        try:
-            df = pd.read_csv(csv_path)
-        except UnicodeDecodeError:
-            df = pd.read_csv(csv_path, encoding="latin-1")
-
-        wanted = None
-        for c in df.columns:
-            if str(c).strip().lower() == target_col.strip().lower():
-                wanted = c
-                break
-        if wanted is None:
+        # Parse only the target column
+        wanted_key = target_col.strip().lower()
+        df = _read_target_column(csv_path, lambda c: str(c).strip().lower() == wanted_key)
+        if df.shape[1] == 0:
             return 0, f"Column '{target_col}' not found"
 
-        series = df[wanted]
+        series = df.iloc[:, 0]
         non_empty = series.dropna()
         if non_empty.dtype == object:
             non_empty = non_empty.map(lambda x: str(x).strip()).replace("", pd.NA).dropna()
@@ -90,55 +127,208 @@ def count_all_records_in_csv(csv_path, target_col=TARGET_COL):
         return 0, f"Error reading CSV: {e}"
 
 
-def collect_data_script1(base_dir, out_dir):
-    rows = []
-    for root, dirs, files in os.walk(base_dir):
-        if os.path.abspath(root).startswith(os.path.abspath(out_dir)):
+def _load_count_cache():
+    try:
+        with open(os.path.join(app_data_dir(), COUNT_CACHE_NAME), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_count_cache(cache):
+    path = os.path.join(app_data_dir(), COUNT_CACHE_NAME)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(cache, f)
+    os.replace(path + ".tmp", path)
+
+
+def count_csv_files(csv_paths, target_col=TARGET_COL, workers=None):
+    """
+    {csv path: (count, note)} for many files: cached results for unchanged files,
+    the rest counted in parallel worker processes.
+    """
+    cache = _load_count_cache()
+    results, todo, keys = {}, [], {}
+    for path in csv_paths:
+        try:
+            st = os.stat(path)
+        except OSError as e:
+            results[path] = (0, f"Error reading CSV: {e}")
             continue
+        key = f"{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}|{target_col}"
+        hit = cache.get(key)
+        if hit is not None:
+            results[path] = tuple(hit)
+        else:
+            todo.append(path)
+            keys[path] = key
+
+    report(stage="Counting CSV records", done=0, total=len(todo), unit="files")
+    counted = []
+    if len(todo) > 1 and (workers is None or workers > 1):
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for result in pool.map(count_all_records_in_csv, todo, [target_col] * len(todo), chunksize=4):
+                counted.append(result)
+                report(stage="Counting CSV records", done=len(counted), total=len(todo), unit="files")
+    else:
+        for path in todo:
+            counted.append(count_all_records_in_csv(path, target_col))
+            report(stage="Counting CSV records", done=len(counted), total=len(todo), unit="files")
+
+    for path, result in zip(todo, counted):
+        results[path] = result
+        if result[1] == "OK" or result[1].startswith("Column "):
+            cache[keys[path]] = list(result)
+
+    if todo:
+        # Drop entries for older versions of the files just counted
+        live = {k.rsplit("|", 3)[0] for k in keys.values()}
+        cache = {k: v for k, v in cache.items() if k.rsplit("|", 3)[0] not in live or k in keys.values()}
+        _save_count_cache(cache)
+    return results
+
 
-        folder_name = os.path.basename(root)
-        txt_path = os.path.join(root, TXT_NAME)
-        txt_exists = os.path.exists(txt_path)
-        txt_counts = parse_txt_counts(txt_path) if txt_exists else {v: 0 for v in set(KEY_ALIASES.values())}
-
-        csv_files = [f for f in files if f.lower().endswith(".csv") and not f.startswith("~$")]
-        for csv_name in csv_files:
-            csv_path = os.path.join(root, csv_name)
-            total_records, note = count_all_records_in_csv(csv_path, TARGET_COL)
-            rows.append({
-                "List Name": folder_name,
-                "2BSkip": txt_counts.get("2BSkip", 0),
-                "CC Ready": txt_counts.get("CC Ready", 0),
-                "GHL Ready": txt_counts.get("GHL Ready", 0),
-                "SC Ready": txt_counts.get("SC Ready", 0),
-                "SkipTraced": txt_counts.get("SkipTraced", 0),
-                "No Hit File": txt_counts.get("No Hit File", 0),
-                "All Records (List)": total_records,
-                "Notes": note if note != "OK" else "",
-            })
-
-        if txt_exists and not csv_files:
-            rows.append({
-                "List Name": folder_name,
-                "2BSkip": txt_counts.get("2BSkip", 0),
-                "CC Ready": txt_counts.get("CC Ready", 0),
-                "GHL Ready": txt_counts.get("GHL Ready", 0),
-                "SC Ready": txt_counts.get("SC Ready", 0),
-                "SkipTraced": txt_counts.get("SkipTraced", 0),
-                "No Hit File": txt_counts.get("No Hit File", 0),
-                "All Records (List)": 0,
-                "Notes": "TXT found; no CSV in folder",
-            })
+def _list_file_names(files):
+    """The files that decide what Script 1 reports for a folder: tracker, run sidecar, CSVs."""
+    csv_files = [f for f in files if f.lower().endswith(".csv") and not f.startswith("~$")]
+    return sorted(csv_files + [name for name in (TXT_NAME, SIDECAR_NAME) if name in files])
+
+
+def folder_stamp(folder, names):
+    """
+    Changes when an entry is added, removed or renamed in folder (its mtime) or one of
+    its list files is rewritten in place (their size and mtime). OSError if folder is gone.
+    """
+    parts = [str(os.stat(folder).st_mtime_ns)]
+    for name in names:
+        try:
+            st = os.stat(os.path.join(folder, name))
+            parts.append(f"{st.st_size}:{st.st_mtime_ns}")
+        except OSError:
+            parts.append("-")
+    return "|".join(parts)
+
+
+def _walk(top, out_dir):
+    """(folder, file names) for top and every folder below it, except the output folder."""
+    out_path = os.path.abspath(out_dir)
+    for root, dirs, files in os.walk(top):
+        if os.path.abspath(root).startswith(out_path):
+            dirs[:] = []
+            continue
+        yield root, files
+
+
+def _read_folders(entries):
+    """
+    entries: [(folder, file names)]. Returns (list folders [(folder, stage counts, has tracker,
+    [(csv name, records, note)])], walked dirs [(folder, stamp, list file names)]).
+    CSVs are counted in parallel + cached.
+    """
+    folders, dirs = [], []
+    for root, files in entries:
+        names = _list_file_names(files)
+        try:
+            dirs.append((root, folder_stamp(root, names), names))
+        except OSError:
+            continue  # removed while scanning
+        txt_counts, txt_exists = folder_stage_counts(root)
+        csv_files = [f for f in names if f.lower().endswith(".csv")]
+        if txt_exists or csv_files:
+            folders.append((root, txt_counts, txt_exists, csv_files))
+
+    counts = count_csv_files([os.path.join(root, f) for root, _, _, csv_files in folders for f in csv_files])
+    folders = [(root, txt_counts, txt_exists, [(f, *counts[os.path.join(root, f)]) for f in csv_files])
+               for root, txt_counts, txt_exists, csv_files in folders]
+    return folders, dirs
+
+
+def scan_folders_script1(base_dir, out_dir):
+    """Walk base_dir once: (list folders, every folder walked with its stamp), see _read_folders."""
+    return _read_folders(_walk(base_dir, out_dir))
+
+
+def scan_changes_script1(base_dir, out_dir, known):
+    """
+    Re-read only what changed since the scans that stamped `known` (run_catalog.scanned_dirs):
+    a folder whose stamp differs is listed again and its new subfolders are walked; a folder
+    that is gone is dropped. Returns (list folders, re-read dirs, gone folders).
+    """
+    out_path = os.path.abspath(out_dir)
+    known_keys = {row["folder"] for row in known}
+    entries, gone = [], []
+    for row in known:
+        path = row["path"]
+        if os.path.abspath(path).startswith(out_path):
+            continue
+        try:
+            if folder_stamp(path, row["files"]) == row["stamp"]:
+                continue
+            with os.scandir(path) as it:
+                listing = [(e.name, e.is_dir(follow_symlinks=False)) for e in it]
+        except OSError:
+            gone.append(path)
+            continue
+        entries.append((path, [name for name, is_dir in listing if not is_dir]))
+        for name, is_dir in listing:
+            sub = os.path.join(path, name)
+            if is_dir and run_catalog.folder_key(sub) not in known_keys:
+                entries.extend(_walk(sub, out_dir))
+    folders, dirs = _read_folders(entries)
+    return folders, dirs, gone
+
+
+def _summary_rows(folder_name, txt_counts, txt_exists, csvs):
+    stage_cols = {k: txt_counts.get(k, 0) for k in ("2BSkip", "CC Ready", "GHL Ready", "SC Ready", "SkipTraced", "No Hit File")}
+    rows = [{"List Name": folder_name, **stage_cols, "All Records (List)": total_records,
+             "Notes": note if note != "OK" else ""}
+            for csv_name, total_records, note in csvs]
+    if txt_exists and not csvs:
+        rows.append({"List Name": folder_name, **stage_cols, "All Records (List)": 0,
+                     "Notes": "TXT found; no CSV in folder"})
     return rows
 
 
-def run_script1():
+def collect_data_script1(base_dir, out_dir, rescan=False, week=None, state=None):
+    """
+    Summary rows from the run catalog. The drive is walked the first time base_dir is
+    seen (or with rescan=True) to backfill lists from older runs; after that only folders
+    whose stamp changed are read again (new lists from other machines or copies, lists
+    Script 3 moved). week / state filter on the catalog indexes.
+    """
+    conn = run_catalog.connect()
+    try:
+        known = [] if rescan else run_catalog.scanned_dirs(base_dir, conn)
+        if not known:  # first scan here (or a catalog from before folder stamps)
+            print("🔎 Script1: Scanning folders to update the run catalog...")
+            folders, dirs = scan_folders_script1(base_dir, out_dir)
+            run_catalog.backfill(base_dir, folders, conn, dirs)
+        else:
+            folders, dirs, gone = scan_changes_script1(base_dir, out_dir, known)
+            if dirs or gone:
+                print(f"🔎 Script1: {len(dirs) + len(gone):,} changed folder(s) read again")
+                run_catalog.update_scan(base_dir, folders, dirs, gone, conn)
+        lists = run_catalog.query_lists(under=base_dir, week=week, state=state, conn=conn)
+    finally:
+        conn.close()
+
+    out_key = run_catalog.folder_key(out_dir)
+    rows = []
+    for item in lists:
+        if item["folder"] == out_key or item["folder"].startswith(out_key + os.sep):
+            continue
+        rows.extend(_summary_rows(item["list_name"], item["counts"], item["has_tracker"], item["csvs"]))
+    return rows
+
+
+@tracked_tool("record_extractor_script1")
+def run_script1(rescan=False, week=None, state=None):
     base_dir = os.getcwd()
     out_dir = os.path.join(base_dir, "Data pulling records")
     out_file = os.path.join(out_dir, "Extracted_Records.xlsx")
     
     os.makedirs(out_dir, exist_ok=True)
-    rows = collect_data_script1(base_dir, out_dir)
+    rows = collect_data_script1(base_dir, out_dir, rescan=rescan, week=week, state=state)
     if not rows:
         print("No matching CSV/TXT files found.")
         return
@@ -210,13 +400,21 @@ def extract_info_from_file(file_path):
     )
 
 
-def run_script2():
+@tracked_tool("record_extractor_script2")
+def run_script2(stage_copy=True, zip_mode="deflate"):
+    """
+    stage_copy=False skips the "Collected GHL Ready Files" copy; the zip is always
+    built straight from the source GHL Ready files (zip_mode: deflate / store / auto).
+    """
     base_path = os.getcwd()
     output_folder = os.path.join(base_path, "Data pulling records")
     ghl_output_folder = os.path.join(base_path, "Collected GHL Ready Files")
     os.makedirs(output_folder, exist_ok=True)
-    os.makedirs(ghl_output_folder, exist_ok=True)
+    if stage_copy:
+        os.makedirs(ghl_output_folder, exist_ok=True)
 
+    # zip member name -> source file (same name from a later folder wins, like the copy)
+    ghl_files = {}
     data, zip_name = [], None
     for folder in os.listdir(base_path):
         folder_path = os.path.join(base_path, folder)
@@ -226,8 +424,13 @@ def run_script2():
                 week, state = parts[0], parts[-1]
                 zip_name = f"{week}-{state}"
             file_path = os.path.join(folder_path, "List Building Records.txt")
-            if os.path.exists(file_path):
-                skiptraced, scready, nohit = extract_info_from_file(file_path)
+            record = _finished_run(folder_path)
+            if record is not None or os.path.exists(file_path):
+                if record is not None:
+                    counts = record.get("counts", {})
+                    skiptraced, scready, nohit = (str(counts.get(k, 0)) for k in ("SkipTraced", "SC Ready", "No Hit File"))
+                else:
+                    skiptraced, scready, nohit = extract_info_from_file(file_path)
                 data.append({
                     "Folder Name": folder, 
                     "SkipTraced": skiptraced, 
@@ -239,7 +442,9 @@ def run_script2():
                 for file_name in os.listdir(ghl_folder):
                     src_file = os.path.join(ghl_folder, file_name)
                     if os.path.isfile(src_file):
-                        shutil.copy2(src_file, os.path.join(ghl_output_folder, f"{file_name}"))
+                        ghl_files[file_name] = src_file
+                        if stage_copy:
+                            shutil.copy2(src_file, os.path.join(ghl_output_folder, f"{file_name}"))
 
     csv_file = os.path.join(output_folder, "GHL_Summary.csv")
     if data:
@@ -249,17 +454,15 @@ def run_script2():
     else:
         print("⚠️ Script2: No List Building Records found.")
 
-    print(f"✅ Script2: GHL Ready files copied to {ghl_output_folder}")
+    if stage_copy:
+        print(f"✅ Script2: GHL Ready files copied to {ghl_output_folder}")
     if zip_name:
         zip_file_path = os.path.join(base_path, f"{zip_name}.zip")
-        with zipfile.ZipFile(zip_file_path, "w", zipfile.ZIP_DEFLATED) as zipf:
-            if csv_file and os.path.exists(csv_file):
-                zipf.write(csv_file, os.path.basename(csv_file))
-            for root, dirs, files in os.walk(ghl_output_folder):
-                for f in files:
-                    full_path = os.path.join(root, f)
-                    arcname = os.path.basename(full_path)
-                    zipf.write(full_path, arcname)
+        members = []
+        if csv_file and os.path.exists(csv_file):
+            members.append((csv_file, os.path.basename(csv_file)))
+        members.extend((src_file, arcname) for arcname, src_file in ghl_files.items())
+        write_zip(zip_file_path, members, mode=zip_mode)
         print(f"✅ Script2: Zip created {zip_file_path}")
     else:
         print("⚠️ Script2: Could not determine zip name.")
@@ -268,40 +471,33 @@ def run_script2():
 # ======================================================================
 #                        SCRIPT 03 – Folder Organization
 # ======================================================================
-def organize_folders(base_dir):
-    for root, dirs, files in os.walk(base_dir, topdown=False):
-        for folder in dirs:
-            folder_path = os.path.join(root, folder)
-            parts = folder.split('-')
-            if len(parts) < 4:
-                continue
-            week, year, absentee, city, state = parts[0], parts[1], parts[2], parts[-2], parts[-1]
-            state_dir = os.path.join(base_dir, state)
-            city_dir = os.path.join(state_dir, city)
-            week_dir = os.path.join(city_dir, week)
-            absentee_dir = os.path.join(week_dir, absentee)
-            for d in [state_dir, city_dir, week_dir, absentee_dir]:
-                os.makedirs(d, exist_ok=True)
-            for item in os.listdir(folder_path):
-                shutil.move(os.path.join(folder_path, item), os.path.join(absentee_dir, item))
-            shutil.rmtree(folder_path, ignore_errors=True)
-
-    for root, dirs, files in os.walk(base_dir, topdown=False):
-        for d in dirs:
-            dir_path = os.path.join(root, d)
-            if not os.listdir(dir_path):
-                os.rmdir(dir_path)
-
-    for root, dirs, files in os.walk(base_dir):
-        for f in files:
-            if f.lower().endswith(".txt"):
-                os.remove(os.path.join(root, f))
-
-
-def run_script3():
+def organize_folders(base_dir, dry_run=False):
+    """
+    Plan the whole reorganization from one scan, then apply it (unless dry_run).
+    Returns the OrganizePlan; plan.report() lists every step.
+    """
+    plan = plan_organization(base_dir)
+    if not dry_run:
+        try:
+            execute_plan(plan)
+        finally:
+            # Moved / removed folders and deleted trackers: Script 1 reads them again
+            touched = [path for _, *paths in plan.steps for path in paths] + plan.pruned + plan.deleted
+            if touched:
+                run_catalog.invalidate(touched)
+    return plan
+
+
+@tracked_tool("record_extractor_script3")
+def run_script3(dry_run=False):
     cwd = os.getcwd()
-    organize_folders(cwd)
+    plan = organize_folders(cwd, dry_run=dry_run)
+    if dry_run:
+        print(plan.report())
+        print(f"📝 Script3: Dry run only, nothing changed ({plan.summary()}).")
+        return plan
     print("✅ Script3: Organization complete (folders structured, empty dirs removed, .txt files deleted).")
+    return plan
 
 
 # ======================================================================
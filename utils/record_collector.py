@@ -1,53 +1,48 @@
-import os
-import shutil
-import tkinter as tk
-from tkinter import messagebox
+from .collector_engine import collect_folder_files, DEFAULT_WORKERS
+from .run_tracking import PipelineRun
 
-def run_record_collector(base_directory, folder_name):
+def collect_records(base_directory, folder_name, link_mode=None, workers=DEFAULT_WORKERS, incremental=True):
     """
     Collect all files from folders with the specified name recursively
-    and copy them to a main folder in the base directory.
+    and copy them to a main folder in the base directory (no dialogs).
     
     Args:
         base_directory: The root directory to search in
         folder_name: The name of the folder to search for
+        link_mode: None to copy, or "hardlink"/"reflink" when on the same filesystem
+        workers: Number of parallel copy threads
+        incremental: Skip files collected by earlier runs (manifest in the target folder)
+    Returns the collect_folder_files result (copied, linked, unchanged, duplicates, target).
     """
-    target_folder = os.path.join(base_directory, folder_name)
-    
-    # Make target folder if it doesn't exist
-    os.makedirs(target_folder, exist_ok=True)
-    
-    files_copied = 0
-    
-    # Walk through all directories and subdirectories
-    for root, dirs, files in os.walk(base_directory):
-        # If folder name matches and it's not the target folder itself
-        if os.path.basename(root) == folder_name and root != target_folder:
-            for file in files:
-                source_file = os.path.join(root, file)
-                dest_file = os.path.join(target_folder, file)
-                
-                # If file with same name exists, rename with suffix
-                if os.path.exists(dest_file):
-                    base, ext = os.path.splitext(file)
-                    i = 1
-                    while os.path.exists(os.path.join(target_folder, f"{base}_{i}{ext}")):
-                        i += 1
-                    dest_file = os.path.join(target_folder, f"{base}_{i}{ext}")
-                
-                try:
-                    shutil.copy2(source_file, dest_file)
-                    files_copied += 1
-                    print(f"✅ Copied: {source_file} -> {dest_file}")
-                except Exception as e:
-                    print(f"❌ Error copying {source_file}: {e}")
+    with PipelineRun("record_collector", folder_name, base_directory, base_directory, sidecar=False) as run:
+        result = collect_folder_files(base_directory, folder_name, link_mode=link_mode,
+                                      workers=workers, incremental=incremental, log=print)
+        for key in ("copied", "linked", "unchanged", "duplicates"):
+            run.count(key, result[key])
+        run.output("target", result["target"])
+    target_folder = result["target"]
+    files_copied = result["copied"] + result["linked"]
     
     print(f"\n🎯 {files_copied} files collected into: {target_folder}")
+    if result["unchanged"] or result["duplicates"]:
+        print(f"⏭️ Skipped {result['unchanged']} already collected and {result['duplicates']} duplicate files")
+    return result
+
+
+def run_record_collector(base_directory, folder_name, link_mode=None, workers=DEFAULT_WORKERS, incremental=True):
+    """collect_records() followed by a completion dialog (used by the app)."""
+    from tkinter import messagebox
+
+    result = collect_records(base_directory, folder_name, link_mode=link_mode,
+                             workers=workers, incremental=incremental)
+    target_folder = result["target"]
+    files_copied = result["copied"] + result["linked"]
     
     # Show completion message
-    if files_copied > 0:
+    if files_copied > 0 or result["unchanged"] or result["duplicates"]:
         messagebox.showinfo("Record Collector", 
-                           f"Successfully collected {files_copied} files into:\n{target_folder}")
+                           f"Successfully collected {files_copied} files into:\n{target_folder}"
+                           f"\n\nUp to date: {result['unchanged']}, duplicates skipped: {result['duplicates']}")
     else:
         messagebox.showwarning("Record Collector", 
                               f"No files found in '{folder_name}' folders within:\n{base_directory}")
@@ -4,6 +4,8 @@ import argparse
 import sys
 from pathlib import Path
 
+from .progress import open_reporting, report
+
 def subtract_records(left_files, right_files, left_columns, right_columns, output_path, output_format="xlsx"):
     """
     Subtract records from right files from left files and save the result
@@ -23,11 +25,13 @@ def subtract_records(left_files, right_files, left_columns, right_columns, outpu
     left_dfs = []
     for i, file in enumerate(left_files):
         print(f"   Reading left file {i+1}/{len(left_files)}: {os.path.basename(file)}")
+        report(item=i + 1, items=len(left_files) + len(right_files))
         
-        if file.endswith('.csv'):
-            df = pd.read_csv(file)
-        else:
-            df = pd.read_excel(file)
+        with open_reporting(file) as f:
+            if file.endswith('.csv'):
+                df = pd.read_csv(f)
+            else:
+                df = pd.read_excel(f)
         left_dfs.append(df)
     
     print("📊 Combining left side data...")
@@ -42,11 +46,13 @@ def subtract_records(left_files, right_files, left_columns, right_columns, outpu
     right_dfs = []
     for i, file in enumerate(right_files):
         print(f"   Reading right file {i+1}/{len(right_files)}: {os.path.basename(file)}")
+        report(item=len(left_files) + i + 1, items=len(left_files) + len(right_files))
         
-        if file.endswith('.csv'):
-            df = pd.read_csv(file)
-        else:
-            df = pd.read_excel(file)
+        with open_reporting(file) as f:
+            if file.endswith('.csv'):
+                df = pd.read_csv(f)
+            else:
+                df = pd.read_excel(f)
         right_dfs.append(df)
     
     print("📊 Combining right side data...")
@@ -65,6 +71,7 @@ def subtract_records(left_files, right_files, left_columns, right_columns, outpu
     left_combined = left_combined.drop(columns=['composite_key'])
     
     print("💾 Saving result...")
+    report(stage="Saving result", done=0, total=len(left_combined), unit="rows")
     
     # Save the result
     if output_format == "csv":
@@ -72,6 +79,7 @@ def subtract_records(left_files, right_files, left_columns, right_columns, outpu
     else:
         left_combined.to_excel(output_path, index=False)
     
+    report(stage="Saving result", done=len(left_combined), total=len(left_combined), unit="rows")
     print(f"✅ Subtraction completed! Result saved to: {output_path}")
     print(f"📊 Original records: {len(left_dfs[0]) + sum(len(df) for df in left_dfs[1:])}")
     print(f"📊 Records after subtraction: {len(left_combined)}")
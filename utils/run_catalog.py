@@ -0,0 +1,313 @@
+# utils/run_catalog.py
+# Local SQLite catalog of processed lists and pipeline/tool runs (no Tk import).
+#
+#   runs       one row per pipeline or tool run (history, from PipelineRun)
+#   lists      one row per list folder: latest stage counts, GHL file, week/state/city
+#   list_csvs  CSV record counts per list folder (filled by Record Extractor scans)
+#   scans      drive folders already walked once to backfill older lists
+#   scan_dirs  every folder a scan walked, with a stamp of its mtime and its list files
+#
+# Lists are keyed by their normalized absolute folder path, so "everything under
+# this drive folder" is an index range scan instead of a walk. Later scans compare
+# the stamps and re-read only folders that changed (see update_scan / invalidate).
+import os
+import json
+import sqlite3
+from datetime import datetime
+
+from .helpers import app_data_dir
+
+CATALOG_NAME = "run_catalog.sqlite3"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    pipeline TEXT NOT NULL,
+    list_name TEXT COLLATE NOCASE,
+    week TEXT COLLATE NOCASE,
+    state TEXT COLLATE NOCASE,
+    folder TEXT,
+    status TEXT,
+    error TEXT,
+    started TEXT,
+    finished TEXT,
+    total_seconds REAL,
+    input_path TEXT,
+    input_hash TEXT,
+    counts TEXT,
+    outputs TEXT,
+    stages TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_list ON runs (list_name);
+CREATE INDEX IF NOT EXISTS runs_week_state ON runs (week, state);
+CREATE INDEX IF NOT EXISTS runs_input_hash ON runs (input_hash);
+
+CREATE TABLE IF NOT EXISTS lists (
+    folder TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    list_name TEXT NOT NULL COLLATE NOCASE,
+    week TEXT COLLATE NOCASE,
+    state TEXT COLLATE NOCASE,
+    city TEXT COLLATE NOCASE,
+    pipeline TEXT,
+    has_tracker INTEGER NOT NULL DEFAULT 0,
+    counts TEXT,
+    ghl_path TEXT,
+    last_run_id INTEGER,
+    position INTEGER,
+    updated TEXT
+);
+CREATE INDEX IF NOT EXISTS lists_week ON lists (week);
+CREATE INDEX IF NOT EXISTS lists_state ON lists (state);
+CREATE INDEX IF NOT EXISTS lists_name ON lists (list_name);
+
+CREATE TABLE IF NOT EXISTS list_csvs (
+    folder TEXT NOT NULL,
+    csv_name TEXT NOT NULL,
+    records INTEGER,
+    note TEXT,
+    position INTEGER,
+    PRIMARY KEY (folder, csv_name)
+);
+
+CREATE TABLE IF NOT EXISTS scans (
+    root TEXT PRIMARY KEY,
+    scanned TEXT
+);
+
+CREATE TABLE IF NOT EXISTS scan_dirs (
+    folder TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    stamp TEXT NOT NULL,
+    files TEXT
+);
+"""
+
+
+def catalog_path():
+    return os.path.join(app_data_dir(), CATALOG_NAME)
+
+
+def connect(path=None):
+    conn = sqlite3.connect(path or catalog_path(), timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def folder_key(folder):
+    return os.path.normcase(os.path.abspath(folder))
+
+
+def _under(prefix):
+    """(low, high) bounds of every key inside prefix, for an index range scan."""
+    prefix = folder_key(prefix).rstrip(os.sep) + os.sep
+    return prefix, prefix + "\U0010ffff"
+
+
+def parse_list_name(list_name):
+    """(week, state, city) from "Week-Year-Absentee-...-City-State", or Nones."""
+    parts = list_name.split("-")
+    if len(parts) < 4:
+        return None, None, None
+    return parts[0], parts[-1], parts[-2]
+
+
+def _now():
+    return datetime.now().isoformat(timespec="seconds")
+
+
+# ---------------------------------------
+# Registration
+# ---------------------------------------
+def register_run(record, folder, conn=None, list_entry=True):
+    """Store a PipelineRun record; a successful list run also refreshes its list entry."""
+    own = conn is None
+    conn = conn or connect()
+    try:
+        week, state, city = parse_list_name(record.get("list_name") or "")
+        with conn:
+            cur = conn.execute(
+                "INSERT INTO runs (pipeline, list_name, week, state, folder, status, error, started,"
+                " finished, total_seconds, input_path, input_hash, counts, outputs, stages)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (record["pipeline"], record.get("list_name"), week, state, folder_key(folder),
+                 record.get("status"), record.get("error"), record.get("started"), record.get("finished"),
+                 record.get("total_seconds"), (record.get("input") or {}).get("path"),
+                 (record.get("input") or {}).get("hash"), json.dumps(record.get("counts", {})),
+                 json.dumps(record.get("outputs", {})), json.dumps(record.get("stages", []))))
+            if list_entry and record.get("status") == "ok" and record.get("counts"):
+                _upsert_list(conn, folder, record.get("counts"), True, record["pipeline"],
+                             (record.get("outputs") or {}).get("GHL Ready"), cur.lastrowid)
+        return cur.lastrowid
+    finally:
+        if own:
+            conn.close()
+
+
+def _upsert_list(conn, folder, counts, has_tracker, pipeline=None, ghl_path=None, run_id=None, position=None):
+    list_name = os.path.basename(os.path.abspath(folder))
+    week, state, city = parse_list_name(list_name)
+    conn.execute(
+        "INSERT INTO lists (folder, path, list_name, week, state, city, pipeline, has_tracker, counts,"
+        " ghl_path, last_run_id, position, updated) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+        " ON CONFLICT(folder) DO UPDATE SET has_tracker=excluded.has_tracker, counts=excluded.counts,"
+        " pipeline=COALESCE(excluded.pipeline, lists.pipeline),"
+        " ghl_path=COALESCE(excluded.ghl_path, lists.ghl_path),"
+        " last_run_id=COALESCE(excluded.last_run_id, lists.last_run_id),"
+        " position=COALESCE(excluded.position, lists.position), updated=excluded.updated",
+        (folder_key(folder), os.path.abspath(folder), list_name, week, state, city, pipeline,
+         int(bool(has_tracker)), json.dumps(counts), ghl_path, run_id, position, _now()))
+
+
+def _delete_at_or_under(conn, path):
+    """Forget a folder and everything below it (lists, their CSV counts, scan stamps)."""
+    key = folder_key(path)
+    low, high = _under(path)
+    for table in ("lists", "list_csvs", "scan_dirs"):
+        conn.execute(f"DELETE FROM {table} WHERE folder = ? OR (folder >= ? AND folder < ?)", (key, low, high))
+
+
+def _store_scan(conn, folders, dirs, start_position=None):
+    """Upsert list folders [(folder, counts, has_tracker, csvs)] and walked dirs [(folder, stamp, files)]."""
+    listed = set()
+    for i, (folder, counts, has_tracker, csvs) in enumerate(folders):
+        key = folder_key(folder)
+        listed.add(key)
+        position = None if start_position is None else start_position + i
+        _upsert_list(conn, folder, counts, has_tracker, position=position)
+        conn.execute("DELETE FROM list_csvs WHERE folder = ?", (key,))
+        conn.executemany(
+            "INSERT INTO list_csvs (folder, csv_name, records, note, position) VALUES (?, ?, ?, ?, ?)",
+            [(key, name, records, note, j) for j, (name, records, note) in enumerate(csvs)])
+    conn.executemany(
+        "INSERT OR REPLACE INTO scan_dirs (folder, path, stamp, files) VALUES (?, ?, ?, ?)",
+        [(folder_key(folder), os.path.abspath(folder), stamp, json.dumps(files)) for folder, stamp, files in dirs])
+    return listed
+
+
+def backfill(root, folders, conn=None, dirs=()):
+    """
+    Replace the catalog's view of everything under root with a fresh walk.
+    folders: [(folder, counts, has_tracker, [(csv name, records, note)])] in walk order.
+    dirs: [(folder, stamp, list file names)] for every folder walked (change detection).
+    """
+    own = conn is None
+    conn = conn or connect()
+    try:
+        low, high = _under(root)
+        root_key = folder_key(root)
+        with conn:
+            conn.execute("DELETE FROM scan_dirs WHERE folder = ? OR (folder >= ? AND folder < ?)",
+                         (root_key, low, high))
+            seen = _store_scan(conn, folders, dirs, start_position=0)
+            # Lists that are gone from the drive (moved, deleted, emptied)
+            stale = [row["folder"] for row in conn.execute(
+                "SELECT folder FROM lists WHERE folder = ? OR (folder >= ? AND folder < ?)",
+                (root_key, low, high)) if row["folder"] not in seen]
+            conn.executemany("DELETE FROM lists WHERE folder = ?", [(k,) for k in stale])
+            conn.executemany("DELETE FROM list_csvs WHERE folder = ?", [(k,) for k in stale])
+            conn.execute("INSERT OR REPLACE INTO scans (root, scanned) VALUES (?, ?)", (root_key, _now()))
+    finally:
+        if own:
+            conn.close()
+
+
+def update_scan(root, folders, dirs, gone, conn=None):
+    """
+    Apply a partial re-scan: dirs [(folder, stamp, files)] were read again and folders are
+    the list folders among them; gone are folders that no longer exist.
+    """
+    own = conn is None
+    conn = conn or connect()
+    try:
+        with conn:
+            for path in gone:
+                _delete_at_or_under(conn, path)
+            listed = _store_scan(conn, folders, dirs)
+            # Read again and no longer a list folder (tracker and CSVs removed)
+            dropped = [(folder_key(folder),) for folder, _, _ in dirs if folder_key(folder) not in listed]
+            conn.executemany("DELETE FROM lists WHERE folder = ?", dropped)
+            conn.executemany("DELETE FROM list_csvs WHERE folder = ?", dropped)
+            conn.execute("INSERT OR REPLACE INTO scans (root, scanned) VALUES (?, ?)", (folder_key(root), _now()))
+    finally:
+        if own:
+            conn.close()
+
+
+def invalidate(paths, conn=None):
+    """
+    Paths that were moved, created or deleted outside a scan (Script 3): forget what is
+    catalogued at or under each one and mark its parent folder as changed, so the next
+    scan reads it again.
+    """
+    own = conn is None
+    conn = conn or connect()
+    try:
+        with conn:
+            for path in paths:
+                _delete_at_or_under(conn, path)
+                conn.execute("UPDATE scan_dirs SET stamp = '' WHERE folder = ?",
+                             (folder_key(os.path.dirname(os.path.abspath(path))),))
+    finally:
+        if own:
+            conn.close()
+
+
+# ---------------------------------------
+# Queries
+# ---------------------------------------
+def scanned_dirs(root, conn=None):
+    """Stamped folders at or under root from earlier scans: [{folder, path, stamp, files}]."""
+    own = conn is None
+    conn = conn or connect()
+    try:
+        low, high = _under(root)
+        rows = conn.execute("SELECT * FROM scan_dirs WHERE folder = ? OR (folder >= ? AND folder < ?)",
+                            (folder_key(root), low, high))
+        return [dict(row, files=json.loads(row["files"] or "[]")) for row in rows]
+    finally:
+        if own:
+            conn.close()
+
+
+def query_lists(under=None, week=None, state=None, list_name=None, conn=None):
+    """
+    Catalogued lists as dicts (counts decoded, "csvs" attached), in scan order, then by folder.
+    Filters use the week / state / list_name indexes; `under` limits to one drive folder.
+    """
+    own = conn is None
+    conn = conn or connect()
+    try:
+        where, args = [], []
+        if under:
+            low, high = _under(under)
+            where.append("(folder = ? OR (folder >= ? AND folder < ?))")
+            args += [folder_key(under), low, high]
+        for column, value in (("week", week), ("state", state), ("list_name", list_name)):
+            if value:
+                where.append(f"{column} = ?")  # NOCASE columns and indexes
+                args.append(value)
+        sql = "SELECT * FROM lists"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY position IS NULL, position, folder"
+        lists = [dict(row) for row in conn.execute(sql, args)]
+
+        csvs = {}
+        if lists:
+            keys = [item["folder"] for item in lists]
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                for row in conn.execute(
+                        f"SELECT * FROM list_csvs WHERE folder IN ({','.join('?' * len(chunk))})"
+                        " ORDER BY folder, position", chunk):
+                    csvs.setdefault(row["folder"], []).append((row["csv_name"], row["records"], row["note"]))
+        for item in lists:
+            item["counts"] = json.loads(item["counts"] or "{}")
+            item["csvs"] = csvs.get(item["folder"], [])
+        return lists
+    finally:
+        if own:
+            conn.close()
@@ -0,0 +1,191 @@
+# utils/run_tracking.py
+# Machine-readable run sidecar for the list-building pipelines (no Tk import).
+#
+# Next to "List Building Records.txt" every run writes "List Building Records.json":
+#   pipeline, list_name, status (ok / failed / cancelled), error, started / finished,
+#   input {path, size, mtime_ns, hash}, counts {label: records},
+#   outputs {label: path}, stages [{name, seconds}], total_seconds,
+#   metrics [{name, wall/cpu seconds, peak RSS, rows in/out, rows/s}] from @instrument,
+#   profile {pstats, folded} when the run was profiled (utils/profiling.py)
+# The Record Extractor reads these instead of regex-parsing the text tracker.
+# The metrics are also appended to the text tracker as "[perf]" lines (and a profiled
+# run adds its top functions as "[profile]" lines).
+# The same record is also registered in the local run catalog (utils/run_catalog.py).
+import os
+import json
+import time
+import functools
+from datetime import datetime
+
+from .collector_manifest import file_hash
+from .instrumentation import Stage, activate, deactivate, flush_logs, format_metric
+from .job_executor import JobCancelled, checkpoint
+from .profiling import RunProfiler, requested as profiling_requested
+from .progress import report
+from .run_catalog import register_run
+
+SIDECAR_NAME = "List Building Records.json"
+TRACKER_NAME = "List Building Records.txt"
+SIDECAR_VERSION = 1
+
+
+def input_info(input_path):
+    try:
+        st = os.stat(input_path)
+    except OSError:
+        return {"path": os.path.abspath(input_path), "size": None, "mtime_ns": None, "hash": None}
+    return {"path": os.path.abspath(input_path), "size": st.st_size, "mtime_ns": st.st_mtime_ns,
+            "hash": file_hash(input_path) if os.path.isfile(input_path) else None}
+
+
+class PipelineRun:
+    """
+    with PipelineRun("listbuilding", list_name, input_path, list_folder) as run:
+        ...step 01...
+        run.lap("Step 01")
+        run.count("SkipTraced", len(df_01)); run.output("SkipTraced", filepath_01)
+    The sidecar is written on exit, also when the run fails (status "failed").
+    While the run is open, @instrument-ed calls report their metrics to it.
+    """
+
+    def __init__(self, pipeline, list_name, input_path, output_folder, sidecar=True):
+        self.pipeline = pipeline
+        self.sidecar = sidecar  # tools log to the catalog only
+        self.output_folder = output_folder
+        self.list_name = list_name
+        self.input_path = input_path
+        self.path = os.path.join(output_folder, SIDECAR_NAME)
+        self.counts = {}
+        self.outputs = {}
+        self.stages = []
+        self.metrics = []
+        self.profiler = None
+        self.profile_files = None
+
+    def __enter__(self):
+        self.started = datetime.now()
+        self._t0 = self._last = time.perf_counter()
+        self.input = input_info(self.input_path)
+        self._token = activate(self)
+        report(list_name=self.list_name)
+        if profiling_requested() and self.sidecar:
+            profiler = RunProfiler()
+            if profiler.start():
+                self.profiler = profiler
+        return self
+
+    def add_metric(self, metric):
+        self.metrics.append(metric)
+
+    def stage(self, name, rows_in=None):
+        """Measure a block that is not a decorated function: with run.stage("Read input") as st: ..."""
+        return Stage(name, rows_in)
+
+    def lap(self, stage_name):
+        """
+        Close the current stage: time since the previous lap (or the start).
+        In a GUI job this is also the cancellation point.
+        """
+        now = time.perf_counter()
+        self.stages.append({"name": stage_name, "seconds": round(now - self._last, 3)})
+        self._last = now
+        checkpoint()
+
+    def count(self, label, records):
+        self.counts[label] = int(records)
+
+    def output(self, label, path):
+        self.outputs[label] = os.path.abspath(path) if path else None
+
+    def to_dict(self, status, error=None):
+        return {
+            "version": SIDECAR_VERSION,
+            "pipeline": self.pipeline,
+            "list_name": self.list_name,
+            "status": status,
+            "error": error,
+            "started": self.started.isoformat(timespec="seconds"),
+            "finished": datetime.now().isoformat(timespec="seconds"),
+            "input": self.input,
+            "counts": self.counts,
+            # outputs removed later in the run (keep_outputs) are recorded as None
+            "outputs": {label: path if path and os.path.exists(path) else None
+                        for label, path in self.outputs.items()},
+            "stages": self.stages,
+            "metrics": self.metrics,
+            "profile": self.profile_files,
+            "total_seconds": round(time.perf_counter() - self._t0, 3),
+        }
+
+    def _finish_profile(self):
+        self.profiler.stop()
+        try:
+            self.profile_files = self.profiler.save(self.output_folder)
+            print(f"🔬 Profile saved: {self.profile_files['pstats']}")
+        except OSError as e:
+            print(f"⚠️ Could not save profile: {e}")
+
+    def _append_to_tracker(self):
+        tracker_path = os.path.join(self.output_folder, TRACKER_NAME)
+        if not os.path.exists(tracker_path):
+            return
+        lines = []
+        if self.metrics:
+            lines += ["", "", "Performance (wall | cpu | peak RSS growth | rows in -> out | rows/s)"]
+            lines += [format_metric(m) for m in self.metrics]
+        if self.profile_files:
+            lines += ["", ""] + self.profiler.summary_lines()
+        if not lines:
+            return
+        try:
+            with open(tracker_path, "a") as f:
+                f.write("\n".join(lines) + "\n")
+        except OSError as e:
+            print(f"⚠️ Could not add performance lines to {tracker_path}: {e}")
+
+    def __exit__(self, exc_type, exc, tb):
+        deactivate(self._token)
+        flush_logs()
+        if self.profiler is not None:
+            self._finish_profile()
+        if exc_type is None:
+            status = "ok"
+        else:
+            status = "cancelled" if issubclass(exc_type, JobCancelled) else "failed"
+        record = self.to_dict(status, None if exc is None else str(exc))
+        if self.sidecar:
+            self._append_to_tracker()
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                tmp_path = self.path + ".tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(record, f, indent=1)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                print(f"⚠️ Could not write run sidecar {self.path}: {e}")
+        try:
+            register_run(record, self.output_folder, list_entry=self.sidecar)
+        except Exception as e:  # the catalog must never fail a run
+            print(f"⚠️ Could not register run in catalog: {e}")
+        return False
+
+
+def tracked_tool(name):
+    """Decorator for tools that work on the current folder: log each call to the catalog."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            cwd = os.getcwd()
+            with PipelineRun(name, None, cwd, cwd, sidecar=False):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def load_sidecar(folder):
+    """The run record in folder, or None (no sidecar / unreadable)."""
+    try:
+        with open(os.path.join(folder, SIDECAR_NAME), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
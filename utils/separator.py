@@ -4,6 +4,8 @@ import logging
 from datetime import datetime
 import re
 
+from .progress import open_reporting, report
+
 # Logging setup
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -46,10 +48,11 @@ def separate_by_column(file, column, output_dir=None, file_format='xlsx',
     ensure_folder(output_dir)
 
     # Read file
-    if file.endswith(".csv"):
-        df = pd.read_csv(file)
-    else:
-        df = pd.read_excel(file)
+    with open_reporting(file) as f:
+        if file.endswith(".csv"):
+            df = pd.read_csv(f)
+        else:
+            df = pd.read_excel(f)
 
     # Handle NaN values
     if handle_na == 'skip':
@@ -67,6 +70,8 @@ def separate_by_column(file, column, output_dir=None, file_format='xlsx',
     total_records = 0
 
     # Separate files
+    stage = f"Separating {os.path.basename(file)}"
+    report(stage=stage, done=0, total=len(df), unit="rows")
     for value, group in df.groupby('_group_key'):
         filename_base = custom_naming(value) if custom_naming else _clean_filename(str(value))
         files_created = []
@@ -83,6 +88,7 @@ def separate_by_column(file, column, output_dir=None, file_format='xlsx',
 
         file_records[filename_base] = len(group)
         total_records += len(group)
+        report(stage=stage, done=total_records, total=len(df), unit="rows")
 
     # Save summary as TXT
     summary_txt = os.path.join(output_dir, "separation_summary.txt")
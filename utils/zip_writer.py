@@ -0,0 +1,161 @@
+# utils/zip_writer.py
+# Zip archives with members compressed in parallel threads (no Tk import).
+#
+# zlib releases the GIL, so each member is deflated on its own thread into a
+# spooled buffer; the buffers are then appended to the archive in member order.
+# Sizes are known before a member is written, so no data descriptors are needed.
+# ZIP64 records are added only when a size, an offset or the member count needs them.
+import os
+import time
+import zlib
+import struct
+import tempfile
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+
+from .progress import report
+
+ZIP_MODES = ("deflate", "store", "auto")
+DEFAULT_WORKERS = min(8, os.cpu_count() or 1)
+READ_CHUNK = 1024 * 1024
+SPOOL_LIMIT = 32 * 1024 * 1024  # larger compressed members spill to a temp file
+
+# Already-compressed formats: "auto" stores these as-is
+STORED_EXTENSIONS = {
+    ".zip", ".gz", ".bz2", ".xz", ".7z", ".rar",
+    ".xlsx", ".xlsm", ".docx", ".pptx",
+    ".png", ".jpg", ".jpeg", ".gif", ".webp", ".pdf", ".mp3", ".mp4",
+}
+
+STORED = 0
+DEFLATED = 8
+ZIP32_MAX = 0xFFFFFFFF
+ZIP16_MAX = 0xFFFF
+
+
+def _dos_datetime(mtime):
+    t = time.localtime(mtime)
+    year = max(t.tm_year, 1980)
+    date = ((year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
+    clock = (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2)
+    return clock, date
+
+
+def _pack_member(src_path, method):
+    """Read and (maybe) deflate one file. Returns (method, crc, raw size, spooled data)."""
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_LIMIT)
+    crc = 0
+    size = 0
+    deflater = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15) if method == DEFLATED else None
+    with open(src_path, "rb") as f:
+        for block in iter(lambda: f.read(READ_CHUNK), b""):
+            crc = zlib.crc32(block, crc)
+            size += len(block)
+            spool.write(deflater.compress(block) if deflater else block)
+    if deflater:
+        spool.write(deflater.flush())
+    return method, crc, size, spool
+
+
+def _pack_auto(src_path):
+    if os.path.splitext(src_path)[1].lower() in STORED_EXTENSIONS:
+        return _pack_member(src_path, STORED)
+    packed = _pack_member(src_path, DEFLATED)
+    method, crc, size, spool = packed
+    if spool.tell() >= size:  # deflate did not help: keep the bytes as they are
+        spool.close()
+        return _pack_member(src_path, STORED)
+    return packed
+
+
+def _copy_spool(spool, out):
+    spool.seek(0)
+    for block in iter(lambda: spool.read(READ_CHUNK), b""):
+        out.write(block)
+    spool.close()
+
+
+def write_zip(zip_path, members, mode="deflate", workers=DEFAULT_WORKERS):
+    """
+    members: [(source file, name inside the zip)], written in that order.
+    mode: "deflate" (like ZIP_DEFLATED), "store" (no compression) or "auto"
+    (store already-compressed formats and anything deflate does not shrink).
+    The archive is written next to zip_path and moved into place when complete.
+    Returns the number of members written.
+    """
+    if mode not in ZIP_MODES:
+        raise ValueError(f"mode must be one of {ZIP_MODES}")
+    if mode == "auto":
+        pack = _pack_auto
+    else:
+        pack = partial(_pack_member, method=DEFLATED if mode == "deflate" else STORED)
+
+    tmp_path = zip_path + ".part"
+    central = []
+    try:
+        with open(tmp_path, "wb") as out, ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            # Bounded look-ahead keeps at most ~2 buffers per worker in flight
+            window = max(1, workers) * 2
+            pending = [pool.submit(pack, src) for src, _ in members[:window]]
+            for i, (src, arcname) in enumerate(members):
+                method, crc, size, spool = pending[i].result()
+                pending[i] = None
+                if i + window < len(members):
+                    pending.append(pool.submit(pack, members[i + window][0]))
+                central.append(_write_member(out, src, arcname, method, crc, size, spool))
+                report(stage=f"Zipping {os.path.basename(zip_path)}", done=i + 1, total=len(members), unit="files")
+            _write_central_directory(out, central)
+        os.replace(tmp_path, zip_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return len(central)
+
+
+def _write_member(out, src_path, arcname, method, crc, size, spool):
+    offset = out.tell()
+    spool.seek(0, os.SEEK_END)
+    csize = spool.tell()
+    st = os.stat(src_path)
+    clock, date = _dos_datetime(st.st_mtime)
+    name = arcname.replace(os.sep, "/").encode("utf-8")
+    flags = 0x800 if not arcname.isascii() else 0  # bit 11: UTF-8 file name
+
+    zip64 = size >= ZIP32_MAX or csize >= ZIP32_MAX
+    extra = struct.pack("<HHQQ", 0x0001, 16, size, csize) if zip64 else b""
+    version = 45 if zip64 else 20
+    out.write(struct.pack(
+        "<IHHHHHIIIHH", 0x04034B50, version, flags, method, clock, date, crc,
+        ZIP32_MAX if zip64 else csize, ZIP32_MAX if zip64 else size, len(name), len(extra)))
+    out.write(name)
+    out.write(extra)
+    _copy_spool(spool, out)
+    return {"name": name, "flags": flags, "method": method, "clock": clock, "date": date,
+            "crc": crc, "size": size, "csize": csize, "offset": offset,
+            "mode": st.st_mode & 0xFFFF}
+
+
+def _write_central_directory(out, central):
+    cd_offset = out.tell()
+    for m in central:
+        big = [v for v in (m["size"], m["csize"], m["offset"]) if v >= ZIP32_MAX]
+        extra = struct.pack("<HH", 0x0001, 8 * len(big)) + b"".join(struct.pack("<Q", v) for v in big) if big else b""
+        version = 45 if big else 20
+        out.write(struct.pack(
+            "<IHHHHHHIIIHHHHHII", 0x02014B50, (3 << 8) | version, version, m["flags"], m["method"],
+            m["clock"], m["date"], m["crc"],
+            min(m["csize"], ZIP32_MAX), min(m["size"], ZIP32_MAX),
+            len(m["name"]), len(extra), 0, 0, 0, m["mode"] << 16, min(m["offset"], ZIP32_MAX)))
+        out.write(m["name"])
+        out.write(extra)
+    cd_size = out.tell() - cd_offset
+    count = len(central)
+
+    if count >= ZIP16_MAX or cd_size >= ZIP32_MAX or cd_offset >= ZIP32_MAX:
+        zip64_eocd = out.tell()
+        out.write(struct.pack("<IQHHIIQQQQ", 0x06064B50, 44, 45, 45, 0, 0, count, count, cd_size, cd_offset))
+        out.write(struct.pack("<IIQI", 0x07064B50, 0, zip64_eocd, 1))
+    out.write(struct.pack(
+        "<IHHHHIIH", 0x06054B50, 0, 0, min(count, ZIP16_MAX), min(count, ZIP16_MAX),
+        min(cd_size, ZIP32_MAX), min(cd_offset, ZIP32_MAX), 0))